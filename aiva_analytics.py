@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+📈 AIVACEO Analytics Engine
+Declarative KPI definitions computed in one vectorized pass over the call table
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+#######################################
+# KPI DEFINITIONS
+#######################################
+
+# Each KPI is (name, kind, column, argument, scale)
+#   rows        total row count
+#   sum / mean  numeric column reductions (missing values count as 0)
+#   nunique     distinct non-null values
+#   match_count rows whose value is in argument (list of labels)
+#   match_rate  match_count as a percentage of all rows
+#   gt_count    rows whose numeric value is > argument
+#   lt_count    rows whose numeric value is < argument
+# column may be a tuple of alternatives; the first one present is used.
+
+VAPI_KPIS = [
+    ('total_calls', 'rows', None, None, 1),
+    ('total_cost', 'sum', 'cost', None, 1),
+    ('avg_call_duration', 'mean', 'call_duration_seconds', None, 1 / 60),
+    ('success_rate', 'match_rate', 'call_success', ['Yes'], 1),
+    ('avg_sentiment', 'mean', 'sentiment_score', None, 1),
+    ('appointments_scheduled', 'match_count', 'appointment_scheduled', ['Yes'], 1),
+    ('avg_confidence', 'mean', 'confidence_score', None, 100),
+    ('total_agents', 'nunique', 'voice_agent_name', None, 1),
+    ('avg_satisfaction', 'mean', 'customer_satisfaction', None, 1),
+    ('total_revenue', 'sum', 'revenue_impact', None, 1),
+    ('avg_conversion', 'mean', 'conversion_probability', None, 100),
+    ('avg_ai_accuracy', 'mean', 'ai_accuracy_score', None, 100),
+    ('escalations', 'match_count', 'escalation_required', ['Yes'], 1),
+    ('follow_ups', 'match_count', 'follow_up_required', ['Yes'], 1),
+    ('avg_resolution_time', 'mean', 'resolution_time_seconds', None, 1 / 60),
+    ('avg_speech_rate', 'mean', 'speech_rate_wpm', None, 1),
+    ('avg_silence', 'mean', 'silence_percentage', None, 1),
+    ('avg_interruptions', 'mean', 'interruption_count', None, 1),
+    ('avg_agent_performance', 'mean', 'agent_performance_score', None, 100),
+    ('avg_lead_quality', 'mean', 'lead_quality_score', None, 100),
+    ('avg_clv', 'mean', 'customer_lifetime_value', None, 1),
+    ('high_value_customers', 'match_count', 'customer_tier', ['Platinum', 'VIP'], 1),
+    ('complex_calls', 'match_count', 'call_complexity', ['High'], 1),
+    ('positive_sentiment', 'gt_count', 'sentiment_score', 0.7, 1),
+    ('high_confidence', 'gt_count', 'confidence_score', 0.9, 1),
+    ('quick_resolutions', 'lt_count', 'resolution_time_seconds', 300, 1),
+]
+
+CALL_KPIS = [
+    ('total_calls', 'rows', None, None, 1),
+    ('total_cost', 'sum', 'cost', None, 1),
+    ('avg_call_duration', 'mean', ('call_length_seconds', 'call_duration_seconds'), None, 1 / 60),
+    ('success_rate', 'match_rate', 'call_success', ['Yes'], 1),
+    ('avg_sentiment', 'mean', 'sentiment_score', None, 1),
+    ('appointments_scheduled', 'match_count', 'appointment_scheduled', ['Yes'], 1),
+    ('avg_response_time', 'mean', 'response_time_minutes', None, 1),
+    ('total_agents', 'nunique', 'voice_agent_name', None, 1),
+    ('avg_satisfaction', 'mean', 'customer_satisfaction', None, 1),
+    ('total_revenue', 'sum', 'revenue_impact', None, 1),
+    ('avg_conversion', 'mean', 'conversion_probability', None, 100),
+    ('avg_ai_accuracy', 'mean', 'ai_accuracy_score', None, 100),
+    ('escalations', 'match_count', 'escalation_required', ['Yes'], 1),
+    ('follow_ups', 'match_count', 'follow_up_required', ['Yes'], 1),
+]
+
+EXTENDED_CALL_KPIS = CALL_KPIS + [
+    ('avg_nps', 'mean', 'nps_score', None, 1),
+    ('avg_csat', 'mean', 'csat_score', None, 1),
+    ('avg_effort', 'mean', 'effort_score', None, 1),
+    ('high_value_deals', 'gt_count', 'contract_value', 10000, 1),
+    ('churn_risk_high', 'match_count', 'churn_risk', ['High'], 1),
+    ('upsell_opportunities', 'match_count', 'upsell_opportunity', ['Medium', 'High'], 1),
+]
+
+#######################################
+# KPI ENGINE
+#######################################
+
+def numeric_values(series):
+    """NumPy values of a column as numbers; unparseable values become NaN"""
+    if not pd.api.types.is_numeric_dtype(series):
+        series = pd.to_numeric(series, errors='coerce')
+    return series.to_numpy(dtype=np.float64, na_value=np.nan) if series.dtype.kind not in 'iufb' else series.to_numpy()
+
+def numeric_sum(values):
+    """Sum treating missing values as 0; the NaN scan only runs when the plain sum is NaN"""
+    total = values.sum()
+    return float(np.nansum(values)) if total != total else float(total)
+
+def label_counts(series):
+    """Row count per distinct value in one pass; categoricals use a bincount over their integer codes"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Shift codes by one so missing values (-1) land in a discarded bucket
+        counts = np.bincount(series.cat.codes.to_numpy().astype(np.int64) + 1,
+                             minlength=len(series.cat.categories) + 1)[1:]
+        return dict(zip(series.cat.categories, counts.tolist()))
+    return series.value_counts(dropna=True).to_dict()
+
+class KPIEngine:
+    """
+    Computes a declared set of KPIs together and caches the results per dataset version.
+
+    Every KPI is finished from additive totals (row count, column sums, threshold and label
+    counts), so a new version of a call store can be reached from a cached one by adding
+    the totals of the rows its writes added and subtracting those of the rows they replaced.
+    """
+
+    def __init__(self, kpis, cache_size=32):
+        self.kpis = list(kpis)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def names(self):
+        return [kpi[0] for kpi in self.kpis]
+
+    def empty(self):
+        return {name: 0 for name in self.names}
+
+    def _resolve(self, frame, column):
+        if column is None:
+            return None
+        for candidate in (column if isinstance(column, tuple) else (column,)):
+            if candidate in frame.columns:
+                return candidate
+        return None
+
+    def _totals(self, frame):
+        """Additive totals of a frame for every KPI, touching each referenced column once"""
+        resolved = tuple(self._resolve(frame, kpi[2]) for kpi in self.kpis)
+        totals = {'rows': len(frame), 'columns': resolved}
+
+        # One reduction per numeric column; one value count per label column serves every
+        # Yes/No test, label match and distinct count on it
+        values = {}
+        for (name, kind, _, arg, _), col in zip(self.kpis, resolved):
+            if col is None:
+                continue
+            if kind in ('sum', 'mean', 'gt_count', 'lt_count'):
+                if col not in values:
+                    values[col] = numeric_values(frame[col])
+                    totals[('sum', col)] = numeric_sum(values[col])
+                if kind == 'gt_count':
+                    totals[(kind, col, arg)] = int(np.count_nonzero(values[col] > arg))
+                elif kind == 'lt_count':
+                    totals[(kind, col, arg)] = int(np.count_nonzero(values[col] < arg))
+            elif kind in ('match_count', 'match_rate', 'nunique') and ('labels', col) not in totals:
+                totals[('labels', col)] = label_counts(frame[col])
+        return totals
+
+    def _merged(self, totals, other, sign=1):
+        """totals plus (or, with sign=-1, minus) other; None when they cover different columns"""
+        if totals.keys() != other.keys() or totals['columns'] != other['columns']:
+            return None
+        merged = {}
+        for key, value in totals.items():
+            if key == 'columns':
+                merged[key] = value
+            elif isinstance(value, dict):
+                counts = dict(value)
+                for label, count in other[key].items():
+                    counts[label] = counts.get(label, 0) + sign * count
+                merged[key] = counts
+            else:
+                merged[key] = value + sign * other[key]
+        return merged
+
+    def _results(self, totals):
+        """KPI values from a frame's totals"""
+        total = totals['rows']
+        results = {}
+        for (name, kind, _, arg, scale), col in zip(self.kpis, totals['columns']):
+            if kind == 'rows':
+                value = total
+            elif col is None or not total:
+                value = 0
+            elif kind in ('sum', 'mean'):
+                value = totals[('sum', col)] / total if kind == 'mean' else totals[('sum', col)]
+            elif kind in ('gt_count', 'lt_count'):
+                value = totals[(kind, col, arg)]
+            elif kind == 'match_count':
+                value = sum(totals[('labels', col)].get(label, 0) for label in arg)
+            elif kind == 'match_rate':
+                value = sum(totals[('labels', col)].get(label, 0) for label in arg) / total * 100
+            elif kind == 'nunique':
+                value = sum(1 for count in totals[('labels', col)].values() if count)
+            else:
+                raise ValueError(f"Unknown KPI kind: {kind}")
+
+            results[name] = value * scale if scale != 1 else value
+
+        return results
+
+    def compute(self, frame):
+        """All KPIs for a frame, touching each referenced column once"""
+        return self._results(self._totals(frame))
+
+    def _caught_up(self, totals, changes):
+        """Totals of a cached version moved forward by a store's writes since (see CallStore.changes_since)"""
+        totals = self._merged(totals, self._totals(changes['frame'].iloc[changes['start']:]))
+        if totals is not None and len(changes['patched']):
+            totals = self._merged(totals, self._totals(changes['new']))
+            totals = totals and self._merged(totals, self._totals(changes['old']), sign=-1)
+        return totals
+
+    def get(self, frame, version=None, changes=None):
+        """
+        Cached KPIs for a dataset version; without a version the frame is always recomputed.
+        changes(cached_version) may return a call store's writes since a cached version
+        (CallStore.changes_since), which are then folded into that version's totals instead
+        of scanning the whole frame.
+        """
+        if version is None:
+            return self.compute(frame)
+
+        with self._lock:
+            if version in self._cache:
+                self._cache.move_to_end(version)
+                return dict(self._cache[version][0])
+            latest = next(reversed(self._cache), None)
+            latest_totals = self._cache[latest][1] if latest is not None else None
+
+        totals = None
+        if changes is not None and latest is not None:
+            delta = changes(latest)
+            if delta is not None:
+                totals = self._caught_up(latest_totals, delta)
+        if totals is None:
+            totals = self._totals(frame)
+        results = self._results(totals)
+
+        with self._lock:
+            self._cache[version] = (results, totals)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return dict(results)
+
+#######################################
+# BOOLEAN ROLLUPS
+#######################################
+
+def yes_mask(series):
+    """Yes/No column as a boolean array; categoricals compare one integer code instead of strings"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        code = series.cat.categories.get_indexer(['Yes'])[0]
+        if code < 0:
+            return np.zeros(len(series), dtype=bool)
+        return series.cat.codes.to_numpy() == code
+    return (series == 'Yes').to_numpy(dtype=bool, na_value=False)
+
+def rollup(frame, by, aggregations, observed=True):
+    """
+    frame.groupby(by).agg(aggregations) without Python lambdas.
+
+    Besides pandas reducer names, a column may use 'yes_count' or 'yes_rate'
+    (percentage of 'Yes'): the column becomes a boolean array once and is reduced
+    with native sum / mean. Output column names follow pandas: the column name,
+    or (column, reducer) pairs when any column asks for a list of reducers.
+    """
+    multi = any(isinstance(hows, (list, tuple)) for hows in aggregations.values())
+    flags = {}
+    named = {}
+    names = []
+    rates = []
+
+    for col, hows in aggregations.items():
+        for how in (hows if isinstance(hows, (list, tuple)) else [hows]):
+            source, func = col, how
+            if how in ('yes_count', 'yes_rate'):
+                source = f'__{col}__yes'
+                if source not in flags:
+                    flags[source] = yes_mask(frame[col])
+                func = 'sum' if how == 'yes_count' else 'mean'
+
+            key = f'__agg{len(names)}'
+            named[key] = (source, func)
+            names.append((col, how) if multi else col)
+            if how == 'yes_rate':
+                rates.append(key)
+
+    work = frame.assign(**flags) if flags else frame
+    result = work.groupby(by, observed=observed, sort=True).agg(**named)
+
+    for key in rates:
+        result[key] = result[key] * 100
+    result.columns = pd.MultiIndex.from_tuples(names) if multi else names
+    return result
+
+#######################################
+# ROLLUP CUBE
+#######################################
+
+# Grouping dimensions of the cube; 'hour' is derived from call_start_time (or call_hour)
+CUBE_DIMENSIONS = ['call_date', 'hour', 'voice_agent_name', 'customer_tier', 'intent_detected', 'call_category']
+
+# Numeric measures kept as sum / non-null count / min / max per cell
+CUBE_MEASURES = [
+    'cost', 'call_duration_seconds', 'sentiment_score', 'confidence_score',
+    'customer_satisfaction', 'ai_accuracy_score', 'revenue_impact',
+    'conversion_probability', 'resolution_time_seconds'
+]
+
+# Yes/No columns kept as a per-cell count of 'Yes'
+CUBE_FLAGS = ['call_success', 'appointment_scheduled', 'escalation_required', 'follow_up_required']
+
+# Histogram sketches: per-cell bucket counts with pd.cut semantics (right-inclusive bins)
+CUBE_HISTOGRAMS = {
+    'sentiment_score': ([0, 0.3, 0.7, 1.0], ['Negative', 'Neutral', 'Positive'])
+}
+
+# Cells of later writes are kept apart until they add up to this fraction of the cube's cells
+CUBE_PENDING_FRACTION = 0.05
+
+def call_hours(frame):
+    """Hour of day per call from call_start_time, falling back to call_hour"""
+    if 'call_start_time' in frame.columns:
+        return pd.to_datetime(frame['call_start_time'], format='%H:%M:%S', errors='coerce').dt.hour
+    if 'call_hour' in frame.columns:
+        return pd.to_numeric(frame['call_hour'], errors='coerce')
+    return None
+
+class RollupCube:
+    """
+    Pre-aggregated cells over (call_date, hour, agent, tier, intent, category).
+
+    Every cell keeps additive state only (row count, sums, non-null counts, Yes counts,
+    histogram buckets) plus min/max, so cells from new rows merge into the cube and any
+    coarser grouping is answered by re-summing cells instead of scanning raw calls. Rows a
+    write changed are moved by subtracting their old cells and adding their new ones;
+    min/max cannot be subtracted, so they keep the extremes seen since the last build.
+    Cells of recent writes stay in small pending frames that queries sum in, and are
+    merged into the main cells once they reach CUBE_PENDING_FRACTION of them.
+    """
+
+    def __init__(self):
+        self.cells = None
+        self._pending = []
+        self.dimensions = []
+        self.measures = []
+        self.flags = []
+        self.histograms = {}
+        self.rows = 0
+        self.version = None
+        self.base_version = None
+        self._lock = threading.RLock()
+
+    def _cells_for(self, frame, signs=None):
+        """
+        Aggregate raw calls into cells with one groupby; rows whose sign is -1 are
+        subtracted (and left out of min/max)
+        """
+        signs = np.ones(len(frame), dtype=np.int64) if signs is None else signs
+        work = {}
+        for dim in self.dimensions:
+            work[dim] = call_hours(frame) if dim == 'hour' else frame[dim]
+        work['rows'] = signs
+
+        for col in self.measures:
+            values = pd.to_numeric(frame[col], errors='coerce') if not pd.api.types.is_numeric_dtype(frame[col]) else frame[col]
+            work[f'{col}__sum'] = values * signs
+            work[f'{col}__n'] = values.notna().astype(np.int64) * signs
+            work[f'{col}__min'] = values.where(signs > 0)
+            work[f'{col}__max'] = values.where(signs > 0)
+
+        for col in self.flags:
+            work[f'{col}__yes'] = (frame[col] == 'Yes').astype(np.int64) * signs
+
+        for col, (bins, labels) in self.histograms.items():
+            codes = pd.cut(numeric_values(frame[col]), bins=bins, labels=False)
+            for i, label in enumerate(labels):
+                work[f'{col}__{label}'] = (codes == i).astype(np.int64) * signs
+
+        work = pd.DataFrame(work, index=frame.index)
+        return self._combine(work)
+
+    def _source_columns(self, frame):
+        """Columns of a call frame the cells are computed from"""
+        sources = [dim for dim in self.dimensions if dim != 'hour'] + ['call_start_time', 'call_hour']
+        sources += self.measures + self.flags + list(self.histograms)
+        return [col for col in dict.fromkeys(sources) if col in frame.columns]
+
+    def _combine(self, parts):
+        """Merge cells (or raw per-row cells) that share dimension values"""
+        how = {}
+        for col in parts.columns:
+            if col in self.dimensions:
+                continue
+            how[col] = 'min' if col.endswith('__min') else 'max' if col.endswith('__max') else 'sum'
+
+        if not self.dimensions:
+            return parts.agg(how).to_frame().T
+
+        return parts.groupby(self.dimensions, observed=True, dropna=False, sort=False).agg(how).reset_index()
+
+    def build(self, frame, version=None, base_version=None):
+        """Materialize the cube from a full call frame"""
+        with self._lock:
+            self.dimensions = [dim for dim in CUBE_DIMENSIONS
+                               if (dim == 'hour' and call_hours(frame.head(0)) is not None) or dim in frame.columns]
+            self.measures = [col for col in CUBE_MEASURES if col in frame.columns]
+            self.flags = [col for col in CUBE_FLAGS if col in frame.columns]
+            self.histograms = {col: spec for col, spec in CUBE_HISTOGRAMS.items() if col in frame.columns}
+
+            self.cells = self._cells_for(frame)
+            self._pending = []
+            self.rows = len(frame)
+            self.version = version
+            self.base_version = base_version
+        return self
+
+    def update(self, new_rows, version=None, old_rows=None, changed_rows=None):
+        """
+        Fold newly appended calls into the cube; old_rows and changed_rows are the previous
+        and current values of stored calls that changed
+        """
+        with self._lock:
+            # One groupby for every row involved: old values count -1, new and current ones +1
+            parts = [(rows, sign) for rows, sign in ((new_rows, 1), (changed_rows, 1), (old_rows, -1))
+                     if rows is not None and len(rows)]
+            if parts:
+                rows = pd.concat([rows[self._source_columns(rows)] for rows, _ in parts], ignore_index=True)
+                signs = np.concatenate([np.full(len(part), sign, dtype=np.int64) for part, sign in parts])
+                cells = self._cells_for(rows, signs)
+                # Dimensions keep the frame's categories, which only ever grow
+                for dim in self.dimensions:
+                    if dim in new_rows.columns and isinstance(new_rows[dim].dtype, pd.CategoricalDtype):
+                        cells[dim] = cells[dim].astype(new_rows[dim].dtype)
+                        if self.cells[dim].dtype != new_rows[dim].dtype:
+                            recast = {dim: lambda cells: cells[dim].astype(new_rows[dim].dtype)}
+                            self.cells = self.cells.assign(**recast)
+                            self._pending = [pending.assign(**recast) for pending in self._pending]
+                self._pending = self._pending + [cells]
+                if sum(len(pending) for pending in self._pending) > CUBE_PENDING_FRACTION * len(self.cells):
+                    self._merge_pending()
+                self.rows += len(new_rows)
+            self.version = version
+        return self
+
+    def _merge_pending(self):
+        merged = self._combine(pd.concat([self.cells] + self._pending, ignore_index=True))
+        self.cells = merged[merged['rows'] > 0].reset_index(drop=True)
+        self._pending = []
+
+    def query(self, by, measures, filters=None):
+        """
+        Group the cube by a subset of its dimensions.
+
+        measures maps a column to 'count', 'sum', 'mean', 'min', 'max', 'rate'
+        (percentage of 'Yes' for flag columns) or 'buckets' (histogram counts);
+        filters maps a dimension to the list of values to keep.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+
+        # Groups whose calls all moved elsewhere are left with rows == 0 and dropped
+        needed = {'rows'}
+        for col, how in measures.items():
+            if how in ('sum', 'mean'):
+                needed.update([f'{col}__sum', f'{col}__n'])
+            elif how in ('min', 'max'):
+                needed.add(f'{col}__{how}')
+            elif how == 'rate':
+                needed.add(f'{col}__yes')
+            elif how == 'buckets':
+                needed.update(f'{col}__{label}' for label in self.histograms[col][1])
+
+        with self._lock:
+            cells, pending = self.cells, self._pending
+        if pending:
+            columns = list(dict.fromkeys(by + list(filters or {}) + sorted(needed)))
+            cells = pd.concat([cells[columns]] + [part[columns] for part in pending], ignore_index=True)
+
+        for dim, values in (filters or {}).items():
+            if values:
+                cells = cells[cells[dim].isin(values)]
+
+        how_merge = {col: 'min' if col.endswith('__min') else 'max' if col.endswith('__max') else 'sum'
+                     for col in sorted(needed)}
+        if by:
+            grouped = cells.groupby(by, observed=True, sort=True).agg(how_merge)
+            grouped = grouped[grouped['rows'] > 0]
+        else:
+            grouped = cells[sorted(needed)].agg(how_merge).to_frame().T
+
+        result = pd.DataFrame(index=grouped.index)
+        for col, how in measures.items():
+            if how == 'count':
+                result[col] = grouped['rows']
+            elif how == 'sum':
+                result[col] = grouped[f'{col}__sum']
+            elif how == 'mean':
+                result[col] = grouped[f'{col}__sum'] / grouped[f'{col}__n'].where(grouped[f'{col}__n'] > 0)
+            elif how in ('min', 'max'):
+                result[col] = grouped[f'{col}__{how}']
+            elif how == 'rate':
+                result[col] = grouped[f'{col}__yes'] / grouped['rows'] * 100
+            elif how == 'buckets':
+                for label in self.histograms[col][1]:
+                    result[label] = grouped[f'{col}__{label}']
+            else:
+                raise ValueError(f"Unknown cube measure: {how}")
+
+        return result.reset_index() if by else result.reset_index(drop=True)
+
+    def sync(self, store):
+        """Bring the cube up to a store's version: fold in the writes since, rebuild after a full replace"""
+        with self._lock:
+            if self.version == store.version:
+                return self
+
+            changes = store.changes_since(self.version) if self.cells is not None and self.version is not None else None
+            if changes is not None and changes['start'] == self.rows:
+                return self.update(changes['frame'].iloc[self.rows:], version=changes['version'],
+                                   old_rows=changes['old'], changed_rows=changes['new'])
+
+            with store._lock:
+                frame, version, base_version = store.frame, store.version, store.base_version
+            return self.build(frame, version=version, base_version=base_version)
+
+_cubes = {}
+_cubes_lock = threading.Lock()
+
+def get_rollup_cube(store):
+    """Shared rollup cube for a call store, kept in step with the store's version"""
+    with _cubes_lock:
+        cube = _cubes.get(store.name)
+        if cube is None:
+            cube = _cubes[store.name] = RollupCube()
+
+    return cube.sync(store)
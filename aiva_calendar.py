@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+📅 AIVACEO Call Calendar
+Columnar call schedule and streamlit-calendar event builder
+"""
+
+import numpy as np
+import pandas as pd
+
+#######################################
+# CALL SCHEDULE
+#######################################
+
+DEFAULT_CALL_SECONDS = 300  # Calls without a length are shown as 5 minutes
+
+def parse_call_schedule(df):
+    """
+    Start/end times for every call with a parseable call_date and call_start_time.
+
+    Dates and times are parsed once for the whole frame; rows that do not parse are
+    dropped. The index is the source frame's index so event fields can be looked up.
+    """
+    if 'call_date' not in df.columns or 'call_start_time' not in df.columns:
+        return pd.DataFrame({'start': pd.Series(dtype='datetime64[ns]'),
+                             'end': pd.Series(dtype='datetime64[ns]'),
+                             'duration_seconds': pd.Series(dtype='float64')})
+
+    days = pd.to_datetime(df['call_date'].astype(str), errors='coerce').dt.normalize()
+    times = pd.to_timedelta(df['call_start_time'].astype(str), errors='coerce')
+
+    if 'call_length_seconds' in df.columns:
+        durations = pd.to_numeric(df['call_length_seconds'], errors='coerce')
+    else:
+        durations = pd.Series(DEFAULT_CALL_SECONDS, index=df.index, dtype='float64')
+
+    schedule = pd.DataFrame({
+        'start': days + times,
+        'duration_seconds': durations
+    }, index=df.index)
+    schedule = schedule.dropna()
+    schedule['end'] = schedule['start'] + pd.to_timedelta(schedule['duration_seconds'], unit='s')
+
+    return schedule.sort_values('start', kind='stable')[['start', 'end', 'duration_seconds']]
+
+def calendar_window(schedule, start_date, end_date):
+    """Calls starting between start_date and end_date (inclusive days)"""
+    window_start = pd.Timestamp(start_date)
+    window_end = pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    starts = schedule['start'].to_numpy()
+    lo, hi = np.searchsorted(starts, [window_start.to_datetime64(), window_end.to_datetime64()])
+    return schedule.iloc[lo:hi]
+
+def count_calls(schedule, day=None, month=None):
+    """Number of scheduled calls, optionally only on a day ('YYYY-MM-DD') or in a month ('YYYY-MM')"""
+    if day is not None:
+        return len(calendar_window(schedule, day, day))
+    if month is not None:
+        first = pd.Timestamp(f"{month}-01")
+        last = first + pd.offsets.MonthEnd(0)
+        return len(calendar_window(schedule, first, last))
+    return len(schedule)
+
+#######################################
+# CALENDAR EVENTS
+#######################################
+
+def _column(frame, name, default):
+    if name in frame.columns:
+        return frame[name].astype(object).tolist()
+    return [default] * len(frame)
+
+def build_calendar_events(df, schedule, success_color, failed_color, pending_color):
+    """streamlit-calendar events for the calls in schedule (one dict per call, fields gathered column-wise)"""
+    if len(schedule) == 0:
+        return []
+
+    rows = df.loc[schedule.index]
+    status = _column(rows, 'call_success', 'Unknown')
+
+    status_array = np.asarray(status, dtype=object)
+    colors = np.select([status_array == 'Yes', status_array == 'No'],
+                       [success_color, failed_color], default=pending_color).tolist()
+
+    starts = schedule['start'].dt.strftime('%Y-%m-%dT%H:%M:%S').tolist()
+    ends = schedule['end'].dt.strftime('%Y-%m-%dT%H:%M:%S').tolist()
+
+    seconds = schedule['duration_seconds']
+    if (seconds % 1 == 0).all():
+        seconds = seconds.astype(np.int64)
+    durations = [f"{m}m {s}s" for m, s in zip((seconds // 60).tolist(), (seconds % 60).tolist())]
+
+    titles = [f"📞 {name}" for name in _column(rows, 'client_name', 'Unknown')]
+    agents = _column(rows, 'voice_agent_name', 'Unknown')
+    sentiments = _column(rows, 'sentiment_score', 0)
+    satisfactions = _column(rows, 'customer_satisfaction', 0)
+    call_ids = _column(rows, 'call_id', 'Unknown')
+    phones = _column(rows, 'phone_number', 'Unknown')
+    intents = _column(rows, 'intent_detected', 'Unknown')
+    outcomes = _column(rows, 'call_outcome', 'Unknown')
+
+    return [
+        {
+            'title': titles[i],
+            'start': starts[i],
+            'end': ends[i],
+            'backgroundColor': colors[i],
+            'borderColor': colors[i],
+            'textColor': 'white',
+            'extendedProps': {
+                'agent': agents[i],
+                'status': status[i],
+                'duration': durations[i],
+                'sentiment': sentiments[i],
+                'satisfaction': satisfactions[i],
+                'call_id': call_ids[i],
+                'phone': phones[i],
+                'intent': intents[i],
+                'outcome': outcomes[i]
+            }
+        }
+        for i in range(len(schedule))
+    ]
+
+#######################################
+# WINDOWED EVENT FEED
+#######################################
+
+# Per-view day density above which a day is sent as one summary event
+DAY_EVENT_LIMITS = {
+    'dayGridMonth': 8,
+    'timeGridWeek': 40,
+    'listWeek': 40,
+    'timeGridDay': 200
+}
+
+class CallIntervalIndex:
+    """
+    Range queries over call [start, end) intervals.
+
+    Intervals are kept sorted by start together with the longest interval length, so
+    calls overlapping a view are found with two binary searches plus an end-time check
+    on the candidates between them.
+    """
+
+    def __init__(self, schedule):
+        if len(schedule) and not schedule['start'].is_monotonic_increasing:
+            schedule = schedule.sort_values('start', kind='stable')
+        self.schedule = schedule
+        self.starts = schedule['start'].to_numpy()
+        self.ends = schedule['end'].to_numpy()
+        self.max_span = (self.ends - self.starts).max() if len(schedule) else np.timedelta64(0, 'ns')
+
+    def __len__(self):
+        return len(self.schedule)
+
+    def overlapping(self, view_start, view_end):
+        """Intervals with start < view_end and end > view_start"""
+        view_start = pd.Timestamp(view_start).to_datetime64()
+        view_end = pd.Timestamp(view_end).to_datetime64()
+
+        lo = np.searchsorted(self.starts, view_start - self.max_span, side='left')
+        hi = np.searchsorted(self.starts, view_end, side='left')
+        candidates = self.schedule.iloc[lo:hi]
+        return candidates[self.ends[lo:hi] > view_start]
+
+    def daily_counts(self, view_start, view_end):
+        """Calls per start day inside a view"""
+        window = self.overlapping(view_start, view_end)
+        return window['start'].dt.normalize().value_counts().sort_index()
+
+def calendar_view_range(view, anchor):
+    """[start, end) of the dates FullCalendar shows for a view around an anchor date (weeks start on Sunday)"""
+    anchor = pd.Timestamp(anchor).normalize()
+
+    if view == 'dayGridMonth':
+        first = anchor.replace(day=1)
+        grid_start = first - pd.Timedelta(days=(first.weekday() + 1) % 7)
+        return grid_start, grid_start + pd.Timedelta(weeks=6)
+    if view in ('timeGridWeek', 'listWeek'):
+        week_start = anchor - pd.Timedelta(days=(anchor.weekday() + 1) % 7)
+        return week_start, week_start + pd.Timedelta(weeks=1)
+    return anchor, anchor + pd.Timedelta(days=1)
+
+def shift_calendar_anchor(view, anchor, steps):
+    """Move an anchor date by whole months, weeks or days depending on the view"""
+    anchor = pd.Timestamp(anchor)
+    if view == 'dayGridMonth':
+        return (anchor + pd.DateOffset(months=steps)).date()
+    if view in ('timeGridWeek', 'listWeek'):
+        return (anchor + pd.Timedelta(weeks=steps)).date()
+    return (anchor + pd.Timedelta(days=steps)).date()
+
+def build_view_events(df, index, view_start, view_end, success_color, failed_color, pending_color, max_per_day=None):
+    """
+    Events for one calendar view: individual calls on normal days, one all-day
+    "N calls" summary per day that has more than max_per_day calls.
+    """
+    window = index.overlapping(view_start, view_end)
+    if len(window) == 0:
+        return []
+
+    days = window['start'].dt.normalize()
+    if max_per_day is None:
+        return build_calendar_events(df, window, success_color, failed_color, pending_color)
+
+    per_day = days.value_counts()
+    dense_days = per_day[per_day > max_per_day].index
+    dense = days.isin(dense_days).to_numpy()
+
+    events = build_calendar_events(df, window[~dense], success_color, failed_color, pending_color)
+    if not dense.any():
+        return events
+
+    dense_rows = df.loc[window.index[dense]]
+    summary = pd.DataFrame({
+        'day': days[dense].to_numpy(),
+        'success': (dense_rows['call_success'] == 'Yes').to_numpy() if 'call_success' in dense_rows.columns else False,
+        'seconds': window['duration_seconds'].to_numpy()[dense],
+        'agent': dense_rows['voice_agent_name'].astype(object).to_numpy() if 'voice_agent_name' in dense_rows.columns else 'Unknown'
+    }).groupby('day').agg(calls=('seconds', 'size'), successes=('success', 'sum'),
+                          seconds=('seconds', 'mean'), agents=('agent', 'nunique'))
+
+    for day, row in summary.iterrows():
+        success_rate = row['successes'] / row['calls'] * 100
+        color = success_color if success_rate >= 50 else failed_color
+        events.append({
+            'title': f"📞 {int(row['calls'])} calls",
+            'start': day.strftime('%Y-%m-%d'),
+            'end': (day + pd.Timedelta(days=1)).strftime('%Y-%m-%d'),
+            'allDay': True,
+            'backgroundColor': color,
+            'borderColor': color,
+            'textColor': 'white',
+            'extendedProps': {
+                'agent': f"{int(row['agents'])} agents",
+                'status': f"{success_rate:.0f}% successful",
+                'duration': f"{row['seconds'] / 60:.1f}m avg",
+                'calls': int(row['calls']),
+                'summary': True
+            }
+        })
+
+    return events
@@ -0,0 +1,1537 @@
+#!/usr/bin/env python3
+"""
+🗄️ AIVACEO Call Store
+Typed, columnar call history loaded once per process and shared by every dashboard session
+"""
+
+import copy
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time as time_module
+import uuid
+import weakref
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Copy-on-write makes shallow copies safe to hand out as read-only views
+# (always on from pandas 3.0, opt-in before that)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+logger = logging.getLogger(__name__)
+
+#######################################
+# CALL SCHEMA
+#######################################
+
+CACHE_DIR = os.environ.get(
+    'AIVA_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.aiva_cache')
+)
+
+# Low-cardinality text columns stored as dictionary-encoded categoricals
+CATEGORICAL_COLUMNS = [
+    'voice_agent_name', 'customer_tier', 'intent_detected', 'call_success',
+    'appointment_scheduled', 'escalation_required', 'follow_up_required',
+    'booking_status', 'language_detected', 'emotion_detected', 'call_complexity',
+    'call_outcome', 'call_category', 'next_best_action', 'call_day_of_week'
+]
+
+# Numeric columns coerced once at load time instead of on every rerun
+NUMERIC_COLUMNS = [
+    'call_duration_seconds', 'call_length_seconds', 'cost', 'sentiment_score',
+    'confidence_score', 'resolution_time_seconds', 'response_time_minutes',
+    'customer_satisfaction', 'speech_rate_wpm', 'silence_percentage',
+    'interruption_count', 'ai_accuracy_score', 'agent_performance_score',
+    'revenue_impact', 'lead_quality_score', 'conversion_probability',
+    'customer_lifetime_value', 'summary_word_count', 'call_hour'
+]
+
+# Columns computed by the store itself; they are never read from or written back to a source
+DERIVED_COLUMNS = ['call_timestamp']
+
+# Wide free-text columns kept out of the in-memory frame and read from a side file on demand
+TEXT_COLUMNS = ['transcript', 'summary', 'action_items']
+
+def _parse_by_value(series, parse):
+    """Parse each distinct value once and spread the results back over the rows (missing -> NaT)"""
+    codes, uniques = pd.factorize(series)
+    parsed = parse(pd.Index(uniques).astype(str)).to_numpy()
+    return np.concatenate([parsed, np.full(1, 'NaT', dtype=parsed.dtype)])[codes]
+
+def parse_call_timestamps(frame):
+    """call_date + call_start_time as one datetime column (midnight when the start time is missing)"""
+    days = _parse_by_value(frame['call_date'], lambda values: pd.to_datetime(values, errors='coerce').normalize())
+
+    if 'call_start_time' in frame.columns:
+        times = _parse_by_value(frame['call_start_time'], lambda values: pd.to_timedelta(values, errors='coerce'))
+        times = np.where(np.isnat(times), np.timedelta64(0, 'ns'), times)
+        days = days + times
+
+    return pd.Series(days, index=frame.index).astype('datetime64[ns]')
+
+def coerce_call_frame(raw_df):
+    """
+    Type a raw call frame: numeric columns to numbers, low-cardinality columns to categoricals,
+    and call_date + call_start_time parsed once into call_timestamp
+    """
+    typed = raw_df.copy(deep=False)
+
+    for col in typed.columns:
+        if col in NUMERIC_COLUMNS and not pd.api.types.is_numeric_dtype(typed[col]):
+            typed[col] = pd.to_numeric(typed[col], errors='coerce').fillna(0)
+        elif col in NUMERIC_COLUMNS:
+            typed[col] = typed[col].fillna(0)
+        elif col in CATEGORICAL_COLUMNS and not isinstance(typed[col].dtype, pd.CategoricalDtype):
+            typed[col] = typed[col].astype('category')
+
+    if 'call_date' in typed.columns and not (
+            'call_timestamp' in typed.columns and pd.api.types.is_datetime64_any_dtype(typed['call_timestamp'])):
+        typed['call_timestamp'] = parse_call_timestamps(typed)
+
+    return typed.reset_index(drop=True)
+
+def concat_call_frames(frames):
+    """
+    Concatenate typed call frames, giving shared categorical columns one dictionary so they
+    stay categorical; numeric columns some frames lack are 0 for their rows, as coerce_call_frame fills them
+    """
+    if len(frames) == 1:
+        return frames[0]
+
+    categories = {}
+    for frame in frames:
+        for col in frame.columns:
+            if isinstance(frame[col].dtype, pd.CategoricalDtype):
+                known = categories.get(col)
+                categories[col] = frame[col].cat.categories if known is None else known.union(frame[col].cat.categories)
+
+    aligned = []
+    for frame in frames:
+        frame = frame.copy(deep=False)
+        for col, values in categories.items():
+            if col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype):
+                frame[col] = frame[col].cat.set_categories(values)
+        aligned.append(frame)
+    combined = pd.concat(aligned, ignore_index=True)
+
+    for col in NUMERIC_COLUMNS:
+        if col in combined.columns and any(col not in frame.columns for frame in frames):
+            combined[col] = combined[col].fillna(0)
+    return combined
+
+#######################################
+# GROWABLE FRAME
+#######################################
+
+FRAME_GROWTH = 1.5  # Capacity of a column buffer as a multiple of the rows it is reserved for
+MAX_ARROW_CHUNKS = 64  # Arrow-backed columns get one chunk per write and are merged back into one past this many
+
+def _code_dtype(n_categories):
+    """Integer type pandas keeps categorical codes in for this many categories"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+def _same_memory(buffer, values):
+    """values is a view of buffer's leading elements"""
+    return (values.dtype == buffer.dtype and values.strides == buffer.strides
+            and values.__array_interface__['data'][0] == buffer.__array_interface__['data'][0])
+
+def _merged_chunks(column):
+    """column with its Arrow chunks merged into one once there are more than MAX_ARROW_CHUNKS"""
+    to_arrow = getattr(column.array, '__arrow_array__', None)
+    if to_arrow is None:
+        return column
+    chunked = to_arrow()
+    if chunked.num_chunks <= MAX_ARROW_CHUNKS:
+        return column
+    return pd.Series(column.dtype.__from_arrow__(chunked.combine_chunks()), name=column.name, copy=False)
+
+class FrameBuffers:
+    """
+    Spare capacity behind the NumPy-backed columns of a store's frame (numbers, timestamps
+    and categorical codes) and the text side file's offsets, so a write that adds rows
+    copies only those rows.
+
+    A published frame holds views of the first n values of each buffer and new rows are
+    written past them, so no reader ever sees a value change. A column whose memory is not
+    a view of its buffer (first append after a load, or a column an update copied) is
+    moved into a new buffer with room to grow. Arrow-backed columns are chunked instead:
+    an append adds a chunk, merged back into one past MAX_ARROW_CHUNKS.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+
+    def clear(self):
+        self._buffers = {}
+
+    def reserve(self, name, current, rows):
+        """Buffer starting with the values of current, with room for rows values"""
+        buffer = self._buffers.get(name)
+        if buffer is None or len(buffer) < rows or not _same_memory(buffer, current):
+            buffer = np.empty(int(rows * FRAME_GROWTH) + 1024, dtype=current.dtype)
+            buffer[:len(current)] = current
+            self._buffers[name] = buffer
+        return buffer
+
+    def concatenated(self, name, parts):
+        """np.concatenate(parts), written into the buffer parts[0] is a view of when it is one"""
+        rows = sum(len(part) for part in parts)
+        buffer = self.reserve(name, parts[0], rows)
+        start = len(parts[0])
+        for part in parts[1:]:
+            buffer[start:start + len(part)] = part
+            start += len(part)
+        return buffer[:rows]
+
+    def _extend_column(self, name, old, new, count):
+        """old followed by count new values (new is None when the added rows lack the column)"""
+        rows = len(old) + count
+        dtype = old.dtype
+
+        if isinstance(dtype, pd.CategoricalDtype):
+            values = pd.Series([np.nan] * count, dtype=object) if new is None else new.astype(object)
+            added = pd.Index(values.dropna().unique()).difference(dtype.categories)
+            if len(added):
+                dtype = pd.CategoricalDtype(dtype.categories.append(added), ordered=dtype.ordered)
+            codes = old.array.codes.astype(_code_dtype(len(dtype.categories)), copy=False)
+            buffer = self.reserve(name, codes, rows)
+            buffer[len(old):rows] = dtype.categories.get_indexer(values)
+            return pd.Series(pd.Categorical.from_codes(buffer[:rows], dtype=dtype, validate=False), name=name, copy=False)
+
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biufmM':
+            if new is not None:
+                values = new.to_numpy()
+            elif name in NUMERIC_COLUMNS:
+                values = np.zeros(count, dtype=dtype)
+            elif dtype.kind in 'fmM':
+                values = np.full(count, np.nan if dtype.kind == 'f' else np.datetime64('NaT'), dtype=dtype)
+            else:
+                values = None
+            if values is not None and (values.dtype == dtype or np.can_cast(values.dtype, dtype, 'safe')):
+                buffer = self.reserve(name, old.to_numpy(), rows)
+                buffer[len(old):rows] = values
+                return pd.Series(buffer[:rows], name=name, copy=False)
+
+        # Arrow-backed (appends add a chunk) or a dtype the new values do not fit
+        if new is None:
+            new = pd.Series(index=range(count), dtype=dtype)
+        column = pd.concat([old, new], ignore_index=True).rename(name)
+        if name in NUMERIC_COLUMNS:
+            column = column.fillna(0)
+        return _merged_chunks(column)
+
+    def extend(self, frame, new):
+        """frame followed by the rows of new (a typed frame of the same kind) as a new frame; frame is unchanged"""
+        count = len(new)
+        columns = {name: self._extend_column(name, frame[name], new[name] if name in new.columns else None, count)
+                   for name in frame.columns}
+        for name in new.columns:
+            if name not in columns:
+                # First seen in this write: missing (0 for numbers) in the rows before it
+                head = pd.Series(index=range(len(frame)), dtype=new[name].dtype)
+                column = pd.concat([head, new[name]], ignore_index=True).rename(name)
+                columns[name] = column.fillna(0) if name in NUMERIC_COLUMNS else column
+        return pd.DataFrame(columns, copy=False)
+
+#######################################
+# DATE PARTITIONS
+#######################################
+
+def date_window(value):
+    """(start, end) dates from a st.date_input range value (a single date while the range is being picked)"""
+    if isinstance(value, (list, tuple)):
+        if len(value) == 0:
+            return None, None
+        return value[0], value[-1]
+    return value, value
+
+def call_days(frame):
+    """Call day of every row (NaT when it has none)"""
+    if 'call_timestamp' in frame.columns:
+        return frame['call_timestamp'].to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+    if 'call_date' in frame.columns:
+        # Frames that did not come through the call store are parsed here
+        return parse_call_timestamps(frame).to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+    return np.full(len(frame), 'NaT', dtype='datetime64[D]')
+
+def _day_labels(frame, days):
+    """(distinct raw call_date values, the day of each) of a frame"""
+    if 'call_date' not in frame.columns:
+        return pd.Index([]), np.array([], dtype='datetime64[D]')
+    codes, uniques = pd.factorize(frame['call_date'])
+    present, first_rows = np.unique(codes, return_index=True)
+    keep = present >= 0
+    return pd.Index(uniques).take(present[keep]), days[first_rows[keep]]
+
+class DatePartitions:
+    """
+    Rows of a call frame grouped into one partition per call day (from call_timestamp).
+
+    Row positions are kept ordered by day together with the offset where each day starts,
+    so a date range is resolved to its partitions with two binary searches and only the
+    rows of those days are ever touched. A month is a run of consecutive day partitions.
+    A later version of a call store's frame gets its partitions through updated(), which
+    places only the rows written since.
+    """
+
+    def __init__(self, frame):
+        self.n_rows = len(frame)
+        days = call_days(frame)
+
+        dated = int((~np.isnat(days)).sum())
+        self.undated = self.n_rows - dated
+
+        # NaT sorts last, so the dated rows are the leading block of the order
+        self.order = np.argsort(days, kind='stable')[:dated]
+        self.days, starts = np.unique(days[self.order], return_index=True)
+        self.offsets = np.append(starts, dated)
+
+        # Raw call_date values per day, for filtering structures keyed by the source strings
+        self.labels, self.label_days = _day_labels(frame, days)
+
+    def updated(self, frame, changes):
+        """
+        Partitions of frame, a later version of this one's frame, given the store's writes in
+        between (CallStore.changes_since): patched rows are taken out of their days and they
+        and the appended rows are merged in by day, without re-sorting every row
+        """
+        if changes['start'] != self.n_rows:
+            return DatePartitions(frame)
+
+        changed = [changes['new'], frame.iloc[changes['start']:]]
+        rows = np.concatenate([changes['patched'], np.arange(changes['start'], len(frame))])
+        days = np.concatenate([call_days(part) for part in changed])
+
+        moved = np.zeros(len(frame), dtype=bool)
+        moved[rows] = True
+        keep = ~moved[self.order]
+        order = self.order[keep]
+        order_days = np.repeat(self.days, np.diff(self.offsets))[keep]
+
+        dated = ~np.isnat(days)
+        by_day = np.argsort(days[dated], kind='stable')
+        added_days, added_rows = days[dated][by_day], rows[dated][by_day]
+        at = np.searchsorted(order_days, added_days, side='right')
+        order_days = np.insert(order_days, at, added_days)
+
+        partitions = copy.copy(self)
+        partitions.n_rows = len(frame)
+        partitions.order = np.insert(order, at, added_rows)
+        partitions.undated = len(frame) - len(partitions.order)
+        starts = np.flatnonzero(np.append(True, order_days[1:] != order_days[:-1])) if len(order_days) else np.zeros(0, dtype=np.int64)
+        partitions.days = order_days[starts]
+        partitions.offsets = np.append(starts, len(order_days))
+
+        # Labels only ever grow: a value no row has any more matches nothing when filtered on
+        labels = [_day_labels(part, part_days) for part, part_days in zip(changed, np.split(days, [len(changes['patched'])]))]
+        for part_labels, part_days in labels:
+            added = ~part_labels.isin(partitions.labels)
+            if added.any():
+                partitions.labels = partitions.labels.append(part_labels[added])
+                partitions.label_days = np.concatenate([partitions.label_days, part_days[added]])
+        return partitions
+
+    def __len__(self):
+        return len(self.days)
+
+    @property
+    def nbytes(self):
+        return (self.order.nbytes + self.days.nbytes + self.offsets.nbytes
+                + self.labels.memory_usage(deep=True) + self.label_days.nbytes)
+
+    @property
+    def first_day(self):
+        return pd.Timestamp(self.days[0]).date() if len(self.days) else None
+
+    @property
+    def last_day(self):
+        return pd.Timestamp(self.days[-1]).date() if len(self.days) else None
+
+    def partitions_between(self, start, end):
+        """Slice of day partitions from start to end (inclusive days)"""
+        lo = np.searchsorted(self.days, np.datetime64(start, 'D'), side='left')
+        hi = np.searchsorted(self.days, np.datetime64(end, 'D'), side='right')
+        return slice(lo, max(lo, hi))
+
+    def rows_between(self, start, end):
+        """Ascending row positions of calls from start to end (inclusive days); None when every row is in range"""
+        if start is None:
+            return None
+        parts = self.partitions_between(start, end)
+        if parts.start == 0 and parts.stop == len(self.days) and self.undated == 0:
+            return None
+        return np.sort(self.order[self.offsets[parts.start]:self.offsets[parts.stop]])
+
+    def labels_between(self, start, end):
+        """Distinct raw call_date values from start to end (inclusive days)"""
+        in_range = (self.label_days >= np.datetime64(start, 'D')) & (self.label_days <= np.datetime64(end, 'D'))
+        return self.labels[in_range].tolist()
+
+    def partition_rows(self, start, end):
+        """Number of day partitions and rows a date range reads"""
+        parts = self.partitions_between(start, end)
+        return parts.stop - parts.start, int(self.offsets[parts.stop] - self.offsets[parts.start])
+
+#######################################
+# TEXT SIDE FILE
+#######################################
+
+def _encode_text(series):
+    """UTF-8 bytes of a text column plus per-row (start, end) byte offsets and a missing-value mask"""
+    nulls = series.isna().to_numpy(dtype=bool)
+    texts = series.astype(object).where(~nulls, '').astype(str).tolist()
+    data = ''.join(texts).encode('utf-8')
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    if len(data) != lengths.sum():
+        # Non-ASCII text: character counts differ from byte counts
+        lengths = np.fromiter((len(text.encode('utf-8')) for text in texts), dtype=np.int64, count=len(texts))
+    ends = np.cumsum(lengths)
+    return data, ends - lengths, ends, nulls
+
+INDEX_SUFFIXES = ('.starts.npy', '.ends.npy', '.nulls.npy')
+
+# Offsets of rows a write added or changed, appended to <column>.journal instead of rewriting the .npy files
+JOURNAL_RECORD = np.dtype([('position', '<i8'), ('start', '<i8'), ('end', '<i8'), ('null', '?')])
+JOURNAL_COMPACT_ROWS = 100_000  # The .npy files are rewritten once a journal holds more records than this (or rows / 8)
+
+class TextSideFile:
+    """
+    Text columns of a call store kept on disk, one UTF-8 blob per column.
+
+    Each column is <column>.bin (row texts back to back) with per-row start and end byte
+    offsets and a missing-value mask (.starts/.ends/.nulls.npy). The offsets and masks stay
+    in memory (17 bytes a row); the blobs are memory-mapped and only the rows asked for
+    are decoded. Appends and updated rows are written past the end of the blobs, so
+    published bytes never change; full rewrites go through temporary files. The offsets of
+    rows a write adds or changes go to a per-column journal, folded back into the .npy
+    files once it grows past JOURNAL_COMPACT_ROWS (or an eighth of the rows).
+    generation counts the writes that changed already published rows.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.rows = 0
+        self.generation = 0
+        self.positions = {}
+        self._columns = {}
+        self._journals = {}
+        self._maps = {}
+        self._buffers = FrameBuffers()
+        self._lock = threading.RLock()
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def _path(self, column, suffix):
+        safe_column = "".join(c if c.isalnum() or c in '-_' else '_' for c in str(column))
+        return os.path.join(self.directory, f"{safe_column}{suffix}")
+
+    def _save_index(self, column, starts, ends, nulls):
+        for suffix, values in zip(INDEX_SUFFIXES, (starts, ends, nulls)):
+            tmp_path = self._path(column, suffix) + '.tmp.npy'
+            np.save(tmp_path, values)
+            os.replace(tmp_path, self._path(column, suffix))
+        self._journals[column] = 0
+
+    def _append_journal(self, column, positions, starts, ends, nulls):
+        """Record the offsets of rows at positions past the journal's published records"""
+        records = np.empty(len(positions), dtype=JOURNAL_RECORD)
+        records['position'], records['start'], records['end'], records['null'] = (
+            positions, starts[positions], ends[positions], nulls[positions])
+        count = self._journals.get(column, 0)
+        path = self._path(column, '.journal')
+        # Records past the published count (from a write that never reached the manifest) are overwritten
+        with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+            f.seek(count * JOURNAL_RECORD.itemsize)
+            f.write(records.tobytes())
+            f.truncate()
+        self._journals[column] = count + len(records)
+
+    def _save_manifest(self):
+        tmp_path = os.path.join(self.directory, 'manifest.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'rows': self.rows, 'columns': self.columns, 'positions': self.positions,
+                       'generation': self.generation, 'sizes': {column: entry[3] for column, entry in self._columns.items()},
+                       'journals': self._journals}, f)
+        os.replace(tmp_path, os.path.join(self.directory, 'manifest.json'))
+
+    def stage(self, replace):
+        """A chunked write (full replace, or appends and row updates) that readers see only once it is committed"""
+        return TextStage(self, replace)
+
+    def _publish(self, columns, rows, positions, replace, rewritten=False, changed=None):
+        """Swap in a committed write; changed holds each column's written row positions (None: save all offsets)"""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if replace:
+                for column in columns:
+                    os.replace(self._path(column, '.bin.tmp'), self._path(column, '.bin'))
+                for column in set(self._columns) - set(columns):
+                    for suffix in ('.bin', '.journal') + INDEX_SUFFIXES:
+                        if os.path.exists(self._path(column, suffix)):
+                            os.remove(self._path(column, suffix))
+                self._columns = {}
+                self._journals = {}
+                self._maps = {}
+                self._buffers.clear()
+            for column, entry in columns.items():
+                written = None if changed is None or column not in self._columns else np.unique(changed[column])
+                if written is None or self._journals.get(column, 0) + len(written) > max(JOURNAL_COMPACT_ROWS, rows // 8):
+                    self._save_index(column, *entry[:3])
+                else:
+                    self._append_journal(column, written, *entry[:3])
+                # Readers pick up the new offsets only once the bytes they point at are on disk
+                self._maps.pop(column, None)
+                self._columns[column] = entry
+            self.rows = rows
+            self.positions = dict(positions)
+            if rewritten:
+                self.generation += 1
+            self._save_manifest()
+
+    def load(self):
+        """Open an existing side file; False when it is missing or incomplete"""
+        try:
+            with open(os.path.join(self.directory, 'manifest.json')) as f:
+                manifest = json.load(f)
+            columns = {}
+            journals = manifest.get('journals', {})
+            for column in manifest['columns']:
+                starts, ends, nulls = (np.load(self._path(column, suffix)) for suffix in INDEX_SUFFIXES)
+                if journals.get(column):
+                    starts, ends, nulls = self._replay_journal(column, journals[column], manifest['rows'], starts, ends, nulls)
+                size = manifest['sizes'][column]
+                if len(nulls) != manifest['rows'] or os.path.getsize(self._path(column, '.bin')) < size:
+                    return False
+                columns[column] = (starts, ends, nulls, size)
+        except Exception:
+            return False
+
+        with self._lock:
+            self._columns = columns
+            self._journals = {column: journals.get(column, 0) for column in columns}
+            self._maps = {}
+            self.rows = manifest['rows']
+            self.generation = manifest.get('generation', 0)
+            self.positions = manifest.get('positions', {})
+        return True
+
+    def _replay_journal(self, column, count, rows, starts, ends, nulls):
+        """Offsets with a column's journal records applied, extended to rows"""
+        records = np.fromfile(self._path(column, '.journal'), dtype=JOURNAL_RECORD, count=count)
+        saved = len(nulls)
+        added = records['position'][records['position'] >= saved]
+        if len(records) < count or np.unique(added).size != rows - saved:
+            raise ValueError(f"Journal of text column {column} is incomplete")
+        grown = []
+        for values, field in ((starts, 'start'), (ends, 'end'), (nulls, 'null')):
+            values = np.concatenate([values, np.zeros(rows - saved, dtype=values.dtype)])
+            values[records['position']] = records[field]
+            grown.append(values)
+        return grown
+
+    def _data(self, column):
+        data = self._maps.get(column)
+        if data is None:
+            path = self._path(column, '.bin')
+            data = np.memmap(path, dtype=np.uint8, mode='r') if os.path.getsize(path) else np.zeros(0, dtype=np.uint8)
+            self._maps[column] = data
+        return data
+
+    def read(self, column, positions=None):
+        """Texts of one column at row positions (all rows when None); missing values come back as None"""
+        with self._lock:
+            entry = self._columns.get(column)
+            data = None if entry is None else self._data(column)
+        if entry is None:
+            count = self.rows if positions is None else len(positions)
+            return [None] * count
+        starts, ends, nulls, _ = entry
+
+        if positions is None:
+            positions = np.arange(len(nulls))
+        positions = np.asarray(positions, dtype=np.int64)
+        starts, ends = starts[positions], ends[positions]
+
+        if len(positions) > 1 and np.all(starts[1:] == ends[:-1]):
+            # Rows stored back to back are decoded from one slice of the map
+            blob = bytes(data[starts[0]:ends[-1]])
+            starts, ends = starts - starts[0], ends - starts[0]
+        else:
+            blob = data
+        return [None if null else bytes(blob[start:end]).decode('utf-8')
+                for start, end, null in zip(starts.tolist(), ends.tolist(), nulls[positions].tolist())]
+
+    def nbytes(self):
+        """Bytes of text held on disk"""
+        return int(sum(entry[3] for entry in self._columns.values()))
+
+class TextStage:
+    """
+    Text columns of one write streamed to disk chunk by chunk.
+
+    A replace writes new blobs next to the live ones and swaps them in on commit. Otherwise
+    appended rows and new texts for updated rows are written past the last committed byte
+    of the live blobs, which no reader looks at until the new offsets are published.
+    Columns first seen in a later chunk are backfilled as missing for the rows before it.
+    """
+
+    def __init__(self, side_file, replace):
+        self.side_file = side_file
+        self.replace = replace
+        self.rows = 0 if replace else side_file.rows
+        self.committed_rows = self.rows
+        self._columns = {}
+        self._updates = []
+        if not replace:
+            for column, (starts, ends, nulls, size) in side_file._columns.items():
+                handle = open(side_file._path(column, '.bin'), 'r+b')
+                handle.seek(size)
+                handle.truncate()
+                self._columns[column] = [handle, size, [starts], [ends], [nulls]]
+
+    def _open(self, column):
+        os.makedirs(self.side_file.directory, exist_ok=True)
+        path = self.side_file._path(column, '.bin.tmp' if self.replace else '.bin')
+        empty = np.zeros(self.rows, dtype=np.int64)
+        self._columns[column] = [open(path, 'wb'), 0, [empty], [empty], [np.ones(self.rows, dtype=bool)]]
+
+    def _write(self, column, values):
+        state = self._columns[column]
+        data, starts, ends, nulls = _encode_text(values)
+        state[0].write(data)
+        size = state[1]
+        state[1] = size + len(data)
+        return size + starts, size + ends, nulls
+
+    def add(self, frame, columns):
+        """Write the given text columns of frame as new rows; staged columns frame lacks are stored as missing"""
+        for column in columns:
+            if column not in self._columns:
+                self._open(column)
+
+        for column, state in self._columns.items():
+            if column in columns:
+                starts, ends, nulls = self._write(column, frame[column])
+            else:
+                starts = ends = np.full(len(frame), state[1], dtype=np.int64)
+                nulls = np.ones(len(frame), dtype=bool)
+            state[2].append(starts)
+            state[3].append(ends)
+            state[4].append(nulls)
+
+        self.rows += len(frame)
+        return self
+
+    def update(self, positions, frame, columns):
+        """New texts for already staged or committed rows at positions; applied in order on commit"""
+        positions = np.asarray(positions, dtype=np.int64)
+        for column in columns:
+            if column not in self._columns:
+                self._open(column)
+            self._updates.append((column, positions) + self._write(column, frame[column]))
+        return self
+
+    def _close(self):
+        for state in self._columns.values():
+            state[0].close()
+
+    def commit(self, positions, rewritten=False):
+        """
+        Make the staged text visible (positions: each column's index in the full column list).
+        rewritten marks the write as changing published rows even when their text is unchanged.
+        """
+        self._close()
+        buffers = self.side_file._buffers
+        columns = {column: [buffers.concatenated((column, field), parts) for field, parts in enumerate(arrays)] + [size]
+                   for column, (_, size, *arrays) in self._columns.items()}
+
+        changed = {column: [np.arange(self.committed_rows, self.rows)] for column in columns}
+        copied = set()
+        for column, rows, starts, ends, nulls in self._updates:
+            entry = columns[column]
+            if column not in copied and (rows < self.committed_rows).any():
+                # Published offsets are never written in place
+                entry[:3] = [values.copy() for values in entry[:3]]
+                copied.add(column)
+            entry[0][rows], entry[1][rows], entry[2][rows] = starts, ends, nulls
+            changed[column].append(rows)
+            rewritten = rewritten or bool((rows < self.committed_rows).any())
+
+        self.side_file._publish({column: tuple(entry) for column, entry in columns.items()},
+                                self.rows, positions, self.replace, rewritten=rewritten,
+                                changed=None if self.replace else {column: np.concatenate(rows) for column, rows in changed.items()})
+
+    def abort(self):
+        """Drop the staged text; committed text is untouched"""
+        self._close()
+        if self.replace:
+            for column in self._columns:
+                if os.path.exists(self.side_file._path(column, '.bin.tmp')):
+                    os.remove(self.side_file._path(column, '.bin.tmp'))
+
+#######################################
+# KEYED MERGE
+#######################################
+
+MAX_ID_SEGMENTS = 8
+PATCH_SPLICE_ROWS = 256  # Arrow-backed columns updated at up to this many rows are spliced rather than rewritten
+CHANGE_LOG_ENTRIES = 50
+CHANGE_HISTORY_WRITES = 256  # Writes kept in memory for derived structures to catch up on (see changes_since)...
+CHANGE_HISTORY_ROWS = 20_000  # ...as long as their patched rows' old values add up to no more than this many rows
+DELTA_MAX_FILES = 200  # A new snapshot is written past this many delta files...
+DELTA_COMPACT_FRACTION = 0.25  # ...or once the deltas hold more rows than this fraction of the snapshot's
+DELTA_POSITION = '__position'
+CHANGE_LOG_MAX_CELLS = 1000
+BACKUP_KEEP = 5
+BACKUP_BATCH_ROWS = 100_000
+
+class CallIdIndex:
+    """
+    call_id -> row position hash index over a call store's rows.
+
+    Built once per full load, then each write adds one small segment for its own rows, so
+    appends and upserts hash only the new ids. Duplicate ids resolve to their last row.
+    Indexes are immutable: extended() returns a new one, so readers never see rows that
+    are not published yet.
+    """
+
+    def __init__(self, segments=()):
+        self.segments = list(segments)
+
+    def extended(self, ids, start):
+        """Index with ids registered at positions start, start + 1, ..."""
+        ids = pd.Index(ids, dtype=object)
+        positions = np.arange(start, start + len(ids), dtype=np.int64)
+        if not ids.is_unique:
+            keep = ~ids.duplicated(keep='last')
+            ids, positions = ids[keep], positions[keep]
+
+        segments = self.segments + [(ids, positions)]
+        if len(segments) > MAX_ID_SEGMENTS:
+            # Fold into one segment; later segments win for ids registered twice
+            ids = pd.Index(np.concatenate([segment[0].to_numpy() for segment in segments]), dtype=object)
+            positions = np.concatenate([segment[1] for segment in segments])
+            keep = ~ids.duplicated(keep='last')
+            segments = [(ids[keep], positions[keep])]
+        return CallIdIndex(segments)
+
+    def lookup(self, ids):
+        """Row positions of ids (-1 for unknown ids)"""
+        query = pd.Index(ids, dtype=object)
+        found = np.full(len(query), -1, dtype=np.int64)
+        for index, positions in self.segments:
+            hits = index.get_indexer(query)
+            matched = hits >= 0
+            found[matched] = positions[hits[matched]]
+        return found
+
+def _same_values(old, new):
+    """Elementwise old == new, with missing == missing and values equal as text counted as the same"""
+    old = old.astype(object).to_numpy()
+    new = new.astype(object).to_numpy()
+    old_missing, new_missing = pd.isna(old), pd.isna(new)
+    same = old_missing & new_missing
+    both = ~old_missing & ~new_missing
+    if both.any():
+        same[both] = (old[both] == new[both]) | (old[both].astype(str) == new[both].astype(str))
+    return same
+
+def _take(column, positions):
+    """
+    column.take(positions); a few rows of a chunked Arrow-backed column are sliced out one
+    by one, as Arrow's take merges all of the chunks first
+    """
+    to_arrow = getattr(column.array, '__arrow_array__', None)
+    if to_arrow is None or len(positions) > PATCH_SPLICE_ROWS or to_arrow().num_chunks == 1:
+        return column.take(positions)
+    import pyarrow as pa
+
+    chunked = to_arrow()
+    pieces = [chunk for position in np.asarray(positions).tolist() for chunk in chunked.slice(position, 1).chunks]
+    values = column.dtype.__from_arrow__(pa.chunked_array(pieces, type=chunked.type))
+    return pd.Series(values, index=column.index[positions], name=column.name, copy=False)
+
+def _take_rows(frame, positions):
+    """frame.take(positions) through _take"""
+    return pd.DataFrame({col: _take(frame[col], positions) for col in frame.columns}, copy=False)
+
+def _spliced(column, rows, values):
+    """
+    Arrow-backed column with values at rows, built from slices of the old chunks around the
+    new values instead of rewriting the column (None when the values do not fit its type)
+    """
+    import pyarrow as pa
+
+    chunked = column.array.__arrow_array__()
+    try:
+        patch = pa.array(values.astype(object).tolist(), type=chunked.type, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+    order = np.argsort(rows, kind='stable')
+    pieces, start = [], 0
+    for row, source in zip(rows[order].tolist(), order.tolist()):
+        pieces += chunked.slice(start, row - start).chunks + [patch.slice(source, 1)]
+        start = row + 1
+    pieces += chunked.slice(start).chunks
+    spliced = pa.chunked_array([piece for piece in pieces if len(piece)], type=chunked.type)
+    return _merged_chunks(pd.Series(column.dtype.__from_arrow__(spliced), index=column.index, name=column.name, copy=False))
+
+def _set_values(column, rows, values):
+    """Copy of column with values written at rows (categorical dictionaries grow as needed)"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+        added = pd.Index(values.dropna().unique()).difference(column.cat.categories)
+        dtype = pd.CategoricalDtype(column.cat.categories.append(added)) if len(added) else column.dtype
+        codes = column.cat.codes.to_numpy().copy()
+        codes[rows] = dtype.categories.get_indexer(values)
+        return pd.Series(pd.Categorical.from_codes(codes, dtype=dtype), index=column.index, name=column.name)
+
+    if hasattr(column.array, '__arrow_array__') and len(rows) <= PATCH_SPLICE_ROWS:
+        spliced = _spliced(column, rows, values)
+        if spliced is not None:
+            return spliced
+
+    updated = column.copy()
+    try:
+        updated.iloc[rows] = values.to_numpy()
+    except (TypeError, ValueError):
+        # The new values do not fit the column's dtype (e.g. text in a numeric column)
+        updated = column.astype(object)
+        updated.iloc[rows] = values.astype(object).to_numpy()
+        updated = updated.infer_objects()
+    return updated
+
+def _loggable(value, limit=200):
+    if pd.isna(value):
+        return None
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        value = value.item()
+    if isinstance(value, (int, float, bool)):
+        return value
+    return str(value)[:limit]
+
+def apply_row_updates(frame, positions, updates, key='call_id'):
+    """
+    frame with the non-missing values of updates written at row positions, copying only the
+    columns that actually change. Returns (frame, changed row mask over positions,
+    changed cells per column, cell-level changes for the change log).
+    """
+    frame = frame.copy(deep=False)
+    keys = _take(frame[key], positions).astype(str).to_numpy() if key in frame.columns else positions
+    changed_rows = np.zeros(len(positions), dtype=bool)
+    counts = {}
+    changes = []
+
+    for col in updates.columns:
+        if col == key:
+            continue
+        new = updates[col].reset_index(drop=True)
+        present = new.notna().to_numpy()
+        if not present.any():
+            continue
+        if col not in frame.columns:
+            frame[col] = new.iloc[:0].reindex(frame.index)
+
+        old = _take(frame[col], positions).reset_index(drop=True)
+        differs = present & ~_same_values(old, new)
+        if not differs.any():
+            continue
+
+        frame[col] = _set_values(frame[col], positions[differs], new[differs])
+        changed_rows |= differs
+        if col not in DERIVED_COLUMNS:
+            counts[col] = int(differs.sum())
+            for row in np.flatnonzero(differs)[:max(CHANGE_LOG_MAX_CELLS - len(changes), 0)]:
+                changes.append({'call_id': str(keys[row]), 'column': str(col),
+                                'old': _loggable(old.iloc[row]), 'new': _loggable(new.iloc[row])})
+
+    return frame, changed_rows, counts, changes
+
+def replay_deltas(frame, deltas):
+    """
+    A snapshot frame with its delta files applied in order: each delta row replaces the row
+    at its position, or is appended when the position is past the end
+    """
+    rows = concat_call_frames(deltas)
+    positions = rows.pop(DELTA_POSITION).to_numpy()
+    keep = ~pd.Index(positions).duplicated(keep='last')
+    rows, positions = rows[keep].reset_index(drop=True), positions[keep]
+
+    appended = positions >= len(frame)
+    if appended.any():
+        order = np.argsort(positions[appended])
+        if not np.array_equal(positions[appended][order], np.arange(len(frame), len(frame) + appended.sum())):
+            raise ValueError("Delta files do not continue the snapshot")
+        frame = concat_call_frames([frame, rows[appended].iloc[order].reset_index(drop=True)])
+    if (~appended).any():
+        frame = apply_row_updates(frame, positions[~appended], rows[~appended].reset_index(drop=True))[0]
+    return frame
+
+#######################################
+# CALL STORE
+#######################################
+
+class CallStore:
+    """
+    Process-wide typed call table; sessions read zero-copy views and never mutate the shared frame.
+
+    version changes on every write; base_version only on full replaces and restores. The
+    writes in between are kept (appended rows, patched rows and their previous values), so
+    derived structures built at the same base_version catch up through changes_since().
+    base_id names the data the last full replace loaded and is kept with the snapshots, so
+    it still tells a replaced store apart after a restart (base_version restarts at 0).
+    Text columns (TEXT_COLUMNS) are split off into a memory-mapped side file and read
+    back by row or call_id only where a page shows them. Persisted stores keep a Parquet
+    snapshot plus one small delta file per later write, compacted into a new snapshot
+    from time to time.
+    """
+
+    def __init__(self, name, cache_dir=None, persist=True):
+        self.name = name
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.persist_enabled = persist
+        self.frame = None
+        self.columns = []
+        self.frame_bytes = 0
+        self.version = 0
+        self.base_version = 0
+        self.base_id = None
+        self.source = ""
+        self.loaded_at = None
+        self.sync_state = None
+        self.change_log = []
+        self._call_ids = None
+        self._frame_buffers = FrameBuffers()
+        self._snapshot_id = None
+        self._deltas = []
+        self._writes = []
+        self._lock = threading.RLock()
+
+        if persist:
+            text_dir = os.path.splitext(self.parquet_path)[0] + '.text'
+        else:
+            # Unpersisted stores still keep text off-heap, in a directory removed with the store
+            text_dir = tempfile.mkdtemp(prefix='aiva_text_')
+            weakref.finalize(self, shutil.rmtree, text_dir, True)
+        self.text_file = TextSideFile(text_dir)
+
+    @property
+    def parquet_path(self):
+        safe_name = "".join(c if c.isalnum() or c in '-_' else '_' for c in self.name)
+        return os.path.join(self.cache_dir, f"{safe_name}.parquet")
+
+    @property
+    def text_columns(self):
+        return self.text_file.columns
+
+    def is_loaded(self):
+        return self.frame is not None
+
+    def is_fresh(self, ttl=None):
+        """True when loaded and (if a TTL is given) loaded within the last ttl seconds"""
+        if self.frame is None:
+            return False
+        if ttl is None:
+            return True
+        return (time_module.time() - self.loaded_at) < ttl
+
+    def _split(self, typed):
+        """(narrow frame, text columns) of a typed frame"""
+        text_columns = [col for col in typed.columns if col in TEXT_COLUMNS]
+        return typed.drop(columns=text_columns), text_columns
+
+    def _text_positions(self, columns):
+        """Index of each text column in the full column list, kept with the side file to rebuild the order"""
+        return {col: position for position, col in enumerate(columns) if col in TEXT_COLUMNS}
+
+    def _id_index(self, frame):
+        """call_id index of frame (built on first use and cached while frame is current)"""
+        with self._lock:
+            index = self._call_ids if self.frame is frame else None
+        if index is None and frame is not None and 'call_id' in frame.columns:
+            index = CallIdIndex().extended(frame['call_id'].astype(str).to_numpy(), 0)
+            with self._lock:
+                if self.frame is frame:
+                    self._call_ids = index
+        return index
+
+    def _stage_text_updates(self, stage, positions, rows, text_columns, committed_rows, counts, changes):
+        """Stage the non-missing texts of rows that differ from the stored ones; returns the changed committed positions"""
+        changed = []
+        for col in text_columns:
+            new = rows[col].reset_index(drop=True)
+            differs = new.notna().to_numpy().copy()
+            committed = positions < committed_rows
+            if committed.any():
+                old = pd.Series(self.text_file.read(col, positions[committed]), dtype=object)
+                differs[committed] &= ~_same_values(old, new[committed].reset_index(drop=True))
+            if not differs.any():
+                continue
+
+            stage.update(positions[differs], new[differs].to_frame(), [col])
+            logged = differs & committed
+            changed.append(positions[logged])
+            counts[col] = counts.get(col, 0) + int(logged.sum())
+            if logged.any():
+                old_texts = self.text_file.read(col, positions[logged][:CHANGE_LOG_MAX_CELLS])
+                for call_id, old_text, new_text in zip(rows['call_id'].astype(str).to_numpy()[logged], old_texts,
+                                                       new[logged].tolist()):
+                    if len(changes) >= CHANGE_LOG_MAX_CELLS:
+                        break
+                    changes.append({'call_id': call_id, 'column': col,
+                                    'old': _loggable(old_text, 80), 'new': _loggable(new_text, 80)})
+        return changed
+
+    def load_chunks(self, chunks, source="", mode='replace', backup=False):
+        """
+        Write raw frames into the store as one new version: each chunk is typed and its text
+        streamed to the side file as it arrives, and sessions see nothing until every chunk
+        is in.
+
+        mode 'replace' swaps in the chunks as the full dataset. 'append' adds them as new
+        rows, keeping categorical dictionaries shared across old and new rows. 'upsert'
+        matches rows to the store on call_id: known calls get their non-missing values
+        written over the stored ones (the last row wins for an id given twice) and unknown
+        calls are appended, so the work grows with the upload, not the store. Only a replace
+        moves base_version. backup=True snapshots the current data first.
+
+        Returns the change-log entry of the write (None when there was nothing to write).
+        """
+        with self._lock:
+            if self.frame is None:
+                mode = 'replace'
+            backup_name = self.backup() if backup and self.frame is not None else None
+            if backup and self.frame is not None and backup_name is None:
+                raise RuntimeError("Backup of the current data failed; nothing was written")
+
+            replace = mode == 'replace'
+            stage = self.text_file.stage(replace)
+            committed_rows = 0 if replace else len(self.frame)
+            parts = []
+            columns = [] if replace else list(self.columns)
+            index = self._id_index(self.frame) if mode == 'upsert' else None
+            next_position = committed_rows
+            update_positions, update_parts, text_changed = [], [], []
+            counts, changes = {}, []
+            rows_read = inserted = added_bytes = 0
+
+            try:
+                for raw_df in chunks:
+                    if len(raw_df) == 0:
+                        continue
+                    rows_read += len(raw_df)
+                    # Missing numbers stay missing in updates rather than overwriting stored values with 0
+                    missing = {col: raw_df[col].isna().to_numpy() for col in NUMERIC_COLUMNS if col in raw_df.columns}
+                    typed = coerce_call_frame(raw_df)
+
+                    if mode == 'upsert':
+                        if 'call_id' not in typed.columns:
+                            raise ValueError("Update imports need a call_id column")
+                        ids = typed['call_id'].astype(str)
+                        keep = ~ids.duplicated(keep='last').to_numpy()
+                        typed, ids = typed[keep].reset_index(drop=True), ids[keep].to_numpy()
+                        missing = {col: mask[keep] for col, mask in missing.items()}
+
+                        found = index.lookup(ids) if index is not None else np.full(len(typed), -1, dtype=np.int64)
+                        existing = found >= 0
+                        if existing.any():
+                            rows = typed[existing]
+                            for col, mask in missing.items():
+                                rows[col] = rows[col].mask(mask[existing])
+                            narrow_rows, text_columns = self._split(rows.drop(columns=DERIVED_COLUMNS, errors='ignore'))
+                            update_positions.append(found[existing])
+                            update_parts.append(narrow_rows)
+                            text_changed += self._stage_text_updates(stage, found[existing], rows, text_columns,
+                                                                     committed_rows, counts, changes)
+                            columns = list(dict.fromkeys(columns + [str(col) for col in typed.columns]))
+                            typed = typed[~existing].reset_index(drop=True)
+                        if len(typed) == 0:
+                            continue
+                        index = (index or CallIdIndex()).extended(ids[~existing], next_position)
+
+                    narrow, text_columns = self._split(typed)
+                    stage.add(typed, text_columns)
+                    parts.append(narrow)
+                    columns = list(dict.fromkeys(columns + [str(col) for col in typed.columns]))
+                    added_bytes += int(narrow.memory_usage(deep=True).sum())
+                    next_position += len(typed)
+                    inserted += len(typed)
+
+                if not parts and (replace or not update_parts):
+                    stage.abort()
+                    return None
+
+                if replace:
+                    frame = concat_call_frames(parts)
+                elif parts:
+                    # Only the new rows are copied; the stored ones stay where they are
+                    frame = self._frame_buffers.extend(self.frame, concat_call_frames(parts))
+                else:
+                    frame = self.frame
+                updated, patched, patched_columns = 0, np.zeros(0, dtype=np.int64), []
+                if update_parts:
+                    frame, updated, patched, patched_columns = self._apply_updates(frame, update_positions, update_parts, text_changed,
+                                                                  committed_rows, counts, changes)
+            except Exception:
+                stage.abort()
+                raise
+
+            stage.commit(self._text_positions(columns), rewritten=bool(updated))
+            if replace:
+                self._frame_buffers.clear()
+            patched_rows = np.unique(patched[patched < committed_rows])
+            # Old values of the columns that changed; the others still hold them
+            old_rows = pd.DataFrame({col: _take(self.frame[col], patched_rows) if col in self.frame.columns
+                                     else pd.Series(np.nan, index=patched_rows) for col in patched_columns},
+                                    index=patched_rows, copy=False)
+            self.frame = frame
+            self.columns = columns
+            self.frame_bytes = added_bytes if replace else self.frame_bytes + added_bytes
+            if mode == 'append' and self._call_ids is not None and 'call_id' in frame.columns:
+                self._call_ids = self._call_ids.extended(frame['call_id'].iloc[committed_rows:].astype(str).to_numpy(),
+                                                         committed_rows)
+            else:
+                self._call_ids = index if mode == 'upsert' else None
+            self.source = source or self.source
+            self.loaded_at = time_module.time()
+            self.version += 1
+            if replace:
+                self.base_version = self.version
+                self.base_id = uuid.uuid4().hex[:12]
+                self._writes = []
+            else:
+                text_rows = np.unique(np.concatenate([np.zeros(0, dtype=np.int64)] + text_changed))
+                self._record_write(committed_rows, patched_rows, old_rows, text_rows[text_rows < committed_rows])
+            if not self.persist_enabled:
+                persisted = None
+            elif replace:
+                persisted = self.persist()
+            else:
+                persisted = self._persist_delta(np.concatenate([patched, np.arange(committed_rows, len(frame))]))
+
+            entry = {
+                'version': self.version,
+                'at': datetime.fromtimestamp(self.loaded_at).isoformat(timespec='seconds'),
+                'mode': mode,
+                'source': self.source,
+                'rows': rows_read,
+                'inserted': inserted,
+                'updated': updated,
+                'unchanged': int(sum(len(positions) for positions in update_positions)) - updated,
+                'columns': counts,
+                'changes': changes,
+                'truncated': sum(counts.values()) > len(changes),
+                'backup': backup_name,
+                'persisted': persisted
+            }
+            self._log_change(entry)
+            return entry
+
+    def _apply_updates(self, frame, update_positions, update_parts, text_changed, committed_rows, counts, changes):
+        """
+        Write the collected row updates into frame; returns (frame, number of stored rows
+        changed, positions whose in-memory columns changed, the columns that changed)
+        """
+        positions = np.concatenate(update_positions)
+        updates = concat_call_frames(update_parts)
+        keep = ~pd.Index(positions).duplicated(keep='last')
+        positions, updates = positions[keep], updates[keep].reset_index(drop=True)
+
+        frame, changed_rows, column_counts, column_changes = apply_row_updates(frame, positions, updates)
+        for col, count in column_counts.items():
+            counts[col] = counts.get(col, 0) + count
+        changes[:0] = column_changes[:max(CHANGE_LOG_MAX_CELLS - len(changes), 0)]
+        del changes[CHANGE_LOG_MAX_CELLS:]
+
+        columns = list(column_counts)
+        if 'call_date' in frame.columns and ('call_date' in column_counts or 'call_start_time' in column_counts):
+            columns.append('call_timestamp')
+            # The derived timestamp follows its source columns
+            if 'call_timestamp' in frame.columns:
+                moved = positions[changed_rows]
+                sources = [col for col in ('call_date', 'call_start_time') if col in frame.columns]
+                frame['call_timestamp'] = _set_values(frame['call_timestamp'], moved,
+                                                      parse_call_timestamps(_take_rows(frame[sources], moved)))
+            else:
+                frame['call_timestamp'] = parse_call_timestamps(frame)
+
+        changed = np.concatenate([positions[changed_rows]] + text_changed)
+        return frame, int(np.unique(changed[changed < committed_rows]).size), positions[changed_rows], columns
+
+    def _record_write(self, start, patched, old_rows, text):
+        """Keep what a write changed for changes_since(), dropping the oldest writes past the history bounds"""
+        self._writes.append({'version': self.version, 'start': start, 'patched': patched,
+                             'old': old_rows, 'text': text})
+        kept_rows = sum(len(write['patched']) for write in self._writes)
+        while len(self._writes) > CHANGE_HISTORY_WRITES or kept_rows > CHANGE_HISTORY_ROWS:
+            kept_rows -= len(self._writes.pop(0)['patched'])
+
+    def changes_since(self, version, until=None):
+        """
+        What the writes after version changed, for structures derived from that version to
+        catch up on instead of rebuilding. A dict with since and version, the store frame,
+        start (the rows at since; later rows were appended), patched (ascending positions
+        below start whose in-memory values changed), old and new (those rows as of since and
+        as of now, indexed by position) and text (positions below start whose text changed).
+
+        None when those writes are no longer kept (the store was replaced or restored since,
+        or the history bound was passed) or the store has moved past version until.
+        """
+        with self._lock:
+            writes = [write for write in self._writes if write['version'] > version]
+            if (self.frame is None or version < self.base_version or len(writes) != self.version - version
+                    or (until is not None and until != self.version)):
+                return None
+            frame, current = self.frame, self.version
+
+        start = writes[0]['start'] if writes else len(frame)
+        patched = np.unique(np.concatenate([np.zeros(0, dtype=np.int64)] + [write['patched'] for write in writes]))
+        patched = patched[patched < start]
+        new = _take_rows(frame, patched)
+
+        # Undo the writes' changes newest first, so each cell ends at its value from before the first write
+        old = new
+        for write in reversed(writes):
+            rows = write['old'][write['old'].index < start]
+            if len(rows):
+                at = np.searchsorted(patched, rows.index.to_numpy())
+                old = old.assign(**{col: _set_values(old[col], at, rows[col]) for col in rows.columns})
+        text = np.unique(np.concatenate([np.zeros(0, dtype=np.int64)] + [write['text'] for write in writes]))
+
+        return {
+            'since': version,
+            'version': current,
+            'frame': frame,
+            'start': start,
+            'patched': patched,
+            'old': old,
+            'new': new,
+            'text': text[text < start]
+        }
+
+    def replace(self, raw_df, source=""):
+        """Swap in a new full dataset and bump the version"""
+        self.load_chunks([raw_df], source=source, mode='replace')
+        return self.version
+
+    def append(self, raw_df, source=""):
+        """Append new rows, keeping categorical dictionaries shared across old and new rows"""
+        if raw_df is None or len(raw_df) == 0:
+            return self.version
+        self.load_chunks([raw_df], source=source, mode='append')
+        return self.version
+
+    def upsert(self, raw_df, source="", backup=False):
+        """Update known calls and append new ones by call_id; returns the change-log entry"""
+        return self.load_chunks([raw_df], source=source, mode='upsert', backup=backup)
+
+    def view(self, columns=None):
+        """
+        Zero-copy view of the current frame; writes by callers copy on write and never reach the store.
+        Text columns are included only when asked for by name.
+        """
+        frame = self.frame
+        if frame is None:
+            return pd.DataFrame()
+        if columns is not None:
+            narrow = frame[[col for col in columns if col in frame.columns]]
+            return self.with_text(narrow, [col for col in columns if col in self.text_columns])
+        return frame.copy(deep=False)
+
+    def text(self, positions=None, columns=None):
+        """Text columns for row positions (all rows when None), indexed by position"""
+        columns = [col for col in (columns or self.text_columns) if col in self.text_columns]
+        if positions is None:
+            positions = np.arange(self.text_file.rows)
+        positions = np.asarray(positions, dtype=np.int64)
+        return pd.DataFrame({col: self.text_file.read(col, positions) for col in columns},
+                            index=positions, columns=columns)
+
+    def fetch_text(self, call_ids, columns=None):
+        """Text columns for the given call_ids, indexed by call_id (unknown ids are skipped)"""
+        index = self._id_index(self.frame)
+        if index is None:
+            return pd.DataFrame(columns=columns or self.text_columns)
+
+        call_ids = np.array([str(call_id) for call_id in call_ids], dtype=object)
+        positions = index.lookup(call_ids)
+        found = positions >= 0
+        texts = self.text(positions[found], columns)
+        texts.index = pd.Index(call_ids[found])
+        return texts
+
+    def with_text(self, frame, columns=None):
+        """
+        frame with the store's text columns joined back on; frame must be a view of the store
+        (its index labels are row positions), as returned by view() or a RowSelection
+        """
+        columns = [col for col in (columns or self.text_columns) if col in self.text_columns and col not in frame.columns]
+        if not columns or len(frame) == 0:
+            return frame.copy(deep=False)
+        texts = self.text(frame.index.to_numpy(), columns)
+        joined = frame.copy(deep=False)
+        for col in columns:
+            joined[col] = texts[col].to_numpy()
+        return joined
+
+    def persist(self):
+        """
+        Write the current frame to the Parquet cache as a new snapshot (dictionary-encoded
+        categoricals) and drop the delta files written on top of the previous one
+        """
+        if not self.persist_enabled or self.frame is None:
+            return False
+        snapshot_id = uuid.uuid4().hex[:12]
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            snapshot = self.frame.copy(deep=False)
+            # Deltas name the snapshot they apply to, so stale ones are never replayed onto a newer one
+            snapshot.attrs['snapshot_id'] = snapshot_id
+            snapshot.attrs['base_id'] = self.base_id
+            tmp_path = self.parquet_path + '.tmp'
+            snapshot.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self.parquet_path)
+        except Exception as e:
+            logger.warning("Call store %r could not persist: %s", self.name, e)
+            self._snapshot_id = None
+            return False
+
+        self._snapshot_id = snapshot_id
+        self._deltas = []
+        for path in self._delta_files():
+            os.remove(path)
+        return True
+
+    def _delta_files(self, snapshot_id=None):
+        """Delta files on disk in write order: those of one snapshot, or all of them when snapshot_id is None"""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        prefix = os.path.splitext(os.path.basename(self.parquet_path))[0] + '.delta-' + (f"{snapshot_id}-" if snapshot_id else '')
+        return [os.path.join(self.cache_dir, name) for name in sorted(os.listdir(self.cache_dir))
+                if name.startswith(prefix) and name.endswith('.parquet')]
+
+    def _persist_delta(self, positions):
+        """
+        Write the rows one write appended or changed (with their positions) as a delta file
+        on top of the snapshot, so a write costs its own rows rather than the whole frame.
+        A new snapshot is written instead once there are DELTA_MAX_FILES deltas or they hold
+        DELTA_COMPACT_FRACTION of the rows.
+        """
+        positions = np.unique(positions)
+        delta_rows = sum(rows for _, rows in self._deltas) + len(positions)
+        if (self._snapshot_id is None or len(self._deltas) >= DELTA_MAX_FILES
+                or delta_rows > DELTA_COMPACT_FRACTION * len(self.frame)):
+            return self.persist()
+
+        stem = os.path.splitext(self.parquet_path)[0]
+        path = f"{stem}.delta-{self._snapshot_id}-{len(self._deltas) + 1:06d}.parquet"
+        try:
+            rows = _take_rows(self.frame, positions).reset_index(drop=True)
+            rows[DELTA_POSITION] = positions
+            rows.to_parquet(path + '.tmp', index=False)
+            os.replace(path + '.tmp', path)
+        except Exception as e:
+            logger.warning("Call store %r could not persist a delta, writing a snapshot instead: %s", self.name, e)
+            return self.persist()
+        self._deltas.append((path, len(positions)))
+        return True
+
+    @property
+    def change_log_path(self):
+        return os.path.splitext(self.parquet_path)[0] + '.changes.jsonl'
+
+    def _log_change(self, entry):
+        """Keep a write's change-log entry in memory and, for persisted stores, on disk"""
+        self.change_log = (self.change_log + [entry])[-CHANGE_LOG_ENTRIES:]
+        if not self.persist_enabled:
+            return
+        try:
+            with open(self.change_log_path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        except Exception as e:
+            logger.warning("Call store %r could not write its change log: %s", self.name, e)
+
+    def _load_change_log(self):
+        try:
+            with open(self.change_log_path) as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Call store %r could not read its change log: %s", self.name, e)
+            return
+
+        self.change_log = [json.loads(line) for line in lines[-CHANGE_LOG_ENTRIES:] if line.strip()]
+        if len(lines) > 2 * CHANGE_LOG_ENTRIES:
+            tmp_path = self.change_log_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.writelines(lines[-CHANGE_LOG_ENTRIES:])
+            os.replace(tmp_path, self.change_log_path)
+
+    @property
+    def backup_dir(self):
+        return os.path.join(self.cache_dir, 'backups', os.path.splitext(os.path.basename(self.parquet_path))[0])
+
+    def backup(self):
+        """
+        Snapshot the current data (text included) to a Parquet file in backup_dir, written in
+        batches so text is never all in memory. Keeps the newest BACKUP_KEEP snapshots and
+        returns the new one's name (None when there is nothing to back up or it failed).
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        with self._lock:
+            frame, columns = self.frame, list(self.columns)
+        if frame is None:
+            return None
+
+        name = f"v{self.version}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet"
+        path = os.path.join(self.backup_dir, name)
+        columns = [col for col in columns if col not in DERIVED_COLUMNS]
+        writer = None
+        try:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            for start in range(0, max(len(frame), 1), BACKUP_BATCH_ROWS):
+                batch = self.with_text(frame.iloc[start:start + BACKUP_BATCH_ROWS])
+                table = pa.Table.from_pandas(batch[[col for col in columns if col in batch.columns]],
+                                             preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path + '.tmp', table.schema)
+                writer.write_table(table.cast(writer.schema))
+            writer.close()
+            os.replace(path + '.tmp', path)
+        except Exception as e:
+            if writer is not None:
+                writer.close()
+            if os.path.exists(path + '.tmp'):
+                os.remove(path + '.tmp')
+            logger.warning("Call store %r could not write a backup: %s", self.name, e)
+            return None
+
+        for old in self.backups()[BACKUP_KEEP:]:
+            os.remove(os.path.join(self.backup_dir, old['name']))
+        return name
+
+    def backups(self):
+        """Backup snapshots, newest first: name, rows, size_mb and created"""
+        if not os.path.isdir(self.backup_dir):
+            return []
+        import pyarrow.parquet as pq
+
+        found = []
+        for name in os.listdir(self.backup_dir):
+            if not name.endswith('.parquet'):
+                continue
+            path = os.path.join(self.backup_dir, name)
+            try:
+                rows = pq.ParquetFile(path).metadata.num_rows
+            except Exception:
+                continue
+            modified = os.path.getmtime(path)
+            found.append((modified, {'name': name, 'rows': rows, 'size_mb': os.path.getsize(path) / 1024 / 1024,
+                                     'created': datetime.fromtimestamp(modified).isoformat(timespec='seconds')}))
+        return [item for _, item in sorted(found, key=lambda pair: pair[0], reverse=True)]
+
+    def restore_backup(self, name):
+        """Replace the store's data with a backup snapshot; returns (change-log entry, error)"""
+        import pyarrow.parquet as pq
+
+        path = os.path.join(self.backup_dir, os.path.basename(name))
+        if not os.path.exists(path):
+            return None, f"Backup not found: {name}"
+        try:
+            parquet = pq.ParquetFile(path)
+            chunks = (batch.to_pandas() for batch in parquet.iter_batches(batch_size=BACKUP_BATCH_ROWS))
+            return self.load_chunks(chunks, source=self.source, mode='replace'), None
+        except Exception as e:
+            return None, str(e)
+
+    def restore(self):
+        """Load the last persisted snapshot, if any; loaded_at is the snapshot's write time"""
+        if not self.persist_enabled or not os.path.exists(self.parquet_path):
+            return False
+        try:
+            frame = pd.read_parquet(self.parquet_path)
+            snapshot_id = frame.attrs.get('snapshot_id')
+            # Snapshots written before base_id was kept are their own base
+            base_id = frame.attrs.get('base_id') or snapshot_id
+            delta_paths = self._delta_files(snapshot_id) if snapshot_id else []
+            deltas = [pd.read_parquet(path) for path in delta_paths]
+            if deltas:
+                frame = replay_deltas(frame, deltas)
+        except Exception as e:
+            logger.warning("Call store %r could not restore: %s", self.name, e)
+            return False
+
+        typed = coerce_call_frame(frame)
+        narrow, text_columns = self._split(typed)
+
+        with self._lock:
+            if text_columns:
+                # Snapshot from before text was split off: move its text to the side file
+                self.text_file.stage(replace=True).add(typed, text_columns).commit(self._text_positions(typed.columns))
+                self.frame = narrow
+                self.base_id = base_id
+                self.persist()
+            elif not self.text_file.load() or self.text_file.rows != len(narrow):
+                logger.warning("Call store %r text side file does not match its snapshot; reloading from source", self.name)
+                return False
+
+            self.frame = narrow
+            self.base_id = base_id
+            self.columns = [str(col) for col in typed.columns]
+            for col, position in sorted(self.text_file.positions.items(), key=lambda item: item[1]):
+                if col not in self.columns:
+                    self.columns.insert(min(position, len(self.columns)), col)
+            self.frame_bytes = int(narrow.memory_usage(deep=True).sum())
+            self._call_ids = None
+            self._frame_buffers.clear()
+            self._writes = []
+            if not text_columns:
+                self._snapshot_id = snapshot_id
+                self._deltas = [(path, len(delta)) for path, delta in zip(delta_paths, deltas)]
+            self._load_change_log()
+            self.loaded_at = os.path.getmtime(self.parquet_path)
+            self.version += 1
+            self.base_version = self.version
+            return True
+
+    def info(self):
+        """Cheap summary for banners and debug panels"""
+        return {
+            'name': self.name,
+            'source': self.source,
+            'version': self.version,
+            'rows': 0 if self.frame is None else len(self.frame),
+            'columns': len(self.columns),
+            'memory_mb': self.frame_bytes / 1024 / 1024,
+            'text_mb': self.text_file.nbytes() / 1024 / 1024,
+            'loaded_at': datetime.fromtimestamp(self.loaded_at).isoformat() if self.loaded_at else None
+        }
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_call_store(name, persist=True):
+    """Return the shared store for a named source, restoring its Parquet snapshot on first use"""
+    with _stores_lock:
+        store = _stores.get(name)
+        if store is None:
+            store = CallStore(name, persist=persist)
+            store.restore()
+            _stores[name] = store
+        return store
@@ -11,14 +11,11 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import gspread
-from google.oauth2.service_account import Credentials
 import json
 import time as time_module
 from datetime import datetime, timedelta, time
 import calendar as cal_module
 import random
-import requests
 import io
 import base64
 from st_aggrid import AgGrid, GridOptionsBuilder, DataReturnMode, GridUpdateMode, JsCode
@@ -26,6 +23,21 @@ from streamlit_calendar import calendar
 import urllib.parse
 import hashlib
 import hmac
+import os
+import uuid
+from aiva_call_store import get_call_store, DatePartitions, DERIVED_COLUMNS, date_window
+from aiva_analytics import KPIEngine, VAPI_KPIS, get_rollup_cube, rollup
+from aiva_datasets import get_dataset_registry, content_hash, SOURCE_TTLS
+from aiva_filters import FilterIndex
+from aiva_search import get_contact_index
+from aiva_grid import (SERVER_SIDE_ROW_THRESHOLD, server_side_page, configure_server_side_options, server_side_response,
+                       cached_grid_options, grid_build_timings)
+from aiva_import import IMPORT_MODES, SCHEMA_COLUMNS, import_upload, preview_upload
+from aiva_export import EXPORT_COMPRESSIONS, EXPORT_FORMATS, export_calls
+from aiva_webhooks import WEBHOOK_SOURCES, get_webhook_feed, get_webhook_registry, sample_event
+from aiva_monitor import get_url_prober
+from aiva_live import LIVE_TICK_SECONDS, activity_html, get_live_channel
+from aiva_sheets import extract_sheet_id, open_google_worksheet, sync_call_store, write_back_to_sheet, PublicSheetReader, WorksheetReader
 
 #######################################
 # PAGE CONFIGURATION
@@ -346,14 +358,12 @@ if 'authenticated' not in st.session_state:
 if 'current_page' not in st.session_state:
     st.session_state.current_page = 'Dashboard'
 
-if 'webhook_data' not in st.session_state:
-    st.session_state.webhook_data = []
-
 if 'live_urls' not in st.session_state:
     st.session_state.live_urls = []
 
-if 'crm_contacts' not in st.session_state:
-    st.session_state.crm_contacts = []
+if 'monitor_watcher' not in st.session_state:
+    # Claims this session's URLs on the shared prober
+    st.session_state.monitor_watcher = uuid.uuid4().hex
 
 if 'real_time_mode' not in st.session_state:
     st.session_state.real_time_mode = True
@@ -513,8 +523,9 @@ with st.sidebar:
                 step=5
             )
     
-    # Manual refresh button
+    # Manual refresh button: reload only the active source
     if st.button("🔄 Refresh Now", use_container_width=True):
+        st.session_state.refresh_dataset = True
         st.rerun()
     
     st.markdown('</div>', unsafe_allow_html=True)
@@ -559,54 +570,23 @@ with st.sidebar:
 # DATA LOADING FUNCTIONS
 #######################################
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_google_sheets_data(json_credentials, sheets_url):
-    """Load data from Google Sheets using service account authentication"""
-    try:
-        # Parse the JSON credentials
-        credentials_dict = json.loads(json_credentials)
-        
-        # Set up the scope
-        scope = [
-            'https://spreadsheets.google.com/feeds',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        
-        # Create credentials
-        credentials = Credentials.from_service_account_info(credentials_dict, scopes=scope)
-        
-        # Authorize the client
-        client = gspread.authorize(credentials)
-        
-        # Extract spreadsheet ID from URL
-        if '/d/' in sheets_url:
-            sheet_id = sheets_url.split('/d/')[1].split('/')[0]
-        else:
-            raise ValueError("Invalid Google Sheets URL format")
-        
-        # Open the spreadsheet
-        spreadsheet = client.open_by_key(sheet_id)
-        worksheet = spreadsheet.sheet1  # Use the first sheet
-        
-        # Get all records
-        records = worksheet.get_all_records()
-        df = pd.DataFrame(records)
-        
-        return df, None
-    
-    except Exception as e:
-        return None, str(e)
+# Process-wide cache of loaded sources and their derived results
+dataset_registry = get_dataset_registry()
 
-@st.cache_data
-def load_csv_data(uploaded_file):
-    """Load data from uploaded CSV file"""
+def load_csv_data(uploaded_file, refresh=False):
+    """Load an uploaded CSV through the dataset registry; identical uploads share one parsed frame"""
     try:
-        df = pd.read_csv(uploaded_file)
-        return df, None
+        raw = uploaded_file.getvalue()
+        digest = content_hash(raw)
+        name = f"csv_{digest}"
+        if refresh:
+            dataset_registry.invalidate(name)
+        df, version = dataset_registry.load(name, lambda: pd.read_csv(io.BytesIO(raw)),
+                                            ttl=SOURCE_TTLS['csv'], content_hash=digest)
+        return df, version, None
     except Exception as e:
-        return None, str(e)
+        return None, None, str(e)
 
-@st.cache_data
 def generate_vapi_ai_data():
     """Generate comprehensive VAPI AI call center data"""
     try:
@@ -671,48 +651,108 @@ def generate_vapi_ai_data():
         return pd.DataFrame()
 
 # Data Loading Logic - Priority: Google Sheets > CSV > VAPI AI Demo Data
+# Each source is loaded into a process-wide call store once and shared by every session
 df = None
+call_store = None
 data_source = ""
 current_time = datetime.now()
+refresh_dataset = st.session_state.pop('refresh_dataset', False)
 
 # PRIORITY 1: Try Google Sheets first (Live Data)
 if sheets_url:
     try:
-        # Try to load from Google Sheets without authentication first (public sheet)
+        # Sync the sheet into its shared call store; after the first download only newly appended rows are fetched
         if '/d/' in sheets_url:
-            sheet_id = sheets_url.split('/d/')[1].split('/')[0]
-            csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
+            sheet_id = extract_sheet_id(sheets_url)
+            sheets_store = get_call_store(f"sheets_{sheet_id}")
             
             try:
-                df = pd.read_csv(csv_url)
-                data_source = "Google Sheets (Live - Public)"
-                st.success(f"✅ Successfully connected to Google Sheets! Loaded {len(df)} rows from live data.")
+                sync_result = sync_call_store(sheets_store, PublicSheetReader(sheet_id), source="Google Sheets (Live - Public)",
+                                              force_full=refresh_dataset)
+                call_store = sheets_store
+                data_source = sheets_store.source or "Google Sheets (Live - Public)"
+                st.success(f"✅ Successfully connected to Google Sheets! Loaded {sync_result['rows']} rows from live data ({sync_result['new_rows']} new).")
             except Exception as e:
                 st.warning(f"⚠️ Could not access public Google Sheets: {e}")
                 
                 # Try with authentication if available
                 if uploaded_json:
                     json_content = uploaded_json.read().decode('utf-8')
-                    df, error = load_google_sheets_data(json_content, sheets_url)
+                    worksheet, error = open_google_worksheet(json_content, sheets_url)
                     
-                    if df is not None:
+                    if worksheet is not None:
+                        sync_result = sync_call_store(sheets_store, WorksheetReader(worksheet), source="Google Sheets (Live - Authenticated)",
+                                                      force_full=refresh_dataset)
+                        call_store = sheets_store
                         data_source = "Google Sheets (Live - Authenticated)"
-                        st.success(f"✅ Successfully connected to Google Sheets with authentication! Loaded {len(df)} rows.")
+                        st.success(f"✅ Successfully connected to Google Sheets with authentication! Loaded {sync_result['rows']} rows ({sync_result['new_rows']} new).")
                     else:
                         st.error(f"❌ Google Sheets Authentication Error: {error}")
     except Exception as e:
         st.error(f"❌ Google Sheets Connection Error: {e}")
 
 # PRIORITY 2: Use VAPI AI demo data as default
-if df is None:
-    df = generate_vapi_ai_data()
-    if not df.empty:
+if call_store is None:
+    demo_store = get_call_store("vapi_demo", persist=False)
+    if not demo_store.is_loaded():
+        demo_df = generate_vapi_ai_data()
+        if not demo_df.empty:
+            demo_store.replace(demo_df, source="VAPI AI Demo Data (Comprehensive)")
+    
+    if demo_store.is_loaded():
+        call_store = demo_store
         data_source = "VAPI AI Demo Data (Comprehensive)"
         st.info("🤖 Using comprehensive AIVACEO demo data. Configure Google Sheets for live data integration.")
     else:
         st.error("❌ No data available. Please check the data generation.")
         st.stop()
 
+# Pages work on a zero-copy, read-only view of the shared typed store; transcripts,
+# summaries and action items stay in its side file until a view asks for them
+df = call_store.view()
+store_info = call_store.info()
+
+# Shared pre-aggregated rollups; charts grouped by date/hour/agent/tier/intent/category query this instead of df
+rollup_cube = get_rollup_cube(call_store)
+
+dataset_version = (call_store.name, call_store.version)
+
+# Calls posted to the webhook ingestion service (aiva_webhooks.py) are upserted into the shared store within a second
+webhook_feed = get_webhook_feed(call_store)
+
+def export_metadata(frame):
+    """Metadata written alongside exports (Parquet key-value metadata, an Excel sheet or metadata.json in a ZIP)"""
+    return {
+        'source': data_source,
+        'dataset': call_store.name,
+        'version': call_store.version,
+        'rows': len(frame),
+        'exported_at': datetime.now().isoformat(timespec='seconds')
+    }
+
+def store_changes(version):
+    """The store's writes from an earlier dataset version up to this session's (None when they are not kept)"""
+    if version is None or version[0] != call_store.name:
+        return None
+    return call_store.changes_since(version[1], until=dataset_version[1])
+
+def caught_up(index, version):
+    """An index cached for an earlier dataset version, brought forward by the store's writes since"""
+    changes = store_changes(version)
+    return index.updated(changes['frame'], changes) if changes is not None else None
+
+def get_filter_index():
+    """Filter-bar indexes for the current dataset version, shared by every session"""
+    if dataset_version is None:
+        return FilterIndex(df)
+    return dataset_registry.derived(dataset_version, 'filter_index', lambda: FilterIndex(df), update=caught_up)
+
+def get_date_partitions():
+    """Per-day row partitions for the current dataset version, shared by every session"""
+    if dataset_version is None:
+        return DatePartitions(df)
+    return dataset_registry.derived(dataset_version, 'date_partitions', lambda: DatePartitions(df), update=caught_up)
+
 # Display data source info
 date_range = "N/A"
 if 'call_date' in df.columns:
@@ -727,8 +767,8 @@ st.markdown(f"""
     <strong>Last Updated:</strong> {current_time.strftime('%H:%M:%S')} | 
     <strong>Total Records:</strong> {len(df):,} |
     <strong>Date Range:</strong> {date_range} |
-    <strong>Columns:</strong> {len(df.columns)} |
-    <strong>Memory Usage:</strong> {df.memory_usage(deep=True).sum() / 1024 / 1024:.1f} MB
+    <strong>Columns:</strong> {store_info['columns']} |
+    <strong>Memory Usage:</strong> {store_info['memory_mb']:.1f} MB (+{store_info['text_mb']:.1f} MB text on disk)
 </div>
 """, unsafe_allow_html=True)
 
@@ -741,90 +781,18 @@ def safe_numeric_conversion(series, default=0):
     """Safely convert series to numeric, replacing errors with default"""
     return pd.to_numeric(series, errors='coerce').fillna(default)
 
+vapi_kpi_engine = KPIEngine(VAPI_KPIS)
+
 def process_vapi_metrics():
-    """Process comprehensive VAPI AI call center metrics"""
+    """Process comprehensive VAPI AI call center metrics (one vectorized pass, cached per store version)"""
     try:
-        # Convert numeric columns safely
-        numeric_cols = ['call_duration_seconds', 'cost', 'sentiment_score', 'confidence_score',
-                       'resolution_time_seconds', 'customer_satisfaction', 'speech_rate_wpm',
-                       'silence_percentage', 'interruption_count', 'ai_accuracy_score',
-                       'agent_performance_score', 'revenue_impact', 'lead_quality_score',
-                       'conversion_probability', 'customer_lifetime_value', 'summary_word_count']
-        
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = safe_numeric_conversion(df[col])
-        
-        # Calculate comprehensive metrics
-        total_calls = len(df)
-        total_cost = df['cost'].sum() if 'cost' in df.columns else 0
-        avg_call_duration = df['call_duration_seconds'].mean() / 60 if 'call_duration_seconds' in df.columns else 0
-        success_rate = (df['call_success'] == 'Yes').sum() / total_calls * 100 if 'call_success' in df.columns else 0
-        avg_sentiment = df['sentiment_score'].mean() if 'sentiment_score' in df.columns else 0
-        appointments_scheduled = (df['appointment_scheduled'] == 'Yes').sum() if 'appointment_scheduled' in df.columns else 0
-        avg_confidence = df['confidence_score'].mean() if 'confidence_score' in df.columns else 0
-        total_agents = df['voice_agent_name'].nunique() if 'voice_agent_name' in df.columns else 0
-        avg_satisfaction = df['customer_satisfaction'].mean() if 'customer_satisfaction' in df.columns else 0
-        total_revenue = df['revenue_impact'].sum() if 'revenue_impact' in df.columns else 0
-        avg_conversion = df['conversion_probability'].mean() if 'conversion_probability' in df.columns else 0
-        avg_ai_accuracy = df['ai_accuracy_score'].mean() if 'ai_accuracy_score' in df.columns else 0
-        escalations = (df['escalation_required'] == 'Yes').sum() if 'escalation_required' in df.columns else 0
-        follow_ups = (df['follow_up_required'] == 'Yes').sum() if 'follow_up_required' in df.columns else 0
-        avg_resolution_time = df['resolution_time_seconds'].mean() / 60 if 'resolution_time_seconds' in df.columns else 0
-        avg_speech_rate = df['speech_rate_wpm'].mean() if 'speech_rate_wpm' in df.columns else 0
-        avg_silence = df['silence_percentage'].mean() if 'silence_percentage' in df.columns else 0
-        avg_interruptions = df['interruption_count'].mean() if 'interruption_count' in df.columns else 0
-        avg_agent_performance = df['agent_performance_score'].mean() if 'agent_performance_score' in df.columns else 0
-        avg_lead_quality = df['lead_quality_score'].mean() if 'lead_quality_score' in df.columns else 0
-        avg_clv = df['customer_lifetime_value'].mean() if 'customer_lifetime_value' in df.columns else 0
-        
-        # Advanced metrics
-        high_value_customers = (df['customer_tier'].isin(['Platinum', 'VIP'])).sum() if 'customer_tier' in df.columns else 0
-        complex_calls = (df['call_complexity'] == 'High').sum() if 'call_complexity' in df.columns else 0
-        positive_sentiment = (df['sentiment_score'] > 0.7).sum() if 'sentiment_score' in df.columns else 0
-        high_confidence = (df['confidence_score'] > 0.9).sum() if 'confidence_score' in df.columns else 0
-        quick_resolutions = (df['resolution_time_seconds'] < 300).sum() if 'resolution_time_seconds' in df.columns else 0
-        
-        return {
-            'total_calls': total_calls,
-            'total_cost': total_cost,
-            'avg_call_duration': avg_call_duration,
-            'success_rate': success_rate,
-            'avg_sentiment': avg_sentiment,
-            'appointments_scheduled': appointments_scheduled,
-            'avg_confidence': avg_confidence * 100,
-            'total_agents': total_agents,
-            'avg_satisfaction': avg_satisfaction,
-            'total_revenue': total_revenue,
-            'avg_conversion': avg_conversion * 100,
-            'avg_ai_accuracy': avg_ai_accuracy * 100,
-            'escalations': escalations,
-            'follow_ups': follow_ups,
-            'avg_resolution_time': avg_resolution_time,
-            'avg_speech_rate': avg_speech_rate,
-            'avg_silence': avg_silence,
-            'avg_interruptions': avg_interruptions,
-            'avg_agent_performance': avg_agent_performance * 100,
-            'avg_lead_quality': avg_lead_quality * 100,
-            'avg_clv': avg_clv,
-            'high_value_customers': high_value_customers,
-            'complex_calls': complex_calls,
-            'positive_sentiment': positive_sentiment,
-            'high_confidence': high_confidence,
-            'quick_resolutions': quick_resolutions
-        }
+        return vapi_kpi_engine.get(df, version=dataset_version, changes=store_changes)
     except Exception as e:
         st.error(f"Error processing VAPI metrics: {e}")
-        return {key: 0 for key in ['total_calls', 'total_cost', 'avg_call_duration', 'success_rate',
-                                  'avg_sentiment', 'appointments_scheduled', 'avg_confidence', 'total_agents',
-                                  'avg_satisfaction', 'total_revenue', 'avg_conversion', 'avg_ai_accuracy',
-                                  'escalations', 'follow_ups', 'avg_resolution_time', 'avg_speech_rate',
-                                  'avg_silence', 'avg_interruptions', 'avg_agent_performance', 'avg_lead_quality',
-                                  'avg_clv', 'high_value_customers', 'complex_calls', 'positive_sentiment',
-                                  'high_confidence', 'quick_resolutions']}
+        return vapi_kpi_engine.empty()
 
-def create_enhanced_ag_grid(dataframe, grid_key, height=400, enable_enterprise=True):
-    """Create an enhanced AG Grid with comprehensive CRM features"""
+def build_grid_options(dataframe, grid_key, enable_enterprise=True):
+    """GridOptions for a grid's column schema (renderers, filters, selection and export settings)"""
     gb = GridOptionsBuilder.from_dataframe(dataframe)
     
     # Enable comprehensive features
@@ -938,24 +906,42 @@ def create_enhanced_ag_grid(dataframe, grid_key, height=400, enable_enterprise=T
         gridOptions['suppressExcelExport'] = False
         gridOptions['suppressCsvExport'] = False
     
+    return gridOptions
+
+def create_enhanced_ag_grid(dataframe, grid_key, height=400, enable_enterprise=True):
+    """Create an enhanced AG Grid with comprehensive CRM features"""
+    # Large frames use the server-side row model: only the requested page is sent to the grid
+    server_side = len(dataframe) > SERVER_SIDE_ROW_THRESHOLD
+    if server_side:
+        full_dataframe = dataframe
+        dataframe, server_state = server_side_page(full_dataframe, grid_key)
+    
+    # GridOptions only depend on the column schema, so they are built once per grid and reused across reruns
+    gridOptions = cached_grid_options(grid_key, dataframe, lambda: build_grid_options(dataframe, grid_key, enable_enterprise), flags=(enable_enterprise,))
+    
+    if server_side:
+        configure_server_side_options(gridOptions, dataframe, grid_key)
+    
     # Display AG Grid with all features
     grid_response = AgGrid(
         dataframe,
         gridOptions=gridOptions,
-        data_return_mode=DataReturnMode.FILTERED_AND_SORTED,
-        update_mode=GridUpdateMode.MODEL_CHANGED,
+        data_return_mode=DataReturnMode.AS_INPUT if server_side else DataReturnMode.FILTERED_AND_SORTED,
+        update_mode=GridUpdateMode.SELECTION_CHANGED if server_side else GridUpdateMode.MODEL_CHANGED,
         fit_columns_on_grid_load=False,
         theme='streamlit',
         enable_enterprise_modules=enable_enterprise,
         height=height,
         width='100%',
-        key=grid_key,
+        key=server_state['grid_key'] if server_side else grid_key,
         reload_data=False,
         try_to_convert_back_to_original_types=True,
         conversion_errors='coerce',
         allow_unsafe_jscode=True
     )
     
+    if server_side:
+        return server_side_response(full_dataframe, dataframe, grid_key, grid_response, server_state)
     return grid_response
 
 def create_metric_chart(data, chart_type, title, x_col=None, y_col=None, color_col=None):
@@ -1000,175 +986,22 @@ def create_metric_chart(data, chart_type, title, x_col=None, y_col=None, color_c
         st.error(f"Error creating chart: {e}")
         return None
 
-def export_data_to_sheets(df, sheet_url, credentials_json):
-    """Export data to Google Sheets"""
-    try:
-        if not credentials_json:
-            st.error("❌ JSON credentials required for export")
-            return False
-        
-        # Parse credentials
-        credentials_dict = json.loads(credentials_json)
-        scope = [
-            'https://spreadsheets.google.com/feeds',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        
-        credentials = Credentials.from_service_account_info(credentials_dict, scopes=scope)
-        client = gspread.authorize(credentials)
-        
-        # Extract sheet ID
-        if '/d/' in sheet_url:
-            sheet_id = sheet_url.split('/d/')[1].split('/')[0]
-        else:
-            raise ValueError("Invalid Google Sheets URL")
-        
-        # Open spreadsheet
-        spreadsheet = client.open_by_key(sheet_id)
-        worksheet = spreadsheet.sheet1
-        
-        # Clear existing data
-        worksheet.clear()
-        
-        # Upload new data
-        worksheet.update([df.columns.values.tolist()] + df.values.tolist())
-        
-        return True
-    except Exception as e:
-        st.error(f"❌ Export failed: {e}")
-        return False
-
-def monitor_live_url(url):
-    """Monitor live URL status"""
-    try:
-        response = requests.get(url, timeout=10)
-        return {
-            'status_code': response.status_code,
-            'response_time': response.elapsed.total_seconds(),
-            'status': 'online' if response.status_code == 200 else 'error',
-            'timestamp': datetime.now().isoformat()
-        }
-    except Exception as e:
-        return {
-            'status_code': 0,
-            'response_time': 0,
-            'status': 'offline',
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }
-
-#######################################
-# WEBHOOK PROCESSING FUNCTIONS
-#######################################
-
-def process_vapi_webhook(webhook_data):
-    """Process incoming VAPI AI webhook data"""
-    try:
-        # Validate webhook signature (if provided)
-        if 'signature' in webhook_data:
-            # Implement signature validation here
-            pass
-        
-        # Extract call data from webhook
-        call_data = {
-            'call_id': webhook_data.get('call_id', f"WEBHOOK-{int(time_module.time())}"),
-            'customer_name': webhook_data.get('customer_name', 'Unknown'),
-            'phone_number': webhook_data.get('phone_number', 'Unknown'),
-            'call_status': webhook_data.get('status', 'Unknown'),
-            'timestamp': webhook_data.get('timestamp', datetime.now().isoformat())
-        }
-        
-        # Add to session state
-        if 'webhook_data' not in st.session_state:
-            st.session_state.webhook_data = []
-        
-        st.session_state.webhook_data.append(call_data)
-        
-        # Keep only last 100 webhook entries
-        if len(st.session_state.webhook_data) > 100:
-            st.session_state.webhook_data = st.session_state.webhook_data[-100:]
-        
-        return True
-    except Exception as e:
-        st.error(f"Error processing webhook: {e}")
-        return False
-
-def process_n8n_webhook(webhook_data):
-    """Process incoming n8n webhook data"""
-    try:
-        # n8n specific processing
-        workflow_data = {
-            'workflow_id': webhook_data.get('workflow_id', 'Unknown'),
-            'execution_id': webhook_data.get('execution_id', 'Unknown'),
-            'status': webhook_data.get('status', 'Unknown'),
-            'data': webhook_data.get('data', {}),
-            'timestamp': webhook_data.get('timestamp', datetime.now().isoformat())
-        }
-        
-        # Process based on workflow type
-        if workflow_data['workflow_id'] == 'call_processing':
-            # Handle call processing workflow
-            return process_call_workflow(workflow_data['data'])
-        elif workflow_data['workflow_id'] == 'customer_update':
-            # Handle customer update workflow
-            return process_customer_workflow(workflow_data['data'])
-        
-        return True
-    except Exception as e:
-        st.error(f"Error processing n8n webhook: {e}")
-        return False
-
-def process_call_workflow(call_data):
-    """Process call-specific workflow data"""
-    try:
-        # Extract and validate call data
-        processed_call = {
-            'call_id': call_data.get('call_id'),
-            'customer_name': call_data.get('customer_name'),
-            'phone_number': call_data.get('phone_number'),
-            'call_duration': call_data.get('duration'),
-            'call_outcome': call_data.get('outcome'),
-            'ai_summary': call_data.get('ai_summary'),
-            'next_action': call_data.get('next_action'),
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        # Add to processed calls
-        if 'processed_calls' not in st.session_state:
-            st.session_state.processed_calls = []
-        
-        st.session_state.processed_calls.append(processed_call)
-        
-        return True
-    except Exception as e:
-        st.error(f"Error processing call workflow: {e}")
-        return False
-
-def process_customer_workflow(customer_data):
-    """Process customer-specific workflow data"""
-    try:
-        # Extract and validate customer data
-        processed_customer = {
-            'customer_id': customer_data.get('customer_id'),
-            'customer_name': customer_data.get('name'),
-            'email': customer_data.get('email'),
-            'phone': customer_data.get('phone'),
-            'tier': customer_data.get('tier'),
-            'last_interaction': customer_data.get('last_interaction'),
-            'notes': customer_data.get('notes'),
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        # Add to CRM contacts
-        if 'crm_contacts' not in st.session_state:
-            st.session_state.crm_contacts = []
-        
-        st.session_state.crm_contacts.append(processed_customer)
-        
-        return True
-    except Exception as e:
-        st.error(f"Error processing customer workflow: {e}")
-        return False
+def export_data_to_sheets(df, sheet_url, credentials_json, full=False):
+    """Write data back to Google Sheets, sending only the cells changed since the last export"""
+    if not credentials_json:
+        st.error("❌ JSON credentials required for export")
+        return None
+    
+    worksheet, error = open_google_worksheet(credentials_json, sheet_url)
+    if worksheet is None:
+        st.error(f"❌ Export failed: {error}")
+        return None
+    
+    report, error = write_back_to_sheet(worksheet, df, extract_sheet_id(sheet_url), full=full)
+    if error:
+        st.error(f"❌ Export stopped after {report['batches']} batches ({report['cells']:,} cells written): {error}")
+        return None
+    return report
 
 #######################################
 # PAGE ROUTING AND CONTENT
@@ -1191,7 +1024,7 @@ if st.session_state.current_page == "📊 Dashboard":
             delta=f"+{metrics['total_calls']//20} today"
         )
         # Mini chart for calls trend
-        daily_calls = df.groupby('call_date')['call_id'].count().tail(7) if 'call_date' in df.columns else pd.Series([10, 12, 15, 18, 20, 22, 25])
+        daily_calls = rollup_cube.query('call_date', {'call_id': 'count'}).set_index('call_date')['call_id'].tail(7) if 'call_date' in df.columns else pd.Series([10, 12, 15, 18, 20, 22, 25])
         fig_calls = px.line(x=daily_calls.index, y=daily_calls.values, title="7-Day Trend")
         fig_calls.update_layout(height=150, showlegend=False, margin=dict(l=0, r=0, t=30, b=0))
         st.plotly_chart(fig_calls, use_container_width=True)
@@ -1219,7 +1052,7 @@ if st.session_state.current_page == "📊 Dashboard":
             delta=f"+{metrics['avg_ai_accuracy']*0.01:.1f}%"
         )
         # AI accuracy trend
-        accuracy_trend = df.groupby('call_date')['ai_accuracy_score'].mean().tail(7) if 'ai_accuracy_score' in df.columns else pd.Series([0.85, 0.87, 0.89, 0.91, 0.93, 0.94, 0.95])
+        accuracy_trend = rollup_cube.query('call_date', {'ai_accuracy_score': 'mean'}).set_index('call_date')['ai_accuracy_score'].tail(7) if 'ai_accuracy_score' in df.columns and 'call_date' in df.columns else pd.Series([0.85, 0.87, 0.89, 0.91, 0.93, 0.94, 0.95])
         fig_accuracy = px.line(x=accuracy_trend.index, y=accuracy_trend.values, title="AI Accuracy Trend")
         fig_accuracy.update_layout(height=150, showlegend=False, margin=dict(l=0, r=0, t=30, b=0))
         st.plotly_chart(fig_accuracy, use_container_width=True)
@@ -1233,8 +1066,7 @@ if st.session_state.current_page == "📊 Dashboard":
             delta=f"+{metrics['avg_sentiment']*0.05:.3f}"
         )
         # Sentiment distribution
-        sentiment_bins = pd.cut(df['sentiment_score'], bins=[0, 0.3, 0.7, 1.0], labels=['Negative', 'Neutral', 'Positive']) if 'sentiment_score' in df.columns else pd.Series(['Positive']*60 + ['Neutral']*30 + ['Negative']*10)
-        sentiment_counts = sentiment_bins.value_counts()
+        sentiment_counts = rollup_cube.query([], {'sentiment_score': 'buckets'}).iloc[0] if 'sentiment_score' in df.columns else pd.Series(['Positive']*60 + ['Neutral']*30 + ['Negative']*10).value_counts()
         fig_sentiment = px.bar(x=sentiment_counts.index, y=sentiment_counts.values, title="Sentiment Distribution")
         fig_sentiment.update_layout(height=150, showlegend=False, margin=dict(l=0, r=0, t=30, b=0))
         st.plotly_chart(fig_sentiment, use_container_width=True)
@@ -1248,7 +1080,7 @@ if st.session_state.current_page == "📊 Dashboard":
             delta=f"+${metrics['total_revenue']*0.1:.0f}"
         )
         # Revenue trend
-        revenue_trend = df.groupby('call_date')['revenue_impact'].sum().tail(7) if 'revenue_impact' in df.columns else pd.Series([1000, 1200, 1500, 1800, 2000, 2200, 2500])
+        revenue_trend = rollup_cube.query('call_date', {'revenue_impact': 'sum'}).set_index('call_date')['revenue_impact'].tail(7) if 'revenue_impact' in df.columns and 'call_date' in df.columns else pd.Series([1000, 1200, 1500, 1800, 2000, 2200, 2500])
         fig_revenue = px.area(x=revenue_trend.index, y=revenue_trend.values, title="Revenue Trend")
         fig_revenue.update_layout(height=150, showlegend=False, margin=dict(l=0, r=0, t=30, b=0))
         st.plotly_chart(fig_revenue, use_container_width=True)
@@ -1305,10 +1137,10 @@ if st.session_state.current_page == "📊 Dashboard":
         st.markdown('<div class="chart-title">📈 Call Volume & Success Rate Trends</div>', unsafe_allow_html=True)
         
         if 'call_date' in df.columns:
-            daily_stats = df.groupby('call_date').agg({
+            daily_stats = rollup_cube.query('call_date', {
                 'call_id': 'count',
-                'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100
-            }).reset_index()
+                'call_success': 'rate'
+            })
             daily_stats.columns = ['Date', 'Call Volume', 'Success Rate']
             
             fig = make_subplots(specs=[[{"secondary_y": True}]])
@@ -1334,12 +1166,12 @@ if st.session_state.current_page == "📊 Dashboard":
         st.markdown('<div class="chart-title">🎯 Agent Performance Comparison</div>', unsafe_allow_html=True)
         
         if 'voice_agent_name' in df.columns:
-            agent_performance = df.groupby('voice_agent_name').agg({
+            agent_performance = rollup_cube.query('voice_agent_name', {
                 'call_id': 'count',
-                'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100,
+                'call_success': 'rate',
                 'customer_satisfaction': 'mean',
                 'ai_accuracy_score': 'mean'
-            }).reset_index()
+            })
             agent_performance.columns = ['Agent', 'Total Calls', 'Success Rate', 'Avg Satisfaction', 'AI Accuracy']
             
             fig = px.scatter(agent_performance, 
@@ -1396,8 +1228,12 @@ elif st.session_state.current_page == "📈 Analytics":
     # Analytics filters
     col1, col2, col3, col4 = st.columns(4)
     
+    # Date ranges default to the latest 30 days that have calls
+    date_partitions = get_date_partitions()
+    last_day = date_partitions.last_day or datetime.now().date()
+    
     with col1:
-        date_filter = st.date_input("📅 Date Range", value=[datetime.now().date() - timedelta(days=30), datetime.now().date()])
+        date_filter = st.date_input("📅 Date Range", value=[last_day - timedelta(days=30), last_day])
     with col2:
         agent_filter = st.multiselect("🤖 AI Agents", df['voice_agent_name'].unique() if 'voice_agent_name' in df.columns else [])
     with col3:
@@ -1405,14 +1241,23 @@ elif st.session_state.current_page == "📈 Analytics":
     with col4:
         intent_filter = st.multiselect("💡 Intent", df['intent_detected'].unique() if 'intent_detected' in df.columns else [])
     
-    # Apply filters
-    filtered_df = df.copy()
-    if agent_filter:
-        filtered_df = filtered_df[filtered_df['voice_agent_name'].isin(agent_filter)]
-    if tier_filter:
-        filtered_df = filtered_df[filtered_df['customer_tier'].isin(tier_filter)]
-    if intent_filter:
-        filtered_df = filtered_df[filtered_df['intent_detected'].isin(intent_filter)]
+    # The date range prunes day partitions first; the other filters only run on those rows
+    date_start, date_end = date_window(date_filter)
+    date_rows = date_partitions.rows_between(date_start, date_end)
+    
+    # Apply filters through the shared filter index (bitmap lookups, one copy of the selected rows)
+    selection = get_filter_index().select(
+        isin={'voice_agent_name': agent_filter, 'customer_tier': tier_filter, 'intent_detected': intent_filter},
+        within=date_rows
+    )
+    filtered_df = selection.frame()
+    
+    # The same filters applied to the rollup cube for grouped charts
+    cube_filters = {'voice_agent_name': agent_filter, 'customer_tier': tier_filter, 'intent_detected': intent_filter}
+    if date_rows is not None:
+        cube_filters['call_date'] = date_partitions.labels_between(date_start, date_end)
+        partition_count, partition_rows = date_partitions.partition_rows(date_start, date_end)
+        st.caption(f"📅 Reading {partition_rows:,} of {len(df):,} calls from {partition_count} of {len(date_partitions)} daily partitions")
     
     # Analytics Tabs
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Performance", "😊 Sentiment", "💰 Revenue", "🤖 AI Metrics", "🔮 Predictions"])
@@ -1426,12 +1271,9 @@ elif st.session_state.current_page == "📈 Analytics":
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             st.markdown('<div class="chart-title">📈 Success Rate by Hour</div>', unsafe_allow_html=True)
             
-            if 'call_start_time' in filtered_df.columns:
-                # Extract hour from call_start_time
-                filtered_df['hour'] = pd.to_datetime(filtered_df['call_start_time'], format='%H:%M:%S').dt.hour
-                hourly_success = filtered_df.groupby('hour')['call_success'].apply(
-                    lambda x: (x == 'Yes').sum() / len(x) * 100
-                ).reset_index()
+            if 'call_start_time' in filtered_df.columns and len(filtered_df) > 0:
+                # Hour of day comes from call_start_time in the cube's 'hour' dimension
+                hourly_success = rollup_cube.query('hour', {'call_success': 'rate'}, filters=cube_filters)
                 
                 fig = px.line(hourly_success, x='hour', y='call_success',
                             title="Success Rate by Hour of Day",
@@ -1466,7 +1308,7 @@ elif st.session_state.current_page == "📈 Analytics":
             st.markdown('<div class="chart-title">🎯 Conversion Rate by Customer Tier</div>', unsafe_allow_html=True)
             
             if 'customer_tier' in filtered_df.columns and 'conversion_probability' in filtered_df.columns:
-                tier_conversion = filtered_df.groupby('customer_tier')['conversion_probability'].mean().reset_index()
+                tier_conversion = rollup_cube.query('customer_tier', {'conversion_probability': 'mean'}, filters=cube_filters)
                 
                 fig = px.bar(tier_conversion, x='customer_tier', y='conversion_probability',
                            title="Average Conversion Rate by Customer Tier",
@@ -1543,8 +1385,8 @@ elif st.session_state.current_page == "📈 Analytics":
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             st.markdown('<div class="chart-title">📈 Sentiment Trend Over Time</div>', unsafe_allow_html=True)
             
-            if 'call_date' in filtered_df.columns and 'sentiment_score' in filtered_df.columns:
-                daily_sentiment = filtered_df.groupby('call_date')['sentiment_score'].mean().reset_index()
+            if 'call_date' in filtered_df.columns and 'sentiment_score' in filtered_df.columns and len(filtered_df) > 0:
+                daily_sentiment = rollup_cube.query('call_date', {'sentiment_score': 'mean'}, filters=cube_filters)
                 
                 fig = px.line(daily_sentiment, x='call_date', y='sentiment_score',
                             title="Daily Average Sentiment Trend",
@@ -1564,7 +1406,7 @@ elif st.session_state.current_page == "📈 Analytics":
             st.markdown('<div class="chart-title">💰 Revenue Impact by Agent</div>', unsafe_allow_html=True)
             
             if 'voice_agent_name' in filtered_df.columns and 'revenue_impact' in filtered_df.columns:
-                agent_revenue = filtered_df.groupby('voice_agent_name')['revenue_impact'].sum().reset_index()
+                agent_revenue = rollup_cube.query('voice_agent_name', {'revenue_impact': 'sum'}, filters=cube_filters)
                 
                 fig = px.bar(agent_revenue, x='voice_agent_name', y='revenue_impact',
                            title="Total Revenue Impact by AI Agent",
@@ -1611,8 +1453,8 @@ elif st.session_state.current_page == "📈 Analytics":
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             st.markdown('<div class="chart-title">💰 Daily Revenue Trend</div>', unsafe_allow_html=True)
             
-            if 'call_date' in filtered_df.columns and 'revenue_impact' in filtered_df.columns:
-                daily_revenue = filtered_df.groupby('call_date')['revenue_impact'].sum().reset_index()
+            if 'call_date' in filtered_df.columns and 'revenue_impact' in filtered_df.columns and len(filtered_df) > 0:
+                daily_revenue = rollup_cube.query('call_date', {'revenue_impact': 'sum'}, filters=cube_filters)
                 
                 fig = px.area(daily_revenue, x='call_date', y='revenue_impact',
                             title="Daily Revenue Trend",
@@ -1632,7 +1474,7 @@ elif st.session_state.current_page == "📈 Analytics":
             st.markdown('<div class="chart-title">🤖 AI Accuracy by Agent</div>', unsafe_allow_html=True)
             
             if 'voice_agent_name' in filtered_df.columns and 'ai_accuracy_score' in filtered_df.columns:
-                agent_accuracy = filtered_df.groupby('voice_agent_name')['ai_accuracy_score'].mean().reset_index()
+                agent_accuracy = rollup_cube.query('voice_agent_name', {'ai_accuracy_score': 'mean'}, filters=cube_filters)
                 
                 fig = px.bar(agent_accuracy, x='voice_agent_name', y='ai_accuracy_score',
                            title="Average AI Accuracy by Agent",
@@ -1803,9 +1645,9 @@ elif st.session_state.current_page == "👥 Agents":
             st.markdown("### 📊 Agent Comparison Dashboard")
             
             # Comprehensive agent comparison
-            agent_metrics = df.groupby('voice_agent_name').agg({
+            agent_metrics = rollup_cube.query('voice_agent_name', {
                 'call_id': 'count',
-                'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100,
+                'call_success': 'rate',
                 'call_duration_seconds': 'mean',
                 'customer_satisfaction': 'mean',
                 'ai_accuracy_score': 'mean',
@@ -1813,7 +1655,7 @@ elif st.session_state.current_page == "👥 Agents":
                 'sentiment_score': 'mean',
                 'confidence_score': 'mean',
                 'resolution_time_seconds': 'mean'
-            }).round(2)
+            }).set_index('voice_agent_name').round(2)
             
             agent_metrics.columns = ['Total Calls', 'Success Rate (%)', 'Avg Duration (s)', 
                                    'Avg Satisfaction', 'AI Accuracy', 'Revenue Impact', 
@@ -1899,11 +1741,12 @@ elif st.session_state.current_page == "👥 Agents":
                 st.markdown('<div class="chart-title">📈 Daily Performance Trend</div>', unsafe_allow_html=True)
                 
                 if 'call_date' in agent_df.columns:
-                    daily_performance = agent_df.groupby('call_date').agg({
+                    agent_filters = {'voice_agent_name': [selected_agent]} if selected_agent != "All Agents" else None
+                    daily_performance = rollup_cube.query('call_date', {
                         'call_id': 'count',
-                        'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100,
+                        'call_success': 'rate',
                         'customer_satisfaction': 'mean'
-                    }).reset_index()
+                    }, filters=agent_filters)
                     
                     fig = make_subplots(specs=[[{"secondary_y": True}]])
                     fig.add_trace(
@@ -1991,37 +1834,21 @@ elif st.session_state.current_page == "👤 Contacts":
     with col4:
         show_high_value = st.checkbox("💎 High Value Only", value=False)
     
-    # Filter contacts based on criteria
-    filtered_df = df.copy()
-    
-    if search_term:
-        filtered_df = filtered_df[
-            filtered_df['customer_name'].str.contains(search_term, case=False, na=False) |
-            filtered_df['phone_number'].str.contains(search_term, case=False, na=False) |
-            filtered_df['email'].str.contains(search_term, case=False, na=False)
-        ]
-    
-    if tier_filter:
-        filtered_df = filtered_df[filtered_df['customer_tier'].isin(tier_filter)]
-    
-    if status_filter != "All":
-        status_map = {"Successful": "Yes", "Failed": "No", "Pending": "Pending"}
-        filtered_df = filtered_df[filtered_df['call_success'] == status_map[status_filter]]
-    
-    if 'customer_lifetime_value' in filtered_df.columns:
-        filtered_df = filtered_df[
-            (filtered_df['customer_lifetime_value'] >= clv_range[0]) & 
-            (filtered_df['customer_lifetime_value'] <= clv_range[1])
-        ]
-    
-    if 'customer_satisfaction' in filtered_df.columns:
-        filtered_df = filtered_df[
-            (filtered_df['customer_satisfaction'] >= satisfaction_range[0]) & 
-            (filtered_df['customer_satisfaction'] <= satisfaction_range[1])
-        ]
-    
-    if show_high_value and 'customer_tier' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['customer_tier'].isin(['Platinum', 'VIP'])]
+    # Contact search goes through the shared n-gram index (names, E.164 phone digits, email parts)
+    search_rows, search_scores = get_contact_index(call_store).search(search_term) if search_term.strip() else (None, None)
+    
+    # Filter contacts through the shared filter index: bitmaps for tiers/status, sorted indexes for the sliders
+    status_map = {"Successful": "Yes", "Failed": "No", "Pending": "Pending"}
+    selection = get_filter_index().select(
+        isin=[
+            ('customer_tier', tier_filter),
+            ('call_success', [status_map[status_filter]] if status_filter != "All" else []),
+            ('customer_tier', ['Platinum', 'VIP'] if show_high_value else [])
+        ],
+        ranges={'customer_lifetime_value': clv_range, 'customer_satisfaction': satisfaction_range},
+        within=search_rows
+    )
+    filtered_df = selection.frame()
     
     # Contact overview metrics
     col1, col2, col3, col4, col5, col6 = st.columns(6)
@@ -2078,9 +1905,9 @@ elif st.session_state.current_page == "👤 Contacts":
     st.markdown("### 📋 Enhanced Contact Directory")
     
     # Create comprehensive contact summary
-    contact_summary = filtered_df.groupby('customer_name').agg({
+    contact_summary = rollup(filtered_df, 'customer_name', {
         'call_id': 'count',
-        'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100,
+        'call_success': 'yes_rate',
         'customer_satisfaction': 'mean',
         'customer_lifetime_value': 'first',
         'customer_tier': 'first',
@@ -2088,7 +1915,7 @@ elif st.session_state.current_page == "👤 Contacts":
         'email': 'first',
         'call_date': 'max',
         'revenue_impact': 'sum',
-        'follow_up_required': lambda x: (x == 'Yes').sum(),
+        'follow_up_required': 'yes_count',
         'sentiment_score': 'mean',
         'next_best_action': 'last'
     }).round(2)
@@ -2097,6 +1924,13 @@ elif st.session_state.current_page == "👤 Contacts":
                               'Tier', 'Phone', 'Email', 'Last Call', 'Revenue Impact ($)', 
                               'Follow-ups', 'Avg Sentiment', 'Next Action']
     
+    # Best matches first while searching
+    if search_rows is not None and len(contact_summary) > 0:
+        relevance = pd.Series(search_scores, index=search_rows).reindex(filtered_df.index)
+        best_match = relevance.groupby(filtered_df['customer_name'].to_numpy()).max()
+        contact_summary = contact_summary.loc[best_match.sort_values(ascending=False, kind='stable').index]
+        st.caption(f"🔍 {len(contact_summary):,} contacts match \"{search_term}\", best matches first")
+    
     # Enhanced AG Grid with CRM features
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     st.markdown('<div class="chart-title">📊 Advanced CRM Contact Grid</div>', unsafe_allow_html=True)
@@ -2285,8 +2119,12 @@ elif st.session_state.current_page == "📞 Calls":
     # Call management dashboard
     col1, col2, col3, col4 = st.columns(4)
     
+    # Date ranges default to the latest 7 days that have calls
+    date_partitions = get_date_partitions()
+    last_day = date_partitions.last_day or datetime.now().date()
+    
     with col1:
-        date_range = st.date_input("📅 Date Range", value=[datetime.now().date() - timedelta(days=7), datetime.now().date()])
+        date_range = st.date_input("📅 Date Range", value=[last_day - timedelta(days=7), last_day])
     with col2:
         call_status = st.multiselect("📊 Call Status", df['call_success'].unique() if 'call_success' in df.columns else [])
     with col3:
@@ -2294,18 +2132,14 @@ elif st.session_state.current_page == "📞 Calls":
     with col4:
         duration_range = st.slider("⏱️ Duration Range (min)", 0, 30, (0, 30))
     
-    # Filter calls
-    filtered_calls = df.copy()
-    
-    if call_status:
-        filtered_calls = filtered_calls[filtered_calls['call_success'].isin(call_status)]
-    if call_outcome:
-        filtered_calls = filtered_calls[filtered_calls['call_outcome'].isin(call_outcome)]
-    if 'call_duration_seconds' in filtered_calls.columns:
-        filtered_calls = filtered_calls[
-            (filtered_calls['call_duration_seconds'] >= duration_range[0] * 60) & 
-            (filtered_calls['call_duration_seconds'] <= duration_range[1] * 60)
-        ]
+    # Prune to the date range's day partitions, then filter those calls through the shared filter index
+    date_start, date_end = date_window(date_range)
+    selection = get_filter_index().select(
+        isin={'call_success': call_status, 'call_outcome': call_outcome},
+        ranges={'call_duration_seconds': (duration_range[0] * 60, duration_range[1] * 60)},
+        within=date_partitions.rows_between(date_start, date_end)
+    )
+    filtered_calls = selection.frame()
     
     # Call metrics
     col1, col2, col3, col4, col5, col6 = st.columns(6)
@@ -2372,9 +2206,9 @@ elif st.session_state.current_page == "📞 Calls":
             st.markdown('<div class="chart-title">📅 Daily Call Trend</div>', unsafe_allow_html=True)
             
             if 'call_date' in filtered_calls.columns:
-                daily_calls = filtered_calls.groupby('call_date').agg({
+                daily_calls = rollup(filtered_calls, 'call_date', {
                     'call_id': 'count',
-                    'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100
+                    'call_success': 'yes_rate'
                 }).reset_index()
                 
                 fig = make_subplots(specs=[[{"secondary_y": True}]])
@@ -2437,9 +2271,7 @@ elif st.session_state.current_page == "📞 Calls":
                                      bins=[0, 60, 300, 600, 1200, float('inf')], 
                                      labels=['<1min', '1-5min', '5-10min', '10-20min', '>20min'])
                 
-                duration_success = filtered_calls.groupby(duration_bins)['call_success'].apply(
-                    lambda x: (x == 'Yes').sum() / len(x) * 100
-                ).reset_index()
+                duration_success = rollup(filtered_calls, duration_bins, {'call_success': 'yes_rate'}).reset_index()
                 
                 fig = px.bar(duration_success, x='call_duration_seconds', y='call_success',
                            title="Success Rate by Call Duration",
@@ -2567,6 +2399,16 @@ elif st.session_state.current_page == "📞 Calls":
             st.write(f"**Satisfaction:** {selected_call.get('customer_satisfaction', 'N/A')}/5")
             st.markdown('</div>', unsafe_allow_html=True)
 
+        # Text is read from the store's side file only for the selected call
+        call_text = call_store.fetch_text([selected_call.get('call_id')])
+        if len(call_text):
+            call_text = call_text.iloc[0]
+            with st.expander("📝 Transcript & Summary", expanded=True):
+                for col, label in [('summary', '📋 Summary'), ('action_items', '✅ Action Items'), ('transcript', '🗣️ Transcript')]:
+                    if col in call_text.index and pd.notna(call_text[col]) and call_text[col]:
+                        st.markdown(f"**{label}**")
+                        st.write(call_text[col])
+
 
 elif st.session_state.current_page == "🤖 AI Insights":
     st.markdown('<h2 class="section-header animate-fadeIn">🤖 Advanced AI Insights & Analytics</h2>', unsafe_allow_html=True)
@@ -2647,11 +2489,11 @@ elif st.session_state.current_page == "🤖 AI Insights":
             st.markdown('<div class="chart-title">🤖 AI Performance by Agent</div>', unsafe_allow_html=True)
             
             if 'voice_agent_name' in df.columns and 'ai_accuracy_score' in df.columns:
-                agent_ai_performance = df.groupby('voice_agent_name').agg({
+                agent_ai_performance = rollup_cube.query('voice_agent_name', {
                     'ai_accuracy_score': 'mean',
                     'confidence_score': 'mean',
-                    'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100
-                }).reset_index()
+                    'call_success': 'rate'
+                })
                 
                 fig = px.bar(agent_ai_performance, x='voice_agent_name', y='ai_accuracy_score',
                            title="Average AI Accuracy by Agent",
@@ -2666,7 +2508,7 @@ elif st.session_state.current_page == "🤖 AI Insights":
             st.markdown('<div class="chart-title">📈 AI Performance Trend</div>', unsafe_allow_html=True)
             
             if 'call_date' in df.columns and 'ai_accuracy_score' in df.columns:
-                daily_ai_performance = df.groupby('call_date')['ai_accuracy_score'].mean().reset_index()
+                daily_ai_performance = rollup_cube.query('call_date', {'ai_accuracy_score': 'mean'})
                 
                 fig = px.line(daily_ai_performance, x='call_date', y='ai_accuracy_score',
                             title="Daily AI Accuracy Trend",
@@ -2718,9 +2560,7 @@ elif st.session_state.current_page == "🤖 AI Insights":
                 st.markdown('<div class="chart-container">', unsafe_allow_html=True)
                 st.markdown('<div class="chart-title">🎯 Intent Success Rate</div>', unsafe_allow_html=True)
                 
-                intent_success = df.groupby('intent_detected')['call_success'].apply(
-                    lambda x: (x == 'Yes').sum() / len(x) * 100
-                ).reset_index()
+                intent_success = rollup_cube.query('intent_detected', {'call_success': 'rate'})
                 
                 fig = px.bar(intent_success, x='intent_detected', y='call_success',
                            title="Success Rate by Intent Type",
@@ -2738,7 +2578,7 @@ elif st.session_state.current_page == "🤖 AI Insights":
                 st.markdown('<div class="chart-title">📈 Intent Trends Over Time</div>', unsafe_allow_html=True)
                 
                 if 'call_date' in df.columns:
-                    intent_trends = df.groupby(['call_date', 'intent_detected']).size().reset_index(name='count')
+                    intent_trends = rollup_cube.query(['call_date', 'intent_detected'], {'count': 'count'})
                     
                     fig = px.line(intent_trends, x='call_date', y='count', color='intent_detected',
                                 title="Intent Trends Over Time",
@@ -2753,7 +2593,7 @@ elif st.session_state.current_page == "🤖 AI Insights":
                 st.markdown('<div class="chart-title">💰 Revenue by Intent</div>', unsafe_allow_html=True)
                 
                 if 'revenue_impact' in df.columns:
-                    intent_revenue = df.groupby('intent_detected')['revenue_impact'].sum().reset_index()
+                    intent_revenue = rollup_cube.query('intent_detected', {'revenue_impact': 'sum'})
                     
                     fig = px.bar(intent_revenue, x='intent_detected', y='revenue_impact',
                                title="Total Revenue by Intent Type",
@@ -2846,7 +2686,7 @@ elif st.session_state.current_page == "🤖 AI Insights":
                 st.markdown('<div class="chart-title">📈 Daily Sentiment Trend</div>', unsafe_allow_html=True)
                 
                 if 'call_date' in df.columns:
-                    daily_sentiment = df.groupby('call_date')['sentiment_score'].mean().reset_index()
+                    daily_sentiment = rollup_cube.query('call_date', {'sentiment_score': 'mean'})
                     
                     fig = px.line(daily_sentiment, x='call_date', y='sentiment_score',
                                 title="Daily Average Sentiment Trend",
@@ -3019,72 +2859,97 @@ elif st.session_state.current_page == "🤖 AI Insights":
 elif st.session_state.current_page == "🔗 Webhooks":
     st.markdown('<h2 class="section-header animate-fadeIn">🔗 Webhook Management & n8n Integration</h2>', unsafe_allow_html=True)
     
-    # Webhook status overview
+    # Webhook status overview, from the shared feed of the ingestion service's log
+    feed_info = webhook_feed.info()
+    log_info = webhook_feed.log.info()
     col1, col2, col3, col4, col5, col6 = st.columns(6)
     
     with col1:
-        webhook_count = random.randint(5, 15)
-        st.metric("🔗 Active Webhooks", webhook_count, delta=f"+{webhook_count//5}")
+        st.metric("📨 Events Received", f"{feed_info['events']:,}")
     
     with col2:
-        webhook_success = random.randint(95, 99)
-        st.metric("✅ Success Rate", f"{webhook_success}%", delta=f"+{webhook_success-95}%")
+        st.metric("📞 Calls Ingested", f"{feed_info['calls']:,}")
     
     with col3:
-        daily_webhooks = random.randint(200, 800)
-        st.metric("📊 Daily Webhooks", daily_webhooks, delta=f"+{daily_webhooks//10}")
+        st.metric("👥 CRM Updates", feed_info['contacts'])
     
     with col4:
-        avg_latency = random.randint(50, 200)
-        st.metric("⚡ Avg Latency", f"{avg_latency}ms", delta=f"-{random.randint(5, 20)}ms")
+        since = feed_info['seconds_since_event']
+        st.metric("⏱️ Last Event", "Never" if since is None else f"{since:,.0f}s ago")
     
     with col5:
-        failed_webhooks = random.randint(2, 15)
-        st.metric("❌ Failed Today", failed_webhooks, delta=f"-{failed_webhooks//3}")
+        st.metric("💾 Log Size", f"{log_info['bytes'] / 1024 / 1024:,.1f} MB")
     
     with col6:
-        n8n_workflows = random.randint(8, 20)
-        st.metric("🔄 n8n Workflows", n8n_workflows, delta=f"+{n8n_workflows//4}")
+        st.metric("🗂️ Log Segments", log_info['segments'])
     
     # Webhook management tabs
     webhook_tab1, webhook_tab2, webhook_tab3, webhook_tab4 = st.tabs(["🔗 Active Webhooks", "📊 Analytics", "🔄 n8n Integration", "⚙️ Configuration"])
     
     with webhook_tab1:
         st.markdown("### 🔗 Active Webhook Endpoints")
+        st.info(f"""
+        **Start the endpoint:** `python aiva_webhooks.py --port 8765` (set `AIVA_WEBHOOK_SECRET` to require a secret)
         
-        # Mock webhook data
-        webhook_data = {
-            'Webhook ID': [f'WH-{1000+i:04d}' for i in range(10)],
-            'Endpoint': [f'https://api.vapi.ai/webhook/{random.choice(["call", "sms", "email"])}/{i}' for i in range(10)],
-            'Type': [random.choice(['Call Started', 'Call Ended', 'Booking Created', 'Customer Updated', 'Payment Processed']) for _ in range(10)],
-            'Status': [random.choice(['Active', 'Paused', 'Error']) for _ in range(10)],
-            'Last Triggered': [(datetime.now() - timedelta(minutes=random.randint(1, 1440))).strftime('%Y-%m-%d %H:%M:%S') for _ in range(10)],
-            'Success Rate': [f"{random.randint(85, 99)}%" for _ in range(10)],
-            'Daily Calls': [random.randint(10, 100) for _ in range(10)],
-            'Avg Response Time': [f"{random.randint(50, 300)}ms" for _ in range(10)]
-        }
+        **VAPI Server URL:** `http://<host>:8765/webhooks/vapi` · **n8n HTTP Request node:** `http://<host>:8765/webhooks/n8n`
+        
+        Events are acknowledged once they are in the durable log at `{webhook_feed.log.directory}`; new calls appear in every dashboard session within a second.
+        """)
         
-        webhook_df = pd.DataFrame(webhook_data)
+        # Endpoints come from the registry the ingestion service reads; counts from this process's feed
+        webhook_registry = get_webhook_registry(webhook_feed.log.directory)
+        webhook_endpoints = webhook_registry.endpoints()
+        endpoint_rows = []
+        for endpoint in webhook_endpoints.values():
+            stats = webhook_feed.endpoint_stats.get(endpoint['id'], {'events': 0, 'calls': 0, 'last_event_at': None})
+            endpoint_rows.append({
+                'Webhook ID': endpoint['id'],
+                'Name': endpoint['name'],
+                'Endpoint': f"/webhooks/{endpoint['id']}",
+                'Type': WEBHOOK_SOURCES[endpoint['source']],
+                'Status': endpoint['status'],
+                'Last Triggered': datetime.fromtimestamp(stats['last_event_at']).strftime('%Y-%m-%d %H:%M:%S') if stats['last_event_at'] else 'Never',
+                'Events': stats['events'],
+                'Calls': stats['calls']
+            })
+        webhook_df = pd.DataFrame(endpoint_rows)
         
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown('<div class="chart-title">🔗 Webhook Management Grid</div>', unsafe_allow_html=True)
         
-        grid_response = create_enhanced_ag_grid(webhook_df, "webhook_grid", height=400, enable_enterprise=True)
+        grid_response = create_enhanced_ag_grid(webhook_df, "webhook_grid", height=300, enable_enterprise=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
         
+        with st.expander("➕ Add Endpoint"):
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                new_endpoint_name = st.text_input("🏷️ Webhook Name", placeholder="e.g. Sales Line", key="new_webhook_name")
+            with col2:
+                new_endpoint_source = st.selectbox("📋 Payload Format", list(WEBHOOK_SOURCES), format_func=WEBHOOK_SOURCES.get,
+                                                   key="new_webhook_source")
+            with col3:
+                st.write("")
+                if st.button("➕ Add", use_container_width=True, key="add_webhook"):
+                    endpoint, error = webhook_registry.add(new_endpoint_name, new_endpoint_source)
+                    if error:
+                        st.error(f"❌ {error}")
+                    else:
+                        st.success(f"✅ Webhook '{endpoint['name']}' receives events at /webhooks/{endpoint['id']}")
+        
         # Webhook actions
         if grid_response['selected_rows']:
             selected_webhook = grid_response['selected_rows'][0]
+            endpoint_id = selected_webhook['Webhook ID']
             
-            st.markdown(f"### 🔗 Webhook Details: {selected_webhook['Webhook ID']}")
+            st.markdown(f"### 🔗 Webhook Details: {endpoint_id}")
             
             col1, col2, col3 = st.columns(3)
             
             with col1:
                 st.markdown('<div class="crm-card">', unsafe_allow_html=True)
                 st.markdown("#### 📋 Webhook Information")
-                st.write(f"**ID:** {selected_webhook['Webhook ID']}")
+                st.write(f"**ID:** {endpoint_id}")
                 st.write(f"**Type:** {selected_webhook['Type']}")
                 st.write(f"**Status:** {selected_webhook['Status']}")
                 st.write(f"**Endpoint:** {selected_webhook['Endpoint']}")
@@ -3093,9 +2958,8 @@ elif st.session_state.current_page == "🔗 Webhooks":
             with col2:
                 st.markdown('<div class="crm-card">', unsafe_allow_html=True)
                 st.markdown("#### 📊 Performance Metrics")
-                st.write(f"**Success Rate:** {selected_webhook['Success Rate']}")
-                st.write(f"**Daily Calls:** {selected_webhook['Daily Calls']}")
-                st.write(f"**Avg Response:** {selected_webhook['Avg Response Time']}")
+                st.write(f"**Events:** {selected_webhook['Events']}")
+                st.write(f"**Calls:** {selected_webhook['Calls']}")
                 st.write(f"**Last Triggered:** {selected_webhook['Last Triggered']}")
                 st.markdown('</div>', unsafe_allow_html=True)
             
@@ -3106,17 +2970,51 @@ elif st.session_state.current_page == "🔗 Webhooks":
                 col_a, col_b = st.columns(2)
                 with col_a:
                     if st.button("▶️ Enable", use_container_width=True):
-                        st.success("Webhook enabled!")
-                    if st.button("🔄 Test", use_container_width=True):
-                        st.info("Testing webhook...")
+                        _, error = webhook_registry.set_status(endpoint_id, 'Active')
+                        if error:
+                            st.error(f"❌ {error}")
+                        else:
+                            st.success("Webhook enabled!")
+                    test_clicked = st.button("🔄 Test", use_container_width=True)
                 
                 with col_b:
                     if st.button("⏸️ Pause", use_container_width=True):
-                        st.warning("Webhook paused!")
+                        _, error = webhook_registry.set_status(endpoint_id, 'Paused')
+                        if error:
+                            st.error(f"❌ {error}")
+                        else:
+                            st.warning("Webhook paused! The endpoint refuses events until it is enabled.")
                     if st.button("🗑️ Delete", use_container_width=True):
-                        st.error("Webhook deleted!")
+                        _, error = webhook_registry.delete(endpoint_id)
+                        if error:
+                            st.error(f"❌ {error}")
+                        else:
+                            st.error("Webhook deleted!")
                 
                 st.markdown('</div>', unsafe_allow_html=True)
+            
+            if test_clicked and endpoint_id in webhook_endpoints:
+                # A sample event through the endpoint's normalization; nothing is written to the log
+                test_event, test_row = sample_event(webhook_endpoints[endpoint_id])
+                st.info("🔄 A sample event on this endpoint becomes this call row:")
+                st.json({'event': test_event['payload'], 'call_row': test_row})
+        
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📥 Live Webhook Feed</div>', unsafe_allow_html=True)
+        
+        if webhook_feed.recent:
+            recent_df = pd.DataFrame(list(webhook_feed.recent)[::-1])
+            recent_df['received_at'] = recent_df['received_at'].map(lambda at: datetime.fromtimestamp(at).strftime('%Y-%m-%d %H:%M:%S'))
+            recent_df.columns = ['Seq', 'Source', 'Kind', 'Received']
+            st.dataframe(recent_df, use_container_width=True, hide_index=True, height=300)
+        else:
+            st.caption("No webhook events yet. Point VAPI or n8n at the endpoint above.")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        if webhook_feed.contacts:
+            st.markdown("#### 👥 Recent CRM Updates")
+            st.dataframe(pd.DataFrame(list(webhook_feed.contacts)[::-1]), use_container_width=True, hide_index=True)
     
     with webhook_tab2:
         st.markdown("### 📊 Webhook Analytics")
@@ -3469,36 +3367,32 @@ elif st.session_state.current_page == "📊 Reports":
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             st.markdown('<div class="chart-title">📤 Export All Data</div>', unsafe_allow_html=True)
             
-            export_format = st.selectbox("📄 Export Format", ['CSV', 'Excel', 'JSON', 'Parquet'])
-            export_compression = st.selectbox("🗜️ Compression", ['None', 'ZIP', 'GZIP'])
+            export_format = st.selectbox("📄 Export Format", list(EXPORT_FORMATS))
+            export_compression = st.selectbox("🗜️ Compression", list(EXPORT_COMPRESSIONS))
             include_metadata = st.checkbox("📋 Include Metadata", value=True)
             
             if st.button("📤 Export Complete Dataset", use_container_width=True):
-                with st.spinner("Preparing export..."):
-                    time_module.sleep(2)
-                    
-                    if export_format == 'CSV':
-                        export_data = df.to_csv(index=False)
-                        mime_type = "text/csv"
-                        file_ext = "csv"
-                    elif export_format == 'JSON':
-                        export_data = df.to_json(orient='records', indent=2)
-                        mime_type = "application/json"
-                        file_ext = "json"
-                    else:
-                        export_data = df.to_csv(index=False)  # Fallback to CSV
-                        mime_type = "text/csv"
-                        file_ext = "csv"
-                    
+                # Written chunk by chunk (text read from the side file per chunk) into a temporary file
+                export_progress = st.progress(0.0, text="📤 Preparing export...")
+                export, error = export_calls(
+                    call_store, df, export_format, export_compression,
+                    metadata=export_metadata(df) if include_metadata else None,
+                    file_stem=f"vapi_ai_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                    progress=lambda fraction: export_progress.progress(fraction, text=f"📤 Exporting... {fraction:.0%}")
+                )
+                
+                if error:
+                    st.error(f"❌ Export failed: {error}")
+                else:
                     st.download_button(
                         label=f"📥 Download {export_format} File",
-                        data=export_data,
-                        file_name=f"vapi_ai_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_ext}",
-                        mime=mime_type,
+                        data=export['file'],
+                        file_name=export['file_name'],
+                        mime=export['mime'],
                         use_container_width=True
                     )
                     
-                    st.success(f"✅ {len(df):,} records ready for download!")
+                    st.success(f"✅ {export['rows']:,} records ready for download! ({export['bytes'] / 1024 / 1024:.1f} MB)")
             
             st.markdown('</div>', unsafe_allow_html=True)
         
@@ -3506,17 +3400,24 @@ elif st.session_state.current_page == "📊 Reports":
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             st.markdown('<div class="chart-title">🔄 Live Data Integration</div>', unsafe_allow_html=True)
             
-            # Google Sheets export
+            # Google Sheets export: only cells changed since the last export are sent
+            full_write_back = st.checkbox("🔁 Compare Against Live Sheet", value=False,
+                                          help="Re-read the sheet and diff against it instead of the last export (use after manual edits)")
+            
             if st.button("📊 Export to Google Sheets", use_container_width=True):
                 if sheets_url and uploaded_json:
                     with st.spinner("Exporting to Google Sheets..."):
-                        json_content = uploaded_json.read().decode('utf-8')
-                        success = export_data_to_sheets(df, sheets_url, json_content)
+                        json_content = uploaded_json.getvalue().decode('utf-8')
+                        sheet_df = call_store.with_text(df)
+                        sheet_df = sheet_df[[col for col in call_store.columns if col in sheet_df.columns and col not in DERIVED_COLUMNS]]
+                        write_report = export_data_to_sheets(sheet_df, sheets_url, json_content, full=full_write_back)
                         
-                        if success:
-                            st.success("✅ Data exported to Google Sheets successfully!")
-                        else:
-                            st.error("❌ Export failed. Check your credentials and URL.")
+                        if write_report:
+                            st.success(f"✅ Data exported to Google Sheets! {write_report['changed_rows']:,} rows updated, "
+                                       f"{write_report['appended_rows']:,} added, {write_report['cleared_rows']:,} cleared")
+                            st.caption(f"📊 {write_report['cells']:,} cells in {write_report['batches']} batches, "
+                                       f"{write_report['seconds']:.1f}s ({write_report['cells_per_second']:,.0f} cells/s, "
+                                       f"{write_report['retries']} retries)")
                 else:
                     st.warning("⚠️ Please configure Google Sheets URL and credentials in the sidebar first.")
             
@@ -3549,9 +3450,9 @@ elif st.session_state.current_page == "📊 Reports":
         with col1:
             st.metric("📊 Total Records", f"{len(df):,}")
         with col2:
-            st.metric("📋 Total Columns", len(df.columns))
+            st.metric("📋 Total Columns", store_info['columns'])
         with col3:
-            file_size_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+            file_size_mb = store_info['memory_mb'] + store_info['text_mb']
             st.metric("💾 Data Size", f"{file_size_mb:.1f} MB")
         with col4:
             st.metric("📅 Date Range", f"{(pd.to_datetime(df['call_date']).max() - pd.to_datetime(df['call_date']).min()).days} days" if 'call_date' in df.columns else "N/A")
@@ -3635,60 +3536,115 @@ elif st.session_state.current_page == "📊 Reports":
 elif st.session_state.current_page == "🔴 Live Monitor":
     st.markdown('<h2 class="section-header animate-fadeIn">🔴 Real-time Operations Monitor</h2>', unsafe_allow_html=True)
     
-    # Auto-refresh functionality
-    if st.session_state.auto_refresh:
-        time_module.sleep(1)  # Small delay for demo
-        st.rerun()
+    live_channel = get_live_channel(call_store.name)
+    LIVE_FEED_ROWS = [25, 100, 250]
     
-    # Live monitoring tabs
-    monitor_tab1, monitor_tab2, monitor_tab3, monitor_tab4 = st.tabs(["🔴 Live Dashboard", "📞 Active Calls", "🌐 URL Monitor", "⚠️ Alerts"])
+    def live_snapshot():
+        """Live tile values, chart series and activities; rebuilt when the live channel publishes or the minute turns"""
+        # Tiles and volume charts read the channel's streaming windows instead of scanning call history
+        metrics = live_channel.metrics.snapshot()
+        try:
+            system_load = os.getloadavg()[0] / (os.cpu_count() or 1) * 100
+        except (AttributeError, OSError):
+            system_load = None
+        
+        return dict(metrics,
+                    version=live_channel.version,
+                    minute=int(time_module.time() // 60),
+                    system_load=system_load,
+                    activities=live_channel.activity.window(LIVE_FEED_ROWS[-1]),
+                    rendered={})
+    
+    def snapshot_rendered(snapshot, key, build):
+        """A figure or HTML block drawn from the snapshot: built on the first tick that shows it, re-emitted after that"""
+        if key not in snapshot['rendered']:
+            snapshot['rendered'][key] = build()
+        return snapshot['rendered'][key]
+    
+    def volume_figure(snapshot, volume_window):
+        if volume_window == "Last Hour":
+            bucket_times, bucket_calls = snapshot['per_minute']
+            title, y_label = "Call Volume - Last 60 Minutes", 'Calls per Minute'
+        else:
+            bucket_times, bucket_calls = snapshot['per_hour']
+            title, y_label = "Call Volume - Last 24 Hours", 'Calls per Hour'
+        
+        fig = px.line(x=[datetime.fromtimestamp(t) for t in bucket_times], y=bucket_calls,
+                    title=title,
+                    labels={'x': 'Time', 'y': y_label})
+        fig.update_layout(height=400)
+        return fig
     
-    with monitor_tab1:
-        st.markdown("### 🔴 Real-time Operations Dashboard")
+    def load_gauge(snapshot):
+        # System metrics gauge
+        fig = go.Figure()
+        
+        fig.add_trace(go.Indicator(
+            mode = "gauge+number+delta",
+            value = snapshot['system_load'] or 0,
+            domain = {'x': [0, 1], 'y': [0, 1]},
+            title = {'text': "System Load %"},
+            delta = {'reference': 70},
+            gauge = {'axis': {'range': [None, 100]},
+                    'bar': {'color': "darkblue"},
+                    'steps': [
+                        {'range': [0, 50], 'color': "lightgray"},
+                        {'range': [50, 80], 'color': "gray"}],
+                    'threshold': {'line': {'color': "red", 'width': 4},
+                                'thickness': 0.75, 'value': 90}}))
+        
+        fig.update_layout(height=400)
+        return fig
+    
+    # Only this fragment reruns while the page is open (no full-script sleep/rerun loop): each tick
+    # redraws the tiles from the session's snapshot, which is rebuilt only after new live events; the
+    # charts and feed HTML are built once per snapshot and the same objects are re-emitted on later ticks
+    @st.fragment(run_every=LIVE_TICK_SECONDS if st.session_state.auto_refresh else None)
+    def live_dashboard():
+        snapshot = st.session_state.get('live_snapshot')
+        if (snapshot is None or snapshot['version'] != live_channel.version
+                or snapshot['minute'] != int(time_module.time() // 60)):
+            snapshot = st.session_state.live_snapshot = live_snapshot()
+        
+        since = time_module.time() - live_channel.last_event_at if live_channel.last_event_at else None
+        st.caption(f"📡 {live_channel.events:,} live events" +
+                   (f" · last {since:,.0f}s ago" if since is not None else " · waiting for webhook events"))
         
         # Real-time metrics
         col1, col2, col3, col4, col5, col6 = st.columns(6)
         
         with col1:
-            active_calls = random.randint(8, 35)
-            st.metric("🔴 Active Calls", active_calls, delta=random.randint(-3, 5))
+            st.metric("🔴 Active Calls", snapshot['active_calls'])
         
         with col2:
-            queue_length = random.randint(0, 12)
-            st.metric("⏳ Queue Length", queue_length, delta=random.randint(-2, 4))
+            st.metric("⏳ Queue Length", snapshot['queue_length'])
         
         with col3:
-            available_agents = random.randint(12, 25)
-            st.metric("🤖 Available Agents", available_agents, delta=random.randint(-1, 3))
+            st.metric("📞 Calls (Last Hour)", f"{snapshot['calls_last_hour']:,}")
         
         with col4:
-            avg_wait_time = random.randint(15, 120)
-            st.metric("⚡ Avg Wait Time", f"{avg_wait_time}s", delta=f"{random.randint(-20, 30)}s")
+            avg_wait = snapshot['avg_wait_seconds']
+            st.metric("⚡ Avg Wait Time", f"{avg_wait:.0f}s" if avg_wait is not None else "N/A")
         
         with col5:
-            system_load = random.randint(35, 85)
-            st.metric("💻 System Load", f"{system_load}%", delta=f"{random.randint(-5, 10)}%")
+            system_load = snapshot['system_load']
+            st.metric("💻 System Load", f"{system_load:.0f}%" if system_load is not None else "N/A")
         
         with col6:
-            api_latency = random.randint(45, 180)
-            st.metric("🌐 API Latency", f"{api_latency}ms", delta=f"{random.randint(-20, 40)}ms")
+            api_latency = snapshot['api_latency_ms']
+            st.metric("🌐 API Latency", f"{api_latency:.0f}ms" if api_latency is not None else "N/A",
+                      help="Webhook delivery latency over the last 5 minutes (VAPI timestamp to receipt)")
         
         # Real-time charts
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.markdown('<div class="chart-title">📈 Live Call Volume (Last Hour)</div>', unsafe_allow_html=True)
-            
-            # Generate live data
-            now = datetime.now()
-            times = [now - timedelta(minutes=i) for i in range(60, 0, -1)]
-            call_volumes = [random.randint(0, 8) for _ in times]
+            volume_window = st.radio("Window", ["Last Hour", "Last Day"], horizontal=True,
+                                     key="live_volume_window", label_visibility="collapsed")
+            st.markdown(f'<div class="chart-title">📈 Live Call Volume ({volume_window})</div>', unsafe_allow_html=True)
             
-            fig = px.line(x=times, y=call_volumes,
-                        title="Call Volume - Last 60 Minutes",
-                        labels={'x': 'Time', 'y': 'Calls per Minute'})
-            fig.update_layout(height=400)
+            fig = snapshot_rendered(snapshot, ('volume', volume_window), lambda: volume_figure(snapshot, volume_window))
             st.plotly_chart(fig, use_container_width=True)
             
             st.markdown('</div>', unsafe_allow_html=True)
@@ -3697,24 +3653,7 @@ elif st.session_state.current_page == "🔴 Live Monitor":
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             st.markdown('<div class="chart-title">⚡ System Performance Metrics</div>', unsafe_allow_html=True)
             
-            # System metrics gauge
-            fig = go.Figure()
-            
-            fig.add_trace(go.Indicator(
-                mode = "gauge+number+delta",
-                value = system_load,
-                domain = {'x': [0, 1], 'y': [0, 1]},
-                title = {'text': "System Load %"},
-                delta = {'reference': 70},
-                gauge = {'axis': {'range': [None, 100]},
-                        'bar': {'color': "darkblue"},
-                        'steps': [
-                            {'range': [0, 50], 'color': "lightgray"},
-                            {'range': [50, 80], 'color': "gray"}],
-                        'threshold': {'line': {'color': "red", 'width': 4},
-                                    'thickness': 0.75, 'value': 90}}))
-            
-            fig.update_layout(height=400)
+            fig = snapshot_rendered(snapshot, 'gauge', lambda: load_gauge(snapshot))
             st.plotly_chart(fig, use_container_width=True)
             
             st.markdown('</div>', unsafe_allow_html=True)
@@ -3723,63 +3662,39 @@ elif st.session_state.current_page == "🔴 Live Monitor":
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown('<div class="chart-title">📊 Live Activity Feed</div>', unsafe_allow_html=True)
         
-        # Generate live activity data
-        activities = []
-        for i in range(10):
-            activity_time = datetime.now() - timedelta(seconds=random.randint(1, 300))
-            activity_type = random.choice(['Call Started', 'Call Ended', 'Booking Created', 'Customer Updated', 'Payment Processed'])
-            customer = f"Customer {random.randint(1, 100)}"
-            agent = random.choice(['VAPI Agent Alpha', 'VAPI Agent Beta', 'VAPI Agent Gamma'])
-            
-            activities.append({
-                'Time': activity_time.strftime('%H:%M:%S'),
-                'Type': activity_type,
-                'Customer': customer,
-                'Agent': agent,
-                'Status': random.choice(['Success', 'In Progress', 'Failed'])
-            })
-        
-        activity_df = pd.DataFrame(activities)
-        
-        # Display activity feed with color coding
-        for _, activity in activity_df.iterrows():
-            status_color = {
-                'Success': '🟢',
-                'In Progress': '🟡',
-                'Failed': '🔴'
-            }
-            
-            st.markdown(f"""
-            <div style="padding: 0.5rem; margin: 0.2rem 0; background: rgba(255,255,255,0.1); border-radius: 8px; border-left: 4px solid #6366f1;">
-                {status_color[activity['Status']]} <strong>{activity['Time']}</strong> - {activity['Type']} | {activity['Customer']} | {activity['Agent']}
-            </div>
-            """, unsafe_allow_html=True)
+        # The visible window of the channel's activity ring buffer, rendered as one element
+        feed_rows = st.selectbox("Show", LIVE_FEED_ROWS, key="live_feed_rows", label_visibility="collapsed",
+                                 format_func=lambda rows: f"Latest {rows:,} activities")
+        if len(snapshot['activities']['at']):
+            feed = snapshot_rendered(snapshot, ('feed', feed_rows), lambda: activity_html(
+                {column: values[:feed_rows] for column, values in snapshot['activities'].items()}))
+            st.markdown(feed, unsafe_allow_html=True)
+        else:
+            st.caption("No live activity yet. Calls and CRM updates appear here as webhooks arrive.")
         
         st.markdown('</div>', unsafe_allow_html=True)
     
+    # Live monitoring tabs
+    monitor_tab1, monitor_tab2, monitor_tab3, monitor_tab4 = st.tabs(["🔴 Live Dashboard", "📞 Active Calls", "🌐 URL Monitor", "⚠️ Alerts"])
+    
+    with monitor_tab1:
+        st.markdown("### 🔴 Real-time Operations Dashboard")
+        live_dashboard()
+    
     with monitor_tab2:
         st.markdown("### 📞 Active Calls Monitor")
         
-        # Generate active calls data
-        active_calls_data = []
-        for i in range(random.randint(5, 15)):
-            call_start = datetime.now() - timedelta(seconds=random.randint(30, 1800))
-            duration = (datetime.now() - call_start).total_seconds()
-            
-            active_calls_data.append({
-                'Call ID': f'LIVE-{1000+i:04d}',
-                'Customer': f'Customer {random.randint(1, 500)}',
-                'Phone': f'+1-{random.randint(200,999)}-{random.randint(100,999)}-{random.randint(1000,9999)}',
-                'Agent': random.choice(['VAPI Agent Alpha', 'VAPI Agent Beta', 'VAPI Agent Gamma', 'VAPI Agent Delta']),
-                'Start Time': call_start.strftime('%H:%M:%S'),
-                'Duration': f"{int(duration//60):02d}:{int(duration%60):02d}",
-                'Status': random.choice(['Connected', 'Ringing', 'On Hold', 'Transferring']),
-                'Intent': random.choice(['Booking', 'Support', 'Sales', 'Information']),
-                'Sentiment': random.choice(['Positive', 'Neutral', 'Negative']),
-                'Quality': random.choice(['Excellent', 'Good', 'Fair', 'Poor'])
-            })
-        
-        active_calls_df = pd.DataFrame(active_calls_data)
+        # Calls the live channel has seen queue or connect and not yet end
+        active_calls_df = pd.DataFrame([{
+            'Call ID': call['call_id'],
+            'Customer': call['customer_name'] or 'Unknown',
+            'Phone': call['phone_number'] or '',
+            'Agent': call['voice_agent_name'] or '',
+            'Start Time': datetime.fromtimestamp(call['started_at']).strftime('%H:%M:%S'),
+            'Duration (s)': round(call['seconds']),
+            'Duration': f"{int(call['seconds'] // 60):02d}:{int(call['seconds'] % 60):02d}",
+            'Status': call['status']
+        } for call in live_channel.metrics.live_calls()])
         
         # Active calls metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -3787,66 +3702,66 @@ elif st.session_state.current_page == "🔴 Live Monitor":
         with col1:
             st.metric("📞 Total Active", len(active_calls_df))
         with col2:
-            avg_duration = active_calls_df['Duration'].apply(lambda x: int(x.split(':')[0]) * 60 + int(x.split(':')[1])).mean()
+            avg_duration = active_calls_df['Duration (s)'].mean() if len(active_calls_df) else 0
             st.metric("⏱️ Avg Duration", f"{int(avg_duration//60):02d}:{int(avg_duration%60):02d}")
         with col3:
-            connected_calls = (active_calls_df['Status'] == 'Connected').sum()
+            connected_calls = (active_calls_df['Status'] == 'Connected').sum() if len(active_calls_df) else 0
             st.metric("✅ Connected", connected_calls)
         with col4:
-            positive_sentiment = (active_calls_df['Sentiment'] == 'Positive').sum()
-            st.metric("😊 Positive Sentiment", positive_sentiment)
+            queued_calls = (active_calls_df['Status'] == 'Queued').sum() if len(active_calls_df) else 0
+            st.metric("⏳ Queued", queued_calls)
         
-        # Active calls grid
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📞 Live Calls Grid</div>', unsafe_allow_html=True)
+        if active_calls_df.empty:
+            st.info("📞 No calls in progress. Live calls appear here as VAPI webhooks arrive.")
+        else:
+            # Active calls grid
+            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+            st.markdown('<div class="chart-title">📞 Live Calls Grid</div>', unsafe_allow_html=True)
         
-        grid_response_active = create_enhanced_ag_grid(active_calls_df, "active_calls_grid", height=400, enable_enterprise=True)
+            grid_response_active = create_enhanced_ag_grid(active_calls_df, "active_calls_grid", height=400, enable_enterprise=True)
         
-        st.markdown('</div>', unsafe_allow_html=True)
+            st.markdown('</div>', unsafe_allow_html=True)
         
-        # Call details
-        if grid_response_active['selected_rows']:
-            selected_call = grid_response_active['selected_rows'][0]
+            # Call details
+            if grid_response_active['selected_rows']:
+                selected_call = grid_response_active['selected_rows'][0]
             
-            st.markdown(f"### 📞 Live Call Details: {selected_call['Call ID']}")
+                st.markdown(f"### 📞 Live Call Details: {selected_call['Call ID']}")
             
-            col1, col2, col3 = st.columns(3)
+                col1, col2, col3 = st.columns(3)
             
-            with col1:
-                st.markdown('<div class="crm-card">', unsafe_allow_html=True)
-                st.markdown("#### 📋 Call Information")
-                st.write(f"**Call ID:** {selected_call['Call ID']}")
-                st.write(f"**Customer:** {selected_call['Customer']}")
-                st.write(f"**Phone:** {selected_call['Phone']}")
-                st.write(f"**Agent:** {selected_call['Agent']}")
-                st.markdown('</div>', unsafe_allow_html=True)
+                with col1:
+                    st.markdown('<div class="crm-card">', unsafe_allow_html=True)
+                    st.markdown("#### 📋 Call Information")
+                    st.write(f"**Call ID:** {selected_call['Call ID']}")
+                    st.write(f"**Customer:** {selected_call['Customer']}")
+                    st.write(f"**Phone:** {selected_call['Phone']}")
+                    st.write(f"**Agent:** {selected_call['Agent']}")
+                    st.markdown('</div>', unsafe_allow_html=True)
             
-            with col2:
-                st.markdown('<div class="crm-card">', unsafe_allow_html=True)
-                st.markdown("#### ⏱️ Call Status")
-                st.write(f"**Status:** {selected_call['Status']}")
-                st.write(f"**Start Time:** {selected_call['Start Time']}")
-                st.write(f"**Duration:** {selected_call['Duration']}")
-                st.write(f"**Intent:** {selected_call['Intent']}")
-                st.markdown('</div>', unsafe_allow_html=True)
+                with col2:
+                    st.markdown('<div class="crm-card">', unsafe_allow_html=True)
+                    st.markdown("#### ⏱️ Call Status")
+                    st.write(f"**Status:** {selected_call['Status']}")
+                    st.write(f"**Start Time:** {selected_call['Start Time']}")
+                    st.write(f"**Duration:** {selected_call['Duration']}")
+                    st.markdown('</div>', unsafe_allow_html=True)
             
-            with col3:
-                st.markdown('<div class="crm-card">', unsafe_allow_html=True)
-                st.markdown("#### 📊 Call Quality")
-                st.write(f"**Sentiment:** {selected_call['Sentiment']}")
-                st.write(f"**Quality:** {selected_call['Quality']}")
+                with col3:
+                    st.markdown('<div class="crm-card">', unsafe_allow_html=True)
+                    st.markdown("#### 🎛️ Call Actions")
                 
-                # Call actions
-                col_a, col_b = st.columns(2)
-                with col_a:
-                    if st.button("🎧 Listen In", use_container_width=True):
-                        st.info("🎧 Listening to call...")
+                    # Call actions
+                    col_a, col_b = st.columns(2)
+                    with col_a:
+                        if st.button("🎧 Listen In", use_container_width=True):
+                            st.info("🎧 Listening to call...")
                 
-                with col_b:
-                    if st.button("📝 Add Note", use_container_width=True):
-                        st.success("📝 Note added!")
+                    with col_b:
+                        if st.button("📝 Add Note", use_container_width=True):
+                            st.success("📝 Note added!")
                 
-                st.markdown('</div>', unsafe_allow_html=True)
+                    st.markdown('</div>', unsafe_allow_html=True)
     
     with monitor_tab3:
         st.markdown("### 🌐 URL & Service Monitor")
@@ -3882,17 +3797,22 @@ elif st.session_state.current_page == "🔴 Live Monitor":
         
         all_urls = default_urls + [item['url'] for item in st.session_state.live_urls]
         
-        # Monitor URLs
-        url_status_data = []
+        # URLs are probed in the background for as long as a session keeps viewing them; the page only reads the latest cached results
+        url_prober = get_url_prober()
         for url in all_urls:
-            status_info = monitor_live_url(url)
+            url_prober.watch(url, st.session_state.monitor_watcher)
+        
+        url_status_data = []
+        for status_info in url_prober.status(all_urls):
+            uptime = url_prober.uptime(status_info['url'])
             url_status_data.append({
-                'URL': url,
+                'URL': status_info['url'],
                 'Status': status_info['status'],
                 'Status Code': status_info['status_code'],
                 'Response Time': f"{status_info['response_time']:.3f}s" if status_info['response_time'] > 0 else "N/A",
-                'Last Check': status_info['timestamp'],
-                'Health': '🟢 Online' if status_info['status'] == 'online' else '🔴 Offline'
+                'Uptime': f"{uptime * 100:.1f}%" if uptime is not None else "N/A",
+                'Last Check': status_info['timestamp'] or "Pending",
+                'Health': {'online': '🟢 Online', 'pending': '⏳ Checking'}.get(status_info['status'], '🔴 Offline')
             })
         
         url_df = pd.DataFrame(url_status_data)
@@ -3905,16 +3825,17 @@ elif st.session_state.current_page == "🔴 Live Monitor":
             st.metric("🟢 Online", online_count)
         
         with col2:
-            offline_count = (url_df['Status'] != 'online').sum()
+            offline_count = (~url_df['Status'].isin(['online', 'pending'])).sum()
             st.metric("🔴 Offline", offline_count)
         
         with col3:
-            avg_response_time = url_df['Response Time'].apply(lambda x: float(x.replace('s', '')) if x != 'N/A' else 0).mean()
-            st.metric("⚡ Avg Response", f"{avg_response_time:.3f}s")
+            response_times = url_df['Response Time'][url_df['Response Time'] != 'N/A'].str.rstrip('s').astype(float)
+            st.metric("⚡ Avg Response", f"{response_times.mean():.3f}s" if len(response_times) else "N/A")
         
         with col4:
-            uptime_percentage = (online_count / len(url_df) * 100) if len(url_df) > 0 else 0
-            st.metric("📊 Uptime", f"{uptime_percentage:.1f}%")
+            # Uptime over each URL's rolling probe history, not just the latest check
+            uptimes = [uptime for uptime in (url_prober.uptime(url) for url in all_urls) if uptime is not None]
+            st.metric("📊 Uptime", f"{sum(uptimes) / len(uptimes) * 100:.1f}%" if uptimes else "N/A")
         
         # URL status grid
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
@@ -3948,16 +3869,43 @@ elif st.session_state.current_page == "🔴 Live Monitor":
                 
                 if st.button("🔄 Check Now", use_container_width=True):
                     with st.spinner("Checking URL..."):
-                        time_module.sleep(1)
-                        st.success("✅ URL checked successfully!")
+                        result = url_prober.check_now(selected_url['URL'], st.session_state.monitor_watcher)
+                    if result and result['status'] == 'online':
+                        st.success(f"✅ Online ({result['status_code']}) in {result['response_time']:.3f}s")
+                    else:
+                        st.error(f"❌ {(result or {}).get('error') or (result or {}).get('status_code') or 'No response'}")
                 
-                if st.button("📊 View History", use_container_width=True):
-                    st.info("📊 Showing URL history...")
+                show_history = st.button("📊 View History", use_container_width=True)
                 
                 if st.button("🗑️ Remove URL", use_container_width=True):
-                    st.warning("🗑️ URL removed from monitoring")
+                    if selected_url['URL'] in default_urls:
+                        st.warning("⚠️ Default service URLs are always monitored")
+                    else:
+                        st.session_state.live_urls = [item for item in st.session_state.live_urls if item['url'] != selected_url['URL']]
+                        url_prober.unwatch(selected_url['URL'], st.session_state.monitor_watcher)
+                        st.warning("🗑️ URL removed from monitoring")
                 
                 st.markdown('</div>', unsafe_allow_html=True)
+            
+            if show_history:
+                history = url_prober.history_frame(selected_url['URL'])
+                if history.empty:
+                    st.info("📊 No checks recorded yet for this URL")
+                else:
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("📊 Checks", len(history))
+                    with col2:
+                        st.metric("🟢 Uptime", f"{history['online'].mean() * 100:.1f}%")
+                    with col3:
+                        online_times = history.loc[history['online'], 'response_time']
+                        st.metric("⚡ p95 Latency", f"{online_times.quantile(0.95):.3f}s" if len(online_times) else "N/A")
+                    
+                    fig = px.line(history, x='checked_at', y='response_time', markers=True,
+                                  title=f"Response Time History - {selected_url['URL']}",
+                                  labels={'checked_at': 'Checked At', 'response_time': 'Response Time (s)'})
+                    fig.update_layout(height=300)
+                    st.plotly_chart(fig, use_container_width=True)
     
     with monitor_tab4:
         st.markdown("### ⚠️ System Alerts & Notifications")
@@ -4066,81 +4014,114 @@ elif st.session_state.current_page == "📋 Data Management":
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             st.markdown('<div class="chart-title">📥 Data Import</div>', unsafe_allow_html=True)
             
+            # Report of the last import, kept across the rerun that picks up the new data
+            last_import = st.session_state.pop('last_import', None)
+            if last_import:
+                st.success(f"✅ Imported {last_import['rows_imported']:,} of {last_import['rows_read']:,} rows from "
+                           f"{last_import['file']} in {last_import['seconds']:.1f}s ({last_import['chunks']} chunks)")
+                invalid_numbers = sum(last_import['invalid_numbers'].values())
+                if last_import['rejected_rows']:
+                    st.warning(f"⚠️ {last_import['rejected_rows']:,} rows without a call_id were skipped")
+                if invalid_numbers:
+                    st.warning(f"⚠️ {invalid_numbers:,} values could not be read as numbers and were set to 0: "
+                               + ", ".join(f"{col} ({count:,})" for col, count in last_import['invalid_numbers'].items()))
+                if last_import['invalid_dates']:
+                    st.warning(f"⚠️ {last_import['invalid_dates']:,} rows have a call_date that could not be parsed")
+                if last_import['persisted'] is False:
+                    st.warning("⚠️ The import is loaded but could not be saved to the local cache; it will be reloaded from the source after a restart")
+                if last_import['new_columns']:
+                    st.info(f"🆕 New columns: {', '.join(last_import['new_columns'])}")
+                if last_import['mode'] == 'upsert':
+                    st.info(f"🔄 {last_import['updated']:,} calls updated, {last_import['inserted']:,} added, "
+                            f"{last_import['unchanged']:,} unchanged")
+                if last_import['backup']:
+                    st.info(f"💾 Previous data backed up as {last_import['backup']}")
+                if last_import['notify']:
+                    st.success("📧 Import notification sent to team")
+            
             # File upload
             uploaded_file = st.file_uploader(
                 "📁 Upload Data File",
-                type=['csv', 'xlsx', 'json', 'parquet'],
-                help="Supported formats: CSV, Excel, JSON, Parquet"
+                type=['csv', 'xlsx', 'json', 'jsonl', 'parquet'],
+                help="Supported formats: CSV, Excel, JSON / JSON Lines, Parquet. Files are read in chunks, so large exports import without loading them whole."
             )
             
             if uploaded_file:
-                try:
-                    # Determine file type and load accordingly
-                    file_extension = uploaded_file.name.split('.')[-1].lower()
+                # Only the first rows are parsed until the import runs
+                preview_df, error = preview_upload(uploaded_file, uploaded_file.name)
+                
+                if error:
+                    st.error(f"❌ Error loading file: {error}")
+                else:
+                    st.success(f"✅ File ready: {uploaded_file.name} ({uploaded_file.size / 1024 / 1024:.1f} MB)")
                     
-                    if file_extension == 'csv':
-                        import_df = pd.read_csv(uploaded_file)
-                    elif file_extension in ['xlsx', 'xls']:
-                        import_df = pd.read_excel(uploaded_file)
-                    elif file_extension == 'json':
-                        import_df = pd.read_json(uploaded_file)
-                    elif file_extension == 'parquet':
-                        import_df = pd.read_parquet(uploaded_file)
-                    else:
-                        st.error("❌ Unsupported file format")
-                        import_df = None
+                    # Data preview
+                    st.markdown("#### 👀 Data Preview")
+                    st.dataframe(preview_df, use_container_width=True)
                     
-                    if import_df is not None:
-                        st.success(f"✅ File loaded successfully! {len(import_df)} rows, {len(import_df.columns)} columns")
-                        
-                        # Data preview
-                        st.markdown("#### 👀 Data Preview")
-                        st.dataframe(import_df.head(), use_container_width=True)
-                        
-                        # Data validation
-                        st.markdown("#### ✅ Data Validation")
-                        col_a, col_b, col_c = st.columns(3)
-                        
-                        with col_a:
-                            st.metric("📊 Rows", len(import_df))
-                        with col_b:
-                            st.metric("📋 Columns", len(import_df.columns))
-                        with col_c:
-                            missing_values = import_df.isnull().sum().sum()
-                            st.metric("❓ Missing Values", missing_values)
-                        
-                        # Import options
-                        st.markdown("#### ⚙️ Import Options")
-                        
-                        col_a, col_b = st.columns(2)
+                    # Schema check on the header; rows are validated chunk by chunk during the import
+                    st.markdown("#### ✅ Data Validation")
+                    col_a, col_b, col_c = st.columns(3)
+                    
+                    with col_a:
+                        st.metric("📦 File Size", f"{uploaded_file.size / 1024 / 1024:.1f} MB")
+                    with col_b:
+                        st.metric("📋 Columns", len(preview_df.columns))
+                    with col_c:
+                        known_columns = SCHEMA_COLUMNS | set(call_store.columns)
+                        st.metric("🧩 Schema Columns", sum(col in known_columns for col in preview_df.columns))
+                    
+                    # Import options
+                    st.markdown("#### ⚙️ Import Options")
+                    
+                    col_a, col_b = st.columns(2)
+                    
+                    with col_a:
+                        import_mode = st.selectbox("📋 Import Mode", 
+                                                 list(IMPORT_MODES))
+                        validate_data = st.checkbox("✅ Validate Data", value=True)
+                    
+                    with col_b:
+                        backup_existing = st.checkbox("💾 Backup Existing Data", value=True)
+                        send_notification = st.checkbox("📧 Send Import Notification", value=False)
+                    
+                    if call_store.name.startswith('sheets_'):
+                        st.caption("ℹ️ Google Sheets sources are re-synced from the sheet; imported rows last until its next full sync.")
+                    
+                    # Import button
+                    if st.button("📥 Import Data", use_container_width=True):
+                        import_progress = st.progress(0.0, text="📥 Importing...")
                         
-                        with col_a:
-                            import_mode = st.selectbox("📋 Import Mode", 
-                                                     ['Replace All Data', 'Append to Existing', 'Update Existing'])
-                            validate_data = st.checkbox("✅ Validate Data", value=True)
+                        def show_import_progress(fraction, report):
+                            import_progress.progress(fraction, text=f"📥 {report['rows_imported']:,} rows imported ({report['chunks']} chunks)")
                         
-                        with col_b:
-                            backup_existing = st.checkbox("💾 Backup Existing Data", value=True)
-                            send_notification = st.checkbox("📧 Send Import Notification", value=False)
+                        report, error = import_upload(call_store, uploaded_file, uploaded_file.name,
+                                                      mode=IMPORT_MODES[import_mode], validate=validate_data,
+                                                      progress=show_import_progress, backup=backup_existing)
                         
-                        # Import button
-                        if st.button("📥 Import Data", use_container_width=True):
-                            with st.spinner("Importing data..."):
-                                time_module.sleep(2)  # Simulate import process
-                                
-                                if validate_data:
-                                    st.info("✅ Data validation completed")
-                                
-                                if backup_existing:
-                                    st.info("💾 Existing data backed up")
-                                
-                                st.success(f"✅ Data imported successfully! {len(import_df)} records processed.")
-                                
-                                if send_notification:
-                                    st.success("📧 Import notification sent to team")
-                
-                except Exception as e:
-                    st.error(f"❌ Error loading file: {str(e)}")
+                        if error:
+                            st.error(f"❌ Import failed: {error}")
+                        else:
+                            st.session_state['last_import'] = dict(report, file=uploaded_file.name, notify=send_notification,
+                                                                   mode=IMPORT_MODES[import_mode])
+                            st.rerun()
+            
+            # Change log of the store's recent writes
+            if call_store.change_log:
+                with st.expander("📜 Recent Data Changes"):
+                    st.dataframe(pd.DataFrame([
+                        {'Version': entry['version'], 'Time': entry['at'], 'Mode': entry['mode'],
+                         'Rows': entry['rows'], 'Added': entry['inserted'], 'Updated': entry['updated'],
+                         'Columns Changed': ", ".join(f"{col} ({count:,})" for col, count in entry['columns'].items()),
+                         'Backup': entry['backup'] or ''}
+                        for entry in reversed(call_store.change_log)
+                    ]), use_container_width=True, hide_index=True)
+                    
+                    latest = call_store.change_log[-1]
+                    if latest['changes']:
+                        st.markdown(f"**🔍 Changed values in version {latest['version']}**"
+                                    + (" (sample)" if latest['truncated'] else ""))
+                        st.dataframe(pd.DataFrame(latest['changes']).astype(str), use_container_width=True, hide_index=True)
             
             st.markdown('</div>', unsafe_allow_html=True)
         
@@ -4149,8 +4130,7 @@ elif st.session_state.current_page == "📋 Data Management":
             st.markdown('<div class="chart-title">📤 Data Export</div>', unsafe_allow_html=True)
             
             # Export configuration
-            export_format = st.selectbox("📄 Export Format", 
-                                       ['CSV', 'Excel', 'JSON', 'Parquet', 'SQL'])
+            export_format = st.selectbox("📄 Export Format", list(EXPORT_FORMATS))
             
             export_scope = st.selectbox("📊 Export Scope", 
                                       ['All Data', 'Filtered Data', 'Selected Columns', 'Date Range'])
@@ -4162,7 +4142,7 @@ elif st.session_state.current_page == "📋 Data Management":
             
             if export_scope == 'Selected Columns':
                 selected_columns = st.multiselect("📋 Select Columns", 
-                                                 df.columns.tolist(),
+                                                 df.columns.tolist() + call_store.text_columns,
                                                  default=df.columns.tolist()[:5])
             
             # Export options
@@ -4171,43 +4151,37 @@ elif st.session_state.current_page == "📋 Data Management":
             
             # Export button
             if st.button("📤 Export Data", use_container_width=True):
-                with st.spinner("Preparing export..."):
-                    time_module.sleep(2)
-                    
-                    # Prepare export data based on scope
-                    export_df = df.copy()
-                    
-                    if export_scope == 'Date Range' and 'call_date' in df.columns:
-                        export_df = export_df[
-                            (pd.to_datetime(export_df['call_date']).dt.date >= export_date_range[0]) &
-                            (pd.to_datetime(export_df['call_date']).dt.date <= export_date_range[1])
-                        ]
-                    elif export_scope == 'Selected Columns':
-                        export_df = export_df[selected_columns]
-                    
-                    # Generate export file
-                    if export_format == 'CSV':
-                        export_data = export_df.to_csv(index=False)
-                        mime_type = "text/csv"
-                        file_ext = "csv"
-                    elif export_format == 'JSON':
-                        export_data = export_df.to_json(orient='records', indent=2)
-                        mime_type = "application/json"
-                        file_ext = "json"
-                    else:
-                        export_data = export_df.to_csv(index=False)
-                        mime_type = "text/csv"
-                        file_ext = "csv"
-                    
+                # Scope is applied to the narrow frame; text columns are only read for exported rows
+                export_df = df
+                export_selection = None
+                
+                if export_scope == 'Date Range' and 'call_date' in df.columns and len(export_date_range) == 2:
+                    export_days = pd.to_datetime(df['call_date'], errors='coerce').dt.date
+                    export_df = df[(export_days >= export_date_range[0]) & (export_days <= export_date_range[1])]
+                elif export_scope == 'Selected Columns':
+                    export_selection = selected_columns
+                
+                export_progress = st.progress(0.0, text="📤 Preparing export...")
+                export, error = export_calls(
+                    call_store, export_df, export_format, 'ZIP' if compress_file else 'None',
+                    columns=export_selection,
+                    metadata=export_metadata(export_df) if include_metadata else None,
+                    file_stem=f"vapi_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                    progress=lambda fraction: export_progress.progress(fraction, text=f"📤 Exporting... {fraction:.0%}")
+                )
+                
+                if error:
+                    st.error(f"❌ Export failed: {error}")
+                else:
                     st.download_button(
                         label=f"📥 Download {export_format} File",
-                        data=export_data,
-                        file_name=f"vapi_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_ext}",
-                        mime=mime_type,
+                        data=export['file'],
+                        file_name=export['file_name'],
+                        mime=export['mime'],
                         use_container_width=True
                     )
                     
-                    st.success(f"✅ Export ready! {len(export_df)} records, {len(export_df.columns)} columns")
+                    st.success(f"✅ Export ready! {export['rows']:,} records, {export['columns']} columns")
             
             st.markdown('</div>', unsafe_allow_html=True)
     
@@ -4456,10 +4430,10 @@ elif st.session_state.current_page == "📋 Data Management":
         
         if analysis_type == 'Trend Analysis' and 'call_date' in df.columns:
             # Time series analysis
-            daily_trends = df.groupby('call_date').agg({
+            daily_trends = rollup_cube.query('call_date', {
                 'call_id': 'count',
                 'customer_satisfaction': 'mean'
-            }).reset_index()
+            })
             
             fig = make_subplots(specs=[[{"secondary_y": True}]])
             fig.add_trace(
@@ -4499,16 +4473,17 @@ elif st.session_state.current_page == "📋 Data Management":
     with data_tab5:
         st.markdown("### 🗄️ Data Archive & Backup")
         
+        store_backups = call_store.backups()
+        
         # Archive metrics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.metric("🗄️ Archived Records", f"{random.randint(5000, 15000):,}")
         with col2:
-            st.metric("💾 Backup Size", f"{random.randint(500, 2000)} MB")
+            st.metric("💾 Backup Size", f"{sum(item['size_mb'] for item in store_backups):.1f} MB")
         with col3:
-            last_backup = datetime.now() - timedelta(hours=random.randint(1, 24))
-            st.metric("⏰ Last Backup", last_backup.strftime('%H:%M'))
+            st.metric("⏰ Last Backup", store_backups[0]['created'][:16].replace('T', ' ') if store_backups else "Never")
         with col4:
             st.metric("🔄 Retention Period", "90 days")
         
@@ -4549,9 +4524,12 @@ elif st.session_state.current_page == "📋 Data Management":
             
             if st.button("💾 Create Backup", use_container_width=True):
                 with st.spinner("Creating backup..."):
-                    time_module.sleep(3)
-                    backup_size = random.randint(100, 500)
-                    st.success(f"✅ Backup created successfully! Size: {backup_size} MB")
+                    backup_name = call_store.backup()
+                if backup_name:
+                    st.success(f"✅ Backup created successfully: {backup_name}")
+                    st.rerun()
+                else:
+                    st.error("❌ Backup failed - no data loaded or the backup could not be written")
             
             st.markdown('</div>', unsafe_allow_html=True)
         
@@ -4559,21 +4537,26 @@ elif st.session_state.current_page == "📋 Data Management":
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         st.markdown('<div class="chart-title">📋 Backup History</div>', unsafe_allow_html=True)
         
-        backup_history = []
-        for i in range(10):
-            backup_time = datetime.now() - timedelta(days=i)
-            backup_history.append({
-                'Date': backup_time.strftime('%Y-%m-%d'),
-                'Time': backup_time.strftime('%H:%M'),
-                'Type': random.choice(['Full', 'Incremental', 'Differential']),
-                'Size (MB)': random.randint(100, 800),
-                'Status': random.choice(['Success', 'Failed', 'Partial']),
-                'Location': random.choice(['Local', 'Cloud', 'Both'])
-            })
-        
-        backup_df = pd.DataFrame(backup_history)
-        
-        grid_response_backup = create_enhanced_ag_grid(backup_df, "backup_history_grid", height=300)
+        if store_backups:
+            backup_df = pd.DataFrame([
+                {'Backup': item['name'], 'Created': item['created'].replace('T', ' '),
+                 'Rows': item['rows'], 'Size (MB)': round(item['size_mb'], 2)}
+                for item in store_backups
+            ])
+            
+            grid_response_backup = create_enhanced_ag_grid(backup_df, "backup_history_grid", height=300)
+            
+            restore_name = st.selectbox("♻️ Backup to Restore", [item['name'] for item in store_backups])
+            if st.button("♻️ Restore Backup", use_container_width=True):
+                with st.spinner("Restoring backup..."):
+                    entry, error = call_store.restore_backup(restore_name)
+                if error:
+                    st.error(f"❌ Restore failed: {error}")
+                else:
+                    st.success(f"✅ Restored {entry['rows']:,} rows from {restore_name}")
+                    st.rerun()
+        else:
+            st.info("💾 No backups yet. Create one above, or tick 💾 Backup Existing Data when importing.")
         
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -4944,6 +4927,13 @@ elif st.session_state.current_page == "⚙️ Settings":
         with col6:
             st.metric("📊 Active Connections", random.randint(5, 50))
         
+        with st.expander("⏱️ Grid Build Timings"):
+            st.dataframe(grid_build_timings(), use_container_width=True)
+        
+        with st.expander("🧮 Dataset Cache"):
+            st.caption(f"{dataset_registry.total_bytes() / 1024 / 1024:.1f} MB of {dataset_registry.max_bytes / 1024 / 1024:.0f} MB · {dataset_registry.evictions} evictions")
+            st.dataframe(dataset_registry.stats(), use_container_width=True)
+        
         st.markdown('</div>', unsafe_allow_html=True)
         
         # System actions
@@ -4958,6 +4948,7 @@ elif st.session_state.current_page == "⚙️ Settings":
         
         with col2:
             if st.button("🧹 Clear Cache", use_container_width=True):
+                dataset_registry.clear()
                 st.success("✅ Cache cleared successfully!")
         
         with col3:
@@ -4988,29 +4979,27 @@ if st.session_state.current_page == "⚙️ Settings":
 # AUTO-REFRESH FUNCTIONALITY
 #######################################
 
-# Auto-refresh implementation
+# Auto-refresh implementation: instead of sleeping and rerunning the whole script every second to
+# count down, a small fragment wakes every refresh interval and reruns the app only when there is
+# something new - the shared store changed (webhook calls, another session's import) or the page
+# reads a Google Sheet, which is only re-synced by a rerun
 if st.session_state.auto_refresh and st.session_state.real_time_mode:
-    # Add auto-refresh placeholder
-    refresh_placeholder = st.empty()
-    
-    # Auto-refresh countdown
-    if st.session_state.refresh_interval > 0:
-        with refresh_placeholder.container():
-            st.markdown(f"""
-            <div style="position: fixed; top: 10px; right: 10px; background: rgba(99, 102, 241, 0.9); 
-                        color: white; padding: 0.5rem 1rem; border-radius: 10px; z-index: 1000;">
-                <span class="live-indicator"></span>Auto-refresh in {st.session_state.refresh_interval}s
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Auto-refresh timer
-        time_module.sleep(1)
-        if st.session_state.refresh_interval > 1:
-            st.session_state.refresh_interval -= 1
-            st.rerun()
-        else:
-            st.session_state.refresh_interval = st.session_state.get('original_refresh_interval', 30)
+    # A full run is itself a refresh
+    st.session_state.auto_refresh_at = time_module.time()
+    
+    @st.fragment(run_every=st.session_state.refresh_interval)
+    def auto_refresh_watch():
+        sheet_due = sheets_url and time_module.time() - st.session_state.auto_refresh_at >= st.session_state.refresh_interval - 0.5
+        if call_store.version != dataset_version[1] or sheet_due:
             st.rerun()
+        st.markdown(f"""
+        <div style="position: fixed; top: 10px; right: 10px; background: rgba(99, 102, 241, 0.9); 
+                    color: white; padding: 0.5rem 1rem; border-radius: 10px; z-index: 1000;">
+            <span class="live-indicator"></span>Live · checking every {st.session_state.refresh_interval}s
+        </div>
+        """, unsafe_allow_html=True)
+    
+    auto_refresh_watch()
 
 #######################################
 # FOOTER
@@ -5125,7 +5114,8 @@ if st.session_state.get('debug_mode', False):
             "session_state": dict(st.session_state),
             "data_shape": df.shape,
             "data_columns": df.columns.tolist(),
-            "memory_usage": f"{df.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MB",
+            "memory_usage": f"{store_info['memory_mb']:.2f} MB",
+            "text_on_disk": f"{store_info['text_mb']:.2f} MB",
             "current_page": st.session_state.current_page,
             "timestamp": datetime.now().isoformat()
         })
@@ -9,15 +9,24 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode, JsCode
-import gspread
-from google.oauth2.service_account import Credentials
-import json
 import io
 from datetime import datetime, timedelta
 import numpy as np
 import os
+import random
 import re
 import time
+from aiva_call_store import get_call_store, DatePartitions, date_window, TEXT_COLUMNS
+from aiva_analytics import KPIEngine, CALL_KPIS, rollup
+from aiva_calendar import CallIntervalIndex
+from aiva_datasets import get_dataset_registry, content_hash, SOURCE_TTLS
+from aiva_filters import FilterIndex
+from aiva_search import get_transcript_index, parse_query, highlight_snippet
+from aiva_grid import (SERVER_SIDE_ROW_THRESHOLD, server_side_page, configure_server_side_options, server_side_response,
+                       cached_grid_options, refresh_set_filter_values, grid_build_timings)
+from aiva_sheets import extract_sheet_id, open_google_worksheet, sync_call_store, PublicSheetReader, WorksheetReader
+from aiva_live import LIVE_TICK_SECONDS, get_live_channel
+from aiva_webhooks import get_webhook_feed
 
 def create_kpi_card(title, value, delta, delta_type):
     """Creates a styled KPI card with optional delta indicator."""
@@ -451,7 +460,7 @@ if 'current_page' not in st.session_state:
     st.session_state.current_page = 'Dashboard'
 
 # Navigation menu
-nav_options = ['Dashboard', 'Call Analytics', 'Agent Performance', 'Client Profiles', 'Reports', 'Real-time Monitor', 'Calendar']
+nav_options = ['Dashboard', 'Call Analytics', 'Agent Performance', 'Client Profiles', 'Reports', 'Real-time Monitor', 'Calendar', 'Transcript Search']
 
 # Create navigation buttons
 st.markdown('<div class="nav-container">', unsafe_allow_html=True)
@@ -472,6 +481,9 @@ st.markdown('</div>', unsafe_allow_html=True)
 # SIDEBAR CONFIGURATION
 #######################################
 
+# Process-wide cache of loaded sources and their derived results
+dataset_registry = get_dataset_registry()
+
 with st.sidebar:
     st.markdown("### 🔧 Advanced Configuration")
     
@@ -500,15 +512,15 @@ with st.sidebar:
     auto_refresh = st.checkbox("Auto-refresh data", value=True, help="Automatically refresh data every 5 minutes")
     
     if st.button("🔄 Refresh Now", use_container_width=True):
-        st.cache_data.clear()
+        # Reload only the active source; other datasets and their derived results stay cached
+        st.session_state.refresh_dataset = True
         st.rerun()
     
     # CSV Template Download
     st.markdown("#### 📄 CSV Template & Backup")
     
     # Load demo data for template
-    @st.cache_data
-    def load_demo_data():
+    def read_demo_data():
         try:
             # Try enhanced data first
             enhanced_path = '/home/ubuntu/ai_call_center_dashboard/ai_call_center_dashboard/enhanced_call_data.csv'
@@ -522,7 +534,11 @@ with st.sidebar:
         except:
             return pd.DataFrame()
     
-    demo_df = load_demo_data()
+    def load_demo_data():
+        """Demo call data, read once per process through the dataset registry"""
+        return dataset_registry.load('demo_csv', read_demo_data, ttl=SOURCE_TTLS['demo'])
+    
+    demo_df, _ = load_demo_data()
     if not demo_df.empty:
         csv_template = demo_df.to_csv(index=False)
         st.download_button(
@@ -548,6 +564,13 @@ with st.sidebar:
     show_charts = st.checkbox("Show KPI Charts", value=True, help="Display charts for each KPI metric")
     show_advanced_metrics = st.checkbox("Show Advanced Metrics", value=True, help="Display additional performance metrics")
     
+    if show_advanced_metrics:
+        with st.expander("⏱️ Grid Build Timings"):
+            st.dataframe(grid_build_timings(), use_container_width=True)
+        with st.expander("🧮 Dataset Cache"):
+            st.caption(f"{dataset_registry.total_bytes() / 1024 / 1024:.1f} MB of {dataset_registry.max_bytes / 1024 / 1024:.0f} MB · {dataset_registry.evictions} evictions")
+            st.dataframe(dataset_registry.stats(), use_container_width=True)
+    
     # Export settings
     st.markdown("#### 📊 Export Settings")
     export_format = st.selectbox("Export Format", ["CSV", "Excel", "JSON"], help="Choose export format for data")
@@ -556,81 +579,60 @@ with st.sidebar:
 # DATA LOADING FUNCTIONS
 #######################################
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_google_sheets_data(json_credentials, sheets_url):
-    """Load data from Google Sheets using service account authentication"""
-    try:
-        # Parse the JSON credentials
-        credentials_dict = json.loads(json_credentials)
-        
-        # Set up the scope
-        scope = [
-            'https://spreadsheets.google.com/feeds',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        
-        # Create credentials
-        credentials = Credentials.from_service_account_info(credentials_dict, scopes=scope)
-        
-        # Authorize the client
-        client = gspread.authorize(credentials)
-        
-        # Extract spreadsheet ID from URL
-        if '/d/' in sheets_url:
-            sheet_id = sheets_url.split('/d/')[1].split('/')[0]
-        else:
-            raise ValueError("Invalid Google Sheets URL format")
-        
-        # Open the spreadsheet
-        spreadsheet = client.open_by_key(sheet_id)
-        worksheet = spreadsheet.sheet1  # Use the first sheet
-        
-        # Get all records
-        records = worksheet.get_all_records()
-        df = pd.DataFrame(records)
-        
-        return df, None
-    
-    except Exception as e:
-        return None, str(e)
-
-@st.cache_data
-def load_csv_data(uploaded_file):
-    """Load data from uploaded CSV file"""
+def load_csv_data(uploaded_file, refresh=False):
+    """Load an uploaded CSV through the dataset registry; identical uploads share one parsed frame"""
     try:
-        df = pd.read_csv(uploaded_file)
-        return df, None
+        raw = uploaded_file.getvalue()
+        digest = content_hash(raw)
+        name = f"csv_{digest}"
+        if refresh:
+            dataset_registry.invalidate(name)
+        df, version = dataset_registry.load(name, lambda: pd.read_csv(io.BytesIO(raw)),
+                                            ttl=SOURCE_TTLS['csv'], content_hash=digest)
+        return df, version, None
     except Exception as e:
-        return None, str(e)
+        return None, None, str(e)
 
 # Data Loading Logic - Priority: Google Sheets > CSV > Demo Data
 df = None
 data_source = ""
+dataset_version = None
+call_store = None
 current_time = datetime.now()
+refresh_dataset = st.session_state.pop('refresh_dataset', False)
 
 # PRIORITY 1: Try Google Sheets first (Live Data)
 if sheets_url:
     try:
-        # Try to load from Google Sheets without authentication first (public sheet)
+        # Sync the sheet into its shared call store; after the first download only newly appended rows are fetched
         if '/d/' in sheets_url:
-            sheet_id = sheets_url.split('/d/')[1].split('/')[0]
-            csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
+            sheet_id = extract_sheet_id(sheets_url)
+            sheets_store = get_call_store(f"sheets_{sheet_id}")
             
             try:
-                df = pd.read_csv(csv_url)
-                data_source = "Google Sheets (Live - Public)"
-                st.success(f"✅ Successfully connected to Google Sheets! Loaded {len(df)} rows from live data.")
+                sync_result = sync_call_store(sheets_store, PublicSheetReader(sheet_id), source="Google Sheets (Live - Public)",
+                                              force_full=refresh_dataset)
+                df = sheets_store.view()
+                call_store = sheets_store
+                dataset_version = (sheets_store.name, sheets_store.version)
+                data_source = sheets_store.source or "Google Sheets (Live - Public)"
+                st.success(f"✅ Successfully connected to Google Sheets! Loaded {len(df)} rows from live data ({sync_result['new_rows']} new).")
             except Exception as e:
                 st.warning(f"⚠️ Could not access public Google Sheets: {e}")
                 
                 # Try with authentication if available
                 if uploaded_json:
                     json_content = uploaded_json.read().decode('utf-8')
-                    df, error = load_google_sheets_data(json_content, sheets_url)
+                    worksheet, error = open_google_worksheet(json_content, sheets_url)
                     
-                    if df is not None:
+                    if worksheet is not None:
+                        sync_result = sync_call_store(sheets_store, WorksheetReader(worksheet), source="Google Sheets (Live - Authenticated)",
+                                                      force_full=refresh_dataset)
+                        df = sheets_store.view()
+                        call_store = sheets_store
+                        dataset_version = (sheets_store.name, sheets_store.version)
                         data_source = "Google Sheets (Live - Authenticated)"
-                        st.success(f"✅ Successfully connected to Google Sheets with authentication! Loaded {len(df)} rows.")
+                        st.success(f"✅ Successfully connected to Google Sheets with authentication! Loaded {len(df)} rows ({sync_result['new_rows']} new).")
                     else:
                         st.error(f"❌ Google Sheets Authentication Error: {error}")
     except Exception as e:
@@ -638,7 +640,7 @@ if sheets_url:
 
 # PRIORITY 2: Fallback to CSV Upload
 if df is None and uploaded_csv:
-    df, error = load_csv_data(uploaded_csv)
+    df, dataset_version, error = load_csv_data(uploaded_csv, refresh=refresh_dataset)
     if df is not None:
         data_source = "CSV Upload (Fallback)"
         st.warning("⚠️ Using CSV fallback data. Configure Google Sheets for live data.")
@@ -647,7 +649,9 @@ if df is None and uploaded_csv:
 
 # PRIORITY 3: Use demo data as last resort
 if df is None:
-    df = load_demo_data()
+    if refresh_dataset:
+        dataset_registry.invalidate('demo_csv')
+    df, dataset_version = load_demo_data()
     if not df.empty:
         data_source = "Demo Data (Last Resort)"
         st.info("🎯 Using demo data. Configure Google Sheets or upload CSV for live data.")
@@ -655,6 +659,10 @@ if df is None:
         st.error("❌ No data available. Please check the demo data file.")
         st.stop()
 
+# Calls posted to the webhook ingestion service (aiva_webhooks.py) are upserted into the shared store
+if call_store is not None:
+    get_webhook_feed(call_store)
+
 # Standardize column names and ensure all required columns exist
 def standardize_columns(df):
     """Standardize column names and create missing columns with default values"""
@@ -723,9 +731,10 @@ def standardize_columns(df):
         'call_day_of_week': 'Monday'
     }
     
-    # Add missing columns
+    # Add missing columns (text the call store keeps in its side file is read on demand instead)
+    lazy_text_columns = call_store.text_columns if call_store is not None else []
     for col, default_value in required_columns.items():
-        if col not in df.columns:
+        if col not in df.columns and col not in lazy_text_columns:
             if callable(default_value):
                 df[col] = default_value()
             else:
@@ -747,6 +756,20 @@ def standardize_columns(df):
 # Apply column standardization
 df = standardize_columns(df)
 
+def with_call_text(frame):
+    """Rows of df with transcript/summary/action_items attached (read from the call store's side file when it holds them)"""
+    if call_store is None:
+        return frame
+    return call_store.with_text(frame)
+
+def call_text(call_id):
+    """transcript/summary/action_items of one call, fetched by call_id"""
+    if call_store is not None:
+        texts = call_store.fetch_text([call_id])
+    else:
+        texts = df.loc[df['call_id'].astype(str) == str(call_id), [col for col in TEXT_COLUMNS if col in df.columns]]
+    return texts.iloc[0] if len(texts) else pd.Series(dtype=object)
+
 # Display data source info
 date_range = "N/A"
 if 'call_date' in df.columns:
@@ -773,62 +796,84 @@ def safe_numeric_conversion(series, default=0):
     """Safely convert series to numeric, replacing errors with default"""
     return pd.to_numeric(series, errors='coerce').fillna(default)
 
+call_kpi_engine = KPIEngine(CALL_KPIS)
+
 def process_call_metrics():
-    """Process key call center metrics with robust column handling"""
+    """Process key call center metrics with robust column handling (one vectorized pass, cached per dataset version)"""
     try:
-        # Convert numeric columns safely
-        numeric_cols = ['call_length_seconds', 'call_duration_seconds', 'cost', 'sentiment_score', 
-                       'response_time_minutes', 'customer_satisfaction', 'resolution_time_seconds',
-                       'agent_performance_score', 'revenue_impact', 'conversion_probability']
-        
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = safe_numeric_conversion(df[col])
-        
-        # Calculate metrics
-        total_calls = len(df)
-        total_cost = df['cost'].sum() if 'cost' in df.columns else 0
-        
-        # Use call_length_seconds or call_duration_seconds
-        duration_col = 'call_length_seconds' if 'call_length_seconds' in df.columns else 'call_duration_seconds'
-        avg_call_duration = df[duration_col].mean() / 60 if duration_col in df.columns else 0
-        
-        success_rate = (df['call_success'] == 'Yes').sum() / total_calls * 100 if 'call_success' in df.columns else 0
-        avg_sentiment = df['sentiment_score'].mean() if 'sentiment_score' in df.columns else 0
-        appointments_scheduled = (df['appointment_scheduled'] == 'Yes').sum() if 'appointment_scheduled' in df.columns else 0
-        avg_response_time = df['response_time_minutes'].mean() if 'response_time_minutes' in df.columns else 0
-        total_agents = df['voice_agent_name'].nunique() if 'voice_agent_name' in df.columns else 0
-        avg_satisfaction = df['customer_satisfaction'].mean() if 'customer_satisfaction' in df.columns else 0
-        total_revenue = df['revenue_impact'].sum() if 'revenue_impact' in df.columns else 0
-        avg_conversion = df['conversion_probability'].mean() if 'conversion_probability' in df.columns else 0
-        avg_ai_accuracy = df['ai_accuracy_score'].mean() if 'ai_accuracy_score' in df.columns else 0
-        escalations = (df['escalation_required'] == 'Yes').sum() if 'escalation_required' in df.columns else 0
-        follow_ups = (df['follow_up_required'] == 'Yes').sum() if 'follow_up_required' in df.columns else 0
-        
-        return {
-            'total_calls': total_calls,
-            'total_cost': total_cost,
-            'avg_call_duration': avg_call_duration,
-            'success_rate': success_rate,
-            'avg_sentiment': avg_sentiment,
-            'appointments_scheduled': appointments_scheduled,
-            'avg_response_time': avg_response_time,
-            'total_agents': total_agents,
-            'avg_satisfaction': avg_satisfaction,
-            'total_revenue': total_revenue,
-            'avg_conversion': avg_conversion * 100,
-            'avg_ai_accuracy': avg_ai_accuracy * 100,
-            'escalations': escalations,
-            'follow_ups': follow_ups
-        }
+        return call_kpi_engine.get(df, version=dataset_version)
     except Exception as e:
         st.error(f"Error processing call metrics: {e}")
-        return {
-            'total_calls': 0, 'total_cost': 0, 'avg_call_duration': 0, 'success_rate': 0,
-            'avg_sentiment': 0, 'appointments_scheduled': 0, 'avg_response_time': 0,
-            'total_agents': 0, 'avg_satisfaction': 0, 'total_revenue': 0, 'avg_conversion': 0,
-            'avg_ai_accuracy': 0, 'escalations': 0, 'follow_ups': 0
-        }
+        return call_kpi_engine.empty()
+
+def get_filter_index():
+    """Filter-bar indexes for the current dataset version, shared by every session"""
+    if dataset_version is None:
+        return FilterIndex(df)
+    return dataset_registry.derived(dataset_version, 'filter_index', lambda: FilterIndex(df))
+
+def get_date_partitions():
+    """Per-day row partitions for the current dataset version, shared by every session"""
+    if dataset_version is None:
+        return DatePartitions(df)
+    return dataset_registry.derived(dataset_version, 'date_partitions', lambda: DatePartitions(df))
+
+def get_call_dates():
+    """call_date parsed once per dataset version, for the pages' date trends (df itself is never modified)"""
+    if dataset_version is None:
+        return pd.to_datetime(df['call_date'], errors='coerce')
+    return dataset_registry.derived(dataset_version, 'call_dates', lambda: pd.to_datetime(df['call_date'], errors='coerce'))
+
+EVENT_COLUMNS = ['Event Type', 'Client', 'Agent', 'Date', 'Time', 'Status', 'Priority']
+MAX_GRID_EVENTS = 500  # Larger event windows are shown as daily totals
+
+def build_upcoming_events(data):
+    """Appointment and follow-up events for flagged calls, with start/end columns for windowed queries"""
+    rng = np.random.default_rng()
+    today = pd.Timestamp.now().normalize()
+    
+    def column(name, default):
+        if name in data.columns:
+            return data[name].astype(object).fillna(default).to_numpy()
+        return np.full(len(data), default, dtype=object)
+    
+    clients = column('client_name', 'Unknown')
+    agents = column('voice_agent_name', 'Unknown')
+    premium = column('customer_tier', '') == 'Premium'
+    
+    frames = []
+    for flag, event_type, max_days, status in [('appointment_scheduled', 'Scheduled Appointment', 7, 'Confirmed'),
+                                               ('follow_up_required', 'Follow-up Call', 3, 'Pending')]:
+        rows = np.flatnonzero(column(flag, '') == 'Yes')
+        if len(rows) == 0:
+            continue
+        
+        starts = (today
+                  + pd.to_timedelta(rng.integers(1, max_days, len(rows)), unit='D')
+                  + pd.to_timedelta(rng.integers(9, 17, len(rows)), unit='h')
+                  + pd.to_timedelta(rng.choice([0, 30], len(rows)), unit='m'))
+        
+        frames.append(pd.DataFrame({
+            'Event Type': event_type,
+            'Client': clients[rows],
+            'Agent': agents[rows],
+            'Date': starts.strftime('%Y-%m-%d'),
+            'Time': starts.strftime('%H:%M'),
+            'Status': status,
+            'Priority': np.where(premium[rows], 'High', 'Medium') if status == 'Confirmed' else 'Medium',
+            'start': starts,
+            'end': starts + pd.Timedelta(minutes=30)
+        }))
+    
+    if not frames:
+        return pd.DataFrame(columns=EVENT_COLUMNS + ['start', 'end']).astype({'start': 'datetime64[ns]', 'end': 'datetime64[ns]'})
+    return pd.concat(frames, ignore_index=True).sort_values('start', kind='stable')
+
+def get_upcoming_events(data, version):
+    """Upcoming events for the loaded dataset, built once per dataset version"""
+    if version is None:
+        return build_upcoming_events(data)
+    return dataset_registry.derived(version, 'upcoming_events', lambda: build_upcoming_events(data))
 
 def create_kpi_chart(metric_name, metric_value, chart_type="gauge"):
     """Create a chart for KPI metrics"""
@@ -863,8 +908,8 @@ def create_kpi_chart(metric_name, metric_value, chart_type="gauge"):
         fig.update_layout(height=200, margin=dict(l=20, r=20, t=40, b=20))
         return fig
 
-def create_enhanced_ag_grid(dataframe, grid_key, height=400):
-    """Create an enhanced AG Grid with extensive advanced features"""
+def build_grid_options(dataframe, grid_key):
+    """GridOptions for a grid's column schema (renderers, filters, selection and export settings)"""
     gb = GridOptionsBuilder.from_dataframe(dataframe)
     
     # Enable comprehensive features
@@ -1229,18 +1274,35 @@ def create_enhanced_ag_grid(dataframe, grid_key, height=400):
     )
     gridOptions = gb.build()
     
+    return gridOptions
+
+def create_enhanced_ag_grid(dataframe, grid_key, height=400):
+    """Create an enhanced AG Grid with extensive advanced features"""
+    # Large frames use the server-side row model: only the requested page is sent to the grid
+    server_side = len(dataframe) > SERVER_SIDE_ROW_THRESHOLD
+    if server_side:
+        full_dataframe = dataframe
+        dataframe, server_state = server_side_page(full_dataframe, grid_key)
+    
+    # GridOptions only depend on the column schema, so they are built once per grid and reused across reruns
+    gridOptions = cached_grid_options(grid_key, dataframe, lambda: build_grid_options(dataframe, grid_key))
+    refresh_set_filter_values(gridOptions, dataframe)
+    
+    if server_side:
+        configure_server_side_options(gridOptions, dataframe, grid_key)
+    
     # Display AG Grid with all features
     grid_response = AgGrid(
         dataframe,
         gridOptions=gridOptions,
-        data_return_mode=DataReturnMode.FILTERED_AND_SORTED,
-        update_mode=GridUpdateMode.MODEL_CHANGED,
+        data_return_mode=DataReturnMode.AS_INPUT if server_side else DataReturnMode.FILTERED_AND_SORTED,
+        update_mode=GridUpdateMode.SELECTION_CHANGED if server_side else GridUpdateMode.MODEL_CHANGED,
         fit_columns_on_grid_load=False,
         theme='streamlit',
         enable_enterprise_modules=True,
         height=height,
         width='100%',
-        key=grid_key,
+        key=server_state['grid_key'] if server_side else grid_key,
         reload_data=False,
         try_to_convert_back_to_original_types=True,
         conversion_errors='coerce',
@@ -1261,13 +1323,15 @@ def create_enhanced_ag_grid(dataframe, grid_key, height=400):
         }
     )
     
+    if server_side:
+        return server_side_response(full_dataframe, dataframe, grid_key, grid_response, server_state)
     return grid_response
 
 #######################################
-# PAGE ROUTING
+# PAGES
 #######################################
 
-if st.session_state.current_page == 'Dashboard':
+def render_dashboard():
     # Process metrics
     metrics = process_call_metrics()
     
@@ -1447,8 +1511,8 @@ if st.session_state.current_page == 'Dashboard':
         st.markdown('<div class="chart-title">✅ Success Rate by Agent</div>', unsafe_allow_html=True)
         
         if 'voice_agent_name' in df.columns and 'call_success' in df.columns:
-            agent_success = df.groupby('voice_agent_name').agg({
-                'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100
+            agent_success = rollup(df, 'voice_agent_name', {
+                'call_success': 'yes_rate'
             }).reset_index()
             agent_success.columns = ['Agent', 'Success_Rate']
             
@@ -1511,8 +1575,172 @@ if st.session_state.current_page == 'Dashboard':
             if 'sentiment_score' in selected_df.columns:
                 avg_sentiment = selected_df['sentiment_score'].mean()
                 st.metric("Avg Sentiment", f"{avg_sentiment:.2f}")
+    
+    # AI-powered insights section
+    st.markdown('<h3 class="section-header">🧠 AI-Powered Insights & Recommendations</h3>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">🎯 Performance Insights</div>', unsafe_allow_html=True)
+        
+        insights = [
+            "📈 Call success rate increased by 15% this week",
+            "⚡ Average response time improved by 23 seconds",
+            "🎯 Agent Sarah shows highest conversion rate (87%)",
+            "📞 Peak call volume occurs between 2-4 PM",
+            "💡 Sentiment scores correlate with call duration",
+            "🔄 Follow-up calls have 34% higher success rate"
+        ]
+        
+        for insight in insights:
+            st.write(f"• {insight}")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">🚀 Optimization Recommendations</div>', unsafe_allow_html=True)
+        
+        recommendations = [
+            "🎯 Schedule more agents during 2-4 PM peak hours",
+            "📚 Provide additional training for agents with <80% success rate",
+            "⏰ Implement callback system for high-priority clients",
+            "📊 Use sentiment analysis to identify at-risk customers",
+            "🔄 Automate follow-up scheduling for successful calls",
+            "💬 Deploy chatbot for initial customer screening"
+        ]
+        
+        for rec in recommendations:
+            st.write(f"• {rec}")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Comprehensive data quality monitoring
+    st.markdown('<h3 class="section-header">📊 Data Quality & Completeness Monitor</h3>', unsafe_allow_html=True)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">🔍 Data Completeness</div>', unsafe_allow_html=True)
+        
+        # Calculate data completeness for every column in one pass
+        non_null_counts = df.notna().sum()
+        completeness_df = pd.DataFrame({
+            'Column': non_null_counts.index,
+            'Completeness': (non_null_counts / len(df) * 100).to_numpy(),
+            'Missing': (len(df) - non_null_counts).to_numpy()
+        })
+        
+        # Show top 10 most complete columns
+        top_complete = completeness_df.nlargest(10, 'Completeness')
+        
+        fig = px.bar(
+            top_complete,
+            x='Completeness',
+            y='Column',
+            orientation='h',
+            title="",
+            color='Completeness',
+            color_continuous_scale='Viridis'
+        )
+        fig.update_layout(
+            height=400,
+            margin=dict(l=0, r=0, t=20, b=0),
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📈 Data Volume Trends</div>', unsafe_allow_html=True)
+        
+        # Generate data volume trends by date
+        if 'call_date' in df.columns:
+            try:
+                daily_volume = df.groupby(get_call_dates().dt.date).size().reset_index()
+                daily_volume.columns = ['Date', 'Call_Count']
+                
+                fig = px.line(
+                    daily_volume,
+                    x='Date',
+                    y='Call_Count',
+                    title="",
+                    markers=True
+                )
+                fig.update_layout(
+                    height=400,
+                    margin=dict(l=0, r=0, t=20, b=0),
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)'
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            except:
+                st.write("Date parsing not available for trend analysis")
+        else:
+            st.write("No date column available for trend analysis")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">🎯 Data Quality Score</div>', unsafe_allow_html=True)
+        
+        # Calculate overall data quality score
+        overall_completeness = completeness_df['Completeness'].mean()
+        
+        # Quality score based on multiple factors
+        quality_factors = {
+            'Completeness': overall_completeness,
+            'Consistency': 85,  # Simulated
+            'Accuracy': 92,     # Simulated
+            'Timeliness': 88    # Simulated
+        }
+        
+        overall_quality = sum(quality_factors.values()) / len(quality_factors)
+        
+        fig = go.Figure(go.Indicator(
+            mode = "gauge+number+delta",
+            value = overall_quality,
+            domain = {'x': [0, 1], 'y': [0, 1]},
+            title = {'text': "Overall Quality Score"},
+            delta = {'reference': 85},
+            gauge = {
+                'axis': {'range': [None, 100]},
+                'bar': {'color': "#10b981"},
+                'steps': [
+                    {'range': [0, 50], 'color': "lightgray"},
+                    {'range': [50, 80], 'color': "gray"}
+                ],
+                'threshold': {
+                    'line': {'color': "red", 'width': 4},
+                    'thickness': 0.75,
+                    'value': 90
+                }
+            }
+        ))
+        fig.update_layout(height=400, margin=dict(l=20, r=20, t=40, b=20))
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Show quality factors breakdown
+        for factor, score in quality_factors.items():
+            color = "#10b981" if score >= 90 else "#f59e0b" if score >= 70 else "#ef4444"
+            st.markdown(f"""
+            <div style="display: flex; justify-content: space-between; margin: 0.5rem 0; padding: 0.5rem; background: rgba(0,0,0,0.02); border-radius: 8px;">
+                <span>{factor}</span>
+                <span style="color: {color}; font-weight: bold;">{score:.1f}%</span>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
 
-elif st.session_state.current_page == 'Call Analytics':
+
+def render_call_analytics():
     st.markdown('<h2 class="section-header">📈 Advanced Call Analytics</h2>', unsafe_allow_html=True)
     
     # Analytics filters
@@ -1530,12 +1758,9 @@ elif st.session_state.current_page == 'Call Analytics':
         else:
             category_filter = []
     
-    # Apply filters
-    filtered_df = df.copy()
-    if agent_filter:
-        filtered_df = filtered_df[filtered_df['voice_agent_name'].isin(agent_filter)]
-    if category_filter:
-        filtered_df = filtered_df[filtered_df['call_category'].isin(category_filter)]
+    # Apply filters through the shared filter index (bitmap lookups, one copy of the selected rows)
+    selection = get_filter_index().select(isin={'voice_agent_name': agent_filter, 'call_category': category_filter})
+    filtered_df = selection.frame()
     
     # Row 1: Call Distribution Charts
     col1, col2 = st.columns(2)
@@ -1744,33 +1969,202 @@ elif st.session_state.current_page == 'Call Analytics':
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     grid_response = create_enhanced_ag_grid(analytics_df, "analytics_grid", height=600)
     st.markdown('</div>', unsafe_allow_html=True)
-
-elif st.session_state.current_page == 'Agent Performance':
-    st.markdown('<h2 class="section-header">👥 Agent Performance Analysis</h2>', unsafe_allow_html=True)
     
-    if 'voice_agent_name' in df.columns:
-        # Agent performance metrics with safe column handling
-        agg_dict = {}
+    # Predictive analytics section
+    st.markdown('<h3 class="section-header">🔮 Predictive Analytics & Forecasting</h3>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📈 Call Volume Prediction</div>', unsafe_allow_html=True)
         
-        # Only include columns that exist
-        duration_col = 'call_length_seconds' if 'call_length_seconds' in df.columns else 'call_duration_seconds'
-        if duration_col in df.columns:
-            agg_dict[duration_col] = ['count', 'mean']
+        # Generate prediction data
+        dates = pd.date_range(start=current_time, periods=30, freq='D')
+        base_calls = 20
+        predicted_calls = [base_calls + np.random.randint(-5, 8) + int(np.sin(i/7) * 3) for i in range(30)]
         
-        if 'cost' in df.columns:
-            agg_dict['cost'] = 'sum'
+        prediction_df = pd.DataFrame({
+            'Date': dates,
+            'Predicted Calls': predicted_calls,
+            'Confidence': ['High' if abs(c - base_calls) < 5 else 'Medium' for c in predicted_calls]
+        })
         
-        if 'call_success' in df.columns:
-            agg_dict['call_success'] = lambda x: (x == 'Yes').sum()
+        fig = px.line(
+            prediction_df,
+            x='Date',
+            y='Predicted Calls',
+            title="",
+            color_discrete_sequence=['#3b82f6']
+        )
+        fig.add_hline(y=base_calls, line_dash="dash", line_color="red", annotation_text="Average")
+        fig.update_layout(
+            height=400,
+            margin=dict(l=0, r=0, t=20, b=0),
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        st.plotly_chart(fig, use_container_width=True)
         
-        if 'sentiment_score' in df.columns:
-            agg_dict['sentiment_score'] = 'mean'
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">🎯 Success Rate Forecast</div>', unsafe_allow_html=True)
         
-        if 'appointment_scheduled' in df.columns:
-            agg_dict['appointment_scheduled'] = lambda x: (x == 'Yes').sum()
+        # Generate success rate prediction
+        success_rates = [95 + np.random.randint(-3, 4) for _ in range(30)]
         
-        if 'agent_performance_score' in df.columns:
-            agg_dict['agent_performance_score'] = 'mean'
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=dates,
+            y=success_rates,
+            mode='lines+markers',
+            name='Predicted Success Rate',
+            line=dict(color='#10b981', width=3),
+            marker=dict(size=6)
+        ))
+        fig.add_hline(y=95, line_dash="dash", line_color="orange", annotation_text="Target")
+        fig.update_layout(
+            height=400,
+            margin=dict(l=0, r=0, t=20, b=0),
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            yaxis_title="Success Rate (%)",
+            xaxis_title="Date"
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Advanced call pattern analysis
+    st.markdown('<h3 class="section-header">🕐 Advanced Call Pattern Analysis</h3>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📅 Call Patterns by Day of Week</div>', unsafe_allow_html=True)
+        
+        # Generate day of week analysis
+        if 'call_date' in df.columns:
+            try:
+                day_patterns = rollup(df.assign(day_of_week=get_call_dates().dt.day_name()), 'day_of_week', {
+                    'call_id': 'count',
+                    'call_success': 'yes_rate',
+                    'sentiment_score': 'mean'
+                }).reset_index()
+                
+                day_patterns.columns = ['Day', 'Call_Count', 'Success_Rate', 'Avg_Sentiment']
+                
+                # Reorder days
+                day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+                day_patterns['Day'] = pd.Categorical(day_patterns['Day'], categories=day_order, ordered=True)
+                day_patterns = day_patterns.sort_values('Day')
+                
+                fig = make_subplots(specs=[[{"secondary_y": True}]])
+                
+                fig.add_trace(
+                    go.Bar(x=day_patterns['Day'], y=day_patterns['Call_Count'], name="Call Count"),
+                    secondary_y=False,
+                )
+                
+                fig.add_trace(
+                    go.Scatter(x=day_patterns['Day'], y=day_patterns['Success_Rate'], 
+                             mode='lines+markers', name="Success Rate (%)", line=dict(color='red')),
+                    secondary_y=True,
+                )
+                
+                fig.update_xaxes(title_text="Day of Week")
+                fig.update_yaxes(title_text="Call Count", secondary_y=False)
+                fig.update_yaxes(title_text="Success Rate (%)", secondary_y=True)
+                
+                fig.update_layout(
+                    height=400,
+                    margin=dict(l=0, r=0, t=20, b=0),
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)'
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            except:
+                st.write("Date parsing not available for day pattern analysis")
+        else:
+            st.write("No date column available for pattern analysis")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">⏰ Hourly Call Distribution</div>', unsafe_allow_html=True)
+        
+        # Generate hourly distribution
+        if 'call_hour' in df.columns:
+            hourly_dist = df.groupby('call_hour').size().reset_index()
+            hourly_dist.columns = ['Hour', 'Call_Count']
+            
+            fig = px.bar(
+                hourly_dist,
+                x='Hour',
+                y='Call_Count',
+                title="",
+                color='Call_Count',
+                color_continuous_scale='Blues'
+            )
+            fig.update_layout(
+                height=400,
+                margin=dict(l=0, r=0, t=20, b=0),
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            # Generate simulated hourly data
+            hours = list(range(24))
+            call_counts = [np.random.poisson(5 + 10 * np.sin((h - 6) * np.pi / 12)) for h in hours]
+            
+            fig = px.bar(
+                x=hours,
+                y=call_counts,
+                title="",
+                labels={'x': 'Hour', 'y': 'Call Count'}
+            )
+            fig.update_layout(
+                height=400,
+                margin=dict(l=0, r=0, t=20, b=0),
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render_agent_performance():
+    st.markdown('<h2 class="section-header">👥 Agent Performance Analysis</h2>', unsafe_allow_html=True)
+    
+    if 'voice_agent_name' in df.columns:
+        # Agent performance metrics with safe column handling
+        agg_dict = {}
+        
+        # Only include columns that exist
+        duration_col = 'call_length_seconds' if 'call_length_seconds' in df.columns else 'call_duration_seconds'
+        if duration_col in df.columns:
+            agg_dict[duration_col] = ['count', 'mean']
+        
+        if 'cost' in df.columns:
+            agg_dict['cost'] = 'sum'
+        
+        if 'call_success' in df.columns:
+            agg_dict['call_success'] = 'yes_count'
+        
+        if 'sentiment_score' in df.columns:
+            agg_dict['sentiment_score'] = 'mean'
+        
+        if 'appointment_scheduled' in df.columns:
+            agg_dict['appointment_scheduled'] = 'yes_count'
+        
+        if 'agent_performance_score' in df.columns:
+            agg_dict['agent_performance_score'] = 'mean'
         
         if 'customer_satisfaction' in df.columns:
             agg_dict['customer_satisfaction'] = 'mean'
@@ -1782,7 +2176,7 @@ elif st.session_state.current_page == 'Agent Performance':
             agg_dict['ai_accuracy_score'] = 'mean'
         
         # Perform aggregation
-        agent_stats = df.groupby('voice_agent_name').agg(agg_dict).round(2)
+        agent_stats = rollup(df, 'voice_agent_name', agg_dict).round(2)
         
         # Flatten column names
         agent_stats.columns = ['_'.join(col).strip() if isinstance(col, tuple) else col for col in agent_stats.columns]
@@ -1795,12 +2189,12 @@ elif st.session_state.current_page == 'Agent Performance':
             column_renames[f'{duration_col}_mean'] = 'Avg_Duration_Sec'
         if 'cost_sum' in agent_stats.columns:
             column_renames['cost_sum'] = 'Total_Cost'
-        if 'call_success_<lambda>' in agent_stats.columns:
-            column_renames['call_success_<lambda>'] = 'Successful_Calls'
+        if 'call_success_yes_count' in agent_stats.columns:
+            column_renames['call_success_yes_count'] = 'Successful_Calls'
         if 'sentiment_score_mean' in agent_stats.columns:
             column_renames['sentiment_score_mean'] = 'Avg_Sentiment'
-        if 'appointment_scheduled_<lambda>' in agent_stats.columns:
-            column_renames['appointment_scheduled_<lambda>'] = 'Appointments'
+        if 'appointment_scheduled_yes_count' in agent_stats.columns:
+            column_renames['appointment_scheduled_yes_count'] = 'Appointments'
         if 'agent_performance_score_mean' in agent_stats.columns:
             column_renames['agent_performance_score_mean'] = 'Performance_Score'
         if 'customer_satisfaction_mean' in agent_stats.columns:
@@ -1974,70 +2368,266 @@ elif st.session_state.current_page == 'Agent Performance':
         st.markdown('</div>', unsafe_allow_html=True)
     else:
         st.info("Agent performance data not available")
-
-elif st.session_state.current_page == 'Client Profiles':
-    st.markdown('<h2 class="section-header">👤 Client Profiles & Communication History</h2>', unsafe_allow_html=True)
     
-    # Client search and filter
-    col1, col2, col3, col4 = st.columns(4)
+    # advanced agent analytics
+    st.markdown('<h3 class="section-header">🏆 Advanced Agent Analytics & Coaching</h3>', unsafe_allow_html=True)
+    
+    # Agent performance matrix
+    col1, col2 = st.columns(2)
     
     with col1:
-        search_term = st.text_input("🔍 Search clients", placeholder="Enter client name, email, or phone...")
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📊 Performance Matrix</div>', unsafe_allow_html=True)
+        
+        # Create performance matrix data
+        agents = df['voice_agent_name'].unique()[:10]
+        calls_by_agent = df['voice_agent_name'].value_counts()
+        performance_data = []
+        
+        for agent in agents:
+            performance_data.append({
+                'Agent': agent,
+                'Success Rate': np.random.uniform(85, 98),
+                'Avg Call Duration': np.random.uniform(2, 6),
+                'Customer Satisfaction': np.random.uniform(8, 10),
+                'Calls Handled': calls_by_agent[agent]
+            })
+        
+        perf_df = pd.DataFrame(performance_data)
+        
+        fig = px.scatter(
+            perf_df,
+            x='Success Rate',
+            y='Customer Satisfaction',
+            size='Calls Handled',
+            color='Avg Call Duration',
+            hover_name='Agent',
+            title="",
+            color_continuous_scale='Viridis'
+        )
+        fig.update_layout(
+            height=400,
+            margin=dict(l=0, r=0, t=20, b=0),
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
-        if 'call_success' in df.columns:
-            success_filter = st.selectbox("Filter by success", ["All", "Yes", "No"])
-        else:
-            success_filter = "All"
-    
-    with col3:
-        if 'customer_tier' in df.columns:
-            tier_filter = st.selectbox("Filter by tier", ["All"] + list(df['customer_tier'].unique()))
-        else:
-            tier_filter = "All"
-    
-    with col4:
-        if 'follow_up_required' in df.columns:
-            followup_filter = st.selectbox("Follow-up required", ["All", "Yes", "No"])
-        else:
-            followup_filter = "All"
-    
-    # Filter data
-    filtered_df = df.copy()
-    
-    if search_term:
-        search_cols = ['client_name', 'email', 'phone_number']
-        search_mask = pd.Series([False] * len(filtered_df))
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">🎯 Coaching Recommendations</div>', unsafe_allow_html=True)
+        
+        # Agent coaching recommendations
+        coaching_data = []
+        for _, row in perf_df.iterrows():
+            recommendations = []
+            if row['Success Rate'] < 90:
+                recommendations.append("Focus on closing techniques")
+            if row['Avg Call Duration'] > 4:
+                recommendations.append("Improve call efficiency")
+            if row['Customer Satisfaction'] < 9:
+                recommendations.append("Enhance customer rapport")
+            if not recommendations:
+                recommendations.append("Maintain excellent performance")
+            
+            coaching_data.append({
+                'Agent': row['Agent'],
+                'Priority': 'High' if row['Success Rate'] < 90 else 'Medium' if row['Success Rate'] < 95 else 'Low',
+                'Recommendations': ', '.join(recommendations)
+            })
         
-        for col in search_cols:
-            if col in filtered_df.columns:
-                search_mask |= filtered_df[col].astype(str).str.contains(search_term, case=False, na=False)
+        coaching_df = pd.DataFrame(coaching_data)
         
-        filtered_df = filtered_df[search_mask]
-    
-    if success_filter != "All" and 'call_success' in df.columns:
-        filtered_df = filtered_df[filtered_df['call_success'] == success_filter]
-    
-    if tier_filter != "All" and 'customer_tier' in df.columns:
-        filtered_df = filtered_df[filtered_df['customer_tier'] == tier_filter]
-    
-    if followup_filter != "All" and 'follow_up_required' in df.columns:
-        filtered_df = filtered_df[filtered_df['follow_up_required'] == followup_filter]
+        # Display coaching recommendations
+        for _, row in coaching_df.iterrows():
+            priority_color = '#ef4444' if row['Priority'] == 'High' else '#f59e0b' if row['Priority'] == 'Medium' else '#10b981'
+            st.markdown(f"""
+            <div style="border-left: 4px solid {priority_color}; padding: 1rem; margin: 0.5rem 0; background: rgba(0,0,0,0.02); border-radius: 8px;">
+                <strong>{row['Agent']}</strong> ({row['Priority']} Priority)<br>
+                <em>{row['Recommendations']}</em>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
     
-    # Client Summary Cards
-    st.markdown('<h3 class="section-header">📊 Client Overview</h3>', unsafe_allow_html=True)
+    # Comprehensive agent performance deep dive
+    st.markdown('<h3 class="section-header">🎯 Agent Performance Deep Dive & Skills Analysis</h3>', unsafe_allow_html=True)
     
-    col1, col2, col3, col4, col5 = st.columns(5)
+    col1, col2 = st.columns(2)
     
     with col1:
-        total_clients = filtered_df['client_name'].nunique() if 'client_name' in filtered_df.columns else 0
-        st.metric("👥 Total Clients", f"{total_clients:,}")
-    
-    with col2:
-        high_value_clients = (filtered_df['customer_lifetime_value'] > 1000).sum() if 'customer_lifetime_value' in filtered_df.columns else 0
-        st.metric("💎 High Value Clients", f"{high_value_clients:,}")
-    
-    with col3:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">🏅 Agent Ranking & Performance Tiers</div>', unsafe_allow_html=True)
+        
+        # Create comprehensive agent performance analysis
+        if 'voice_agent_name' in df.columns:
+            agent_performance = rollup(df, 'voice_agent_name', {
+                'call_id': 'count',
+                'call_success': 'yes_rate',
+                'sentiment_score': 'mean',
+                'customer_satisfaction': 'mean',
+                'revenue_impact': 'sum',
+                'call_duration_seconds': 'mean'
+            }).reset_index()
+            
+            agent_performance.columns = ['Agent', 'Total_Calls', 'Success_Rate', 'Avg_Sentiment', 
+                                       'Avg_Satisfaction', 'Total_Revenue', 'Avg_Duration']
+            
+            # Calculate composite performance score
+            agent_performance['Performance_Score'] = (
+                agent_performance['Success_Rate'] * 0.4 +
+                agent_performance['Avg_Sentiment'] * 20 * 0.3 +
+                agent_performance['Avg_Satisfaction'] * 10 * 0.3
+            )
+            
+            # Assign performance tiers
+            agent_performance['Tier'] = pd.cut(
+                agent_performance['Performance_Score'],
+                bins=[0, 70, 85, 95, 100],
+                labels=['Developing', 'Proficient', 'Expert', 'Elite']
+            )
+            
+            # Sort by performance score
+            agent_performance = agent_performance.sort_values('Performance_Score', ascending=False)
+            
+            # Display top 10 agents
+            top_agents = agent_performance.head(10)
+            
+            fig = px.bar(
+                top_agents,
+                x='Performance_Score',
+                y='Agent',
+                orientation='h',
+                color='Tier',
+                title="",
+                color_discrete_map={
+                    'Elite': '#10b981',
+                    'Expert': '#3b82f6',
+                    'Proficient': '#f59e0b',
+                    'Developing': '#ef4444'
+                }
+            )
+            fig.update_layout(
+                height=400,
+                margin=dict(l=0, r=0, t=20, b=0),
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.write("Agent performance data not available")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📊 Skills Gap Analysis</div>', unsafe_allow_html=True)
+        
+        # Skills analysis based on performance metrics
+        skills_data = {
+            'Skill': ['Closing', 'Communication', 'Product Knowledge', 'Problem Solving', 'Time Management'],
+            'Team_Average': [78, 85, 82, 79, 76],
+            'Top_Performer': [95, 98, 94, 92, 89],
+            'Gap': [17, 13, 12, 13, 13]
+        }
+        
+        skills_df = pd.DataFrame(skills_data)
+        
+        fig = go.Figure()
+        
+        fig.add_trace(go.Bar(
+            name='Team Average',
+            x=skills_df['Skill'],
+            y=skills_df['Team_Average'],
+            marker_color='lightblue'
+        ))
+        
+        fig.add_trace(go.Bar(
+            name='Top Performer',
+            x=skills_df['Skill'],
+            y=skills_df['Top_Performer'],
+            marker_color='darkblue'
+        ))
+        
+        fig.update_layout(
+            barmode='group',
+            height=400,
+            margin=dict(l=0, r=0, t=20, b=0),
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Show improvement recommendations
+        st.markdown("**🎯 Priority Training Areas:**")
+        for _, row in skills_df.iterrows():
+            if row['Gap'] > 15:
+                priority = "🔴 High"
+            elif row['Gap'] > 10:
+                priority = "🟡 Medium"
+            else:
+                priority = "🟢 Low"
+            
+            st.markdown(f"• **{row['Skill']}**: {priority} (Gap: {row['Gap']}%)")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render_client_profiles():
+    st.markdown('<h2 class="section-header">👤 Client Profiles & Communication History</h2>', unsafe_allow_html=True)
+    
+    # Client search and filter
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        search_term = st.text_input("🔍 Search clients", placeholder="Enter client name, email, or phone...")
+    
+    with col2:
+        if 'call_success' in df.columns:
+            success_filter = st.selectbox("Filter by success", ["All", "Yes", "No"])
+        else:
+            success_filter = "All"
+    
+    with col3:
+        if 'customer_tier' in df.columns:
+            tier_filter = st.selectbox("Filter by tier", ["All"] + list(df['customer_tier'].unique()))
+        else:
+            tier_filter = "All"
+    
+    with col4:
+        if 'follow_up_required' in df.columns:
+            followup_filter = st.selectbox("Follow-up required", ["All", "Yes", "No"])
+        else:
+            followup_filter = "All"
+    
+    # Filter data through the shared filter index
+    selection = get_filter_index().select(
+        isin={
+            'call_success': [success_filter] if success_filter != "All" else [],
+            'customer_tier': [tier_filter] if tier_filter != "All" else [],
+            'follow_up_required': [followup_filter] if followup_filter != "All" else []
+        },
+        search=search_term,
+        search_columns=['client_name', 'email', 'phone_number']
+    )
+    filtered_df = selection.frame()
+    
+    # Client Summary Cards
+    st.markdown('<h3 class="section-header">📊 Client Overview</h3>', unsafe_allow_html=True)
+    
+    col1, col2, col3, col4, col5 = st.columns(5)
+    
+    with col1:
+        total_clients = filtered_df['client_name'].nunique() if 'client_name' in filtered_df.columns else 0
+        st.metric("👥 Total Clients", f"{total_clients:,}")
+    
+    with col2:
+        high_value_clients = (filtered_df['customer_lifetime_value'] > 1000).sum() if 'customer_lifetime_value' in filtered_df.columns else 0
+        st.metric("💎 High Value Clients", f"{high_value_clients:,}")
+    
+    with col3:
         satisfied_clients = (filtered_df['customer_satisfaction'] >= 4).sum() if 'customer_satisfaction' in filtered_df.columns else 0
         st.metric("😊 Satisfied Clients", f"{satisfied_clients:,}")
     
@@ -2227,98 +2817,279 @@ elif st.session_state.current_page == 'Client Profiles':
                 st.metric("Revenue Impact", f"${selected_client['revenue_impact']:,.2f}")
         
         with col2:
-            if 'summary' in selected_client and selected_client['summary']:
+            # The summary is fetched for the selected call only
+            summary = call_text(selected_client.get('call_id')).get('summary')
+            if pd.notna(summary) and summary:
                 st.markdown("**Call Summary:**")
-                st.write(selected_client['summary'])
+                st.write(summary)
             
             if 'conversion_probability' in selected_client:
                 st.metric("Conversion Probability", f"{selected_client['conversion_probability']:.2%}")
-
-elif st.session_state.current_page == 'Reports':
-    st.markdown('<h2 class="section-header">📊 Advanced Reports & Export</h2>', unsafe_allow_html=True)
     
-    # Report generation options
+    # Client journey mapping
+    st.markdown('<h3 class="section-header">🗺️ Client Journey Mapping & Lifecycle Analysis</h3>', unsafe_allow_html=True)
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📈 Executive Performance Summary</div>', unsafe_allow_html=True)
-        
-        metrics = process_call_metrics()
+        st.markdown('<div class="chart-title">🔄 Customer Lifecycle Stages</div>', unsafe_allow_html=True)
         
-        summary_data = {
-            'Metric': [
-                'Total Calls', 'Success Rate (%)', 'Avg Duration (min)', 
-                'Total Cost ($)', 'Avg Sentiment', 'Appointments',
-                'Avg Response Time (min)', 'Active Agents', 'Avg Satisfaction',
-                'Total Revenue ($)', 'Avg Conversion (%)', 'AI Accuracy (%)',
-                'Escalations', 'Follow-ups Required'
-            ],
-            'Value': [
-                f"{metrics['total_calls']:,}",
-                f"{metrics['success_rate']:.1f}%",
-                f"{metrics['avg_call_duration']:.1f}",
-                f"${metrics['total_cost']:.2f}",
-                f"{metrics['avg_sentiment']:.2f}",
-                f"{metrics['appointments_scheduled']:,}",
-                f"{metrics['avg_response_time']:.1f}",
-                f"{metrics['total_agents']:,}",
-                f"{metrics['avg_satisfaction']:.2f}",
-                f"${metrics['total_revenue']:,.0f}",
-                f"{metrics['avg_conversion']:.1f}%",
-                f"{metrics['avg_ai_accuracy']:.1f}%",
-                f"{metrics['escalations']:,}",
-                f"{metrics['follow_ups']:,}"
-            ],
-            'Status': [
-                '🟢 Good', '🟢 Excellent', '🟡 Average', '🟢 Good',
-                '🟢 Good', '🟢 Good', '🟢 Good', '🟢 Stable',
-                '🟢 Good', '🟢 Excellent', '🟢 Good', '🟢 Excellent',
-                '🟡 Monitor', '🟡 Monitor'
-            ]
+        lifecycle_data = {
+            'Stage': ['Lead', 'Prospect', 'Customer', 'Advocate', 'Churned'],
+            'Count': [45, 32, 78, 23, 12],
+            'Conversion Rate': [71, 85, 92, 95, 0]
         }
         
-        summary_df = pd.DataFrame(summary_data)
-        st.dataframe(summary_df, use_container_width=True, hide_index=True)
+        fig = px.funnel(
+            lifecycle_data,
+            x='Count',
+            y='Stage',
+            title=""
+        )
+        fig.update_layout(
+            height=400,
+            margin=dict(l=0, r=0, t=20, b=0),
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        st.plotly_chart(fig, use_container_width=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📥 Export Options</div>', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📈 Customer Value Analysis</div>', unsafe_allow_html=True)
         
-        # Export full data
-        if export_format == "CSV":
-            export_data = df.to_csv(index=False)
-            file_extension = "csv"
-            mime_type = "text/csv"
-        elif export_format == "Excel":
-            buffer = io.BytesIO()
-            df.to_excel(buffer, index=False)
-            export_data = buffer.getvalue()
-            file_extension = "xlsx"
-            mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        else:  # JSON
-            export_data = df.to_json(orient='records', indent=2)
-            file_extension = "json"
-            mime_type = "application/json"
+        # Customer value segments
+        value_data = {
+            'Segment': ['High Value', 'Medium Value', 'Low Value', 'At Risk'],
+            'Customers': [25, 45, 65, 15],
+            'Revenue': [125000, 90000, 32000, 8000]
+        }
         
-        st.download_button(
-            label=f"📄 Export Full Dataset ({export_format})",
-            data=export_data,
-            file_name=f"aiva_call_data_{current_time.strftime('%Y%m%d_%H%M%S')}.{file_extension}",
-            mime=mime_type,
-            use_container_width=True
+        fig = px.scatter(
+            x=value_data['Customers'],
+            y=value_data['Revenue'],
+            size=value_data['Customers'],
+            color=value_data['Segment'],
+            hover_name=value_data['Segment'],
+            title=""
         )
-        
-        # Export agent summary
-        if 'voice_agent_name' in df.columns:
-            agent_summary = df.groupby('voice_agent_name').agg({
-                'call_id': 'count',
-                'call_success': lambda x: (x == 'Yes').sum() if 'call_success' in df.columns else 0,
-                'cost': 'sum' if 'cost' in df.columns else lambda x: 0,
-                'revenue_impact': 'sum' if 'revenue_impact' in df.columns else lambda x: 0
-            }).reset_index()
+        fig.update_layout(
+            height=400,
+            margin=dict(l=0, r=0, t=20, b=0),
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            xaxis_title="Number of Customers",
+            yaxis_title="Revenue ($)"
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Comprehensive client segmentation and value analysis
+    st.markdown('<h3 class="section-header">💎 Advanced Client Segmentation & Value Analysis</h3>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">🎯 RFM Analysis (Recency, Frequency, Monetary)</div>', unsafe_allow_html=True)
+        
+        # Create RFM analysis
+        if 'client_name' in df.columns and 'revenue_impact' in df.columns:
+            client_rfm = df.groupby('client_name').agg({
+                'call_id': 'count',
+                'revenue_impact': 'sum'
+            })
+            last_call = get_call_dates().groupby(df['client_name']).max()
+            client_rfm.insert(0, 'Recency_Days', (pd.Timestamp(current_time) - last_call).dt.days.fillna(0).astype(int))
+            client_rfm = client_rfm.reset_index()
+            
+            client_rfm.columns = ['Client', 'Recency_Days', 'Frequency', 'Monetary']
+            
+            # Create RFM scores (1-5 scale)
+            client_rfm['R_Score'] = pd.qcut(client_rfm['Recency_Days'], 5, labels=[5,4,3,2,1])
+            client_rfm['F_Score'] = pd.qcut(client_rfm['Frequency'].rank(method='first'), 5, labels=[1,2,3,4,5])
+            client_rfm['M_Score'] = pd.qcut(client_rfm['Monetary'], 5, labels=[1,2,3,4,5])
+            
+            # Create RFM segments
+            client_rfm['RFM_Score'] = (
+                client_rfm['R_Score'].astype(int) * 100 +
+                client_rfm['F_Score'].astype(int) * 10 +
+                client_rfm['M_Score'].astype(int)
+            )
+            
+            # Define segments
+            def rfm_segment(score):
+                if score >= 444:
+                    return 'Champions'
+                elif score >= 334:
+                    return 'Loyal Customers'
+                elif score >= 244:
+                    return 'Potential Loyalists'
+                elif score >= 144:
+                    return 'At Risk'
+                else:
+                    return 'Lost Customers'
+            
+            client_rfm['Segment'] = client_rfm['RFM_Score'].apply(rfm_segment)
+            
+            # Visualize segments
+            segment_counts = client_rfm['Segment'].value_counts()
+            
+            fig = px.pie(
+                values=segment_counts.values,
+                names=segment_counts.index,
+                title="",
+                color_discrete_sequence=px.colors.qualitative.Set3
+            )
+            fig.update_layout(
+                height=400,
+                margin=dict(l=0, r=0, t=20, b=0)
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.write("Client RFM analysis requires client and revenue data")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📈 Customer Lifetime Value Distribution</div>', unsafe_allow_html=True)
+        
+        # CLV analysis
+        if 'customer_lifetime_value' in df.columns:
+            clv_data = df['customer_lifetime_value'].dropna()
+            
+            fig = px.histogram(
+                x=clv_data,
+                nbins=20,
+                title="",
+                labels={'x': 'Customer Lifetime Value ($)', 'y': 'Count'}
+            )
+            fig.update_layout(
+                height=400,
+                margin=dict(l=0, r=0, t=20, b=0),
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # CLV statistics
+            st.markdown("**📊 CLV Statistics:**")
+            st.markdown(f"• **Average CLV**: ${clv_data.mean():.2f}")
+            st.markdown(f"• **Median CLV**: ${clv_data.median():.2f}")
+            st.markdown(f"• **Top 10% CLV**: ${clv_data.quantile(0.9):.2f}")
+            st.markdown(f"• **Total CLV**: ${clv_data.sum():.2f}")
+        else:
+            # Generate simulated CLV data
+            clv_values = np.random.lognormal(8, 1, len(df))
+            
+            fig = px.histogram(
+                x=clv_values,
+                nbins=20,
+                title="",
+                labels={'x': 'Customer Lifetime Value ($)', 'y': 'Count'}
+            )
+            fig.update_layout(
+                height=400,
+                margin=dict(l=0, r=0, t=20, b=0),
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render_reports():
+    st.markdown('<h2 class="section-header">📊 Advanced Reports & Export</h2>', unsafe_allow_html=True)
+    
+    # Report generation options
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📈 Executive Performance Summary</div>', unsafe_allow_html=True)
+        
+        metrics = process_call_metrics()
+        
+        summary_data = {
+            'Metric': [
+                'Total Calls', 'Success Rate (%)', 'Avg Duration (min)', 
+                'Total Cost ($)', 'Avg Sentiment', 'Appointments',
+                'Avg Response Time (min)', 'Active Agents', 'Avg Satisfaction',
+                'Total Revenue ($)', 'Avg Conversion (%)', 'AI Accuracy (%)',
+                'Escalations', 'Follow-ups Required'
+            ],
+            'Value': [
+                f"{metrics['total_calls']:,}",
+                f"{metrics['success_rate']:.1f}%",
+                f"{metrics['avg_call_duration']:.1f}",
+                f"${metrics['total_cost']:.2f}",
+                f"{metrics['avg_sentiment']:.2f}",
+                f"{metrics['appointments_scheduled']:,}",
+                f"{metrics['avg_response_time']:.1f}",
+                f"{metrics['total_agents']:,}",
+                f"{metrics['avg_satisfaction']:.2f}",
+                f"${metrics['total_revenue']:,.0f}",
+                f"{metrics['avg_conversion']:.1f}%",
+                f"{metrics['avg_ai_accuracy']:.1f}%",
+                f"{metrics['escalations']:,}",
+                f"{metrics['follow_ups']:,}"
+            ],
+            'Status': [
+                '🟢 Good', '🟢 Excellent', '🟡 Average', '🟢 Good',
+                '🟢 Good', '🟢 Good', '🟢 Good', '🟢 Stable',
+                '🟢 Good', '🟢 Excellent', '🟢 Good', '🟢 Excellent',
+                '🟡 Monitor', '🟡 Monitor'
+            ]
+        }
+        
+        summary_df = pd.DataFrame(summary_data)
+        st.dataframe(summary_df, use_container_width=True, hide_index=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📥 Export Options</div>', unsafe_allow_html=True)
+        
+        # Export full data
+        if export_format == "CSV":
+            export_data = df.to_csv(index=False)
+            file_extension = "csv"
+            mime_type = "text/csv"
+        elif export_format == "Excel":
+            buffer = io.BytesIO()
+            df.to_excel(buffer, index=False)
+            export_data = buffer.getvalue()
+            file_extension = "xlsx"
+            mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        else:  # JSON
+            export_data = df.to_json(orient='records', indent=2)
+            file_extension = "json"
+            mime_type = "application/json"
+        
+        st.download_button(
+            label=f"📄 Export Full Dataset ({export_format})",
+            data=export_data,
+            file_name=f"aiva_call_data_{current_time.strftime('%Y%m%d_%H%M%S')}.{file_extension}",
+            mime=mime_type,
+            use_container_width=True
+        )
+        
+        # Export agent summary
+        if 'voice_agent_name' in df.columns:
+            # standardize_columns guarantees these columns exist
+            agent_summary = rollup(df, 'voice_agent_name', {
+                'call_id': 'count',
+                'call_success': 'yes_count',
+                'cost': 'sum',
+                'revenue_impact': 'sum'
+            }).reset_index()
             
             if export_format == "CSV":
                 agent_export = agent_summary.to_csv(index=False)
@@ -2392,8 +3163,7 @@ elif st.session_state.current_page == 'Reports':
         
         if 'revenue_impact' in df.columns and 'call_date' in df.columns:
             try:
-                df['call_date_parsed'] = pd.to_datetime(df['call_date'])
-                revenue_trend = df.groupby('call_date_parsed')['revenue_impact'].sum().reset_index()
+                revenue_trend = df['revenue_impact'].groupby(get_call_dates().rename('call_date_parsed')).sum().reset_index()
                 
                 fig = px.line(
                     revenue_trend,
@@ -2459,42 +3229,113 @@ elif st.session_state.current_page == 'Reports':
     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
     grid_response = create_enhanced_ag_grid(df, "complete_data_grid", height=600)
     st.markdown('</div>', unsafe_allow_html=True)
-
-#######################################
-# GOOGLE CALENDAR TAB
-#######################################
-
-elif st.session_state.current_page == 'Calendar':
-    st.markdown('<h2 class="section-header">📅 Google Calendar Integration</h2>', unsafe_allow_html=True)
     
-    # Calendar overview
-    st.markdown("""
-    <div class="data-source-info">
-        📅 <strong>Calendar Integration:</strong> Live Google Calendar events synchronized with call data | 
-        <strong>Source:</strong> Same Google Sheets data | 
-        <strong>Features:</strong> Appointment scheduling, follow-ups, and meeting management
-    </div>
-    """, unsafe_allow_html=True)
+    # Advanced reporting features
+    st.markdown('<h3 class="section-header">📊 Advanced Reporting & Business Intelligence</h3>', unsafe_allow_html=True)
     
-    # Calendar metrics
-    col1, col2, col3, col4 = st.columns(4)
+    # Report generation options
+    col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown(create_kpi_card(
-            "📅 Today's Meetings",
-            str(len(df[df['appointment_scheduled'] == 'Yes'])),
-            "+3 vs yesterday",
-            "positive"
-        ), unsafe_allow_html=True)
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📋 Report Templates</div>', unsafe_allow_html=True)
+        
+        report_templates = [
+            "📈 Daily Performance Summary",
+            "📊 Weekly Analytics Report",
+            "🎯 Monthly KPI Dashboard",
+            "👥 Agent Performance Review",
+            "💰 Revenue Impact Analysis",
+            "📞 Call Quality Assessment",
+            "🔮 Predictive Analytics Report",
+            "📋 Compliance & Audit Report"
+        ]
+        
+        for template in report_templates:
+            if st.button(template, key=f"template_{template}", use_container_width=True):
+                st.success(f"Generating {template}...")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
-        st.markdown(create_kpi_card(
-            "⏰ Upcoming Calls",
-            str(len(df[df['follow_up_required'] == 'Yes'])),
-            "+5 vs yesterday",
-            "positive"
-        ), unsafe_allow_html=True)
-    
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">⚙️ Custom Report Builder</div>', unsafe_allow_html=True)
+        
+        # Custom report options
+        report_type = st.selectbox("Report Type", ["Summary", "Detailed", "Executive", "Technical"])
+        date_range = st.selectbox("Date Range", ["Today", "This Week", "This Month", "Last 30 Days", "Custom"])
+        
+        metrics = st.multiselect(
+            "Select Metrics",
+            ["Call Volume", "Success Rate", "Revenue", "Agent Performance", "Customer Satisfaction", "Response Time"],
+            default=["Call Volume", "Success Rate"]
+        )
+        
+        format_type = st.selectbox("Export Format", ["PDF", "Excel", "PowerPoint", "CSV"])
+        
+        if st.button("🚀 Generate Custom Report", use_container_width=True):
+            st.success(f"Generating {report_type} report with {len(metrics)} metrics in {format_type} format...")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📤 Automated Reporting</div>', unsafe_allow_html=True)
+        
+        # Automated reporting settings
+        auto_reports = st.checkbox("Enable Automated Reports", value=True)
+        
+        if auto_reports:
+            schedule = st.selectbox("Schedule", ["Daily", "Weekly", "Monthly"])
+            recipients = st.text_area("Email Recipients", "manager@company.com\nsupervisor@company.com")
+            
+            report_types = st.multiselect(
+                "Automated Reports",
+                ["Performance Summary", "KPI Dashboard", "Agent Review", "Revenue Report"],
+                default=["Performance Summary"]
+            )
+            
+            if st.button("💾 Save Automation Settings", use_container_width=True):
+                st.success("Automated reporting configured successfully!")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+#######################################
+# GOOGLE CALENDAR TAB
+#######################################
+
+def render_calendar():
+    st.markdown('<h2 class="section-header">📅 Google Calendar Integration</h2>', unsafe_allow_html=True)
+    
+    # Calendar overview
+    st.markdown("""
+    <div class="data-source-info">
+        📅 <strong>Calendar Integration:</strong> Live Google Calendar events synchronized with call data | 
+        <strong>Source:</strong> Same Google Sheets data | 
+        <strong>Features:</strong> Appointment scheduling, follow-ups, and meeting management
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Calendar metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown(create_kpi_card(
+            "📅 Today's Meetings",
+            str(len(df[df['appointment_scheduled'] == 'Yes'])),
+            "+3 vs yesterday",
+            "positive"
+        ), unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(create_kpi_card(
+            "⏰ Upcoming Calls",
+            str(len(df[df['follow_up_required'] == 'Yes'])),
+            "+5 vs yesterday",
+            "positive"
+        ), unsafe_allow_html=True)
+    
     with col3:
         st.markdown(create_kpi_card(
             "🔄 Follow-ups",
@@ -2583,34 +3424,34 @@ elif st.session_state.current_page == 'Calendar':
     # Upcoming events from call data
     st.markdown('<h3 class="section-header">📋 Upcoming Events & Follow-ups</h3>', unsafe_allow_html=True)
     
-    # Create events based on call data
-    events_data = []
-    for _, row in df.iterrows():
-        if row.get('appointment_scheduled') == 'Yes':
-            event_date = current_time + timedelta(days=np.random.randint(1, 7))
-            events_data.append({
-                'Event Type': 'Scheduled Appointment',
-                'Client': row.get('client_name', 'Unknown'),
-                'Agent': row.get('voice_agent_name', 'Unknown'),
-                'Date': event_date.strftime('%Y-%m-%d'),
-                'Time': f"{np.random.randint(9, 17)}:{np.random.choice(['00', '30'])}",
-                'Status': 'Confirmed',
-                'Priority': 'High' if row.get('customer_tier') == 'Premium' else 'Medium'
-            })
+    # Upcoming events for the selected window only; dense windows are summarised per day
+    events_window = st.date_input(
+        "📆 Events Window",
+        value=[current_time.date(), (current_time + timedelta(days=6)).date()],
+        help="Only events in this window are loaded into the grid"
+    )
+    if isinstance(events_window, (list, tuple)) and len(events_window) == 2:
+        window_start, window_end = events_window
+    else:
+        window_start = window_end = events_window[0] if isinstance(events_window, (list, tuple)) and events_window else current_time.date()
+    
+    events_index = CallIntervalIndex(get_upcoming_events(df, dataset_version))
+    window_events = events_index.overlapping(pd.Timestamp(window_start), pd.Timestamp(window_end) + pd.Timedelta(days=1))
+    events_data = window_events[EVENT_COLUMNS].to_dict('records')
+    
+    if len(window_events) > MAX_GRID_EVENTS:
+        st.info(f"📅 {len(window_events):,} events in this window – showing daily totals. Narrow the window to see individual events.")
         
-        if row.get('follow_up_required') == 'Yes':
-            event_date = current_time + timedelta(days=np.random.randint(1, 3))
-            events_data.append({
-                'Event Type': 'Follow-up Call',
-                'Client': row.get('client_name', 'Unknown'),
-                'Agent': row.get('voice_agent_name', 'Unknown'),
-                'Date': event_date.strftime('%Y-%m-%d'),
-                'Time': f"{np.random.randint(9, 17)}:{np.random.choice(['00', '30'])}",
-                'Status': 'Pending',
-                'Priority': 'Medium'
-            })
+        daily_events = window_events.pivot_table(index='Date', columns='Event Type', values='Client',
+                                                 aggfunc='size', fill_value=0)
+        daily_events['Total'] = daily_events.sum(axis=1)
+        
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">📅 Calendar Events per Day</div>', unsafe_allow_html=True)
+        st.dataframe(daily_events.reset_index(), use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
     
-    if events_data:
+    elif events_data:
         events_df = pd.DataFrame(events_data)
         
         # Display events in AG Grid
@@ -2720,44 +3561,18 @@ END:VEVENT
                 mime="text/calendar"
             )
 
+
 #######################################
 # REAL-TIME MONITOR TAB
 #######################################
 
-elif st.session_state.current_page == 'Real-time Monitor':
+def render_realtime_monitor():
     st.markdown('<h2 class="section-header">⚡ Real-time Call Center Monitor</h2>', unsafe_allow_html=True)
     
-    # Auto-refresh functionality
-    if auto_refresh:
-        time.sleep(1)  # Small delay for demo
-        st.rerun()
-    
-    # Real-time metrics
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("🔴 Live Calls", "3", delta="1")
-    
-    with col2:
-        st.metric("⏱️ Avg Wait Time", "2.3 min", delta="-0.5 min")
-    
-    with col3:
-        st.metric("👥 Available Agents", "12", delta="2")
-    
-    with col4:
-        st.metric("📈 Calls/Hour", "47", delta="5")
-    
-    # Real-time charts
-    col1, col2 = st.columns(2)
+    live_channel = get_live_channel(call_store.name) if call_store is not None else None
     
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📊 Live Call Volume</div>', unsafe_allow_html=True)
-        
-        # Simulate real-time data
-        import random
+    def volume_figure(live_calls):
         hours = list(range(24))
-        live_calls = [random.randint(10, 50) for _ in hours]
         
         fig = px.line(
             x=hours,
@@ -2774,14 +3589,9 @@ elif st.session_state.current_page == 'Real-time Monitor':
             plot_bgcolor='rgba(0,0,0,0)',
             paper_bgcolor='rgba(0,0,0,0)'
         )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+        return fig
     
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">🎯 Agent Status</div>', unsafe_allow_html=True)
-        
+    def status_figure():
         agent_status = {
             'Status': ['Available', 'On Call', 'Break', 'Offline'],
             'Count': [12, 3, 2, 1]
@@ -2800,884 +3610,236 @@ elif st.session_state.current_page == 'Real-time Monitor':
             plot_bgcolor='rgba(0,0,0,0)',
             paper_bgcolor='rgba(0,0,0,0)'
         )
-        st.plotly_chart(fig, use_container_width=True)
+        return fig
+    
+    def activity_feed(at):
+        # Simulate live activities
+        activities = [
+            "🟢 New call started - Agent Sarah - Client: John Smith",
+            "✅ Call completed successfully - Agent Mike - Duration: 5:23",
+            "📅 Appointment scheduled - Agent Lisa - Client: ABC Corp",
+            "🔄 Call transferred to supervisor - Agent Tom",
+            "⚠️ High priority call - Agent Sarah - VIP Client",
+            "✅ Call completed successfully - Agent Anna - Duration: 3:45"
+        ]
+        
+        return "\n\n".join(f"**{at.strftime('%H:%M:%S')}** - {activity}" for activity in activities)
+    
+    # Only this fragment reruns while the page is open (no full-script sleep/rerun loop); the simulated
+    # charts and feed are built into the session's snapshot only when live events arrive, and every tick
+    # re-emits those same objects
+    @st.fragment(run_every=LIVE_TICK_SECONDS if auto_refresh else None)
+    def realtime_monitor():
+        live_version = live_channel.version if live_channel is not None else 0
+        if st.session_state.get('realtime_snapshot', {}).get('version') != live_version:
+            live_calls = [random.randint(10, 50) for _ in range(24)]
+            st.session_state.realtime_snapshot = {
+                'version': live_version,
+                'volume_figure': volume_figure(live_calls),
+                'status_figure': status_figure(),
+                'feed': activity_feed(datetime.now())
+            }
+        snapshot = st.session_state.realtime_snapshot
+        
+        if live_channel is not None and live_channel.last_event_at:
+            st.caption(f"📡 {live_channel.events:,} live events · last {time.time() - live_channel.last_event_at:,.0f}s ago")
+        
+        # Real-time metrics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("🔴 Live Calls", "3", delta="1")
+        
+        with col2:
+            st.metric("⏱️ Avg Wait Time", "2.3 min", delta="-0.5 min")
+        
+        with col3:
+            st.metric("👥 Available Agents", "12", delta="2")
+        
+        with col4:
+            st.metric("📈 Calls/Hour", "47", delta="5")
+        
+        # Real-time charts
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+            st.markdown('<div class="chart-title">📊 Live Call Volume</div>', unsafe_allow_html=True)
+            
+            st.plotly_chart(snapshot['volume_figure'], use_container_width=True)
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+            st.markdown('<div class="chart-title">🎯 Agent Status</div>', unsafe_allow_html=True)
+            
+            st.plotly_chart(snapshot['status_figure'], use_container_width=True)
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Live activity feed
+        st.markdown('<h3 class="section-header">📡 Live Activity Feed</h3>', unsafe_allow_html=True)
+        
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        
+        st.markdown(snapshot['feed'])
         
         st.markdown('</div>', unsafe_allow_html=True)
     
-    # Live activity feed
-    st.markdown('<h3 class="section-header">📡 Live Activity Feed</h3>', unsafe_allow_html=True)
-    
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    
-    # Simulate live activities
-    activities = [
-        "🟢 New call started - Agent Sarah - Client: John Smith",
-        "✅ Call completed successfully - Agent Mike - Duration: 5:23",
-        "📅 Appointment scheduled - Agent Lisa - Client: ABC Corp",
-        "🔄 Call transferred to supervisor - Agent Tom",
-        "⚠️ High priority call - Agent Sarah - VIP Client",
-        "✅ Call completed successfully - Agent Anna - Duration: 3:45"
-    ]
+    realtime_monitor()
     
-    for activity in activities:
-        st.write(f"**{current_time.strftime('%H:%M:%S')}** - {activity}")
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-
-#######################################
-# ADVANCED FEATURES & ENHANCEMENTS
-#######################################
-
-# Add AI-powered insights section
-if st.session_state.current_page == 'Dashboard':
-    st.markdown('<h3 class="section-header">🧠 AI-Powered Insights & Recommendations</h3>', unsafe_allow_html=True)
+    # Real-time monitoring enhancements
+    st.markdown('<h3 class="section-header">🔔 Alert Management & Notifications</h3>', unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">🎯 Performance Insights</div>', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">⚠️ Active Alerts</div>', unsafe_allow_html=True)
         
-        insights = [
-            "📈 Call success rate increased by 15% this week",
-            "⚡ Average response time improved by 23 seconds",
-            "🎯 Agent Sarah shows highest conversion rate (87%)",
-            "📞 Peak call volume occurs between 2-4 PM",
-            "💡 Sentiment scores correlate with call duration",
-            "🔄 Follow-up calls have 34% higher success rate"
+        alerts = [
+            {"type": "Critical", "message": "Call queue exceeding 5 minutes", "time": "2 min ago"},
+            {"type": "Warning", "message": "Agent utilization below 70%", "time": "5 min ago"},
+            {"type": "Info", "message": "New high-value client call", "time": "8 min ago"},
+            {"type": "Critical", "message": "System response time degraded", "time": "12 min ago"}
         ]
         
-        for insight in insights:
-            st.write(f"• {insight}")
+        for alert in alerts:
+            color = "#ef4444" if alert["type"] == "Critical" else "#f59e0b" if alert["type"] == "Warning" else "#3b82f6"
+            st.markdown(f"""
+            <div style="border-left: 4px solid {color}; padding: 1rem; margin: 0.5rem 0; background: rgba(0,0,0,0.02); border-radius: 8px;">
+                <strong>{alert["type"]}</strong> - {alert["time"]}<br>
+                {alert["message"]}
+            </div>
+            """, unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">🚀 Optimization Recommendations</div>', unsafe_allow_html=True)
+        st.markdown('<div class="chart-title">🔧 Alert Configuration</div>', unsafe_allow_html=True)
         
-        recommendations = [
-            "🎯 Schedule more agents during 2-4 PM peak hours",
-            "📚 Provide additional training for agents with <80% success rate",
-            "⏰ Implement callback system for high-priority clients",
-            "📊 Use sentiment analysis to identify at-risk customers",
-            "🔄 Automate follow-up scheduling for successful calls",
-            "💬 Deploy chatbot for initial customer screening"
-        ]
+        # Alert configuration
+        st.markdown("**Performance Thresholds:**")
+        success_threshold = st.slider("Success Rate Alert (%)", 70, 95, 85)
+        response_threshold = st.slider("Response Time Alert (min)", 1, 10, 3)
+        queue_threshold = st.slider("Queue Length Alert", 3, 15, 5)
         
-        for rec in recommendations:
-            st.write(f"• {rec}")
+        st.markdown("**Notification Settings:**")
+        email_alerts = st.checkbox("Email Notifications", value=True)
+        sms_alerts = st.checkbox("SMS Notifications", value=False)
+        slack_alerts = st.checkbox("Slack Integration", value=True)
+        
+        if st.button("💾 Save Alert Settings", use_container_width=True):
+            st.success("Alert configuration saved successfully!")
         
         st.markdown('</div>', unsafe_allow_html=True)
 
-# Add predictive analytics section
-if st.session_state.current_page == 'Call Analytics':
-    st.markdown('<h3 class="section-header">🔮 Predictive Analytics & Forecasting</h3>', unsafe_allow_html=True)
+
+def render_transcript_search():
+    st.markdown('<h2 class="section-header">🔎 Transcript & Summary Search</h2>', unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
+    query = st.text_input("Search transcripts, summaries, action items and tags",
+                          placeholder='e.g. "cancel my subscription" refund', key="transcript_query")
     
+    # Search filters
+    col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📈 Call Volume Prediction</div>', unsafe_allow_html=True)
-        
-        # Generate prediction data
-        dates = pd.date_range(start=current_time, periods=30, freq='D')
-        base_calls = 20
-        predicted_calls = [base_calls + np.random.randint(-5, 8) + int(np.sin(i/7) * 3) for i in range(30)]
-        
-        prediction_df = pd.DataFrame({
-            'Date': dates,
-            'Predicted Calls': predicted_calls,
-            'Confidence': ['High' if abs(c - base_calls) < 5 else 'Medium' for c in predicted_calls]
-        })
-        
-        fig = px.line(
-            prediction_df,
-            x='Date',
-            y='Predicted Calls',
-            title="",
-            color_discrete_sequence=['#3b82f6']
-        )
-        fig.add_hline(y=base_calls, line_dash="dash", line_color="red", annotation_text="Average")
-        fig.update_layout(
-            height=400,
-            margin=dict(l=0, r=0, t=20, b=0),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
+        search_dates = st.date_input("Filter by Date Range", value=[], key="transcript_dates")
     with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">🎯 Success Rate Forecast</div>', unsafe_allow_html=True)
-        
-        # Generate success rate prediction
-        success_rates = [95 + np.random.randint(-3, 4) for _ in range(30)]
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=dates,
-            y=success_rates,
-            mode='lines+markers',
-            name='Predicted Success Rate',
-            line=dict(color='#10b981', width=3),
-            marker=dict(size=6)
-        ))
-        fig.add_hline(y=95, line_dash="dash", line_color="orange", annotation_text="Target")
-        fig.update_layout(
-            height=400,
-            margin=dict(l=0, r=0, t=20, b=0),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            yaxis_title="Success Rate (%)",
-            xaxis_title="Date"
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-
-# Add advanced agent analytics
-if st.session_state.current_page == 'Agent Performance':
-    st.markdown('<h3 class="section-header">🏆 Advanced Agent Analytics & Coaching</h3>', unsafe_allow_html=True)
-    
-    # Agent performance matrix
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📊 Performance Matrix</div>', unsafe_allow_html=True)
-        
-        # Create performance matrix data
-        agents = df['voice_agent_name'].unique()[:10]
-        performance_data = []
-        
-        for agent in agents:
-            agent_data = df[df['voice_agent_name'] == agent]
-            performance_data.append({
-                'Agent': agent,
-                'Success Rate': np.random.uniform(85, 98),
-                'Avg Call Duration': np.random.uniform(2, 6),
-                'Customer Satisfaction': np.random.uniform(8, 10),
-                'Calls Handled': len(agent_data)
-            })
-        
-        perf_df = pd.DataFrame(performance_data)
-        
-        fig = px.scatter(
-            perf_df,
-            x='Success Rate',
-            y='Customer Satisfaction',
-            size='Calls Handled',
-            color='Avg Call Duration',
-            hover_name='Agent',
-            title="",
-            color_continuous_scale='Viridis'
-        )
-        fig.update_layout(
-            height=400,
-            margin=dict(l=0, r=0, t=20, b=0),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">🎯 Coaching Recommendations</div>', unsafe_allow_html=True)
-        
-        # Agent coaching recommendations
-        coaching_data = []
-        for _, row in perf_df.iterrows():
-            recommendations = []
-            if row['Success Rate'] < 90:
-                recommendations.append("Focus on closing techniques")
-            if row['Avg Call Duration'] > 4:
-                recommendations.append("Improve call efficiency")
-            if row['Customer Satisfaction'] < 9:
-                recommendations.append("Enhance customer rapport")
-            if not recommendations:
-                recommendations.append("Maintain excellent performance")
-            
-            coaching_data.append({
-                'Agent': row['Agent'],
-                'Priority': 'High' if row['Success Rate'] < 90 else 'Medium' if row['Success Rate'] < 95 else 'Low',
-                'Recommendations': ', '.join(recommendations)
-            })
-        
-        coaching_df = pd.DataFrame(coaching_data)
-        
-        # Display coaching recommendations
-        for _, row in coaching_df.iterrows():
-            priority_color = '#ef4444' if row['Priority'] == 'High' else '#f59e0b' if row['Priority'] == 'Medium' else '#10b981'
-            st.markdown(f"""
-            <div style="border-left: 4px solid {priority_color}; padding: 1rem; margin: 0.5rem 0; background: rgba(0,0,0,0.02); border-radius: 8px;">
-                <strong>{row['Agent']}</strong> ({row['Priority']} Priority)<br>
-                <em>{row['Recommendations']}</em>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-
-# Add client journey mapping
-if st.session_state.current_page == 'Client Profiles':
-    st.markdown('<h3 class="section-header">🗺️ Client Journey Mapping & Lifecycle Analysis</h3>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">🔄 Customer Lifecycle Stages</div>', unsafe_allow_html=True)
-        
-        lifecycle_data = {
-            'Stage': ['Lead', 'Prospect', 'Customer', 'Advocate', 'Churned'],
-            'Count': [45, 32, 78, 23, 12],
-            'Conversion Rate': [71, 85, 92, 95, 0]
-        }
-        
-        fig = px.funnel(
-            lifecycle_data,
-            x='Count',
-            y='Stage',
-            title=""
-        )
-        fig.update_layout(
-            height=400,
-            margin=dict(l=0, r=0, t=20, b=0),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📈 Customer Value Analysis</div>', unsafe_allow_html=True)
-        
-        # Customer value segments
-        value_data = {
-            'Segment': ['High Value', 'Medium Value', 'Low Value', 'At Risk'],
-            'Customers': [25, 45, 65, 15],
-            'Revenue': [125000, 90000, 32000, 8000]
-        }
-        
-        fig = px.scatter(
-            x=value_data['Customers'],
-            y=value_data['Revenue'],
-            size=value_data['Customers'],
-            color=value_data['Segment'],
-            hover_name=value_data['Segment'],
-            title=""
-        )
-        fig.update_layout(
-            height=400,
-            margin=dict(l=0, r=0, t=20, b=0),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            xaxis_title="Number of Customers",
-            yaxis_title="Revenue ($)"
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-
-# Add advanced reporting features
-if st.session_state.current_page == 'Reports':
-    st.markdown('<h3 class="section-header">📊 Advanced Reporting & Business Intelligence</h3>', unsafe_allow_html=True)
-    
-    # Report generation options
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📋 Report Templates</div>', unsafe_allow_html=True)
-        
-        report_templates = [
-            "📈 Daily Performance Summary",
-            "📊 Weekly Analytics Report",
-            "🎯 Monthly KPI Dashboard",
-            "👥 Agent Performance Review",
-            "💰 Revenue Impact Analysis",
-            "📞 Call Quality Assessment",
-            "🔮 Predictive Analytics Report",
-            "📋 Compliance & Audit Report"
-        ]
-        
-        for template in report_templates:
-            if st.button(template, key=f"template_{template}", use_container_width=True):
-                st.success(f"Generating {template}...")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">⚙️ Custom Report Builder</div>', unsafe_allow_html=True)
-        
-        # Custom report options
-        report_type = st.selectbox("Report Type", ["Summary", "Detailed", "Executive", "Technical"])
-        date_range = st.selectbox("Date Range", ["Today", "This Week", "This Month", "Last 30 Days", "Custom"])
-        
-        metrics = st.multiselect(
-            "Select Metrics",
-            ["Call Volume", "Success Rate", "Revenue", "Agent Performance", "Customer Satisfaction", "Response Time"],
-            default=["Call Volume", "Success Rate"]
-        )
-        
-        format_type = st.selectbox("Export Format", ["PDF", "Excel", "PowerPoint", "CSV"])
-        
-        if st.button("🚀 Generate Custom Report", use_container_width=True):
-            st.success(f"Generating {report_type} report with {len(metrics)} metrics in {format_type} format...")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📤 Automated Reporting</div>', unsafe_allow_html=True)
-        
-        # Automated reporting settings
-        auto_reports = st.checkbox("Enable Automated Reports", value=True)
-        
-        if auto_reports:
-            schedule = st.selectbox("Schedule", ["Daily", "Weekly", "Monthly"])
-            recipients = st.text_area("Email Recipients", "manager@company.com\nsupervisor@company.com")
-            
-            report_types = st.multiselect(
-                "Automated Reports",
-                ["Performance Summary", "KPI Dashboard", "Agent Review", "Revenue Report"],
-                default=["Performance Summary"]
-            )
-            
-            if st.button("💾 Save Automation Settings", use_container_width=True):
-                st.success("Automated reporting configured successfully!")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-
-# Add real-time monitoring enhancements
-if st.session_state.current_page == 'Real-time Monitor':
-    st.markdown('<h3 class="section-header">🔔 Alert Management & Notifications</h3>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">⚠️ Active Alerts</div>', unsafe_allow_html=True)
-        
-        alerts = [
-            {"type": "Critical", "message": "Call queue exceeding 5 minutes", "time": "2 min ago"},
-            {"type": "Warning", "message": "Agent utilization below 70%", "time": "5 min ago"},
-            {"type": "Info", "message": "New high-value client call", "time": "8 min ago"},
-            {"type": "Critical", "message": "System response time degraded", "time": "12 min ago"}
-        ]
-        
-        for alert in alerts:
-            color = "#ef4444" if alert["type"] == "Critical" else "#f59e0b" if alert["type"] == "Warning" else "#3b82f6"
-            st.markdown(f"""
-            <div style="border-left: 4px solid {color}; padding: 1rem; margin: 0.5rem 0; background: rgba(0,0,0,0.02); border-radius: 8px;">
-                <strong>{alert["type"]}</strong> - {alert["time"]}<br>
-                {alert["message"]}
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">🔧 Alert Configuration</div>', unsafe_allow_html=True)
-        
-        # Alert configuration
-        st.markdown("**Performance Thresholds:**")
-        success_threshold = st.slider("Success Rate Alert (%)", 70, 95, 85)
-        response_threshold = st.slider("Response Time Alert (min)", 1, 10, 3)
-        queue_threshold = st.slider("Queue Length Alert", 3, 15, 5)
-        
-        st.markdown("**Notification Settings:**")
-        email_alerts = st.checkbox("Email Notifications", value=True)
-        sms_alerts = st.checkbox("SMS Notifications", value=False)
-        slack_alerts = st.checkbox("Slack Integration", value=True)
-        
-        if st.button("💾 Save Alert Settings", use_container_width=True):
-            st.success("Alert configuration saved successfully!")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-
-#######################################
-# COMPREHENSIVE DATA ENHANCEMENT & ADDITIONAL FEATURES
-#######################################
-
-# Add comprehensive data quality monitoring
-if st.session_state.current_page == 'Dashboard':
-    st.markdown('<h3 class="section-header">📊 Data Quality & Completeness Monitor</h3>', unsafe_allow_html=True)
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">🔍 Data Completeness</div>', unsafe_allow_html=True)
-        
-        # Calculate data completeness for each column
-        completeness_data = []
-        for col in df.columns:
-            non_null_count = df[col].notna().sum()
-            completeness_pct = (non_null_count / len(df)) * 100
-            completeness_data.append({
-                'Column': col,
-                'Completeness': completeness_pct,
-                'Missing': len(df) - non_null_count
-            })
-        
-        completeness_df = pd.DataFrame(completeness_data)
-        
-        # Show top 10 most complete columns
-        top_complete = completeness_df.nlargest(10, 'Completeness')
-        
-        fig = px.bar(
-            top_complete,
-            x='Completeness',
-            y='Column',
-            orientation='h',
-            title="",
-            color='Completeness',
-            color_continuous_scale='Viridis'
-        )
-        fig.update_layout(
-            height=400,
-            margin=dict(l=0, r=0, t=20, b=0),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📈 Data Volume Trends</div>', unsafe_allow_html=True)
-        
-        # Generate data volume trends by date
-        if 'call_date' in df.columns:
-            try:
-                df['call_date_parsed'] = pd.to_datetime(df['call_date'], errors='coerce')
-                daily_volume = df.groupby(df['call_date_parsed'].dt.date).size().reset_index()
-                daily_volume.columns = ['Date', 'Call_Count']
-                
-                fig = px.line(
-                    daily_volume,
-                    x='Date',
-                    y='Call_Count',
-                    title="",
-                    markers=True
-                )
-                fig.update_layout(
-                    height=400,
-                    margin=dict(l=0, r=0, t=20, b=0),
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            except:
-                st.write("Date parsing not available for trend analysis")
-        else:
-            st.write("No date column available for trend analysis")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">🎯 Data Quality Score</div>', unsafe_allow_html=True)
-        
-        # Calculate overall data quality score
-        overall_completeness = completeness_df['Completeness'].mean()
-        
-        # Quality score based on multiple factors
-        quality_factors = {
-            'Completeness': overall_completeness,
-            'Consistency': 85,  # Simulated
-            'Accuracy': 92,     # Simulated
-            'Timeliness': 88    # Simulated
-        }
-        
-        overall_quality = sum(quality_factors.values()) / len(quality_factors)
-        
-        fig = go.Figure(go.Indicator(
-            mode = "gauge+number+delta",
-            value = overall_quality,
-            domain = {'x': [0, 1], 'y': [0, 1]},
-            title = {'text': "Overall Quality Score"},
-            delta = {'reference': 85},
-            gauge = {
-                'axis': {'range': [None, 100]},
-                'bar': {'color': "#10b981"},
-                'steps': [
-                    {'range': [0, 50], 'color': "lightgray"},
-                    {'range': [50, 80], 'color': "gray"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 90
-                }
-            }
-        ))
-        fig.update_layout(height=400, margin=dict(l=20, r=20, t=40, b=20))
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Show quality factors breakdown
-        for factor, score in quality_factors.items():
-            color = "#10b981" if score >= 90 else "#f59e0b" if score >= 70 else "#ef4444"
-            st.markdown(f"""
-            <div style="display: flex; justify-content: space-between; margin: 0.5rem 0; padding: 0.5rem; background: rgba(0,0,0,0.02); border-radius: 8px;">
-                <span>{factor}</span>
-                <span style="color: {color}; font-weight: bold;">{score:.1f}%</span>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-
-# Add advanced call pattern analysis
-if st.session_state.current_page == 'Call Analytics':
-    st.markdown('<h3 class="section-header">🕐 Advanced Call Pattern Analysis</h3>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📅 Call Patterns by Day of Week</div>', unsafe_allow_html=True)
-        
-        # Generate day of week analysis
-        if 'call_date' in df.columns:
-            try:
-                df['call_date_parsed'] = pd.to_datetime(df['call_date'], errors='coerce')
-                df['day_of_week'] = df['call_date_parsed'].dt.day_name()
-                
-                day_patterns = df.groupby('day_of_week').agg({
-                    'call_id': 'count',
-                    'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100 if len(x) > 0 else 0,
-                    'sentiment_score': 'mean'
-                }).reset_index()
-                
-                day_patterns.columns = ['Day', 'Call_Count', 'Success_Rate', 'Avg_Sentiment']
-                
-                # Reorder days
-                day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-                day_patterns['Day'] = pd.Categorical(day_patterns['Day'], categories=day_order, ordered=True)
-                day_patterns = day_patterns.sort_values('Day')
-                
-                fig = make_subplots(specs=[[{"secondary_y": True}]])
-                
-                fig.add_trace(
-                    go.Bar(x=day_patterns['Day'], y=day_patterns['Call_Count'], name="Call Count"),
-                    secondary_y=False,
-                )
-                
-                fig.add_trace(
-                    go.Scatter(x=day_patterns['Day'], y=day_patterns['Success_Rate'], 
-                             mode='lines+markers', name="Success Rate (%)", line=dict(color='red')),
-                    secondary_y=True,
-                )
-                
-                fig.update_xaxes(title_text="Day of Week")
-                fig.update_yaxes(title_text="Call Count", secondary_y=False)
-                fig.update_yaxes(title_text="Success Rate (%)", secondary_y=True)
-                
-                fig.update_layout(
-                    height=400,
-                    margin=dict(l=0, r=0, t=20, b=0),
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            except:
-                st.write("Date parsing not available for day pattern analysis")
-        else:
-            st.write("No date column available for pattern analysis")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">⏰ Hourly Call Distribution</div>', unsafe_allow_html=True)
-        
-        # Generate hourly distribution
-        if 'call_hour' in df.columns:
-            hourly_dist = df.groupby('call_hour').size().reset_index()
-            hourly_dist.columns = ['Hour', 'Call_Count']
-            
-            fig = px.bar(
-                hourly_dist,
-                x='Hour',
-                y='Call_Count',
-                title="",
-                color='Call_Count',
-                color_continuous_scale='Blues'
-            )
-            fig.update_layout(
-                height=400,
-                margin=dict(l=0, r=0, t=20, b=0),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        search_agents = st.multiselect("Filter by Agent", df['voice_agent_name'].unique() if 'voice_agent_name' in df.columns else [])
+    with col3:
+        search_intents = st.multiselect("Filter by Intent", df['intent_detected'].unique() if 'intent_detected' in df.columns else [])
+    with col4:
+        result_limit = st.selectbox("Results", [25, 50, 100, 250], index=1)
+    
+    # Shared index for this data source: only calls that landed since the last sync (or last save) are tokenized
+    started = time.perf_counter()
+    transcript_index = get_transcript_index(dataset_version[0] if dataset_version else "session", df,
+                                            version=dataset_version, persist=dataset_version is not None,
+                                            text_store=call_store)
+    index_info = transcript_index.info()
+    
+    if query.strip():
+        # Date range and filters narrow the candidate calls; BM25 ranks the matches among them
+        date_start, date_end = date_window(search_dates)
+        candidates = get_date_partitions().rows_between(date_start, date_end)
+        if search_agents or search_intents:
+            candidates = get_filter_index().select(
+                isin={'voice_agent_name': search_agents, 'intent_detected': search_intents},
+                within=candidates
+            ).positions
+        
+        hit_rows, hit_scores = transcript_index.search(query, within=candidates, limit=result_limit)
+        search_ms = (time.perf_counter() - started) * 1000
+        
+        st.caption(f"📚 {len(hit_rows):,} matching calls in {search_ms:.1f} ms · {index_info['rows']:,} calls indexed · "
+                   f"{index_info['terms']:,} terms in {index_info['segments']} segments")
+        
+        if len(hit_rows) == 0:
+            st.info("No calls match this search. Quoted phrases must appear word for word.")
         else:
-            # Generate simulated hourly data
-            hours = list(range(24))
-            call_counts = [np.random.poisson(5 + 10 * np.sin((h - 6) * np.pi / 12)) for h in hours]
+            phrases, loose = parse_query(query)
+            highlight_terms = loose + [term for phrase in phrases for term in phrase]
+            hits = with_call_text(df.take(hit_rows))
             
-            fig = px.bar(
-                x=hours,
-                y=call_counts,
-                title="",
-                labels={'x': 'Hour', 'y': 'Call Count'}
-            )
-            fig.update_layout(
-                height=400,
-                margin=dict(l=0, r=0, t=20, b=0),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+            for (_, call), score in zip(hits.iterrows(), hit_scores):
+                with st.expander(f"📞 {call.get('call_id', '')} · {call.get('client_name', 'Unknown')} · "
+                                 f"{call.get('voice_agent_name', 'Unknown')} · {call.get('call_date', '')} · score {score:.2f}"):
+                    col1, col2 = st.columns([3, 1])
+                    with col1:
+                        for col in ['transcript', 'summary', 'action_items']:
+                            if col in call.index and pd.notna(call[col]) and str(call[col]).strip():
+                                st.markdown(f"**{col.replace('_', ' ').title()}:** {highlight_snippet(call[col], highlight_terms)}")
+                    with col2:
+                        st.write(f"**Intent:** {call.get('intent_detected', 'N/A')}")
+                        st.write(f"**Outcome:** {call.get('call_outcome', 'N/A')}")
+                        st.write(f"**Sentiment:** {call.get('sentiment_score', 'N/A')}")
+    else:
+        st.caption(f"📚 {index_info['rows']:,} calls indexed · {index_info['terms']:,} terms in {index_info['segments']} segments")
+        st.info('💡 Quote phrases for exact matches, e.g. "cancel my subscription"; other words rank calls by relevance (BM25).')
 
-# Add comprehensive agent performance deep dive
-if st.session_state.current_page == 'Agent Performance':
-    st.markdown('<h3 class="section-header">🎯 Agent Performance Deep Dive & Skills Analysis</h3>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">🏅 Agent Ranking & Performance Tiers</div>', unsafe_allow_html=True)
-        
-        # Create comprehensive agent performance analysis
-        if 'voice_agent_name' in df.columns:
-            agent_performance = df.groupby('voice_agent_name').agg({
-                'call_id': 'count',
-                'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100 if len(x) > 0 else 0,
-                'sentiment_score': 'mean',
-                'customer_satisfaction': 'mean',
-                'revenue_impact': 'sum',
-                'call_duration_seconds': 'mean'
-            }).reset_index()
-            
-            agent_performance.columns = ['Agent', 'Total_Calls', 'Success_Rate', 'Avg_Sentiment', 
-                                       'Avg_Satisfaction', 'Total_Revenue', 'Avg_Duration']
-            
-            # Calculate composite performance score
-            agent_performance['Performance_Score'] = (
-                agent_performance['Success_Rate'] * 0.4 +
-                agent_performance['Avg_Sentiment'] * 20 * 0.3 +
-                agent_performance['Avg_Satisfaction'] * 10 * 0.3
-            )
-            
-            # Assign performance tiers
-            agent_performance['Tier'] = pd.cut(
-                agent_performance['Performance_Score'],
-                bins=[0, 70, 85, 95, 100],
-                labels=['Developing', 'Proficient', 'Expert', 'Elite']
-            )
-            
-            # Sort by performance score
-            agent_performance = agent_performance.sort_values('Performance_Score', ascending=False)
-            
-            # Display top 10 agents
-            top_agents = agent_performance.head(10)
-            
-            fig = px.bar(
-                top_agents,
-                x='Performance_Score',
-                y='Agent',
-                orientation='h',
-                color='Tier',
-                title="",
-                color_discrete_map={
-                    'Elite': '#10b981',
-                    'Expert': '#3b82f6',
-                    'Proficient': '#f59e0b',
-                    'Developing': '#ef4444'
-                }
-            )
-            fig.update_layout(
-                height=400,
-                margin=dict(l=0, r=0, t=20, b=0),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.write("Agent performance data not available")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📊 Skills Gap Analysis</div>', unsafe_allow_html=True)
-        
-        # Skills analysis based on performance metrics
-        skills_data = {
-            'Skill': ['Closing', 'Communication', 'Product Knowledge', 'Problem Solving', 'Time Management'],
-            'Team_Average': [78, 85, 82, 79, 76],
-            'Top_Performer': [95, 98, 94, 92, 89],
-            'Gap': [17, 13, 12, 13, 13]
-        }
-        
-        skills_df = pd.DataFrame(skills_data)
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            name='Team Average',
-            x=skills_df['Skill'],
-            y=skills_df['Team_Average'],
-            marker_color='lightblue'
-        ))
-        
-        fig.add_trace(go.Bar(
-            name='Top Performer',
-            x=skills_df['Skill'],
-            y=skills_df['Top_Performer'],
-            marker_color='darkblue'
-        ))
-        
-        fig.update_layout(
-            barmode='group',
-            height=400,
-            margin=dict(l=0, r=0, t=20, b=0),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Show improvement recommendations
-        st.markdown("**🎯 Priority Training Areas:**")
-        for _, row in skills_df.iterrows():
-            if row['Gap'] > 15:
-                priority = "🔴 High"
-            elif row['Gap'] > 10:
-                priority = "🟡 Medium"
-            else:
-                priority = "🟢 Low"
-            
-            st.markdown(f"• **{row['Skill']}**: {priority} (Gap: {row['Gap']}%)")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
 
-# Add comprehensive client segmentation and value analysis
-if st.session_state.current_page == 'Client Profiles':
-    st.markdown('<h3 class="section-header">💎 Advanced Client Segmentation & Value Analysis</h3>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">🎯 RFM Analysis (Recency, Frequency, Monetary)</div>', unsafe_allow_html=True)
-        
-        # Create RFM analysis
-        if 'client_name' in df.columns and 'revenue_impact' in df.columns:
-            client_rfm = df.groupby('client_name').agg({
-                'call_date': lambda x: (current_time - pd.to_datetime(x.max(), errors='coerce')).days if pd.to_datetime(x.max(), errors='coerce') is not pd.NaT else 0,
-                'call_id': 'count',
-                'revenue_impact': 'sum'
-            }).reset_index()
-            
-            client_rfm.columns = ['Client', 'Recency_Days', 'Frequency', 'Monetary']
-            
-            # Create RFM scores (1-5 scale)
-            client_rfm['R_Score'] = pd.qcut(client_rfm['Recency_Days'], 5, labels=[5,4,3,2,1])
-            client_rfm['F_Score'] = pd.qcut(client_rfm['Frequency'].rank(method='first'), 5, labels=[1,2,3,4,5])
-            client_rfm['M_Score'] = pd.qcut(client_rfm['Monetary'], 5, labels=[1,2,3,4,5])
-            
-            # Create RFM segments
-            client_rfm['RFM_Score'] = (
-                client_rfm['R_Score'].astype(int) * 100 +
-                client_rfm['F_Score'].astype(int) * 10 +
-                client_rfm['M_Score'].astype(int)
-            )
-            
-            # Define segments
-            def rfm_segment(score):
-                if score >= 444:
-                    return 'Champions'
-                elif score >= 334:
-                    return 'Loyal Customers'
-                elif score >= 244:
-                    return 'Potential Loyalists'
-                elif score >= 144:
-                    return 'At Risk'
-                else:
-                    return 'Lost Customers'
-            
-            client_rfm['Segment'] = client_rfm['RFM_Score'].apply(rfm_segment)
-            
-            # Visualize segments
-            segment_counts = client_rfm['Segment'].value_counts()
-            
-            fig = px.pie(
-                values=segment_counts.values,
-                names=segment_counts.index,
-                title="",
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            fig.update_layout(
-                height=400,
-                margin=dict(l=0, r=0, t=20, b=0)
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.write("Client RFM analysis requires client and revenue data")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        st.markdown('<div class="chart-title">📈 Customer Lifetime Value Distribution</div>', unsafe_allow_html=True)
-        
-        # CLV analysis
-        if 'customer_lifetime_value' in df.columns:
-            clv_data = df['customer_lifetime_value'].dropna()
-            
-            fig = px.histogram(
-                x=clv_data,
-                nbins=20,
-                title="",
-                labels={'x': 'Customer Lifetime Value ($)', 'y': 'Count'}
-            )
-            fig.update_layout(
-                height=400,
-                margin=dict(l=0, r=0, t=20, b=0),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # CLV statistics
-            st.markdown("**📊 CLV Statistics:**")
-            st.markdown(f"• **Average CLV**: ${clv_data.mean():.2f}")
-            st.markdown(f"• **Median CLV**: ${clv_data.median():.2f}")
-            st.markdown(f"• **Top 10% CLV**: ${clv_data.quantile(0.9):.2f}")
-            st.markdown(f"• **Total CLV**: ${clv_data.sum():.2f}")
-        else:
-            # Generate simulated CLV data
-            clv_values = np.random.lognormal(8, 1, len(df))
-            
-            fig = px.histogram(
-                x=clv_values,
-                nbins=20,
-                title="",
-                labels={'x': 'Customer Lifetime Value ($)', 'y': 'Count'}
-            )
-            fig.update_layout(
-                height=400,
-                margin=dict(l=0, r=0, t=20, b=0),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+#######################################
+# PAGE ROUTING
+#######################################
+
+# One renderer per navigation entry: the selected page (with all of its sections) is rendered exactly once per run
+PAGES = {
+    'Dashboard': render_dashboard,
+    'Call Analytics': render_call_analytics,
+    'Agent Performance': render_agent_performance,
+    'Client Profiles': render_client_profiles,
+    'Reports': render_reports,
+    'Real-time Monitor': render_realtime_monitor,
+    'Calendar': render_calendar,
+    'Transcript Search': render_transcript_search
+}
+PAGE_TIMING_SAMPLES = 20
+
+def render_page(page):
+    """Render page and record its wall-clock and CPU time (the last PAGE_TIMING_SAMPLES runs per page) in the session"""
+    started, cpu_started = time.perf_counter(), time.thread_time()
+    PAGES.get(page, render_dashboard)()
+    timing = ((time.perf_counter() - started) * 1000, (time.thread_time() - cpu_started) * 1000)
+    
+    timings = st.session_state.setdefault('page_timings', {})
+    timings[page] = (timings.get(page, []) + [timing])[-PAGE_TIMING_SAMPLES:]
+    return timing
+
+wall_ms, cpu_ms = render_page(st.session_state.current_page)
+
+if show_advanced_metrics:
+    with st.sidebar:
+        with st.expander("⏱️ Page Render Timings"):
+            st.caption(f"{st.session_state.current_page}: {wall_ms:,.0f} ms wall · {cpu_ms:,.0f} ms CPU this run")
+            st.dataframe(pd.DataFrame([
+                {'Page': page, 'Runs': len(samples),
+                 'Avg Wall (ms)': round(sum(wall for wall, _ in samples) / len(samples)),
+                 'Avg CPU (ms)': round(sum(cpu for _, cpu in samples) / len(samples))}
+                for page, samples in st.session_state.page_timings.items()
+            ]), hide_index=True, use_container_width=True)
 
 # Footer
 st.markdown(f"""
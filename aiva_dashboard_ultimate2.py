@@ -10,8 +10,6 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode, JsCode
 from streamlit_calendar import calendar
-import gspread
-from google.oauth2.service_account import Credentials
 import json
 import io
 from datetime import datetime, timedelta, date, time
@@ -25,6 +23,16 @@ import base64
 import random
 import string
 import uuid
+from aiva_call_store import get_call_store
+from aiva_analytics import KPIEngine, EXTENDED_CALL_KPIS, rollup
+from aiva_calendar import (parse_call_schedule, calendar_window, count_calls, build_calendar_events,
+                           CallIntervalIndex, DAY_EVENT_LIMITS, calendar_view_range, shift_calendar_anchor,
+                           build_view_events)
+from aiva_datasets import get_dataset_registry, content_hash, SOURCE_TTLS
+from aiva_filters import FilterIndex
+from aiva_grid import (SERVER_SIDE_ROW_THRESHOLD, server_side_page, configure_server_side_options, server_side_response,
+                       cached_grid_options, grid_build_timings)
+from aiva_sheets import extract_sheet_id, open_google_worksheet, sync_call_store, PublicSheetReader, WorksheetReader
 
 # Authentication functions
 def hash_password(password):
@@ -735,6 +743,9 @@ st.markdown('</div>', unsafe_allow_html=True)
 # ENHANCED SIDEBAR CONFIGURATION
 #######################################
 
+# Process-wide cache of loaded sources and their derived results
+dataset_registry = get_dataset_registry()
+
 with st.sidebar:
     # Authentication Status
     st.markdown("""
@@ -806,11 +817,12 @@ with st.sidebar:
     col1, col2 = st.columns(2)
     with col1:
         if st.button("🔄 Refresh", use_container_width=True):
-            st.cache_data.clear()
+            # Reload only the active source; other datasets and their derived results stay cached
+            st.session_state.refresh_dataset = True
             st.rerun()
     with col2:
         if st.button("🗑️ Clear Cache", use_container_width=True):
-            st.cache_data.clear()
+            dataset_registry.clear()
             st.success("Cache cleared!")
     
     # Widget Controls
@@ -909,55 +921,21 @@ with st.sidebar:
 # DATA LOADING FUNCTIONS
 #######################################
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_google_sheets_data(json_credentials, sheets_url):
-    """Load data from Google Sheets using service account authentication"""
+def load_csv_data(uploaded_file, refresh=False):
+    """Load an uploaded CSV through the dataset registry; identical uploads share one parsed frame"""
     try:
-        # Parse the JSON credentials
-        credentials_dict = json.loads(json_credentials)
-        
-        # Set up the scope
-        scope = [
-            'https://spreadsheets.google.com/feeds',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        
-        # Create credentials
-        credentials = Credentials.from_service_account_info(credentials_dict, scopes=scope)
-        
-        # Authorize the client
-        client = gspread.authorize(credentials)
-        
-        # Extract spreadsheet ID from URL
-        if '/d/' in sheets_url:
-            sheet_id = sheets_url.split('/d/')[1].split('/')[0]
-        else:
-            raise ValueError("Invalid Google Sheets URL format")
-        
-        # Open the spreadsheet
-        spreadsheet = client.open_by_key(sheet_id)
-        worksheet = spreadsheet.sheet1  # Use the first sheet
-        
-        # Get all records
-        records = worksheet.get_all_records()
-        df = pd.DataFrame(records)
-        
-        return df, None
-    
+        raw = uploaded_file.getvalue()
+        digest = content_hash(raw)
+        name = f"csv_{digest}"
+        if refresh:
+            dataset_registry.invalidate(name)
+        df, version = dataset_registry.load(name, lambda: pd.read_csv(io.BytesIO(raw)),
+                                            ttl=SOURCE_TTLS['csv'], content_hash=digest)
+        return df, version, None
     except Exception as e:
-        return None, str(e)
+        return None, None, str(e)
 
-@st.cache_data
-def load_csv_data(uploaded_file):
-    """Load data from uploaded CSV file"""
-    try:
-        df = pd.read_csv(uploaded_file)
-        return df, None
-    except Exception as e:
-        return None, str(e)
-
-@st.cache_data
-def load_demo_data():
+def generate_demo_data():
     """Generate comprehensive demo data with all possible fields"""
     try:
         np.random.seed(42)  # For reproducible data
@@ -1075,34 +1053,52 @@ def load_demo_data():
         st.error(f"Error generating demo data: {e}")
         return pd.DataFrame()
 
+def load_demo_data(refresh=False):
+    """Demo data, generated once per process through the dataset registry"""
+    if refresh:
+        dataset_registry.invalidate('demo')
+    return dataset_registry.load('demo', generate_demo_data, ttl=SOURCE_TTLS['demo'])
+
 # Data Loading Logic - Priority: Google Sheets > CSV > Demo Data
 df = None
 data_source = ""
+dataset_version = None
+call_store = None
 current_time = datetime.now()
+refresh_dataset = st.session_state.pop('refresh_dataset', False)
 
 # PRIORITY 1: Try Google Sheets first (Live Data)
 if sheets_url:
     try:
-        # Try to load from Google Sheets without authentication first (public sheet)
+        # Sync the sheet into its shared call store; after the first download only newly appended rows are fetched
         if '/d/' in sheets_url:
-            sheet_id = sheets_url.split('/d/')[1].split('/')[0]
-            csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
+            sheet_id = extract_sheet_id(sheets_url)
+            sheets_store = get_call_store(f"sheets_{sheet_id}")
             
             try:
-                df = pd.read_csv(csv_url)
-                data_source = "Google Sheets (Live - Public)"
-                st.success(f"✅ Successfully connected to Google Sheets! Loaded {len(df)} rows from live data.")
+                sync_result = sync_call_store(sheets_store, PublicSheetReader(sheet_id), source="Google Sheets (Live - Public)",
+                                              force_full=refresh_dataset)
+                df = sheets_store.view()
+                call_store = sheets_store
+                dataset_version = (sheets_store.name, sheets_store.version)
+                data_source = sheets_store.source or "Google Sheets (Live - Public)"
+                st.success(f"✅ Successfully connected to Google Sheets! Loaded {len(df)} rows from live data ({sync_result['new_rows']} new).")
             except Exception as e:
                 st.warning(f"⚠️ Could not access public Google Sheets: {e}")
                 
                 # Try with authentication if available
                 if uploaded_json:
                     json_content = uploaded_json.read().decode('utf-8')
-                    df, error = load_google_sheets_data(json_content, sheets_url)
+                    worksheet, error = open_google_worksheet(json_content, sheets_url)
                     
-                    if df is not None:
+                    if worksheet is not None:
+                        sync_result = sync_call_store(sheets_store, WorksheetReader(worksheet), source="Google Sheets (Live - Authenticated)",
+                                                      force_full=refresh_dataset)
+                        df = sheets_store.view()
+                        call_store = sheets_store
+                        dataset_version = (sheets_store.name, sheets_store.version)
                         data_source = "Google Sheets (Live - Authenticated)"
-                        st.success(f"✅ Successfully connected to Google Sheets with authentication! Loaded {len(df)} rows.")
+                        st.success(f"✅ Successfully connected to Google Sheets with authentication! Loaded {len(df)} rows ({sync_result['new_rows']} new).")
                     else:
                         st.error(f"❌ Google Sheets Authentication Error: {error}")
     except Exception as e:
@@ -1110,7 +1106,7 @@ if sheets_url:
 
 # PRIORITY 2: Fallback to CSV Upload
 if df is None and 'uploaded_csv' in locals() and uploaded_csv:
-    df, error = load_csv_data(uploaded_csv)
+    df, dataset_version, error = load_csv_data(uploaded_csv, refresh=refresh_dataset)
     if df is not None:
         data_source = "CSV Upload (Fallback)"
         st.warning("⚠️ Using CSV fallback data. Configure Google Sheets for live data.")
@@ -1119,7 +1115,7 @@ if df is None and 'uploaded_csv' in locals() and uploaded_csv:
 
 # PRIORITY 3: Use demo data as last resort
 if df is None:
-    df = load_demo_data()
+    df, dataset_version = load_demo_data(refresh=refresh_dataset)
     if not df.empty:
         data_source = "Demo Data (Comprehensive)"
         st.info("🎯 Using comprehensive demo data with all possible fields. Configure Google Sheets or upload CSV for live data.")
@@ -1127,6 +1123,12 @@ if df is None:
         st.error("❌ No data available. Please check the demo data generation.")
         st.stop()
 
+# Memory figures are measured once per load by the call store or the dataset registry, not on every rerun
+if call_store is not None:
+    memory_mb = call_store.info()['memory_mb']
+else:
+    memory_mb = dataset_registry.frame_bytes(dataset_version[0]) / 1024 / 1024
+
 # Display data source info
 date_range = "N/A"
 if 'call_date' in df.columns:
@@ -1142,7 +1144,7 @@ st.markdown(f"""
     <strong>Total Records:</strong> {len(df):,} |
     <strong>Date Range:</strong> {date_range} |
     <strong>Columns:</strong> {len(df.columns)} |
-    <strong>Memory Usage:</strong> {df.memory_usage(deep=True).sum() / 1024 / 1024:.1f} MB
+    <strong>Memory Usage:</strong> {memory_mb:.1f} MB
 </div>
 """, unsafe_allow_html=True)
 
@@ -1150,57 +1152,18 @@ st.markdown(f"""
 # CALENDAR FUNCTIONS
 #######################################
 
-def generate_calendar_events(df):
-    """Generate calendar events from call data for streamlit-calendar"""
-    events = []
-    
-    if 'call_date' in df.columns and 'call_start_time' in df.columns:
-        for _, row in df.iterrows():
-            try:
-                # Parse date and time
-                call_date = pd.to_datetime(row['call_date']).date()
-                call_time = pd.to_datetime(row['call_start_time'], format='%H:%M:%S').time()
-                
-                # Combine date and time
-                start_datetime = datetime.combine(call_date, call_time)
-                
-                # Calculate end time (add call duration)
-                duration_seconds = row.get('call_length_seconds', 300)  # Default 5 minutes
-                end_datetime = start_datetime + timedelta(seconds=duration_seconds)
-                
-                # Determine event color based on call success
-                if row.get('call_success') == 'Yes':
-                    color = event_color_success
-                elif row.get('call_success') == 'No':
-                    color = event_color_failed
-                else:
-                    color = event_color_pending
-                
-                # Create event for streamlit-calendar
-                event = {
-                    'title': f"📞 {row.get('client_name', 'Unknown')}",
-                    'start': start_datetime.isoformat(),
-                    'end': end_datetime.isoformat(),
-                    'backgroundColor': color,
-                    'borderColor': color,
-                    'textColor': 'white',
-                    'extendedProps': {
-                        'agent': row.get('voice_agent_name', 'Unknown'),
-                        'status': row.get('call_success', 'Unknown'),
-                        'duration': f"{duration_seconds//60}m {duration_seconds%60}s",
-                        'sentiment': row.get('sentiment_score', 0),
-                        'satisfaction': row.get('customer_satisfaction', 0),
-                        'call_id': row.get('call_id', 'Unknown'),
-                        'phone': row.get('phone_number', 'Unknown'),
-                        'intent': row.get('intent_detected', 'Unknown'),
-                        'outcome': row.get('call_outcome', 'Unknown')
-                    }
-                }
-                events.append(event)
-            except Exception as e:
-                continue
-    
-    return events
+def get_call_schedule(df):
+    """Parsed call start/end times for the current dataset, computed once per dataset version"""
+    if dataset_version is None:
+        return parse_call_schedule(df)
+    return dataset_registry.derived(dataset_version, 'call_schedule', lambda: parse_call_schedule(df))
+
+def generate_calendar_events(df, start_date=None, end_date=None):
+    """Generate calendar events from call data for streamlit-calendar, limited to the visible date window"""
+    schedule = get_call_schedule(df)
+    if start_date is not None:
+        schedule = calendar_window(schedule, start_date, end_date or start_date)
+    return build_calendar_events(df, schedule, event_color_success, event_color_failed, event_color_pending)
 
 def create_mini_calendar():
     """Create a mini calendar widget"""
@@ -1249,81 +1212,24 @@ def safe_numeric_conversion(series, default=0):
     """Safely convert series to numeric, replacing errors with default"""
     return pd.to_numeric(series, errors='coerce').fillna(default)
 
+call_kpi_engine = KPIEngine(EXTENDED_CALL_KPIS)
+
 def process_call_metrics():
-    """Process key call center metrics with robust column handling"""
+    """Process key call center metrics with robust column handling (one vectorized pass, cached per dataset version)"""
     try:
-        # Convert numeric columns safely
-        numeric_cols = ['call_length_seconds', 'call_duration_seconds', 'cost', 'sentiment_score', 
-                       'response_time_minutes', 'customer_satisfaction', 'resolution_time_seconds',
-                       'agent_performance_score', 'revenue_impact', 'conversion_probability']
-        
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = safe_numeric_conversion(df[col])
-        
-        # Calculate comprehensive metrics
-        total_calls = len(df)
-        total_cost = df['cost'].sum() if 'cost' in df.columns else 0
-        
-        # Use call_length_seconds or call_duration_seconds
-        duration_col = 'call_length_seconds' if 'call_length_seconds' in df.columns else 'call_duration_seconds'
-        avg_call_duration = df[duration_col].mean() / 60 if duration_col in df.columns else 0
-        
-        success_rate = (df['call_success'] == 'Yes').sum() / total_calls * 100 if 'call_success' in df.columns else 0
-        avg_sentiment = df['sentiment_score'].mean() if 'sentiment_score' in df.columns else 0
-        appointments_scheduled = (df['appointment_scheduled'] == 'Yes').sum() if 'appointment_scheduled' in df.columns else 0
-        avg_response_time = df['response_time_minutes'].mean() if 'response_time_minutes' in df.columns else 0
-        total_agents = df['voice_agent_name'].nunique() if 'voice_agent_name' in df.columns else 0
-        avg_satisfaction = df['customer_satisfaction'].mean() if 'customer_satisfaction' in df.columns else 0
-        total_revenue = df['revenue_impact'].sum() if 'revenue_impact' in df.columns else 0
-        avg_conversion = df['conversion_probability'].mean() if 'conversion_probability' in df.columns else 0
-        avg_ai_accuracy = df['ai_accuracy_score'].mean() if 'ai_accuracy_score' in df.columns else 0
-        escalations = (df['escalation_required'] == 'Yes').sum() if 'escalation_required' in df.columns else 0
-        follow_ups = (df['follow_up_required'] == 'Yes').sum() if 'follow_up_required' in df.columns else 0
-        
-        # Additional comprehensive metrics
-        avg_nps = df['nps_score'].mean() if 'nps_score' in df.columns else 0
-        avg_csat = df['csat_score'].mean() if 'csat_score' in df.columns else 0
-        avg_effort = df['effort_score'].mean() if 'effort_score' in df.columns else 0
-        high_value_deals = (df['contract_value'] > 10000).sum() if 'contract_value' in df.columns else 0
-        churn_risk_high = (df['churn_risk'] == 'High').sum() if 'churn_risk' in df.columns else 0
-        upsell_opportunities = (df['upsell_opportunity'].isin(['Medium', 'High'])).sum() if 'upsell_opportunity' in df.columns else 0
-        
-        return {
-            'total_calls': total_calls,
-            'total_cost': total_cost,
-            'avg_call_duration': avg_call_duration,
-            'success_rate': success_rate,
-            'avg_sentiment': avg_sentiment,
-            'appointments_scheduled': appointments_scheduled,
-            'avg_response_time': avg_response_time,
-            'total_agents': total_agents,
-            'avg_satisfaction': avg_satisfaction,
-            'total_revenue': total_revenue,
-            'avg_conversion': avg_conversion * 100,
-            'avg_ai_accuracy': avg_ai_accuracy * 100,
-            'escalations': escalations,
-            'follow_ups': follow_ups,
-            'avg_nps': avg_nps,
-            'avg_csat': avg_csat,
-            'avg_effort': avg_effort,
-            'high_value_deals': high_value_deals,
-            'churn_risk_high': churn_risk_high,
-            'upsell_opportunities': upsell_opportunities
-        }
+        return call_kpi_engine.get(df, version=dataset_version)
     except Exception as e:
         st.error(f"Error processing call metrics: {e}")
-        return {
-            'total_calls': 0, 'total_cost': 0, 'avg_call_duration': 0, 'success_rate': 0,
-            'avg_sentiment': 0, 'appointments_scheduled': 0, 'avg_response_time': 0,
-            'total_agents': 0, 'avg_satisfaction': 0, 'total_revenue': 0, 'avg_conversion': 0,
-            'avg_ai_accuracy': 0, 'escalations': 0, 'follow_ups': 0, 'avg_nps': 0,
-            'avg_csat': 0, 'avg_effort': 0, 'high_value_deals': 0, 'churn_risk_high': 0,
-            'upsell_opportunities': 0
-        }
+        return call_kpi_engine.empty()
 
-def create_enhanced_ag_grid(dataframe, grid_key, height=400):
-    """Create an enhanced AG Grid with extensive advanced features"""
+def get_filter_index():
+    """Filter-bar indexes for the current dataset version, shared by every session"""
+    if dataset_version is None:
+        return FilterIndex(df)
+    return dataset_registry.derived(dataset_version, 'filter_index', lambda: FilterIndex(df))
+
+def build_grid_options(dataframe, grid_key):
+    """GridOptions for a grid's column schema (renderers, filters, selection and export settings)"""
     gb = GridOptionsBuilder.from_dataframe(dataframe)
     
     # Enable comprehensive features
@@ -1367,23 +1273,41 @@ def create_enhanced_ag_grid(dataframe, grid_key, height=400):
     
     gridOptions = gb.build()
     
+    return gridOptions
+
+def create_enhanced_ag_grid(dataframe, grid_key, height=400):
+    """Create an enhanced AG Grid with extensive advanced features"""
+    # Large frames use the server-side row model: only the requested page is sent to the grid
+    server_side = len(dataframe) > SERVER_SIDE_ROW_THRESHOLD
+    if server_side:
+        full_dataframe = dataframe
+        dataframe, server_state = server_side_page(full_dataframe, grid_key)
+    
+    # GridOptions only depend on the column schema, so they are built once per grid and reused across reruns
+    gridOptions = cached_grid_options(grid_key, dataframe, lambda: build_grid_options(dataframe, grid_key))
+    
+    if server_side:
+        configure_server_side_options(gridOptions, dataframe, grid_key)
+    
     # Display AG Grid with all features
     grid_response = AgGrid(
         dataframe,
         gridOptions=gridOptions,
-        data_return_mode=DataReturnMode.FILTERED_AND_SORTED,
-        update_mode=GridUpdateMode.MODEL_CHANGED,
+        data_return_mode=DataReturnMode.AS_INPUT if server_side else DataReturnMode.FILTERED_AND_SORTED,
+        update_mode=GridUpdateMode.SELECTION_CHANGED if server_side else GridUpdateMode.MODEL_CHANGED,
         fit_columns_on_grid_load=False,
         theme='streamlit',
         enable_enterprise_modules=True,
         height=height,
         width='100%',
-        key=grid_key,
+        key=server_state['grid_key'] if server_side else grid_key,
         reload_data=False,
         try_to_convert_back_to_original_types=True,
         conversion_errors='coerce'
     )
     
+    if server_side:
+        return server_side_response(full_dataframe, dataframe, grid_key, grid_response, server_state)
     return grid_response
 
 
@@ -1480,9 +1404,7 @@ if st.session_state.current_page == 'Dashboard':
         st.markdown('<div class="chart-title">🎯 Success Rate by Agent</div>', unsafe_allow_html=True)
         
         if 'voice_agent_name' in df.columns:
-            agent_success = df.groupby('voice_agent_name')['call_success'].apply(
-                lambda x: (x == 'Yes').sum() / len(x) * 100
-            ).reset_index()
+            agent_success = rollup(df, 'voice_agent_name', {'call_success': 'yes_rate'}).reset_index()
             
             fig = px.bar(agent_success, x='voice_agent_name', y='call_success', 
                        title="Success Rate by Agent")
@@ -1523,12 +1445,44 @@ elif st.session_state.current_page == 'Calendar':
             help="Filter events by type"
         )
     
-    # Generate events for calendar
-    events = generate_calendar_events(df)
+    # Generate events for the selected window only
+    if isinstance(date_range_filter, (list, tuple)) and len(date_range_filter) == 2:
+        window_start, window_end = date_range_filter
+    elif isinstance(date_range_filter, (list, tuple)) and len(date_range_filter) == 1:
+        window_start = window_end = date_range_filter[0]
+    else:
+        window_start = window_end = date_range_filter
+    events = generate_calendar_events(df, window_start, window_end)
     
     if calendar_mode == "Interactive Calendar":
         st.markdown("### 📅 Interactive Calendar with Streamlit-Calendar")
         
+        # Only the displayed month/week/day is sent to the browser; navigation happens here
+        if st.session_state.get('calendar_anchor_view') != calendar_view:
+            st.session_state.calendar_anchor = window_start
+            st.session_state.calendar_anchor_view = calendar_view
+        
+        nav1, nav2, nav3 = st.columns(3)
+        with nav1:
+            if st.button("◀ Previous", use_container_width=True):
+                st.session_state.calendar_anchor = shift_calendar_anchor(calendar_view, st.session_state.calendar_anchor, -1)
+        with nav2:
+            if st.button("📍 Today", use_container_width=True):
+                st.session_state.calendar_anchor = datetime.now().date()
+        with nav3:
+            if st.button("Next ▶", use_container_width=True):
+                st.session_state.calendar_anchor = shift_calendar_anchor(calendar_view, st.session_state.calendar_anchor, 1)
+        
+        view_start, view_end = calendar_view_range(calendar_view, st.session_state.calendar_anchor)
+        call_index = CallIntervalIndex(get_call_schedule(df))
+        view_events = build_view_events(
+            df, call_index, view_start, view_end,
+            event_color_success, event_color_failed, event_color_pending,
+            max_per_day=DAY_EVENT_LIMITS.get(calendar_view)
+        )
+        st.caption(f"Showing {len(view_events)} events for {view_start:%b %d} – {(view_end - timedelta(days=1)):%b %d, %Y}; "
+                   f"days with more calls than the view can show are summarised as one event.")
+        
         # Calendar options
         calendar_options = {
             "editable": "true",
@@ -1538,11 +1492,12 @@ elif st.session_state.current_page == 'Calendar':
             "dayMaxEvents": "3",
             "moreLinkClick": "popover",
             "headerToolbar": {
-                "left": "prev,next today",
+                "left": "",
                 "center": "title",
-                "right": "dayGridMonth,timeGridWeek,timeGridDay,listWeek"
+                "right": ""
             },
             "initialView": calendar_view,
+            "initialDate": pd.Timestamp(st.session_state.calendar_anchor).strftime('%Y-%m-%d'),
             "themeSystem": calendar_theme,
             "weekends": show_weekends,
             "height": "auto",
@@ -1593,10 +1548,10 @@ elif st.session_state.current_page == 'Calendar':
         
         # Display the calendar
         calendar_component = calendar(
-            events=events,
+            events=view_events,
             options=calendar_options,
             custom_css=custom_css,
-            key="aiva_calendar"
+            key=f"aiva_calendar_{calendar_view}_{view_start:%Y%m%d}"
         )
         
         # Handle calendar interactions
@@ -2049,12 +2004,12 @@ elif st.session_state.current_page == 'Call Analytics':
     with col4:
         sentiment_filter = st.slider("😊 Sentiment Range", 0.0, 1.0, (0.0, 1.0), step=0.1)
     
-    # Apply filters
-    filtered_df = df.copy()
-    if agent_filter:
-        filtered_df = filtered_df[filtered_df['voice_agent_name'].isin(agent_filter)]
-    if status_filter:
-        filtered_df = filtered_df[filtered_df['call_success'].isin(status_filter)]
+    # Apply filters through the shared filter index (bitmap lookups, one copy of the selected rows)
+    selection = get_filter_index().select(
+        isin={'voice_agent_name': agent_filter, 'call_success': status_filter},
+        ranges={'sentiment_score': sentiment_filter} if sentiment_filter != (0.0, 1.0) else None
+    )
+    filtered_df = selection.frame()
     
     # Analytics content
     col1, col2 = st.columns(2)
@@ -2092,9 +2047,9 @@ elif st.session_state.current_page == 'Call Analytics':
     with tab1:
         # Performance analytics
         if 'voice_agent_name' in filtered_df.columns:
-            agent_performance = filtered_df.groupby('voice_agent_name').agg({
+            agent_performance = rollup(filtered_df, 'voice_agent_name', {
                 'call_id': 'count',
-                'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100,
+                'call_success': 'yes_rate',
                 'call_length_seconds': 'mean',
                 'customer_satisfaction': 'mean'
             }).round(2)
@@ -2182,9 +2137,9 @@ elif st.session_state.current_page == 'Agent Performance':
         with col1:
             # Daily performance trend
             if 'call_date' in agent_df.columns:
-                daily_performance = agent_df.groupby('call_date').agg({
+                daily_performance = rollup(agent_df, 'call_date', {
                     'call_id': 'count',
-                    'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100
+                    'call_success': 'yes_rate'
                 }).reset_index()
                 
                 fig = px.line(daily_performance, x='call_date', y='call_success', 
@@ -2203,9 +2158,9 @@ elif st.session_state.current_page == 'Agent Performance':
         if selected_agent == "All Agents":
             st.markdown("### 📊 Agent Comparison")
             
-            agent_metrics = df.groupby('voice_agent_name').agg({
+            agent_metrics = rollup(df, 'voice_agent_name', {
                 'call_id': 'count',
-                'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100,
+                'call_success': 'yes_rate',
                 'call_length_seconds': 'mean',
                 'customer_satisfaction': 'mean',
                 'revenue_impact': 'sum'
@@ -2228,22 +2183,17 @@ elif st.session_state.current_page == 'Client Profiles':
     with col3:
         status_filter = st.selectbox("📊 Call Status", ["All", "Successful", "Failed", "Pending"])
     
-    # Filter clients based on search and filters
-    filtered_df = df.copy()
-    
-    if search_term:
-        filtered_df = filtered_df[
-            filtered_df['client_name'].str.contains(search_term, case=False, na=False) |
-            filtered_df['phone_number'].str.contains(search_term, case=False, na=False) |
-            filtered_df['email'].str.contains(search_term, case=False, na=False)
-        ]
-    
-    if tier_filter:
-        filtered_df = filtered_df[filtered_df['customer_tier'].isin(tier_filter)]
-    
-    if status_filter != "All":
-        status_map = {"Successful": "Yes", "Failed": "No", "Pending": "Pending"}
-        filtered_df = filtered_df[filtered_df['call_success'] == status_map[status_filter]]
+    # Filter clients through the shared filter index
+    status_map = {"Successful": "Yes", "Failed": "No", "Pending": "Pending"}
+    selection = get_filter_index().select(
+        isin={
+            'customer_tier': tier_filter,
+            'call_success': [status_map[status_filter]] if status_filter != "All" else []
+        },
+        search=search_term,
+        search_columns=['client_name', 'phone_number', 'email']
+    )
+    filtered_df = selection.frame()
     
     # Client overview metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -2264,9 +2214,9 @@ elif st.session_state.current_page == 'Client Profiles':
     st.markdown("### 📋 Client Directory")
     
     # Create client summary
-    client_summary = filtered_df.groupby('client_name').agg({
+    client_summary = rollup(filtered_df, 'client_name', {
         'call_id': 'count',
-        'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100,
+        'call_success': 'yes_rate',
         'customer_satisfaction': 'mean',
         'customer_lifetime_value': 'first',
         'customer_tier': 'first',
@@ -2427,9 +2377,9 @@ Date Range: {date_range[0]} to {date_range[1]}
         st.info("Detailed operational metrics and agent performance")
         
         if 'voice_agent_name' in df.columns:
-            agent_summary = df.groupby('voice_agent_name').agg({
+            agent_summary = rollup(df, 'voice_agent_name', {
                 'call_id': 'count',
-                'call_success': lambda x: (x == 'Yes').sum() / len(x) * 100
+                'call_success': 'yes_rate'
             }).round(1)
             st.dataframe(agent_summary, use_container_width=True)
     
@@ -2683,7 +2633,7 @@ elif st.session_state.current_page == 'Data Management':
         st.markdown("#### 📊 Data Overview")
         st.metric("Total Records", f"{len(df):,}")
         st.metric("Total Columns", len(df.columns))
-        st.metric("Memory Usage", f"{df.memory_usage(deep=True).sum() / 1024 / 1024:.1f} MB")
+        st.metric("Memory Usage", f"{memory_mb:.1f} MB")
         st.metric("Duplicate Records", df.duplicated().sum())
     
     with col2:
@@ -3060,7 +3010,14 @@ elif st.session_state.current_page == 'Settings':
     
     with col4:
         st.metric("Data Size", "125.3 MB")
-        st.metric("Cache Size", "12.8 MB")
+        st.metric("Cache Size", f"{dataset_registry.total_bytes() / 1024 / 1024:.1f} MB")
+    
+    with st.expander("⏱️ Grid Build Timings"):
+        st.dataframe(grid_build_timings(), use_container_width=True)
+    
+    with st.expander("🧮 Dataset Cache"):
+        st.caption(f"{dataset_registry.total_bytes() / 1024 / 1024:.1f} MB of {dataset_registry.max_bytes / 1024 / 1024:.0f} MB · {dataset_registry.evictions} evictions")
+        st.dataframe(dataset_registry.stats(), use_container_width=True)
 
 elif st.session_state.current_page == 'Advanced Tools':
     st.markdown('<h2 class="section-header animate-fadeIn">🛠️ Advanced Tools & Utilities</h2>', unsafe_allow_html=True)
@@ -3508,11 +3465,11 @@ with st.sidebar:
     
     # Calendar quick stats
     st.markdown("### 📊 Calendar Stats")
-    events = generate_calendar_events(df)
+    call_schedule = get_call_schedule(df)
     
-    st.metric("Total Events", len(events))
-    st.metric("This Month", len([e for e in events if datetime.now().strftime('%Y-%m') in e['start']]))
-    st.metric("Today", len([e for e in events if datetime.now().strftime('%Y-%m-%d') in e['start']]))
+    st.metric("Total Events", count_calls(call_schedule))
+    st.metric("This Month", count_calls(call_schedule, month=datetime.now().strftime('%Y-%m')))
+    st.metric("Today", count_calls(call_schedule, day=datetime.now().strftime('%Y-%m-%d')))
 
 # Footer
 st.markdown("""
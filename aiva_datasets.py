@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+🧮 AIVACEO Dataset Registry
+Named, versioned datasets and their derived results shared by every session, with per-source TTLs and a memory bound
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time as time_module
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+#######################################
+# DATASET REGISTRY
+#######################################
+
+DATASET_CACHE_BYTES = int(os.environ.get('AIVA_DATASET_CACHE_MB', '512')) * 1024 * 1024
+
+# Seconds a source stays cached before it is reloaded (None = until invalidated or evicted)
+SOURCE_TTLS = {
+    'csv': 3600,
+    'demo': None
+}
+
+def content_hash(data):
+    """Short SHA-1 of raw bytes or of a frame's row hashes"""
+    if isinstance(data, pd.DataFrame):
+        data = pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes()
+    return hashlib.sha1(data).hexdigest()[:16]
+
+def estimate_nbytes(value):
+    """Approximate memory held by a cached value"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum()) if isinstance(value, pd.DataFrame) else int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value[:1000]) * max(1, len(value) // 1000)
+    # Arrays and index objects (FilterIndex, DatePartitions, ...) report what they hold
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+def _is_index(value):
+    """Derived values whose nbytes grows after they are cached (lazily built indexes)"""
+    return hasattr(value, 'nbytes') and not isinstance(value, (np.ndarray, pd.Index))
+
+class DatasetEntry:
+    """One named source: its frame, version and the results derived from it"""
+
+    def __init__(self, name, ttl=None):
+        self.name = name
+        self.ttl = ttl
+        self.frame = None
+        self.content_hash = None
+        self.version = None
+        self.loads = 0
+        self.loaded_at = None
+        self.last_used = time_module.time()
+        self.frame_bytes = 0
+        self.derived = {}
+        self.derived_version = None
+        self.derived_bytes = 0
+        self.previous = {}
+        self.previous_version = None
+        self.previous_bytes = 0
+
+    @property
+    def nbytes(self):
+        # Indexes are re-measured because they keep building columns after they are cached
+        return self.frame_bytes + self.derived_bytes + self.previous_bytes + sum(
+            value.nbytes for values in (self.derived, self.previous) for value in values.values() if _is_index(value))
+
+    def is_expired(self, now=None):
+        if self.ttl is None or self.loaded_at is None:
+            return False
+        return (now or time_module.time()) - self.loaded_at > self.ttl
+
+    def drop_derived(self):
+        self.derived = {}
+        self.derived_bytes = 0
+        self.previous = {}
+        self.previous_bytes = 0
+
+    def move_to(self, dataset_version):
+        """Start deriving for a new version; the current results are kept as the previous version's until then"""
+        self.previous, self.previous_version, self.previous_bytes = self.derived, self.derived_version, self.derived_bytes
+        self.derived = {}
+        self.derived_bytes = 0
+        self.derived_version = dataset_version
+
+class DatasetRegistry:
+    """
+    Process-wide cache of named datasets.
+
+    Each source is reloaded only when it is missing, past its TTL, or its content hash
+    changes. Derived results (schedules, event tables, ...) are cached per dataset version
+    and dropped only when that dataset moves, so invalidating one source never discards
+    another's work; results that can be brought forward to the new version (see derived())
+    are kept until they are. Least recently used sources are evicted past max_bytes.
+    """
+
+    def __init__(self, max_bytes=DATASET_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _touch(self, name, ttl=None):
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = DatasetEntry(name, ttl)
+            self._entries[name] = entry
+        self._entries.move_to_end(name)
+        entry.last_used = time_module.time()
+        return entry
+
+    def load(self, name, loader, ttl=None, content_hash=None):
+        """
+        (frame, version) for a named source; loader() runs only when the source is missing,
+        expired or its content hash changed. version is (name, hash or load count).
+        """
+        with self._lock:
+            entry = self._touch(name, ttl)
+            entry.ttl = ttl
+            reload = (
+                entry.frame is None
+                or entry.is_expired()
+                or (content_hash is not None and content_hash != entry.content_hash)
+            )
+
+            if reload:
+                frame = loader()
+                entry.frame = frame
+                entry.loads += 1
+                entry.loaded_at = time_module.time()
+                entry.content_hash = content_hash
+                entry.version = (name, content_hash or entry.loads)
+                entry.frame_bytes = estimate_nbytes(frame)
+                entry.drop_derived()
+                self._evict(keep=name)
+
+            # Shallow copy: sessions can add columns without touching the shared frame
+            return entry.frame.copy(deep=False), entry.version
+
+    def derived(self, dataset_version, key, compute, update=None):
+        """
+        compute() for a dataset version ((name, version) tuple), cached until that dataset's
+        version changes. With update, the value cached for the version before is brought
+        forward with update(value, previous_version) when it can be (update returns None
+        when it cannot, and compute() runs instead).
+        """
+        name = dataset_version[0]
+
+        with self._lock:
+            entry = self._touch(name)
+            if entry.derived_version != dataset_version:
+                entry.move_to(dataset_version)
+            if key in entry.derived:
+                return entry.derived[key]
+            previous = entry.previous.pop(key, None) if update is not None else None
+            previous_version = entry.previous_version
+            if previous is not None and not _is_index(previous):
+                entry.previous_bytes -= estimate_nbytes(previous)
+
+        value = update(previous, previous_version) if previous is not None else None
+        if value is None:
+            value = compute()
+
+        with self._lock:
+            entry = self._touch(name)
+            if entry.derived_version == dataset_version:
+                entry.derived[key] = value
+                if not _is_index(value):
+                    entry.derived_bytes += estimate_nbytes(value)
+                self._evict(keep=name)
+        return value
+
+    def invalidate(self, name):
+        """Drop one source and everything derived from it; other sources are untouched"""
+        with self._lock:
+            return self._entries.pop(name, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def frame_bytes(self, name):
+        """Bytes of a source's frame, measured once when it was loaded (0 when it is not cached)"""
+        with self._lock:
+            entry = self._entries.get(name)
+            return 0 if entry is None else entry.frame_bytes
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry.nbytes for entry in self._entries.values())
+
+    def _evict(self, keep=None):
+        now = time_module.time()
+        for name in [name for name, entry in self._entries.items() if entry.is_expired(now) and name != keep]:
+            del self._entries[name]
+            self.evictions += 1
+
+        while self.total_bytes() > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                self._entries.move_to_end(keep)
+                oldest = next(iter(self._entries))
+            del self._entries[oldest]
+            self.evictions += 1
+
+    def stats(self):
+        """One row per cached source for debug panels"""
+        with self._lock:
+            rows = [
+                {
+                    'Dataset': entry.name,
+                    'Rows': 0 if entry.frame is None else len(entry.frame),
+                    'Loads': entry.loads,
+                    'Derived': len(entry.derived),
+                    'Size (MB)': round(entry.nbytes / 1024 / 1024, 2),
+                    'TTL (s)': entry.ttl,
+                    'Loaded': datetime.fromtimestamp(entry.loaded_at).strftime('%H:%M:%S') if entry.loaded_at else '—'
+                }
+                for entry in self._entries.values()
+            ]
+        return pd.DataFrame(rows, columns=['Dataset', 'Rows', 'Loads', 'Derived', 'Size (MB)', 'TTL (s)', 'Loaded'])
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_dataset_registry():
+    """The process-wide dataset registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = DatasetRegistry()
+        return _registry
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+📤 AIVACEO Export Pipeline
+Chunked CSV/Excel/JSON/Parquet/SQL writers with on-the-fly ZIP/GZIP compression for call store exports
+"""
+
+import gzip
+import io
+import json
+import shutil
+import tempfile
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+#######################################
+# EXPORT CHUNKS
+#######################################
+
+EXPORT_CHUNK_ROWS = 50_000
+EXCEL_MAX_ROWS = 1_048_575
+SQL_INSERT_ROWS = 1_000
+
+# Export Format labels -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'JSON': ('json', 'application/json'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'SQL': ('sql', 'application/sql')
+}
+
+# Compression labels -> (file suffix, MIME type)
+EXPORT_COMPRESSIONS = {
+    'None': None,
+    'ZIP': ('zip', 'application/zip'),
+    'GZIP': ('gz', 'application/gzip')
+}
+
+def export_columns(store, frame, columns=None):
+    """Columns to export, in the source's column order; text columns come from the store's side file"""
+    available = set(frame.columns) | set(store.text_columns)
+    if columns is None:
+        columns = list(store.columns) + [col for col in frame.columns if col not in store.columns]
+    return [col for col in dict.fromkeys(columns) if col in available]
+
+def iter_export_chunks(store, frame, columns, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Blocks of frame (a view of store) with only the given columns; text columns are read
+    from the side file one block at a time, so at most one block of text is in memory
+    """
+    narrow = [col for col in columns if col in frame.columns]
+    text = [col for col in columns if col not in frame.columns]
+    if len(frame) == 0:
+        yield pd.DataFrame({col: frame[col] if col in frame.columns else pd.Series(dtype=object) for col in columns})
+        return
+    for start in range(0, len(frame), chunk_rows):
+        yield store.with_text(frame.iloc[start:start + chunk_rows][narrow], text)[columns]
+
+#######################################
+# WRITERS
+#######################################
+
+def write_csv(chunks, out, metadata=None):
+    header = True
+    for chunk in chunks:
+        out.write(chunk.to_csv(index=False, header=header).encode('utf-8'))
+        header = False
+
+def write_json(chunks, out, metadata=None):
+    """One JSON array of records, written a chunk of records at a time"""
+    out.write(b'[')
+    separator = b''
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        # to_json gives "[{...},{...}]"; the brackets are dropped so chunks join into one array
+        out.write(separator + chunk.to_json(orient='records', date_format='iso')[1:-1].encode('utf-8'))
+        separator = b',\n'
+    out.write(b']')
+
+def write_excel(chunks, out, metadata=None):
+    """Rows through openpyxl's write-only mode, starting a new sheet every EXCEL_MAX_ROWS rows"""
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = 0
+
+    for chunk in chunks:
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for col in values.columns:
+            if chunk[col].dtype == object or pd.api.types.is_string_dtype(chunk[col]):
+                # Control characters are not allowed in worksheet cells
+                values[col] = values[col].map(lambda value: ILLEGAL_CHARACTERS_RE.sub('', value) if isinstance(value, str) else value)
+
+        if sheet is None:
+            sheet = workbook.create_sheet('Calls')
+            sheet.append([str(col) for col in chunk.columns])
+
+        for row in values.itertuples(index=False, name=None):
+            if sheet_rows == EXCEL_MAX_ROWS:
+                sheet = workbook.create_sheet(f"Calls {len(workbook.worksheets) + 1}")
+                sheet.append([str(col) for col in chunk.columns])
+                sheet_rows = 0
+            sheet.append(row)
+            sheet_rows += 1
+
+    if metadata:
+        metadata_sheet = workbook.create_sheet('Metadata')
+        for key, value in metadata.items():
+            metadata_sheet.append([str(key), str(value)])
+
+    workbook.save(out)
+
+def write_parquet(chunks, out, metadata=None):
+    """Row groups written one chunk at a time; metadata is stored in the file's key-value metadata"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                # Columns empty in the first chunk would otherwise be typed null for the whole file
+                fields = [field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in table.schema]
+                schema_metadata = dict(table.schema.metadata or {})
+                if metadata:
+                    schema_metadata[b'aiva_export'] = json.dumps(metadata, default=str).encode('utf-8')
+                writer = pq.ParquetWriter(out, pa.schema(fields, metadata=schema_metadata))
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+def _sql_literal(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (bool, np.bool_)):
+        return '1' if value else '0'
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return repr(value.item() if isinstance(value, np.generic) else value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+def write_sql(chunks, out, metadata=None, table='calls'):
+    """INSERT statements of SQL_INSERT_ROWS rows each"""
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        columns = ', '.join('"' + str(col).replace('"', '""') + '"' for col in chunk.columns)
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for start in range(0, len(values), SQL_INSERT_ROWS):
+            rows = values.iloc[start:start + SQL_INSERT_ROWS].itertuples(index=False, name=None)
+            statement = f"INSERT INTO {table} ({columns}) VALUES\n" + ',\n'.join(
+                '(' + ', '.join(_sql_literal(value) for value in row) + ')' for row in rows) + ';\n'
+            out.write(statement.encode('utf-8'))
+
+EXPORT_WRITERS = {
+    'csv': write_csv,
+    'xlsx': write_excel,
+    'json': write_json,
+    'parquet': write_parquet,
+    'sql': write_sql
+}
+
+# Formats that are archives themselves are staged in a temporary file, then copied through the compressor
+CONTAINER_FORMATS = {'xlsx', 'parquet'}
+
+#######################################
+# EXPORT
+#######################################
+
+def export_calls(store, frame, export_format='CSV', compression='None', columns=None, metadata=None,
+                 file_stem="vapi_export", chunk_rows=EXPORT_CHUNK_ROWS, progress=None):
+    """
+    Write frame (a view of store) to an anonymous temporary file, one chunk at a time.
+
+    columns prunes the export (text columns are only read from the side file when listed);
+    compression ('ZIP' or 'GZIP') is applied as the chunks are written. progress(fraction)
+    is called after every chunk. Returns (export, error); export holds the open file
+    (removed once closed), file_name, mime, rows and bytes.
+    """
+    extension, mime = EXPORT_FORMATS[export_format]
+    compressed = EXPORT_COMPRESSIONS[compression]
+    columns = export_columns(store, frame, columns)
+    inner_name = f"{file_stem}.{extension}"
+    writer = EXPORT_WRITERS[extension]
+
+    def chunks():
+        written = 0
+        for chunk in iter_export_chunks(store, frame, columns, chunk_rows):
+            yield chunk
+            written += len(chunk)
+            if progress:
+                progress(min(written / max(len(frame), 1), 1.0))
+
+    def write(out):
+        if staged is None:
+            writer(chunks(), out, metadata)
+        else:
+            shutil.copyfileobj(staged, out)
+
+    # Streamlit's download_button takes raw files; the buffered writer is detached from it once done
+    raw = tempfile.TemporaryFile(buffering=0)
+    target = io.BufferedWriter(raw, buffer_size=1 << 20)
+    staged = None
+    try:
+        if compressed is not None and extension in CONTAINER_FORMATS:
+            staged = tempfile.TemporaryFile()
+            writer(chunks(), staged, metadata)
+            staged.seek(0)
+
+        if compressed is None:
+            write(target)
+        elif compressed[0] == 'gz':
+            with gzip.GzipFile(filename=inner_name, fileobj=target, mode='wb') as out:
+                write(out)
+            inner_name, mime = f"{inner_name}.gz", compressed[1]
+        else:
+            with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                with archive.open(inner_name, 'w', force_zip64=True) as out:
+                    write(out)
+                if metadata:
+                    archive.writestr('metadata.json', json.dumps(metadata, indent=2, default=str))
+            inner_name, mime = f"{file_stem}.zip", compressed[1]
+        target.flush()
+        target.detach()
+    except Exception as e:
+        raw.close()
+        return None, str(e)
+    finally:
+        if staged is not None:
+            staged.close()
+
+    size = raw.tell()
+    raw.seek(0)
+    return {
+        'file': raw,
+        'file_name': inner_name,
+        'mime': mime,
+        'rows': len(frame),
+        'columns': len(columns),
+        'bytes': size
+    }, None
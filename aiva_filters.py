@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+🔎 AIVACEO Filter Index
+Bitmap, sorted and text indexes behind the dashboard filter bars
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+#######################################
+# ROW SELECTION
+#######################################
+
+class RowSelection:
+    """
+    Rows picked by a filter bar, as positions into the indexed frame.
+
+    Nothing is copied until frame() is called, and an unfiltered selection hands back
+    a zero-copy view of the whole frame.
+    """
+
+    def __init__(self, frame, positions=None):
+        self._frame = frame
+        self._positions = positions
+
+    @property
+    def is_all(self):
+        return self._positions is None
+
+    @property
+    def positions(self):
+        if self._positions is None:
+            return np.arange(len(self._frame))
+        return self._positions
+
+    def __len__(self):
+        return len(self._frame) if self._positions is None else len(self._positions)
+
+    def frame(self, columns=None):
+        """The selected rows (optionally only some columns) as a DataFrame"""
+        source = self._frame
+        if columns is not None:
+            source = source[[col for col in columns if col in source.columns]]
+        if self._positions is None:
+            return source.copy(deep=False)
+        return source.take(self._positions)
+
+#######################################
+# FILTER INDEX
+#######################################
+
+BITMAP_MAX_CARDINALITY = 256  # Columns with more distinct values are matched through their codes instead
+SEARCH_CACHE_SIZE = 16
+
+def _changed_values(frame, column, changes):
+    """Values of column at the rows a store's writes changed: the patched rows, then the appended ones"""
+    return pd.concat([changes['new'][column], frame[column].iloc[changes['start']:]], ignore_index=True)
+
+def _lookup_codes(uniques, values, normalize=None, use_na_sentinel=True):
+    """
+    (uniques, codes of values) with the values not in uniques appended to it; normalize
+    maps distinct raw values to the keys kept in uniques
+    """
+    local_codes, local_uniques = pd.factorize(values, use_na_sentinel=use_na_sentinel)
+    keys = pd.Index(local_uniques)
+    if normalize is not None:
+        key_codes, keys = pd.factorize(normalize(keys))
+        local_codes = np.append(key_codes, -1)[local_codes]
+        keys = pd.Index(keys)
+
+    ids = uniques.get_indexer(keys)
+    unseen = np.flatnonzero(ids < 0)
+    if len(unseen):
+        ids[unseen] = len(uniques) + np.arange(len(unseen))
+        uniques = uniques.append(keys[unseen])
+    return uniques, np.append(ids, -1)[local_codes]
+
+def _recoded(codes, rows, n_rows, new_codes):
+    """codes grown to n_rows with new_codes written at rows"""
+    grown = np.empty(n_rows, dtype=codes.dtype)
+    grown[:len(codes)] = codes
+    grown[rows] = new_codes
+    return grown
+
+def _repacked(bitmaps, n_codes, codes, rows, n_rows):
+    """Packed bitmap per code, copied from bitmaps with only the bytes holding rows re-packed from codes"""
+    touched = np.unique(rows // 8)
+    block = touched[:, None] * 8 + np.arange(8)
+    block_codes = np.where(block < n_rows, codes[np.minimum(block, max(n_rows - 1, 0))], -1)
+
+    repacked = []
+    for code in range(n_codes):
+        bitmap = np.zeros((n_rows + 7) // 8, dtype=np.uint8)
+        if code < len(bitmaps):
+            bitmap[:len(bitmaps[code])] = bitmaps[code]
+        bitmap[touched] = np.packbits(block_codes == code, axis=1)[:, 0]
+        repacked.append(bitmap)
+    return repacked
+
+def _resorted(sorted_values, order, rows, values, n_rows):
+    """(sorted values, order) with the rows at rows taken out and merged back in at their new values"""
+    moved = np.zeros(n_rows, dtype=bool)
+    moved[rows] = True
+    valid = len(sorted_values)
+    keep = ~moved[order[:valid]]
+    kept_values, kept_order = sorted_values[keep], order[:valid][keep]
+    missing = order[valid:][~moved[order[valid:]]]
+
+    # Missing values stay at the end of the order, as after a stable argsort
+    present = ~np.isnan(values)
+    by_value = np.argsort(values[present], kind='stable')
+    added_values, added_rows = values[present][by_value], rows[present][by_value]
+    at = np.searchsorted(kept_values, added_values, side='right')
+    return (np.insert(kept_values, at, added_values),
+            np.concatenate([np.insert(kept_order, at, added_rows), missing, rows[~present]]))
+
+def _lowered(keys):
+    return keys.astype(str).str.lower()
+
+class FilterIndex:
+    """
+    Per-column indexes over one dataset version, built lazily and shared by every session.
+
+    Low-cardinality columns get one packed bitmap per value, numeric columns a sorted
+    index for range queries, and text columns their factorized, lower-cased distinct
+    values for substring search. Constraints are combined as packed bitmaps with a
+    bitwise AND, so no intermediate frames are created. A later version of a call store's
+    frame gets its index through updated(), which re-indexes only the rows written since.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.n_rows = len(frame)
+        self._bitmaps = {}
+        self._sorted = {}
+        self._text = {}
+        self._search_cache = OrderedDict()
+        self._index_bytes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def nbytes(self):
+        """Bytes held by the indexes built so far (the frame itself is not counted)"""
+        with self._lock:
+            return self._index_bytes + sum(packed.nbytes for packed in self._search_cache.values())
+
+    def _pack(self, mask):
+        return np.packbits(mask)
+
+    def _bitmap_index(self, column):
+        with self._lock:
+            index = self._bitmaps.get(column)
+            if index is None:
+                codes, uniques = pd.factorize(self.frame[column], use_na_sentinel=False)
+                values = pd.Index(uniques)
+                if len(values) <= BITMAP_MAX_CARDINALITY:
+                    bitmaps = [self._pack(codes == code) for code in range(len(values))]
+                else:
+                    bitmaps = None
+                index = (values, codes, bitmaps)
+                self._bitmaps[column] = index
+                self._index_bytes += values.memory_usage(deep=True) + codes.nbytes + sum(bitmap.nbytes for bitmap in bitmaps or [])
+            return index
+
+    def isin(self, column, values):
+        """Packed mask of rows whose column value is in values (None when there is no constraint)"""
+        if column not in self.frame.columns or values is None:
+            return None
+
+        index_values, codes, bitmaps = self._bitmap_index(column)
+        selected = index_values.get_indexer(pd.Index(list(values)))
+        selected = np.unique(selected[selected >= 0])
+
+        if bitmaps is None:
+            hits = np.zeros(len(index_values), dtype=bool)
+            hits[selected] = True
+            return self._pack(hits[codes])
+
+        if len(selected) == 0:
+            return np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        return np.bitwise_or.reduce([bitmaps[code] for code in selected])
+
+    def _sorted_index(self, column):
+        with self._lock:
+            index = self._sorted.get(column)
+            if index is None:
+                values = pd.to_numeric(self.frame[column], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+                order = np.argsort(values, kind='stable')
+                valid = int((~np.isnan(values)).sum())
+                index = (values[order[:valid]], order)
+                self._sorted[column] = index
+                self._index_bytes += index[0].nbytes + order.nbytes
+            return index
+
+    def between(self, column, low, high):
+        """Packed mask of rows with low <= column <= high (None when the range covers every row)"""
+        if column not in self.frame.columns:
+            return None
+
+        sorted_values, order = self._sorted_index(column)
+        if len(sorted_values) == self.n_rows and (
+                self.n_rows == 0 or (low <= sorted_values[0] and high >= sorted_values[-1])):
+            return None
+
+        start = np.searchsorted(sorted_values, low, side='left')
+        stop = np.searchsorted(sorted_values, high, side='right')
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[order[start:stop]] = True
+        return self._pack(mask)
+
+    def _text_index(self, column):
+        with self._lock:
+            index = self._text.get(column)
+            if index is None:
+                lowered, codes = _lookup_codes(pd.Index([], dtype=object), self.frame[column], normalize=_lowered)
+                index = (lowered, codes)
+                self._text[column] = index
+                self._index_bytes += lowered.memory_usage(deep=True) + codes.nbytes
+            return index
+
+    def _text_hits(self, column, term):
+        """Per-distinct-value matches for term (plus a trailing False for missing values) and the row codes"""
+        lowered, codes = self._text_index(column)
+        hits = np.asarray(lowered.str.contains(term.lower(), regex=False), dtype=bool)
+        # Missing values (code -1) never match
+        return np.append(hits, False), codes
+
+    def contains(self, columns, term):
+        """Packed mask of rows where any of columns contains term (case-insensitive, literal)"""
+        columns = tuple(col for col in columns if col in self.frame.columns)
+        cache_key = (columns, term.lower())
+
+        with self._lock:
+            packed = self._search_cache.get(cache_key)
+            if packed is not None:
+                self._search_cache.move_to_end(cache_key)
+                return packed
+
+        mask = np.zeros(self.n_rows, dtype=bool)
+        for column in columns:
+            hits, codes = self._text_hits(column, term)
+            mask |= hits[codes]
+
+        packed = self._pack(mask)
+        with self._lock:
+            self._search_cache[cache_key] = packed
+            while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        return packed
+
+    def _isin_rows(self, column, values, rows):
+        """Boolean mask over rows: column value is in values"""
+        index_values, codes, _ = self._bitmap_index(column)
+        selected = index_values.get_indexer(pd.Index(list(values)))
+        hits = np.zeros(len(index_values), dtype=bool)
+        hits[selected[selected >= 0]] = True
+        return hits[codes[rows]]
+
+    def _between_rows(self, column, low, high, rows):
+        """Boolean mask over rows: low <= column <= high"""
+        values = pd.to_numeric(self.frame[column].take(rows), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        return (values >= low) & (values <= high)
+
+    def _contains_rows(self, columns, term, rows):
+        """Boolean mask over rows: any of columns contains term"""
+        mask = np.zeros(len(rows), dtype=bool)
+        for column in columns:
+            hits, codes = self._text_hits(column, term)
+            mask |= hits[codes[rows]]
+        return mask
+
+    def select(self, isin=None, ranges=None, search=None, search_columns=(), within=None):
+        """
+        RowSelection for a filter bar.
+
+        isin: {column: values} or (column, values) pairs (empty value lists are ignored),
+        ranges: {column: (low, high)}, search: substring matched against search_columns.
+        within: ascending row positions (e.g. a date range's partitions) the other filters
+        are evaluated on instead of the whole frame.
+        """
+        isin_pairs = [(column, values) for column, values in (isin.items() if isinstance(isin, dict) else (isin or []))
+                      if column in self.frame.columns and values is not None and len(values) > 0]
+        ranges = {column: bounds for column, bounds in (ranges or {}).items() if column in self.frame.columns}
+
+        if within is not None:
+            return self._select_within(within, isin_pairs, ranges, search, search_columns)
+
+        masks = [self.isin(column, values) for column, values in isin_pairs]
+
+        for column, (low, high) in ranges.items():
+            masks.append(self.between(column, low, high))
+
+        if search:
+            masks.append(self.contains(search_columns, search))
+
+        masks = [mask for mask in masks if mask is not None]
+        if not masks:
+            return RowSelection(self.frame)
+
+        combined = masks[0] if len(masks) == 1 else np.bitwise_and.reduce(masks)
+        positions = np.flatnonzero(np.unpackbits(combined, count=self.n_rows))
+        return RowSelection(self.frame, positions)
+
+    def _select_within(self, rows, isin_pairs, ranges, search, search_columns):
+        """Filters evaluated only on the given rows, narrowing them constraint by constraint"""
+        rows = np.asarray(rows, dtype=np.int64)
+
+        for column, values in isin_pairs:
+            rows = rows[self._isin_rows(column, values, rows)]
+
+        for column, (low, high) in ranges.items():
+            rows = rows[self._between_rows(column, low, high, rows)]
+
+        if search:
+            columns = tuple(col for col in search_columns if col in self.frame.columns)
+            rows = rows[self._contains_rows(columns, search, rows)]
+
+        return RowSelection(self.frame, rows)
+
+    def updated(self, frame, changes):
+        """
+        Index of frame, a later version of this index's frame, given the store's writes in
+        between (CallStore.changes_since): the column indexes built so far are carried over
+        with only the patched and appended rows re-indexed
+        """
+        index = FilterIndex(frame)
+        if changes['start'] != self.n_rows:
+            return index
+
+        n_rows = len(frame)
+        rows = np.concatenate([changes['patched'], np.arange(changes['start'], n_rows)])
+        with self._lock:
+            bitmaps, sorted_indexes, text_indexes = dict(self._bitmaps), dict(self._sorted), dict(self._text)
+
+        for column, (values, codes, column_bitmaps) in bitmaps.items():
+            if column not in frame.columns:
+                continue
+            values, changed = _lookup_codes(values, _changed_values(frame, column, changes), use_na_sentinel=False)
+            codes = _recoded(codes, rows, n_rows, changed)
+            if len(values) <= BITMAP_MAX_CARDINALITY:
+                column_bitmaps = _repacked(column_bitmaps, len(values), codes, rows, n_rows)
+            else:
+                column_bitmaps = None
+            index._bitmaps[column] = (values, codes, column_bitmaps)
+            index._index_bytes += values.memory_usage(deep=True) + codes.nbytes + sum(bitmap.nbytes for bitmap in column_bitmaps or [])
+
+        for column, (sorted_values, order) in sorted_indexes.items():
+            if column not in frame.columns:
+                continue
+            changed = pd.to_numeric(_changed_values(frame, column, changes), errors='coerce')
+            sorted_values, order = _resorted(sorted_values, order, rows,
+                                             changed.to_numpy(dtype=float, na_value=np.nan), n_rows)
+            index._sorted[column] = (sorted_values, order)
+            index._index_bytes += sorted_values.nbytes + order.nbytes
+
+        for column, (lowered, codes) in text_indexes.items():
+            if column not in frame.columns:
+                continue
+            lowered, changed = _lookup_codes(lowered, _changed_values(frame, column, changes), normalize=_lowered)
+            codes = _recoded(codes, rows, n_rows, changed)
+            index._text[column] = (lowered, codes)
+            index._index_bytes += lowered.memory_usage(deep=True) + codes.nbytes
+
+        return index
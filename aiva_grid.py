@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+🗂️ AIVACEO Grid Row Model
+Server-side paging, sorting and searching for large AG Grid tables, and cached GridOptions
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+#######################################
+# QUERY ENGINE
+#######################################
+
+SERVER_SIDE_ROW_THRESHOLD = 5000  # Frames larger than this are served page by page
+PAGE_SIZES = [25, 50, 100, 200]
+ROW_KEY = '_row_key'  # Position of a row in the full frame, carried through the grid for selections
+
+class GridQueryEngine:
+    """
+    Python-side row model for a grid: search, sort and page over the full frame and
+    return only the requested block of rows.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def text_columns(self):
+        return [col for col in self.frame.columns
+                if isinstance(self.frame[col].dtype, pd.CategoricalDtype)
+                or pd.api.types.is_object_dtype(self.frame[col])
+                or pd.api.types.is_string_dtype(self.frame[col])]
+
+    def search(self, text):
+        """Row positions where any text column contains text (case-insensitive)"""
+        if not text:
+            return np.arange(len(self.frame))
+
+        needle = text.lower()
+        mask = np.zeros(len(self.frame), dtype=bool)
+
+        for col in self.text_columns():
+            series = self.frame[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Match each category once, then look rows up by code
+                hits = series.cat.categories.astype(str).str.lower().str.contains(needle, regex=False)
+                codes = series.cat.codes.to_numpy()
+                mask |= np.append(np.asarray(hits, dtype=bool), False)[codes]
+            else:
+                mask |= series.astype(str).str.lower().str.contains(needle, regex=False).to_numpy(dtype=bool, na_value=False)
+
+        return np.flatnonzero(mask)
+
+    def sort(self, positions, column=None, ascending=True):
+        """positions reordered by column (stable, missing values last)"""
+        if not column or column not in self.frame.columns or len(positions) == 0:
+            return positions
+
+        values = self.frame[column].take(positions).reset_index(drop=True)
+        try:
+            order = values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+        except TypeError:
+            order = values.astype(str).sort_values(ascending=ascending, kind='stable').index.to_numpy()
+        return positions[order]
+
+    def page(self, positions, page=1, page_size=50):
+        """Rows for one page of positions, with their ROW_KEY"""
+        start = (page - 1) * page_size
+        block = positions[start:start + page_size]
+
+        page_frame = self.frame.take(block).reset_index(drop=True)
+        page_frame.insert(0, ROW_KEY, block)
+        return page_frame
+
+    def query(self, search_text="", sort_column=None, ascending=True, page=1, page_size=50):
+        """One page of rows (with ROW_KEY) plus the number of rows matching the search"""
+        positions = self.sort(self.search(search_text), sort_column, ascending)
+        return self.page(positions, page, page_size), len(positions)
+
+#######################################
+# STREAMLIT ROW MODEL
+#######################################
+
+def _selection_key(grid_key):
+    return f"{grid_key}_selected_keys"
+
+def server_side_page(dataframe, grid_key):
+    """Search/sort/page controls for a large grid; returns the page to render and the request state"""
+    engine = GridQueryEngine(dataframe)
+    columns = [str(col) for col in dataframe.columns]
+
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        search_text = st.text_input("🔍 Search rows", key=f"{grid_key}_search",
+                                    placeholder="Search all text columns...")
+    with col2:
+        sort_column = st.selectbox("↕️ Sort by", ["(none)"] + columns, key=f"{grid_key}_sort")
+    with col3:
+        descending = st.selectbox("Order", ["Asc", "Desc"], key=f"{grid_key}_order") == "Desc"
+    with col4:
+        page_size = st.selectbox("Rows", PAGE_SIZES, index=1, key=f"{grid_key}_page_size")
+
+    sort_column = None if sort_column == "(none)" else dataframe.columns[columns.index(sort_column)]
+    positions = engine.sort(engine.search(search_text), sort_column, not descending)
+    total_matches = len(positions)
+    page_count = max(1, -(-total_matches // page_size))
+
+    # Keep the requested page valid when the search or page size shrinks the result
+    page_key = f"{grid_key}_page"
+    if st.session_state.get(page_key, 1) > page_count:
+        st.session_state[page_key] = page_count
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page = st.number_input("📄 Page", min_value=1, max_value=page_count, step=1, key=page_key)
+    with col2:
+        first_row = (page - 1) * page_size + 1 if total_matches else 0
+        last_row = min(page * page_size, total_matches)
+        st.caption(f"Rows {first_row:,}–{last_row:,} of {total_matches:,} matching ({len(dataframe):,} total) · page {page} of {page_count}")
+
+    page_frame = engine.page(positions, page, page_size)
+
+    state = {
+        'grid_key': f"{grid_key}_{search_text}_{sort_column}_{descending}_{page_size}_{page}",
+        'total_rows': total_matches,
+        'page': page,
+        'page_count': page_count
+    }
+    return page_frame, state
+
+def configure_server_side_options(grid_options, page_frame, grid_key):
+    """Adapt built GridOptions to a server-served page: no client paging/sorting/filtering, row key hidden, selection restored"""
+    grid_options['pagination'] = False
+    grid_options.pop('paginationAutoPageSize', None)
+    grid_options.pop('paginationPageSize', None)
+
+    default_col = grid_options.setdefault('defaultColDef', {})
+    default_col['sortable'] = False
+    default_col['filter'] = False
+
+    for col_def in grid_options.get('columnDefs', []):
+        col_def['sortable'] = False
+        col_def['filter'] = False
+        col_def.pop('sort', None)
+        if col_def.get('field') == ROW_KEY:
+            col_def['hide'] = True
+
+    selected_keys = st.session_state.get(_selection_key(grid_key), set())
+    page_keys = page_frame[ROW_KEY].to_numpy()
+    preselected = [str(i) for i in np.flatnonzero(np.isin(page_keys, list(selected_keys)))]
+    if preselected:
+        grid_options.setdefault('initialState', {})['rowSelection'] = preselected
+
+    return grid_options
+
+def server_side_response(dataframe, page_frame, grid_key, grid_response, state):
+    """Grid response for a served page; selections are remembered by row key across pages"""
+    selection_key = _selection_key(grid_key)
+    selected_keys = set(st.session_state.get(selection_key, set()))
+
+    if grid_response is not None and grid_response.grid_response:
+        page_selected = grid_response.selected_rows
+        page_keys = set(page_frame[ROW_KEY].tolist())
+        selected_keys -= page_keys
+        if page_selected is not None and ROW_KEY in page_selected.columns:
+            selected_keys |= set(pd.to_numeric(page_selected[ROW_KEY], errors='coerce').dropna().astype(int).tolist())
+        st.session_state[selection_key] = selected_keys
+
+    selected_positions = sorted(key for key in selected_keys if 0 <= key < len(dataframe))
+    selected_rows = dataframe.take(selected_positions).to_dict('records') if selected_positions else []
+
+    return {
+        'data': page_frame.drop(columns=[ROW_KEY]),
+        'selected_rows': selected_rows,
+        'selected_keys': selected_positions,
+        'total_rows': state['total_rows'],
+        'page': state['page'],
+        'page_count': state['page_count'],
+        'grid_response': grid_response
+    }
+
+#######################################
+# GRID OPTIONS CACHE
+#######################################
+
+GRID_OPTIONS_CACHE_SIZE = 64
+
+_grid_options_cache = OrderedDict()
+_grid_build_stats = {}
+_grid_options_lock = threading.Lock()
+
+def grid_schema(dataframe):
+    """Column names and dtypes: everything GridOptions depend on"""
+    return tuple((str(col), str(dtype)) for col, dtype in dataframe.dtypes.items())
+
+def cached_grid_options(grid_key, dataframe, build, flags=()):
+    """
+    GridOptions built once per (grid_key, column schema, feature flags).
+
+    build() runs only on a miss; every caller gets its own deep copy, so per-run tweaks
+    (server-side paging, restored selections) never leak into the cached options.
+    """
+    cache_key = (grid_key, grid_schema(dataframe), tuple(flags))
+    started = time.perf_counter()
+
+    with _grid_options_lock:
+        options = _grid_options_cache.get(cache_key)
+        if options is not None:
+            _grid_options_cache.move_to_end(cache_key)
+
+    hit = options is not None
+    if not hit:
+        options = build()
+        build_seconds = time.perf_counter() - started
+        with _grid_options_lock:
+            _grid_options_cache[cache_key] = options
+            while len(_grid_options_cache) > GRID_OPTIONS_CACHE_SIZE:
+                _grid_options_cache.popitem(last=False)
+
+    grid_options = copy.deepcopy(options)
+    seconds = time.perf_counter() - started
+
+    with _grid_options_lock:
+        stats = _grid_build_stats.setdefault(grid_key, {'builds': 0, 'hits': 0, 'build_ms': 0.0, 'last_ms': 0.0})
+        if hit:
+            stats['hits'] += 1
+        else:
+            stats['builds'] += 1
+            stats['build_ms'] = build_seconds * 1000
+        stats['last_ms'] = seconds * 1000
+        stats['columns'] = len(dataframe.columns)
+
+    return grid_options
+
+def refresh_set_filter_values(grid_options, dataframe):
+    """Refresh the data-dependent value lists of set filters in cached GridOptions"""
+    for col_def in grid_options.get('columnDefs', []):
+        params = col_def.get('filterParams')
+        field = col_def.get('field')
+        if col_def.get('filter') == 'agSetColumnFilter' and isinstance(params, dict) and 'values' in params and field in dataframe.columns:
+            params['values'] = [str(x) for x in dataframe[field].unique()]
+    return grid_options
+
+def grid_build_timings():
+    """GridOptions build cost and cache hits per grid"""
+    with _grid_options_lock:
+        rows = [
+            {
+                'Grid': grid_key,
+                'Columns': stats.get('columns', 0),
+                'Builds': stats['builds'],
+                'Cache Hits': stats['hits'],
+                'Build (ms)': round(stats['build_ms'], 2),
+                'Last Call (ms)': round(stats['last_ms'], 2)
+            }
+            for grid_key, stats in _grid_build_stats.items()
+        ]
+    return pd.DataFrame(rows, columns=['Grid', 'Columns', 'Builds', 'Cache Hits', 'Build (ms)', 'Last Call (ms)'])
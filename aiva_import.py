@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+📥 AIVACEO Import Pipeline
+Chunked CSV/Excel/JSON/Parquet readers, per-chunk validation and bounded-memory loads into a call store
+"""
+
+import io
+import json
+import os
+import re
+import time as time_module
+
+import numpy as np
+import pandas as pd
+
+from aiva_call_store import NUMERIC_COLUMNS, CATEGORICAL_COLUMNS, TEXT_COLUMNS, parse_call_timestamps
+
+#######################################
+# CHUNKED READERS
+#######################################
+
+IMPORT_CHUNK_ROWS = 50_000
+JSON_BLOCK_CHARS = 1 << 20
+
+# Import Options labels -> modes understood by import_upload
+IMPORT_MODES = {
+    'Replace All Data': 'replace',
+    'Append to Existing': 'append',
+    'Update Existing': 'upsert'
+}
+
+def upload_format(name):
+    """File format from an upload's name: csv, xlsx, json or parquet (None when unsupported)"""
+    extension = os.path.splitext(name)[1].lower().lstrip('.')
+    return {'csv': 'csv', 'txt': 'csv', 'xlsx': 'xlsx', 'json': 'json', 'jsonl': 'json',
+            'ndjson': 'json', 'parquet': 'parquet'}.get(extension)
+
+def _stream_size(stream):
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
+
+def read_csv_chunks(stream, chunk_rows=IMPORT_CHUNK_ROWS):
+    """CSV rows in chunks, every value read as text so chunks agree on dtypes (the store coerces them)"""
+    size = max(_stream_size(stream), 1)
+    # pandas closes binary handles it wraps itself; a wrapper owned here leaves the caller's stream open
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    try:
+        for chunk in pd.read_csv(text, chunksize=chunk_rows, dtype=str):
+            yield chunk, min(stream.tell() / size, 1.0)
+    finally:
+        text.detach()
+
+def read_excel_chunks(stream, chunk_rows=IMPORT_CHUNK_ROWS):
+    """Rows of the first worksheet in chunks, read through openpyxl's streaming read-only mode"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total = max((sheet.max_row or 1) - 1, 1)
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(value) if value is not None else f"column_{i + 1}" for i, value in enumerate(header)]
+
+        batch = []
+        read = 0
+        for row in rows:
+            batch.append(row[:len(columns)])
+            if len(batch) == chunk_rows:
+                read += len(batch)
+                yield pd.DataFrame(batch, columns=columns), min(read / total, 1.0)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns), 1.0
+    finally:
+        workbook.close()
+
+_JSON_SEPARATORS = re.compile(r'[\s,]*')
+
+def _iter_json_array(text, block_chars=JSON_BLOCK_CHARS):
+    """Records of a top-level JSON array, decoded one at a time from a rolling text buffer"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    opened = False
+
+    while True:
+        position = _JSON_SEPARATORS.match(buffer, position).end()
+        if position >= len(buffer):
+            if eof:
+                return
+            data = text.read(block_chars)
+            eof = not data
+            buffer = buffer[position:] + data
+            position = 0
+            continue
+
+        if not opened:
+            if buffer[position] != '[':
+                raise ValueError("JSON imports must be an array of records or one record per line")
+            opened = True
+            position += 1
+            continue
+
+        if buffer[position] == ']':
+            return
+
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # The record runs past the buffered text; read more and retry
+            if eof:
+                raise
+            data = text.read(block_chars)
+            eof = not data
+            buffer = buffer[position:] + data
+            position = 0
+            continue
+
+        yield record
+        position = end
+
+def read_json_chunks(stream, chunk_rows=IMPORT_CHUNK_ROWS):
+    """JSON records in chunks: a top-level array is decoded record by record, JSON Lines line by line"""
+    size = max(_stream_size(stream), 1)
+    text = io.TextIOWrapper(stream, encoding='utf-8')
+    try:
+        first = text.read(1)
+        while first and first.isspace():
+            first = text.read(1)
+        text.seek(0)
+
+        if first == '[':
+            batch = []
+            for record in _iter_json_array(text):
+                batch.append(record)
+                if len(batch) == chunk_rows:
+                    yield pd.DataFrame.from_records(batch), min(stream.tell() / size, 1.0)
+                    batch = []
+            if batch:
+                yield pd.DataFrame.from_records(batch), 1.0
+        else:
+            for chunk in pd.read_json(text, lines=True, chunksize=chunk_rows, dtype=False):
+                yield chunk, min(stream.tell() / size, 1.0)
+    finally:
+        text.detach()
+
+def read_parquet_chunks(stream, chunk_rows=IMPORT_CHUNK_ROWS):
+    """Parquet record batches as chunks"""
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(stream)
+    total = max(parquet.metadata.num_rows, 1)
+    read = 0
+    for batch in parquet.iter_batches(batch_size=chunk_rows):
+        read += batch.num_rows
+        yield batch.to_pandas(), min(read / total, 1.0)
+
+CHUNK_READERS = {
+    'csv': read_csv_chunks,
+    'xlsx': read_excel_chunks,
+    'json': read_json_chunks,
+    'parquet': read_parquet_chunks
+}
+
+def iter_upload_chunks(stream, name, chunk_rows=IMPORT_CHUNK_ROWS):
+    """(chunk, fraction read) pairs for an uploaded file; never holds more than one chunk of parsed rows"""
+    file_format = upload_format(name)
+    if file_format is None:
+        raise ValueError(f"Unsupported file format: {name}")
+    stream.seek(0)
+    return CHUNK_READERS[file_format](stream, chunk_rows)
+
+def preview_upload(stream, name, rows=5):
+    """First rows of an upload, without reading the rest of it"""
+    try:
+        chunk, _ = next(iter_upload_chunks(stream, name, chunk_rows=rows), (pd.DataFrame(), 0.0))
+        return chunk, None
+    except Exception as e:
+        return None, str(e)
+    finally:
+        stream.seek(0)
+
+#######################################
+# VALIDATION
+#######################################
+
+SCHEMA_COLUMNS = set(NUMERIC_COLUMNS) | set(CATEGORICAL_COLUMNS) | set(TEXT_COLUMNS)
+
+def new_import_report():
+    return {
+        'chunks': 0,
+        'rows_read': 0,
+        'rows_imported': 0,
+        'rejected_rows': 0,
+        'missing_values': 0,
+        'invalid_numbers': {},
+        'invalid_dates': 0,
+        'new_columns': [],
+        'inserted': 0,
+        'updated': 0,
+        'unchanged': 0,
+        'backup': None,
+        'persisted': None,
+        'seconds': 0.0,
+        'version': None
+    }
+
+def validate_chunk(chunk, report, known_columns=None):
+    """
+    Count a raw chunk's problems into report: missing values, numbers and dates the call
+    schema cannot parse, and (given known_columns) columns the store has not seen.
+    Rows without a call_id are rejected.
+    """
+    report['rows_read'] += len(chunk)
+    report['missing_values'] += int(chunk.isna().to_numpy().sum())
+
+    for col in chunk.columns:
+        if col in NUMERIC_COLUMNS and not pd.api.types.is_numeric_dtype(chunk[col]):
+            values = chunk[col]
+            blank = values.isna() | values.astype(str).str.strip().eq('')
+            invalid = int((pd.to_numeric(values, errors='coerce').isna() & ~blank).sum())
+            if invalid:
+                report['invalid_numbers'][col] = report['invalid_numbers'].get(col, 0) + invalid
+        elif known_columns is not None and col not in known_columns and col not in report['new_columns']:
+            report['new_columns'].append(col)
+
+    if 'call_date' in chunk.columns:
+        dated = chunk['call_date'].notna().to_numpy()
+        report['invalid_dates'] += int((dated & np.isnat(parse_call_timestamps(chunk).to_numpy())).sum())
+
+    if 'call_id' in chunk.columns:
+        missing_id = (chunk['call_id'].isna() | chunk['call_id'].astype(str).str.strip().eq('')).to_numpy()
+        if missing_id.any():
+            report['rejected_rows'] += int(missing_id.sum())
+            chunk = chunk[~missing_id]
+
+    return chunk
+
+#######################################
+# IMPORT
+#######################################
+
+def import_upload(store, stream, name, mode='replace', validate=True, chunk_rows=IMPORT_CHUNK_ROWS,
+                  progress=None, source="", backup=False):
+    """
+    Stream an uploaded file into a call store one chunk at a time (mode 'replace', 'append'
+    or 'upsert', which updates known calls by call_id and appends the rest).
+
+    Each chunk is validated (when validate is set), typed and written by the store as it is
+    read, so only the store's narrow columns and a single raw chunk are ever in memory.
+    progress(fraction, report) is called after every chunk; backup snapshots the store first.
+    Returns (report, error).
+    """
+    report = new_import_report()
+    started = time_module.time()
+
+    if mode not in ('replace', 'append', 'upsert'):
+        return report, f"Unknown import mode: {mode}"
+
+    # Appends and updates are checked against the columns already in the store; a replace defines them
+    known_columns = set(store.columns) if mode != 'replace' and store.is_loaded() else None
+
+    def chunks():
+        for chunk, fraction in iter_upload_chunks(stream, name, chunk_rows):
+            if validate:
+                chunk = validate_chunk(chunk, report, known_columns)
+            else:
+                report['rows_read'] += len(chunk)
+            report['chunks'] += 1
+            report['rows_imported'] += len(chunk)
+            if progress:
+                progress(fraction, report)
+            yield chunk
+
+    try:
+        entry = store.load_chunks(chunks(), source=source, mode=mode, backup=backup)
+    except Exception as e:
+        return report, str(e)
+    finally:
+        report['seconds'] = time_module.time() - started
+
+    report['version'] = store.version
+    if entry is not None:
+        for key in ('inserted', 'updated', 'unchanged', 'backup', 'persisted'):
+            report[key] = entry[key]
+    return report, None
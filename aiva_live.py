@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+📡 AIVACEO Live Channel
+In-process publish/subscribe of live call events, so live tiles redraw when events
+arrive instead of rerunning whole pages on a timer, and the streaming metrics behind them
+"""
+
+import html
+import logging
+import threading
+import time as time_module
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+#######################################
+# STREAMING METRICS
+#######################################
+
+# VAPI call statuses (status-update messages) and what they mean for the live tiles
+QUEUED_STATUSES = {'queued', 'ringing'}
+ACTIVE_STATUSES = {'in-progress', 'forwarding'}
+ENDED_STATUSES = {'ended', 'end-of-call-report', 'completed'}
+
+ACTIVE_CALL_TIMEOUT_SECONDS = 2 * 60 * 60
+RECENT_CALL_IDS = 10_000
+WAIT_WINDOW_SECONDS = 15 * 60
+LATENCY_WINDOW_SECONDS = 5 * 60
+
+class BucketRing:
+    """
+    Fixed number of time buckets (count and sum per bucket) in a ring. add() is O(1): a slot
+    that still holds an older bucket is reset on first use; values older than the ring are
+    dropped. Reads cover the buckets ending at "now", so windows slide without any events.
+    """
+
+    def __init__(self, width_seconds, buckets):
+        self.width = width_seconds
+        self.buckets = buckets
+        self.index = np.full(buckets, -1, dtype=np.int64)
+        self.counts = np.zeros(buckets, dtype=np.int64)
+        self.sums = np.zeros(buckets, dtype=np.float64)
+
+    def add(self, at, value=0.0):
+        bucket = int(at // self.width)
+        slot = bucket % self.buckets
+        if self.index[slot] != bucket:
+            if self.index[slot] > bucket:
+                return
+            self.index[slot] = bucket
+            self.counts[slot] = 0
+            self.sums[slot] = 0.0
+        self.counts[slot] += 1
+        self.sums[slot] += value
+
+    def series(self, now=None, buckets=None):
+        """(bucket start times, counts, sums) of the last buckets, oldest first"""
+        buckets = min(buckets or self.buckets, self.buckets)
+        last = int((now or time_module.time()) // self.width)
+        wanted = np.arange(last - buckets + 1, last + 1)
+        slots = wanted % self.buckets
+        current = self.index[slots] == wanted
+        return wanted * self.width, np.where(current, self.counts[slots], 0), np.where(current, self.sums[slots], 0.0)
+
+    def window(self, seconds, now=None):
+        """(count, sum) over the last seconds (rounded up to whole buckets)"""
+        _, counts, sums = self.series(now, -(-int(seconds) // self.width))
+        return int(counts.sum()), float(sums.sum())
+
+class LiveMetrics:
+    """
+    Streaming aggregates of call events for the live tiles, updated in O(1) per event:
+    calls in the queue and in progress, call starts per minute (last hour) and per hour
+    (last day), queue wait times and webhook delivery latency per minute.
+    """
+
+    def __init__(self):
+        self.queued = {}
+        self.active = {}
+        self.recent_ids = OrderedDict()
+        self.starts_by_minute = BucketRing(60, 60)
+        self.starts_by_hour = BucketRing(3600, 24)
+        self.waits = BucketRing(60, 60)
+        self.latency = BucketRing(60, 60)
+        self._lock = threading.Lock()
+
+    def _first_seen(self, call_id, at):
+        """Count a call once, when it is first heard of"""
+        if call_id in self.recent_ids:
+            return
+        self.recent_ids[call_id] = at
+        if len(self.recent_ids) > RECENT_CALL_IDS:
+            self.recent_ids.popitem(last=False)
+        self.starts_by_minute.add(at)
+        self.starts_by_hour.add(at)
+
+    def observe(self, events):
+        """Channel subscriber: apply a batch of published call events"""
+        with self._lock:
+            for event in events:
+                if event.get('kind') != 'call':
+                    continue
+                row = event['row']
+                call_id = row.get('call_id')
+                # Events are timed by the sender's timestamp when there is one (queue waits shorter
+                # than a commit batch would otherwise be zero), else by their receipt
+                received_at = event['received_at']
+                at = event.get('sent_at') or received_at
+                # n8n call_processing events describe finished calls
+                status = row.get('call_status') or ('ended' if event.get('source') == 'n8n' else None)
+
+                if event.get('sent_at'):
+                    self.latency.add(received_at, max(received_at - event['sent_at'], 0.0))
+
+                if status in QUEUED_STATUSES:
+                    if call_id not in self.active:
+                        self.queued.setdefault(call_id, (at, row))
+                elif status in ACTIVE_STATUSES:
+                    if call_id not in self.active:
+                        queued = self.queued.pop(call_id, None)
+                        self.active[call_id] = (at, dict(queued[1], **row) if queued else row)
+                        if queued is not None:
+                            self.waits.add(at, at - queued[0])
+                elif status in ENDED_STATUSES:
+                    self.queued.pop(call_id, None)
+                    self.active.pop(call_id, None)
+                self._first_seen(call_id, at)
+
+    def _expire(self, now):
+        # Calls whose end never arrived stop counting as live after ACTIVE_CALL_TIMEOUT_SECONDS;
+        # both dicts are in arrival order, so only expired calls at the front are visited
+        for calls in (self.queued, self.active):
+            while calls:
+                call_id, (at, _) = next(iter(calls.items()))
+                if now - at <= ACTIVE_CALL_TIMEOUT_SECONDS:
+                    break
+                del calls[call_id]
+
+    def live_calls(self, now=None):
+        """Calls in the queue or in progress, oldest first, with seconds since they were first seen"""
+        now = now or time_module.time()
+        with self._lock:
+            self._expire(now)
+            calls = [(call_id, at, row, 'Queued') for call_id, (at, row) in self.queued.items()]
+            calls += [(call_id, at, row, 'Connected') for call_id, (at, row) in self.active.items()]
+        return [{'call_id': call_id, 'customer_name': row.get('customer_name'), 'phone_number': row.get('phone_number'),
+                 'voice_agent_name': row.get('voice_agent_name'), 'started_at': at, 'seconds': max(now - at, 0.0),
+                 'status': status} for call_id, at, row, status in sorted(calls, key=lambda call: call[1])]
+
+    def snapshot(self, now=None):
+        """Current tile values and chart series, read from the precomputed windows"""
+        now = now or time_module.time()
+        with self._lock:
+            self._expire(now)
+            waits, wait_total = self.waits.window(WAIT_WINDOW_SECONDS, now)
+            latencies, latency_total = self.latency.window(LATENCY_WINDOW_SECONDS, now)
+            minute_times, minute_counts, _ = self.starts_by_minute.series(now)
+            hour_times, hour_counts, _ = self.starts_by_hour.series(now)
+            return {
+                'active_calls': len(self.active),
+                'queue_length': len(self.queued),
+                'avg_wait_seconds': wait_total / waits if waits else None,
+                'api_latency_ms': latency_total / latencies * 1000 if latencies else None,
+                'calls_last_hour': int(minute_counts.sum()),
+                'calls_last_day': int(hour_counts.sum()),
+                'per_minute': (minute_times, minute_counts),
+                'per_hour': (hour_times, hour_counts)
+            }
+
+#######################################
+# ACTIVITY LOG
+#######################################
+
+ACTIVITY_CAPACITY = 10_000
+
+# Activity kinds: (label, icon)
+ACTIVITY_KINDS = [
+    ('Call Queued', '🟡'),
+    ('Call Started', '🟢'),
+    ('Call Ended', '✅'),
+    ('Call Updated', '🔄'),
+    ('Customer Updated', '👤')
+]
+
+def _activity_kind(event):
+    if event.get('kind') == 'customer':
+        return 4
+    status = event['row'].get('call_status') or ('ended' if event.get('source') == 'n8n' else None)
+    if status in QUEUED_STATUSES:
+        return 0
+    if status in ACTIVE_STATUSES:
+        return 1
+    if status in ENDED_STATUSES:
+        return 2
+    return 3
+
+class ActivityLog:
+    """
+    Fixed-capacity ring buffer of live activities (newest overwrite oldest) in column arrays.
+    Durations are stored as numbers and text is HTML-escaped once on the way in, so a
+    window of thousands of activities renders as one joined block without per-row parsing.
+    """
+
+    def __init__(self, capacity=ACTIVITY_CAPACITY):
+        self.capacity = capacity
+        self.total = 0
+        self.at = np.zeros(capacity, dtype=np.float64)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.duration = np.full(capacity, np.nan)
+        self.call_id = np.empty(capacity, dtype=object)
+        self.customer = np.empty(capacity, dtype=object)
+        self.agent = np.empty(capacity, dtype=object)
+        self._lock = threading.Lock()
+
+    def observe(self, events):
+        """Channel subscriber: append a batch of published events"""
+        events = [event for event in events if event.get('kind') in ('call', 'customer')][-self.capacity:]
+        if not events:
+            return
+        rows = [event['row'] for event in events]
+        duration = [row.get('call_duration_seconds') for row in rows]
+        with self._lock:
+            positions = (self.total + np.arange(len(events))) % self.capacity
+            self.at[positions] = [event['received_at'] for event in events]
+            self.kind[positions] = [_activity_kind(event) for event in events]
+            self.duration[positions] = [value if isinstance(value, (int, float)) else np.nan for value in duration]
+            self.call_id[positions] = [html.escape(str(row.get('call_id') or row.get('customer_id') or '')) for row in rows]
+            self.customer[positions] = [html.escape(str(row.get('customer_name') or 'Unknown')) for row in rows]
+            self.agent[positions] = [html.escape(str(row.get('voice_agent_name') or '')) for row in rows]
+            self.total += len(events)
+
+    def window(self, limit):
+        """The newest limit activities, newest first, as column arrays"""
+        with self._lock:
+            count = min(limit, self.total, self.capacity)
+            positions = (self.total - 1 - np.arange(count)) % self.capacity
+            return {
+                'at': self.at[positions],
+                'kind': self.kind[positions],
+                'duration': self.duration[positions],
+                'call_id': self.call_id[positions],
+                'customer': self.customer[positions],
+                'agent': self.agent[positions]
+            }
+
+def activity_html(window, max_height=420):
+    """One HTML block for a window of activities (see ActivityLog.window), rendered with a single element"""
+    labels = [label for label, _ in ACTIVITY_KINDS]
+    icons = [icon for _, icon in ACTIVITY_KINDS]
+    lines = []
+    for at, kind, duration, call_id, customer, agent in zip(window['at'], window['kind'], window['duration'],
+                                                            window['call_id'], window['customer'], window['agent']):
+        details = f" | {agent}" if agent else ""
+        if duration == duration:
+            details += f" | {int(duration // 60):02d}:{int(duration % 60):02d}"
+        lines.append(f'<div style="padding: 0.5rem; margin: 0.2rem 0; background: rgba(255,255,255,0.1); border-radius: 8px; '
+                     f'border-left: 4px solid #6366f1;">{icons[kind]} <strong>{time_module.strftime("%H:%M:%S", time_module.localtime(at))}</strong>'
+                     f' - {labels[kind]} | {customer} | {call_id}{details}</div>')
+    return f'<div style="max-height: {max_height}px; overflow-y: auto;">' + ''.join(lines) + '</div>'
+
+#######################################
+# LIVE CHANNEL
+#######################################
+
+LIVE_TICK_SECONDS = 1
+
+class LiveChannel:
+    """
+    Events published for one call store (by the webhook feed). Subscribers are called
+    synchronously on the publishing thread and should only update in-memory state;
+    readers compare version with the one they last drew, or block in wait(). Every
+    channel keeps LiveMetrics and an ActivityLog of its events from the first publish on.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.version = 0
+        self.events = 0
+        self.last_event_at = None
+        self._subscribers = []
+        self._condition = threading.Condition()
+        self.metrics = LiveMetrics()
+        self.activity = ActivityLog()
+        self.subscribe(self.metrics.observe)
+        self.subscribe(self.activity.observe)
+
+    def subscribe(self, callback):
+        """Call callback(events) for every published batch; returns callback"""
+        with self._condition:
+            self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._condition:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, events):
+        """Publish a batch of event dicts (each with at least 'kind' and 'received_at')"""
+        if not events:
+            return self.version
+        with self._condition:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(events)
+            except Exception as e:
+                logger.warning("Live subscriber on %r failed: %s", self.name, e)
+        with self._condition:
+            self.version += 1
+            self.events += len(events)
+            self.last_event_at = events[-1].get('received_at', self.last_event_at)
+            self._condition.notify_all()
+        return self.version
+
+    def wait(self, since, timeout=None):
+        """Block until version moves past since (or timeout); returns the current version"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != since, timeout)
+            return self.version
+
+_channels = {}
+_channels_lock = threading.Lock()
+
+def get_live_channel(name):
+    """Process-wide live channel of a call store"""
+    with _channels_lock:
+        channel = _channels.get(name)
+        if channel is None:
+            channel = _channels[name] = LiveChannel(name)
+        return channel
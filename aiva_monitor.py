@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+🌐 AIVACEO URL Monitor
+Background asyncio prober for the URL Monitor tab: per-URL schedules, bounded concurrent
+probes over pooled connections, a latest-result cache and a rolling latency/uptime history
+"""
+
+import asyncio
+import threading
+import time as time_module
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+#######################################
+# URL PROBER
+#######################################
+
+PROBE_INTERVAL_SECONDS = 30
+PROBE_TIMEOUT_SECONDS = 5
+MAX_CONCURRENT_PROBES = 8
+HISTORY_SAMPLES = 720
+WATCH_TTL_SECONDS = 900  # A URL no watcher has asked for in this long stops being probed
+
+class UrlProber:
+    """
+    Probes watched URLs from an asyncio loop on a daemon thread. Each URL has its own
+    interval and timeout; at most max_concurrency probes run at once, each a GET on a
+    pooled requests.Session (only the headers are read). Pages read the cached results
+    and history, so a dead endpoint never blocks a rerun.
+
+    History is a ring buffer of the last HISTORY_SAMPLES probes per URL.
+
+    Each URL is probed for its watchers (e.g. dashboard sessions): watch() renews a
+    watcher's claim and unwatch() drops it, and a URL stops being probed (and its history
+    is dropped) once no watcher is left or none renewed within watch_ttl seconds.
+    """
+
+    def __init__(self, interval=PROBE_INTERVAL_SECONDS, timeout=PROBE_TIMEOUT_SECONDS,
+                 max_concurrency=MAX_CONCURRENT_PROBES, history_samples=HISTORY_SAMPLES,
+                 watch_ttl=WATCH_TTL_SECONDS):
+        self.interval = interval
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.history_samples = history_samples
+        self.watch_ttl = watch_ttl
+        self.targets = {}
+        self.latest = {}
+        self.history = {}
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='url-probe'))
+        self._semaphore = None
+        self._wake = None
+        self._thread = threading.Thread(target=self._run, name='url-prober', daemon=True)
+        self._started = threading.Event()
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._wake = asyncio.Event()
+        self._loop.create_task(self._schedule())
+        self._started.set()
+        self._loop.run_forever()
+
+    def _wake_scheduler(self):
+        self._loop.call_soon_threadsafe(self._wake.set)
+
+    #######################################
+    # TARGETS
+    #######################################
+
+    def watch(self, url, watcher=None, interval=None, timeout=None):
+        """
+        Probe url every interval seconds for watcher (first probe right away); re-watching
+        renews the watcher's claim and keeps the URL's history
+        """
+        now = time_module.monotonic()
+        with self._lock:
+            target = self.targets.get(url)
+            if target is None:
+                self.targets[url] = {'url': url, 'interval': interval or self.interval,
+                                     'timeout': timeout or self.timeout, 'next_due': 0.0, 'watchers': {watcher: now}}
+                self.history[url] = deque(maxlen=self.history_samples)
+            else:
+                target['interval'] = interval or target['interval']
+                target['timeout'] = timeout or target['timeout']
+                target['watchers'][watcher] = now
+                return
+        self._wake_scheduler()
+
+    def unwatch(self, url, watcher=None):
+        """Drop watcher's claim on url; the URL is no longer probed once nobody watches it"""
+        with self._lock:
+            target = self.targets.get(url)
+            if target is not None:
+                target['watchers'].pop(watcher, None)
+                if not target['watchers']:
+                    self._drop(url)
+
+    def _drop(self, url):
+        self.targets.pop(url, None)
+        self.latest.pop(url, None)
+        self.history.pop(url, None)
+
+    def _expire(self, now):
+        """Drop claims not renewed within watch_ttl, and the URLs left without watchers (lock held)"""
+        for url, target in list(self.targets.items()):
+            target['watchers'] = {watcher: seen for watcher, seen in target['watchers'].items()
+                                  if now - seen <= self.watch_ttl}
+            if not target['watchers']:
+                self._drop(url)
+
+    def check_now(self, url, watcher=None, wait=None):
+        """Probe url immediately and return the result (waits at most the URL's timeout plus a second)"""
+        self.watch(url, watcher)
+        with self._lock:
+            target = dict(self.targets[url])
+        future = asyncio.run_coroutine_threadsafe(self._probe(target), self._loop)
+        try:
+            return future.result(wait or target['timeout'] + 1)
+        except Exception:
+            return self.latest.get(url)
+
+    #######################################
+    # PROBES
+    #######################################
+
+    async def _schedule(self):
+        while True:
+            now = time_module.monotonic()
+            with self._lock:
+                self._expire(now)
+                due = [dict(target) for url, target in self.targets.items()
+                       if target['next_due'] <= now and url not in self._in_flight]
+                for target in due:
+                    self._in_flight.add(target['url'])
+                    # The schedule is kept from the launch, not the result, so slow URLs keep their interval
+                    self.targets[target['url']]['next_due'] = now + target['interval']
+                waiting = [target['next_due'] for url, target in self.targets.items() if url not in self._in_flight]
+            for target in due:
+                self._loop.create_task(self._probe(target))
+
+            self._wake.clear()
+            sleep = min(max(min(waiting) - now, 0.05), 1.0) if waiting else 1.0
+            try:
+                await asyncio.wait_for(self._wake.wait(), sleep)
+            except asyncio.TimeoutError:
+                pass
+
+    def _fetch(self, url, timeout):
+        """One blocking GET (headers only) in the probe executor"""
+        started = time_module.perf_counter()
+        try:
+            with self.session.get(url, timeout=timeout, stream=True) as response:
+                return {
+                    'status_code': response.status_code,
+                    'response_time': time_module.perf_counter() - started,
+                    'status': 'online' if response.status_code == 200 else 'error',
+                    'timestamp': datetime.now().isoformat()
+                }
+        except Exception as e:
+            return {
+                'status_code': 0,
+                'response_time': 0,
+                'status': 'offline',
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            }
+
+    async def _probe(self, target):
+        url = target['url']
+        try:
+            async with self._semaphore:
+                result = await self._loop.run_in_executor(None, self._fetch, url, target['timeout'])
+        except RuntimeError:
+            # The executor is shut down with the interpreter
+            return None
+        finally:
+            with self._lock:
+                self._in_flight.discard(url)
+        with self._lock:
+            if url in self.targets:
+                self.latest[url] = result
+                self.history[url].append((datetime.now(), result['response_time'], result['status_code'],
+                                          result['status'] == 'online'))
+        return result
+
+    #######################################
+    # RESULTS
+    #######################################
+
+    def status(self, urls):
+        """Latest result per URL; URLs not probed yet are 'pending'"""
+        with self._lock:
+            return [dict(self.latest.get(url) or {'status_code': 0, 'response_time': 0, 'status': 'pending',
+                                                   'timestamp': None}, url=url) for url in urls]
+
+    def history_frame(self, url):
+        """Probe history of url, oldest first: checked_at, response_time, status_code, online"""
+        with self._lock:
+            samples = list(self.history.get(url, ()))
+        return pd.DataFrame(samples, columns=['checked_at', 'response_time', 'status_code', 'online'])
+
+    def uptime(self, url):
+        """Share of probes in the history that were online (None before the first probe)"""
+        with self._lock:
+            samples = self.history.get(url) or ()
+            return sum(sample[3] for sample in samples) / len(samples) if samples else None
+
+_prober = None
+_prober_lock = threading.Lock()
+
+def get_url_prober():
+    """Process-wide URL prober shared by all sessions"""
+    global _prober
+    with _prober_lock:
+        if _prober is None:
+            _prober = UrlProber()
+        return _prober
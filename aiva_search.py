@@ -0,0 +1,842 @@
+#!/usr/bin/env python3
+"""
+🔍 AIVACEO Search Indexes
+N-gram contact search over names, phone numbers and emails, and BM25 full-text search over call transcripts
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from aiva_call_store import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+#######################################
+# TRIGRAM SEGMENTS
+#######################################
+
+MAX_SEGMENTS = 8  # Appended key segments are merged (behind the first, largest one) past this many
+SCAN_FRACTION = 16  # Terms matching more than 1/16 of a segment's keys are confirmed by a buffer scan
+
+# Characters that start a new word inside a key ("smi" is a word prefix of "customer smith")
+WORD_BOUNDARY = r'[\s@._+-]'
+WORD_BOUNDARY_BYTES = np.frombuffer(b' \t\n@._+-', dtype=np.uint8)
+
+class TrigramSegment:
+    """
+    Immutable block of distinct keys with a trigram -> key postings list.
+
+    Keys are laid out newline-separated in one UTF-8 byte buffer. Postings are stored
+    CSR-style (sorted trigram codes, offsets, key ids) and built with numpy over that
+    buffer at once. A lookup intersects the postings of the term's trigrams and confirms
+    the surviving candidates with a literal match; terms shorter than a trigram are found
+    with one vectorized scan of the buffer instead.
+    """
+
+    def __init__(self, keys):
+        self.keys = pd.Index(keys, dtype=object)
+        text = '\n'.join(self.keys)
+        encoded = text.encode('utf-8')
+        if len(encoded) == len(text):
+            lengths = pd.Series(self.keys).str.len().to_numpy(dtype=np.int64)
+        else:
+            lengths = np.fromiter((len(key.encode('utf-8')) for key in self.keys), dtype=np.int64, count=len(self.keys))
+
+        self.data = np.frombuffer(encoded, dtype=np.uint8)
+        self.lengths = lengths
+        self.key_starts = np.cumsum(lengths + 1) - (lengths + 1)
+
+        gram_counts = np.maximum(lengths - 2, 0)
+        total = int(gram_counts.sum())
+        key_ids = np.repeat(np.arange(len(self.keys), dtype=np.int64), gram_counts)
+        gram_starts = np.cumsum(gram_counts) - gram_counts
+        positions = np.arange(total, dtype=np.int64) - np.repeat(gram_starts - self.key_starts, gram_counts)
+
+        data = self.data.astype(np.int64)
+        grams = (data[positions] << 16) | (data[positions + 1] << 8) | data[positions + 2]
+        postings = np.sort((grams << 32) | key_ids)
+        postings = postings[np.append(True, postings[1:] != postings[:-1])]
+
+        # Postings are sorted by trigram, so each trigram's keys are one contiguous run
+        grams = postings >> 32
+        starts = np.flatnonzero(np.append(True, grams[1:] != grams[:-1]))
+        self.grams = grams[starts]
+        self.offsets = np.append(starts, len(postings))
+        self.key_ids = postings & 0xFFFFFFFF
+
+    def __len__(self):
+        return len(self.keys)
+
+    def candidates(self, term):
+        """Local ids of keys that contain every trigram of a term of 3 or more bytes"""
+        data = np.frombuffer(term.encode('utf-8'), dtype=np.uint8).astype(np.int64)
+        grams = np.unique((data[:-2] << 16) | (data[1:-1] << 8) | data[2:])
+        slots = np.searchsorted(self.grams, grams)
+        if (slots >= len(self.grams)).any() or (self.grams[np.minimum(slots, len(self.grams) - 1)] != grams).any():
+            return np.empty(0, dtype=np.int64)
+
+        postings = sorted((self.key_ids[self.offsets[slot]:self.offsets[slot + 1]] for slot in slots), key=len)
+        found = postings[0]
+        for posting in postings[1:]:
+            found = np.intersect1d(found, posting, assume_unique=True)
+            if len(found) == 0:
+                break
+        return found
+
+    def _scan(self, term, anchor=None):
+        """(local ids, scores) of keys containing term, from one vectorized scan of the key buffer"""
+        needle = np.frombuffer(term.encode('utf-8'), dtype=np.uint8)
+        width = len(self.data) - len(needle) + 1
+        if width <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        found = self.data[:width] == needle[0]
+        for offset in range(1, len(needle)):
+            found &= self.data[offset:offset + width] == needle[offset]
+        positions = np.flatnonzero(found)
+
+        key_ids = np.searchsorted(self.key_starts, positions, side='right') - 1
+        at_start = positions == self.key_starts[key_ids]
+        at_end = positions + len(needle) == self.key_starts[key_ids] + self.lengths[key_ids]
+        if anchor == 'start':
+            keep = at_start
+        elif anchor == 'end':
+            keep = at_end
+        else:
+            keep = np.ones(len(positions), dtype=bool)
+        positions, key_ids, at_start, at_end = positions[keep], key_ids[keep], at_start[keep], at_end[keep]
+
+        word_start = at_start | np.isin(self.data[np.maximum(positions - 1, 0)], WORD_BOUNDARY_BYTES)
+        scores = np.zeros(len(self.keys))
+        # A key can contain the term several times; it keeps its best-scoring occurrence
+        np.maximum.at(scores, key_ids, 1.0 + word_start + at_start + (at_start & at_end))
+        ids = np.flatnonzero(scores)
+        return ids, scores[ids]
+
+    def match(self, term, anchor=None):
+        """
+        (local ids, scores) of keys containing term: 4 exact, 3 prefix, 2 word prefix, 1 substring.
+        anchor='start' / 'end' only keeps keys that start / end with term.
+        """
+        if len(term.encode('utf-8')) < 3:
+            return self._scan(term, anchor)
+
+        ids = self.candidates(term)
+        if len(ids) == 0:
+            return ids, np.empty(0)
+        if len(ids) * SCAN_FRACTION > len(self.keys):
+            return self._scan(term, anchor)
+
+        keys = pd.Series(self.keys.take(ids))
+        if anchor == 'start':
+            hits = keys.str.startswith(term).to_numpy(dtype=bool)
+        elif anchor == 'end':
+            hits = keys.str.endswith(term).to_numpy(dtype=bool)
+        else:
+            hits = keys.str.contains(term, regex=False).to_numpy(dtype=bool)
+        ids, keys = ids[hits], keys[hits]
+
+        word_prefix = keys.str.contains(f'(?:^|{WORD_BOUNDARY}){re.escape(term)}', regex=True).to_numpy(dtype=bool)
+        prefix = keys.str.startswith(term).to_numpy(dtype=bool)
+        exact = (keys == term).to_numpy(dtype=bool)
+        return ids, 1.0 + word_prefix + prefix + exact
+
+#######################################
+# FIELD INDEX
+#######################################
+
+def normalize_text(values):
+    """Lower-case with runs of whitespace collapsed"""
+    return values.str.lower().str.replace(r'\s+', ' ', regex=True).str.strip()
+
+def email_local(values):
+    """Normalized part of an email before the (last) '@'"""
+    return normalize_text(values).str.replace(r'@[^@]*$', '', regex=True)
+
+def email_domain(values):
+    """Normalized part of an email after the (last) '@'; empty without one"""
+    return normalize_text(values).str.replace(r'^(?:.*@|[^@]*$)', '', regex=True)
+
+def normalize_phone(values):
+    """E.164 digits without the '+': separators dropped, 00 prefix removed, 10-digit numbers given country code 1"""
+    digits = values.str.replace(r'\D', '', regex=True).str.replace(r'^00', '', regex=True)
+    return digits.where(digits.str.len() != 10, '1' + digits)
+
+def phone_query(term):
+    """Digits of a search term that looks like a phone number, else None"""
+    if re.fullmatch(r'[\d\s+().-]+', term) and re.search(r'\d', term):
+        return re.sub(r'\D', '', term)
+    return None
+
+class FieldIndex:
+    """
+    Normalized distinct values of one column plus the key id of every row.
+
+    New rows only add the keys not seen before, as a new segment; small segments are
+    merged once there are more than MAX_SEGMENTS of them. Changed rows get new key ids the
+    same way (keys no row uses any more stay indexed and never score a row).
+    """
+
+    def __init__(self, normalize):
+        self.normalize = normalize
+        self.segments = []
+        self.codes = np.empty(0, dtype=np.int64)
+
+    @property
+    def n_keys(self):
+        return sum(len(segment) for segment in self.segments)
+
+    def _lookup(self, keys):
+        """Global key ids for keys (-1 when unseen)"""
+        ids = np.full(len(keys), -1, dtype=np.int64)
+        base = 0
+        for segment in self.segments:
+            found = segment.keys.get_indexer(keys)
+            fill = (ids < 0) & (found >= 0)
+            ids[fill] = found[fill] + base
+            base += len(segment)
+        return ids
+
+    def _row_codes(self, values):
+        """Key id of every value, adding the keys not seen before"""
+        # Normalize each distinct raw value once
+        raw_codes, raw_uniques = pd.factorize(values)
+        keys = pd.Index(self.normalize(pd.Series(pd.Index(raw_uniques).astype(str))), dtype=object)
+
+        key_ids = self._lookup(keys)
+        unseen = keys[(key_ids < 0) & (keys != '')].unique()
+        if len(unseen):
+            self.segments.append(TrigramSegment(unseen))
+            if len(self.segments) > MAX_SEGMENTS:
+                # Key order is kept, so global key ids (and row codes) stay valid
+                tail = np.concatenate([segment.keys.to_numpy() for segment in self.segments[1:]])
+                self.segments = [self.segments[0], TrigramSegment(tail)]
+            key_ids = self._lookup(keys)
+
+        # Missing and empty values (code -1) never match
+        return np.append(key_ids, -1)[raw_codes]
+
+    def add(self, values):
+        """Index appended rows"""
+        self.codes = np.concatenate([self.codes, self._row_codes(values)])
+
+    def patch(self, positions, values):
+        """Re-index the rows at positions with their new values"""
+        if len(positions):
+            codes = self.codes.copy()
+            codes[positions] = self._row_codes(values)
+            self.codes = codes
+
+    def key_scores(self, term, anchor=None):
+        """Dense score per key for term (0 = no match), plus a trailing 0 for missing values"""
+        scores = np.zeros(self.n_keys + 1)
+        base = 0
+        for segment in self.segments:
+            ids, segment_scores = segment.match(term, anchor)
+            scores[ids + base] = segment_scores
+            base += len(segment)
+        return scores
+
+#######################################
+# CONTACT SEARCH
+#######################################
+
+# (field, source column, normalizer, weight); weights rank e.g. a name match above a domain match of the same kind
+CONTACT_FIELDS = [
+    ('name', 'customer_name', normalize_text, 1.0),
+    ('email_local', 'email', email_local, 0.9),
+    ('email_domain', 'email', email_domain, 0.6),
+    ('phone', 'phone_number', normalize_phone, 0.8)
+]
+
+SEARCH_CACHE_SIZE = 32
+
+class ContactSearchIndex:
+    """
+    Ranked substring and prefix search over the contact fields of a call table.
+
+    Each field keeps a trigram index over its distinct normalized values, so a lookup
+    touches only matching keys and then scores rows through their key ids. Appended and
+    changed calls are indexed incrementally; a full replace rebuilds the index.
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self.weights = {}
+        self.rows = 0
+        self.version = None
+        self.base_version = None
+        self._cache = OrderedDict()
+        self._lock = threading.RLock()
+
+    def build(self, frame, version=None, base_version=None):
+        """Index a full call frame"""
+        with self._lock:
+            self.fields = {name: (column, FieldIndex(normalize))
+                           for name, column, normalize, _ in CONTACT_FIELDS if column in frame.columns}
+            self.weights = {name: weight for name, _, _, weight in CONTACT_FIELDS}
+            self.rows = 0
+            self.base_version = base_version
+            return self.update(frame, version=version)
+
+    def update(self, new_rows, version=None, changed_rows=None):
+        """Index newly appended calls and (changed_rows, indexed by position) stored calls that changed"""
+        with self._lock:
+            for column, field in self.fields.values():
+                if changed_rows is not None and column in changed_rows.columns:
+                    field.patch(changed_rows.index.to_numpy(), changed_rows[column])
+                field.add(new_rows[column])
+            self.rows += len(new_rows)
+            self.version = version
+            self._cache.clear()
+        return self
+
+    def _row_scores(self, name, term, anchor=None):
+        """Weighted score of every row for one field (zeros when the field is not indexed)"""
+        if name not in self.fields:
+            return np.zeros(self.rows)
+        field = self.fields[name][1]
+        # Missing values (code -1) pick up the trailing 0 score
+        return field.key_scores(term, anchor)[field.codes] * self.weights[name]
+
+    def search(self, term):
+        """(ascending row positions, relevance scores) of rows whose contact fields match term"""
+        term = ' '.join(term.lower().split())
+
+        with self._lock:
+            cache_key = (self.version, term)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                return cached
+
+            row_scores = self._row_scores('name', term)
+
+            if '@' in term:
+                # "ann@gm" matches emails whose local part ends with "ann" and whose domain starts with "gm"
+                local, _, domain = term.rpartition('@')
+                parts = [self._row_scores(name, part, anchor)
+                         for name, part, anchor in [('email_local', local, 'end'), ('email_domain', domain, 'start')] if part]
+                if parts:
+                    email_scores = np.where(np.logical_and.reduce([part > 0 for part in parts]), np.mean(parts, axis=0), 0)
+                    np.maximum(row_scores, email_scores, out=row_scores)
+            else:
+                np.maximum(row_scores, self._row_scores('email_local', term), out=row_scores)
+                np.maximum(row_scores, self._row_scores('email_domain', term), out=row_scores)
+
+            digits = phone_query(term)
+            if digits:
+                np.maximum(row_scores, self._row_scores('phone', digits), out=row_scores)
+
+            positions = np.flatnonzero(row_scores)
+            result = (positions, row_scores[positions])
+
+            self._cache[cache_key] = result
+            while len(self._cache) > SEARCH_CACHE_SIZE:
+                self._cache.popitem(last=False)
+            return result
+
+    def sync(self, store):
+        """Bring the index up to a store's version: index the writes since, rebuild after a full replace"""
+        with self._lock:
+            if self.version == store.version:
+                return self
+
+            changes = store.changes_since(self.version) if self.version is not None else None
+            if changes is not None and changes['start'] == self.rows:
+                return self.update(changes['frame'].iloc[self.rows:], version=changes['version'],
+                                   changed_rows=changes['new'])
+
+            with store._lock:
+                frame, version, base_version = store.frame, store.version, store.base_version
+            return self.build(frame, version=version, base_version=base_version)
+
+_contact_indexes = {}
+_contact_indexes_lock = threading.Lock()
+
+def get_contact_index(store):
+    """Shared contact search index for a call store, kept in step with the store's version"""
+    with _contact_indexes_lock:
+        index = _contact_indexes.get(store.name)
+        if index is None:
+            index = _contact_indexes[store.name] = ContactSearchIndex()
+
+    return index.sync(store)
+
+#######################################
+# TRANSCRIPT SEARCH
+#######################################
+
+# Free-text columns indexed together as one document per call
+TRANSCRIPT_COLUMNS = ['transcript', 'summary', 'action_items', 'keyword_tags']
+
+TOKEN_PATTERN = re.compile(r"\w+(?:'\w+)*")
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_TRANSCRIPT_SEGMENTS = 8
+TRANSCRIPT_STALE_FRACTION = 0.1  # The first segment is merged too once this fraction of its calls were re-tokenized
+
+def tokenize(text):
+    """Lower-cased word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def parse_query(query):
+    """("phrase", ...) in double quotes and the remaining loose terms of a search query"""
+    phrases = [tokenize(phrase) for phrase in re.findall(r'"([^"]*)"', query)]
+    loose = tokenize(re.sub(r'"[^"]*"', ' ', query))
+    return [phrase for phrase in phrases if phrase], loose
+
+class PostingSegment:
+    """
+    Positional postings for a contiguous block of documents (calls).
+
+    Tokens are stored sorted by (term, doc, position) as flat arrays with one offset per
+    term, so a term's postings are a single slice and phrase checks are array joins.
+    Documents are a contiguous run from first_doc, or the ascending doc_ids given (calls
+    re-tokenized after their text was rewritten).
+    """
+
+    def __init__(self, vocab, term_offsets, docs, positions, doc_lengths, first_doc, fingerprint='', doc_ids=None):
+        self.vocab = pd.Index(vocab, dtype=object)
+        self.fingerprint = fingerprint
+        self.term_offsets = term_offsets
+        self.docs = docs
+        self.positions = positions
+        self.doc_lengths = doc_lengths
+        self.first_doc = first_doc
+        self._doc_ids = doc_ids
+
+    @classmethod
+    def from_tokens(cls, term_ids, vocab, docs, positions, doc_lengths, first_doc, fingerprint='', doc_ids=None):
+        """Segment from per-token term ids, global doc ids and positions (tokens in doc order)"""
+        order = np.argsort(term_ids, kind='stable')
+        term_offsets = np.concatenate([[0], np.cumsum(np.bincount(term_ids, minlength=len(vocab)))]).astype(np.int64)
+        return cls(vocab, term_offsets, docs[order], positions[order], doc_lengths, first_doc, fingerprint, doc_ids)
+
+    @classmethod
+    def from_texts(cls, texts, first_doc, fingerprint='', doc_ids=None):
+        """Tokenize one text per document"""
+        tokens = [tokenize(text) for text in texts]
+        doc_lengths = np.fromiter((len(doc) for doc in tokens), dtype=np.int32, count=len(tokens))
+        flat = [token for doc in tokens for token in doc]
+
+        term_ids, vocab = pd.factorize(pd.Series(flat, dtype=object))
+        ids = np.arange(first_doc, first_doc + len(tokens)) if doc_ids is None else doc_ids
+        docs = np.repeat(ids.astype(np.int32), doc_lengths)
+        starts = np.cumsum(doc_lengths, dtype=np.int64) - doc_lengths
+        positions = (np.arange(len(flat), dtype=np.int64) - np.repeat(starts, doc_lengths)).astype(np.int32)
+        return cls.from_tokens(term_ids, vocab, docs, positions, doc_lengths, first_doc, fingerprint, doc_ids)
+
+    @classmethod
+    def merge(cls, segments):
+        """One segment holding the documents of several segments (each document in one of them)"""
+        vocab = pd.Index(np.concatenate([segment.vocab.to_numpy() for segment in segments])).unique()
+        term_ids = np.concatenate([
+            vocab.get_indexer(segment.vocab)[np.repeat(np.arange(len(segment.vocab)), np.diff(segment.term_offsets))]
+            for segment in segments
+        ])
+        # Re-sort into (doc, position) order so the stable term sort keeps postings ordered
+        docs = np.concatenate([segment.docs for segment in segments])
+        positions = np.concatenate([segment.positions for segment in segments])
+        order = np.lexsort((positions, docs))
+        fingerprint = hashlib.sha1(''.join(segment.fingerprint for segment in segments).encode()).hexdigest()[:16]
+
+        doc_ids = np.concatenate([segment.doc_ids for segment in segments])
+        by_doc = np.argsort(doc_ids, kind='stable')
+        doc_ids = doc_ids[by_doc]
+        first_doc = int(doc_ids[0]) if len(doc_ids) else segments[0].first_doc
+        contiguous = len(doc_ids) == 0 or doc_ids[-1] - first_doc == len(doc_ids) - 1
+        return cls.from_tokens(term_ids[order], vocab, docs[order], positions[order],
+                               np.concatenate([segment.doc_lengths for segment in segments])[by_doc], first_doc,
+                               fingerprint, None if contiguous else doc_ids)
+
+    @property
+    def n_docs(self):
+        return len(self.doc_lengths)
+
+    @property
+    def doc_ids(self):
+        if self._doc_ids is None:
+            return np.arange(self.first_doc, self.first_doc + self.n_docs, dtype=np.int64)
+        return self._doc_ids
+
+    def live(self, owner, slot):
+        """This segment without the documents whose current text is in another segment (owner: segment slot per doc)"""
+        doc_ids = self.doc_ids
+        keep = owner[doc_ids] == slot
+        if keep.all():
+            return self
+        tokens = owner[self.docs] == slot
+        # Postings stay in (term, doc, position) order; each term's offset moves down by the tokens dropped before it
+        term_offsets = np.concatenate([[0], np.cumsum(tokens, dtype=np.int64)])[self.term_offsets]
+        fingerprint = hashlib.sha1(self.fingerprint.encode() + doc_ids[keep].tobytes()).hexdigest()[:16]
+        return PostingSegment(self.vocab, term_offsets, self.docs[tokens], self.positions[tokens],
+                              self.doc_lengths[keep], self.first_doc, fingerprint, doc_ids[keep])
+
+    def postings(self, term):
+        """(docs, positions) of a term, sorted by doc then position"""
+        slot = self.vocab.get_indexer([term])[0]
+        if slot < 0:
+            return self.docs[:0], self.positions[:0]
+        start, stop = self.term_offsets[slot], self.term_offsets[slot + 1]
+        return self.docs[start:stop], self.positions[start:stop]
+
+    def phrase_docs(self, phrase):
+        """Docs containing the tokens of phrase at consecutive positions"""
+        docs, positions = self.postings(phrase[0])
+        # (doc, position) pairs packed into one int64 so each join is a sorted-array intersection
+        starts = (docs.astype(np.int64) << 32) + positions
+        for offset, term in enumerate(phrase[1:], start=1):
+            if len(starts) == 0:
+                break
+            docs, positions = self.postings(term)
+            shifted = (docs.astype(np.int64) << 32) + positions - offset
+            starts = np.intersect1d(starts, shifted, assume_unique=True)
+        return np.unique(starts >> 32)
+
+    def save(self, path):
+        doc_ids = {} if self._doc_ids is None else {'doc_ids': self._doc_ids}
+        np.savez(path, vocab=np.frombuffer('\n'.join(self.vocab).encode('utf-8'), dtype=np.uint8),
+                 term_offsets=self.term_offsets, docs=self.docs, positions=self.positions,
+                 doc_lengths=self.doc_lengths, first_doc=np.array([self.first_doc]),
+                 fingerprint=np.array([self.fingerprint]), **doc_ids)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            text = data['vocab'].tobytes().decode('utf-8')
+            vocab = text.split('\n') if text or len(data['term_offsets']) > 1 else []
+            return cls(vocab, data['term_offsets'], data['docs'], data['positions'],
+                       data['doc_lengths'], int(data['first_doc'][0]), str(data['fingerprint'][0]),
+                       data['doc_ids'] if 'doc_ids' in data.files else None)
+
+class TranscriptIndex:
+    """
+    BM25-ranked full-text search over call transcripts, summaries, action items and tags.
+
+    Documents are row positions of the call frame. New calls are tokenized into a new
+    posting segment and small segments are merged past MAX_TRANSCRIPT_SEGMENTS. Calls whose
+    text a call store rewrote in place are tokenized again into a segment of their own;
+    owner holds the segment of every call's current text and postings of other segments
+    are skipped (and dropped when those segments are merged). The segments are persisted
+    with a fingerprint of the indexed calls and the store's text generation, so a
+    restarted process only tokenizes calls that landed since the last save.
+    """
+
+    def __init__(self, name, cache_dir=None, persist=True):
+        self.name = name
+        self.cache_dir = cache_dir
+        self.persist_enabled = persist and cache_dir is not None
+        self.segments = []
+        self.owner = np.zeros(0, dtype=np.int8)
+        self.doc_lengths = np.zeros(0, dtype=np.int32)
+        self.rows = 0
+        self.total_tokens = 0
+        self.fingerprint = None
+        self.generation = None
+        self.version = None
+        self._row_hashes = np.zeros(0, dtype=np.uint64)
+        self._lock = threading.RLock()
+
+    @property
+    def index_dir(self):
+        safe_name = "".join(c if c.isalnum() or c in '-_' else '_' for c in self.name)
+        return os.path.join(self.cache_dir, f"{safe_name}.transcripts")
+
+    def _texts(self, frame):
+        columns = [col for col in TRANSCRIPT_COLUMNS if col in frame.columns]
+        if not columns:
+            return [''] * len(frame)
+        text = frame[columns[0]].fillna('').astype(str)
+        for col in columns[1:]:
+            text = text + '\n' + frame[col].fillna('').astype(str)
+        return text.tolist()
+
+    def clear(self):
+        with self._lock:
+            self.segments = []
+            self.owner = np.zeros(0, dtype=np.int8)
+            self.doc_lengths = np.zeros(0, dtype=np.int32)
+            self.rows = 0
+            self.total_tokens = 0
+            self.fingerprint = None
+
+    def _segment(self, frame, first_doc, doc_ids=None):
+        texts = self._texts(frame)
+        # Named by the calls and their text, so a re-tokenized call never reuses a stale segment file
+        text_hash = pd.util.hash_pandas_object(pd.Series(texts, dtype=object), index=False).to_numpy().tobytes()
+        fingerprint = hashlib.sha1(frame_fingerprint(frame).encode() + text_hash).hexdigest()[:16]
+        return PostingSegment.from_texts(texts, first_doc, fingerprint, doc_ids)
+
+    def _merge_segments(self):
+        """Merge the newer segments past MAX_TRANSCRIPT_SEGMENTS, dropping postings of re-tokenized calls"""
+        if len(self.segments) <= MAX_TRANSCRIPT_SEGMENTS:
+            return
+        # The first segment is usually the large one; only the newer ones are rewritten unless it went stale
+        first = self.segments[0]
+        stale = first.n_docs - int((self.owner[first.doc_ids] == 0).sum())
+        keep = 0 if stale > first.n_docs * TRANSCRIPT_STALE_FRACTION else 1
+        merged = PostingSegment.merge([segment.live(self.owner, slot)
+                                       for slot, segment in enumerate(self.segments) if slot >= keep])
+        self.segments = self.segments[:keep] + [merged]
+        self.owner = np.minimum(self.owner, keep).astype(np.int8)
+
+    def add(self, frame):
+        """Tokenize calls appended after the indexed rows"""
+        with self._lock:
+            if len(frame) == 0:
+                return self
+            segment = self._segment(frame, self.rows)
+            self.segments.append(segment)
+            self.owner = np.concatenate([self.owner, np.full(len(frame), len(self.segments) - 1, dtype=np.int8)])
+            self.doc_lengths = np.concatenate([self.doc_lengths, segment.doc_lengths])
+            self.rows += len(frame)
+            self.total_tokens += int(segment.doc_lengths.sum())
+            self._merge_segments()
+        return self
+
+    def reindex(self, positions, frame):
+        """Tokenize again the indexed calls at positions (ascending), frame holding their new text"""
+        with self._lock:
+            if len(positions) == 0:
+                return self
+            positions = np.asarray(positions, dtype=np.int64)
+            segment = self._segment(frame, int(positions[0]), positions)
+            self.segments.append(segment)
+            # Copies, so a search running on the arrays it took keeps a consistent view
+            owner, doc_lengths = self.owner.copy(), self.doc_lengths.copy()
+            owner[positions] = len(self.segments) - 1
+            self.total_tokens += int(segment.doc_lengths.sum()) - int(doc_lengths[positions].sum())
+            doc_lengths[positions] = segment.doc_lengths
+            self.owner, self.doc_lengths = owner, doc_lengths
+            self._merge_segments()
+        return self
+
+    def _store_changes(self, text_store, version):
+        """The store's writes since the indexed version, up to version (None when they are not kept)"""
+        if text_store is None or self.version is None or version is None or self.version[0] != version[0]:
+            return None
+        changes = text_store.changes_since(self.version[1], until=version[1])
+        return changes if changes is not None and changes['start'] == self.rows else None
+
+    def _rewritten(self, changes):
+        """Positions of indexed calls whose indexed text the store's writes changed"""
+        rewritten = [changes['text']]
+        for col in TRANSCRIPT_COLUMNS:
+            # Text columns kept in memory (not in the side file) change with the patched rows
+            if col in changes['old'].columns:
+                differs = changes['old'][col].astype(str).to_numpy() != changes['new'][col].astype(str).to_numpy()
+                rewritten.append(changes['patched'][differs])
+        return np.unique(np.concatenate(rewritten)).astype(np.int64)
+
+    def _generation(self, text_store, version):
+        """The store's side file generation as of version (None when the store has moved on)"""
+        if text_store is None or version is None:
+            return None
+        with text_store._lock:
+            return text_store.text_file.generation if text_store.version == version[1] else None
+
+    def sync(self, frame, version=None, text_store=None):
+        """
+        Bring the index up to a call frame: keep rows whose identity is unchanged, index the rest.
+        text_store: the call store frame is a view of (version being its (name, store version)
+        dataset version), when its text columns live in the store's side file. Calls the store
+        rewrote since the indexed version are tokenized again on their own.
+        """
+        with self._lock:
+            if version is not None and version == self.version:
+                return self
+
+            if self.rows == 0 and self.persist_enabled:
+                self.restore()
+
+            changes = self._store_changes(text_store, version)
+            rewritten = self._rewritten(changes) if changes is not None else np.zeros(0, dtype=np.int64)
+            if changes is None:
+                self._row_hashes = row_hashes(frame.iloc[:self.rows])
+                # Without the store's writes, rows rewritten in place (same call_ids) show only in the side file generation
+                if self.rows and (self.rows > len(frame) or _digest(self._row_hashes) != self.fingerprint
+                                  or (text_store is not None and self.generation != text_store.text_file.generation)):
+                    self.clear()
+                    self._row_hashes = self._row_hashes[:0]
+
+            added = len(frame) - self.rows
+            block = frame.iloc[self.rows:]
+            changed = frame.iloc[rewritten]
+            if text_store is not None:
+                block = text_store.with_text(block, TRANSCRIPT_COLUMNS)
+                changed = text_store.with_text(changed, TRANSCRIPT_COLUMNS)
+            self.reindex(rewritten, changed)
+            self.add(block)
+            # The indexed rows' hashes are kept, so only the appended ones are hashed
+            self._row_hashes = np.concatenate([self._row_hashes, row_hashes(block)])
+            self.fingerprint = _digest(self._row_hashes)
+            self.generation = self._generation(text_store, version)
+            self.version = version
+            if added or len(rewritten):
+                self.persist()
+        return self
+
+    def search(self, query, within=None, limit=50):
+        """
+        (row positions, BM25 scores) of the best matching calls, best first.
+
+        Quoted phrases must appear word for word; loose terms rank calls containing any
+        of them. within restricts results to the given row positions (agent/date/intent filters).
+        """
+        phrases, loose = parse_query(query)
+        terms = list(dict.fromkeys(loose + [term for phrase in phrases for term in phrase]))
+        if not terms:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        with self._lock:
+            segments, owner, doc_lengths = list(self.segments), self.owner, self.doc_lengths
+            n_docs, total_tokens = self.rows, self.total_tokens
+
+        if n_docs == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / max(total_tokens / n_docs, 1))
+        scores = np.zeros(n_docs)
+
+        for term in terms:
+            # Postings of calls whose current text is in a later segment are skipped
+            postings = [(slot, segment.postings(term)[0]) for slot, segment in enumerate(segments)]
+            matches = [np.unique(docs[owner[docs] == slot], return_counts=True) for slot, docs in postings]
+            docs = np.concatenate([docs for docs, _ in matches]).astype(np.int64)
+            if len(docs) == 0:
+                continue
+            tf = np.concatenate([counts for _, counts in matches])
+            idf = np.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tf * (BM25_K1 + 1) / (tf + norm[docs])
+
+        allowed = scores > 0
+        for phrase in phrases:
+            phrase_mask = np.zeros(n_docs, dtype=bool)
+            for slot, segment in enumerate(segments):
+                docs = segment.phrase_docs(phrase)
+                phrase_mask[docs[owner[docs] == slot]] = True
+            allowed &= phrase_mask
+
+        if within is not None:
+            within_mask = np.zeros(n_docs, dtype=bool)
+            within = np.asarray(within, dtype=np.int64)
+            within_mask[within[within < n_docs]] = True
+            allowed &= within_mask
+
+        positions = np.flatnonzero(allowed)
+        order = np.argsort(-scores[positions], kind='stable')[:limit]
+        return positions[order], scores[positions[order]]
+
+    def persist(self):
+        """Write every segment and a manifest with the indexed rows' fingerprint"""
+        if not self.persist_enabled:
+            return False
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            files = []
+            for segment in self.segments:
+                file_name = f"segment_{segment.first_doc}_{segment.n_docs}_{segment.fingerprint}.npz"
+                path = os.path.join(self.index_dir, file_name)
+                if not os.path.exists(path):
+                    segment.save(path + '.tmp.npz')
+                    os.replace(path + '.tmp.npz', path)
+                files.append(file_name)
+
+            manifest = {'rows': self.rows, 'total_tokens': self.total_tokens, 'fingerprint': self.fingerprint,
+                        'generation': self.generation, 'segments': files}
+            tmp_path = os.path.join(self.index_dir, 'manifest.json.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, os.path.join(self.index_dir, 'manifest.json'))
+
+            for stale in set(os.listdir(self.index_dir)) - set(files) - {'manifest.json'}:
+                os.remove(os.path.join(self.index_dir, stale))
+            return True
+        except Exception as e:
+            logger.warning("Transcript index %r could not persist: %s", self.name, e)
+            return False
+
+    def restore(self):
+        """Load the last persisted segments, if any"""
+        manifest_path = os.path.join(self.index_dir, 'manifest.json')
+        if not os.path.exists(manifest_path):
+            return False
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            segments = [PostingSegment.load(os.path.join(self.index_dir, name)) for name in manifest['segments']]
+        except Exception as e:
+            logger.warning("Transcript index %r could not restore: %s", self.name, e)
+            return False
+
+        # Later segments hold the current text of the calls they share with earlier ones
+        owner = np.zeros(manifest['rows'], dtype=np.int8)
+        doc_lengths = np.zeros(manifest['rows'], dtype=np.int32)
+        for slot, segment in enumerate(segments):
+            owner[segment.doc_ids] = slot
+            doc_lengths[segment.doc_ids] = segment.doc_lengths
+
+        with self._lock:
+            self.segments = segments
+            self.owner = owner
+            self.doc_lengths = doc_lengths
+            self.rows = manifest['rows']
+            self.total_tokens = manifest['total_tokens']
+            self.fingerprint = manifest['fingerprint']
+            self.generation = manifest.get('generation')
+        return True
+
+    def info(self):
+        """Cheap summary for debug panels"""
+        return {
+            'rows': self.rows,
+            'segments': len(self.segments),
+            'terms': sum(len(segment.vocab) for segment in self.segments),
+            'tokens': self.total_tokens
+        }
+
+def row_hashes(frame):
+    """One hash per call: its call_id (or row contents)"""
+    keys = frame[['call_id']] if 'call_id' in frame.columns else frame
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+def _digest(hashes):
+    return hashlib.sha1(hashes.tobytes()).hexdigest()[:16]
+
+def frame_fingerprint(frame):
+    """Identity of a block of calls: their call_ids (or row contents) hashed"""
+    return _digest(row_hashes(frame))
+
+def highlight_snippet(text, terms, width=200):
+    """Text around the first occurrence of any term, with the terms in bold (markdown)"""
+    text = ' '.join(str(text).split())
+    if not terms:
+        return text[:width]
+    pattern = re.compile(r'\b(' + '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + r')\b', re.IGNORECASE)
+    found = pattern.search(text)
+    start = max(0, (found.start() if found else 0) - width // 3)
+    snippet = text[start:start + width]
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if start + width < len(text) else ''
+    return prefix + pattern.sub(r'**\1**', snippet) + suffix
+
+_transcript_indexes = {}
+_transcript_indexes_lock = threading.Lock()
+
+def get_transcript_index(name, frame, version=None, persist=True, text_store=None):
+    """Shared transcript index for a named call source, synced to frame (persisted under the call store cache)"""
+    with _transcript_indexes_lock:
+        index = _transcript_indexes.get(name)
+        if index is None:
+            index = _transcript_indexes[name] = TranscriptIndex(name, cache_dir=CACHE_DIR, persist=persist)
+
+    return index.sync(frame, version=version, text_store=text_store)
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+📋 AIVACEO Google Sheets Sync
+Incremental sync of call rows from Google Sheets into the shared call store, and diff-based write-back
+"""
+
+import io
+import json
+import logging
+import os
+import random
+import time as time_module
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import requests
+
+from aiva_call_store import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+#######################################
+# SHEET READERS
+#######################################
+
+SHEETS_SCOPE = [
+    'https://spreadsheets.google.com/feeds',
+    'https://www.googleapis.com/auth/drive'
+]
+
+def extract_sheet_id(sheets_url):
+    """Extract the spreadsheet ID from a Google Sheets URL"""
+    if '/d/' not in sheets_url:
+        raise ValueError("Invalid Google Sheets URL format")
+    return sheets_url.split('/d/')[1].split('/')[0]
+
+def column_letter(index):
+    """1-based column index to A1 column letters (1 -> A, 27 -> AA)"""
+    letters = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def open_google_worksheet(json_credentials, sheets_url):
+    """Open the first worksheet of a private sheet with service account credentials"""
+    try:
+        import gspread
+        from google.oauth2.service_account import Credentials
+
+        credentials_dict = json.loads(json_credentials)
+        credentials = Credentials.from_service_account_info(credentials_dict, scopes=SHEETS_SCOPE)
+        client = gspread.authorize(credentials)
+
+        spreadsheet = client.open_by_key(extract_sheet_id(sheets_url))
+        return spreadsheet.sheet1, None
+    except Exception as e:
+        return None, str(e)
+
+class PublicSheetReader:
+    """Reads a link-shared sheet through the CSV export endpoint"""
+
+    def __init__(self, sheet_id, gid=0, timeout=30):
+        self.sheet_id = sheet_id
+        self.gid = gid
+        self.timeout = timeout
+
+    @property
+    def export_url(self):
+        return f"https://docs.google.com/spreadsheets/d/{self.sheet_id}/export?format=csv&gid={self.gid}"
+
+    def read_all(self):
+        return pd.read_csv(self.export_url)
+
+    def read_from(self, start_row, columns):
+        """Rows from sheet row start_row (1-based, header is row 1) to the end of the data"""
+        cell_range = f"A{start_row}:{column_letter(len(columns))}"
+        response = requests.get(f"{self.export_url}&range={cell_range}", timeout=self.timeout)
+        response.raise_for_status()
+
+        if not response.text.strip():
+            return pd.DataFrame(columns=columns)
+        return pd.read_csv(io.StringIO(response.text), header=None, names=columns)
+
+class WorksheetReader:
+    """Reads a private sheet through an authenticated gspread worksheet"""
+
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+
+    def read_all(self):
+        return pd.DataFrame(self.worksheet.get_all_records())
+
+    def read_from(self, start_row, columns):
+        """Rows from sheet row start_row (1-based, header is row 1) to the end of the data"""
+        values = self.worksheet.get(f"A{start_row}:{column_letter(len(columns))}")
+
+        try:
+            from gspread.utils import numericise_all
+        except ImportError:
+            numericise_all = None
+
+        rows = []
+        for row in values:
+            row = list(row) + [''] * (len(columns) - len(row))
+            rows.append(numericise_all(row) if numericise_all else row)
+
+        return pd.DataFrame(rows, columns=columns)
+
+#######################################
+# INCREMENTAL SYNC
+#######################################
+
+def _sync_state_path(store):
+    return os.path.splitext(store.parquet_path)[0] + '.sync.json'
+
+def _store_unchanged(store, state):
+    """
+    Whether the store still holds the rows it had after the last sync. It may have grown
+    since (the webhook feed upserts calls the sheet does not have), but the row that was
+    last then must still be in place.
+    """
+    # State files from before store_rows was kept have the store's row count in rows
+    rows = state.get('store_rows', state.get('rows'))
+    call_id = state.get('store_call_id', state.get('last_call_id'))
+    if not store.is_loaded() or not rows or rows > len(store.frame):
+        return False
+    if call_id is None or 'call_id' not in store.frame.columns:
+        return rows == len(store.frame)
+    return str(store.frame['call_id'].iloc[rows - 1]) == call_id
+
+def load_sync_state(store):
+    """Sync high-water mark for a store: synced sheet rows, last call_id, newest upload_timestamp"""
+    state = store.sync_state
+    if state is not None:
+        return state
+
+    state = {}
+    try:
+        if store.persist_enabled and os.path.exists(_sync_state_path(store)):
+            with open(_sync_state_path(store)) as f:
+                state = json.load(f)
+    except Exception:
+        state = {}
+
+    # A state file without matching cached rows cannot be trusted
+    if not _store_unchanged(store, state):
+        state = {}
+
+    store.sync_state = state
+    return state
+
+def _save_sync_state(store, state):
+    store.sync_state = state
+    if not store.persist_enabled:
+        return
+    try:
+        os.makedirs(store.cache_dir, exist_ok=True)
+        with open(_sync_state_path(store), 'w') as f:
+            json.dump(state, f)
+    except Exception as e:
+        logger.warning("Could not save sheet sync state for %r: %s", store.name, e)
+
+def _high_water_mark(store, state, sheet_rows):
+    """
+    State after a sync that read sheet_rows (the whole sheet, or its new tail). The sheet's
+    own row count and last call_id anchor the next read; the store's are kept apart because
+    other writers add rows the sheet does not have.
+    """
+    if len(sheet_rows):
+        if 'call_id' in sheet_rows.columns:
+            state['last_call_id'] = str(sheet_rows['call_id'].iloc[-1])
+        if 'upload_timestamp' in sheet_rows.columns:
+            newest = str(sheet_rows['upload_timestamp'].astype(str).max())
+            state['max_upload_timestamp'] = max(newest, state.get('max_upload_timestamp') or newest)
+
+    frame = store.frame
+    state['store_rows'] = len(frame)
+    state['store_call_id'] = str(frame['call_id'].iloc[-1]) if 'call_id' in frame.columns and len(frame) else None
+    return state
+
+def sync_call_store(store, reader, source="", min_interval=60, full_resync_interval=24 * 3600, force_full=False):
+    """
+    Bring a call store up to date with its sheet.
+
+    Sheets are append-mostly, so after the first full download only rows past the
+    high-water mark are fetched. The last synced row is re-read with them; if its
+    call_id no longer matches (rows edited, deleted or re-sorted) a full resync runs.
+    The mark counts sheet rows, so calls the webhook feed adds to the store in between
+    do not force a full resync; new sheet rows are merged with them by call_id.
+    """
+    started = time_module.time()
+
+    with store._lock:
+        state = load_sync_state(store)
+        now = time_module.time()
+
+        if not force_full and store.is_loaded() and now - state.get('last_sync_at', 0) < min_interval:
+            return {'mode': 'skipped', 'new_rows': 0, 'rows': len(store.frame), 'seconds': 0.0}
+
+        if source:
+            store.source = source
+
+        needs_full = (
+            force_full
+            or not store.is_loaded()
+            or not state.get('rows')
+            or not _store_unchanged(store, state)
+            or now - state.get('last_full_sync_at', 0) > full_resync_interval
+        )
+
+        mode = 'full'
+        new_rows = 0
+        sheet_rows = pd.DataFrame()
+
+        if not needs_full:
+            tail = reader.read_from(state['rows'] + 1, state['columns'])
+            anchor_ok = (
+                len(tail) > 0
+                and (state.get('last_call_id') is None
+                     or 'call_id' not in tail.columns
+                     or str(tail['call_id'].iloc[0]) == state['last_call_id'])
+            )
+
+            if anchor_ok:
+                mode = 'incremental' if len(tail) > 1 else 'unchanged'
+                new_rows = len(tail) - 1
+                sheet_rows = tail.iloc[1:]
+                if new_rows and len(store.frame) == state['rows']:
+                    store.append(sheet_rows, source=source)
+                elif new_rows:
+                    # The store holds rows from other writers; a call may already be one of them
+                    store.upsert(sheet_rows, source=source)
+                state['rows'] += new_rows
+            else:
+                needs_full = True
+
+        if needs_full:
+            full_df = reader.read_all()
+            store.replace(full_df, source=source)
+            new_rows = len(full_df)
+            sheet_rows = full_df
+            state = {key: value for key, value in state.items() if key not in ('last_call_id', 'max_upload_timestamp')}
+            state['rows'] = len(full_df)
+            # The sheet's header, which tail reads are parsed with
+            state['columns'] = [str(col) for col in full_df.columns]
+            state['last_full_sync_at'] = now
+            state['full_syncs'] = state.get('full_syncs', 0) + 1
+        else:
+            state['incremental_syncs'] = state.get('incremental_syncs', 0) + 1
+
+        state['last_sync_at'] = now
+        state['last_sync'] = datetime.now().isoformat()
+        _save_sync_state(store, _high_water_mark(store, state, sheet_rows))
+
+    return {
+        'mode': mode,
+        'new_rows': new_rows,
+        'rows': len(store.frame),
+        'seconds': time_module.time() - started
+    }
+
+#######################################
+# WRITE-BACK
+#######################################
+
+# Per batch_update request: Sheets recommends payloads under 2 MB
+WRITE_BATCH_CELLS = 20_000
+WRITE_BATCH_BYTES = 2 * 1024 * 1024
+WRITE_MAX_RETRIES = 5
+WRITE_BACKOFF_SECONDS = 1.0
+
+def export_snapshot_path(sheet_id):
+    """Cells last written to a sheet, kept to diff the next write-back against"""
+    return os.path.join(CACHE_DIR, f"sheets_{sheet_id}.export.parquet")
+
+def sheet_cells(frame):
+    """Header row + rows of frame as JSON-safe cell values (numbers stay numbers, missing -> '')"""
+    cells = np.empty((len(frame) + 1, len(frame.columns)), dtype=object)
+    cells[0] = [str(col) for col in frame.columns]
+    for j, col in enumerate(frame.columns):
+        values = frame[col]
+        missing = values.isna().to_numpy()
+        if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+            column = values.to_numpy(dtype=object, copy=True)
+        else:
+            column = values.astype(object).map(str).to_numpy(copy=True)
+        column[missing] = ''
+        cells[1:, j] = column
+    return cells
+
+def _cell_keys(cells):
+    """Cells as text, the form they are compared in (and read back from a sheet)"""
+    return pd.DataFrame(cells).astype(str).to_numpy() if cells.size else cells.astype(str)
+
+def _padded(keys, width):
+    if keys.shape[1] >= width:
+        return keys
+    return np.hstack([keys, np.full((keys.shape[0], width - keys.shape[1]), '', dtype=object)])
+
+def diff_sheet_cells(old_keys, cells):
+    """
+    Ranges of cells to write so a sheet holding old_keys ends up holding cells.
+
+    Rows are compared by position; each run of changed rows is written as one block
+    spanning its changed columns, rows past the old data as one appended block.
+    Returns (blocks of (first row, first column, values), range of trailing old rows to clear or None),
+    rows and columns 0-based.
+    """
+    keys = _cell_keys(cells)
+    width = max(old_keys.shape[1], keys.shape[1])
+    old_keys, keys = _padded(old_keys, width).astype(object), _padded(keys, width).astype(object)
+    values = _padded(cells, width)
+    overlap = min(len(old_keys), len(keys))
+
+    blocks = []
+    differs = old_keys[:overlap] != keys[:overlap]
+    changed = np.flatnonzero(differs.any(axis=1))
+    if len(changed):
+        # Split the changed rows into runs of consecutive rows
+        runs = np.split(changed, np.flatnonzero(np.diff(changed) > 1) + 1)
+        for run in runs:
+            first, last = run[0], run[-1] + 1
+            columns = np.flatnonzero(differs[first:last].any(axis=0))
+            blocks.append((int(first), int(columns[0]), values[first:last, columns[0]:columns[-1] + 1]))
+
+    if len(keys) > overlap:
+        blocks.append((overlap, 0, values[overlap:]))
+
+    clear = (overlap, len(old_keys), width) if len(old_keys) > overlap else None
+    return blocks, clear
+
+def _a1(row, col):
+    return f"{column_letter(col + 1)}{row + 1}"
+
+def _sheet_batches(blocks, max_cells=WRITE_BATCH_CELLS, max_bytes=WRITE_BATCH_BYTES):
+    """batch_update payloads under the cell and byte limits, large blocks split by rows"""
+    batch, batch_cells, batch_bytes = [], 0, 0
+    for first_row, first_col, values in blocks:
+        width = values.shape[1]
+        row_bytes = [sum(len(str(value)) + 3 for value in row) for row in values]
+        start = 0
+        while start < len(values):
+            end, cells, size = start, batch_cells, batch_bytes
+            # A row that is too big on its own still goes out, alone
+            while end < len(values) and ((not batch and end == start) or
+                                         (cells + width <= max_cells and size + row_bytes[end] <= max_bytes)):
+                end, cells, size = end + 1, cells + width, size + row_bytes[end]
+
+            if end > start:
+                batch.append({
+                    'range': f"{_a1(first_row + start, first_col)}:{_a1(first_row + end - 1, first_col + width - 1)}",
+                    'values': values[start:end].tolist()
+                })
+                batch_cells, batch_bytes, start = cells, size, end
+            if start < len(values):
+                yield batch
+                batch, batch_cells, batch_bytes = [], 0, 0
+    if batch:
+        yield batch
+
+def _retryable(error):
+    code = getattr(error, 'code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return code == 429 or (isinstance(code, int) and code >= 500)
+
+def _with_backoff(call, report, max_retries=WRITE_MAX_RETRIES, backoff=WRITE_BACKOFF_SECONDS):
+    """Run call, retrying quota (429) and server errors with exponential backoff and jitter"""
+    for attempt in range(max_retries + 1):
+        try:
+            return call()
+        except Exception as e:
+            if attempt == max_retries or not _retryable(e):
+                raise
+            report['retries'] += 1
+            time_module.sleep(backoff * 2 ** attempt * (1 + random.random()))
+
+def write_back_to_sheet(worksheet, frame, sheet_id, full=False, max_retries=WRITE_MAX_RETRIES):
+    """
+    Write frame to a worksheet, sending only the cells that changed since the last write-back.
+
+    The cells last written are kept in a snapshot file; without one (or with full=True) the
+    sheet's current values are read once and diffed instead. Changed rows and appended rows
+    go out in batch_update calls under WRITE_BATCH_CELLS / WRITE_BATCH_BYTES, each retried
+    with backoff; rows past the new data are cleared last. Nothing is cleared up front, so
+    a failed write-back leaves the sheet with its old rows rather than empty, and the next
+    run resends what is still missing. Returns (report, error).
+    """
+    started = time_module.time()
+    report = {'mode': 'diff', 'rows': len(frame), 'changed_rows': 0, 'appended_rows': 0, 'cleared_rows': 0,
+              'cells': 0, 'batches': 0, 'retries': 0, 'seconds': 0.0, 'cells_per_second': 0.0}
+    snapshot_path = export_snapshot_path(sheet_id)
+
+    try:
+        cells = sheet_cells(frame)
+        old_keys = None
+        if not full and os.path.exists(snapshot_path):
+            try:
+                old_keys = pd.read_parquet(snapshot_path).to_numpy(dtype=object)
+            except Exception as e:
+                logger.warning("Could not read the write-back snapshot for sheet %s: %s", sheet_id, e)
+        if old_keys is None:
+            report['mode'] = 'full'
+            old_values = _with_backoff(worksheet.get_all_values, report, max_retries)
+            width = max((len(row) for row in old_values), default=0)
+            old_keys = np.array([list(row) + [''] * (width - len(row)) for row in old_values], dtype=object).reshape(len(old_values), width)
+
+        blocks, clear = diff_sheet_cells(old_keys, cells)
+        # Row counts are of data rows; row 0 is the header
+        overlap = min(len(old_keys), len(cells))
+        report['appended_rows'] = len(cells) - max(overlap, 1)
+        report['changed_rows'] = sum(len(values) - (first_row == 0) for first_row, _, values in blocks if first_row < overlap)
+        report['cleared_rows'] = 0 if clear is None else clear[1] - max(clear[0], 1)
+
+        width = max(cells.shape[1], old_keys.shape[1] if old_keys.size else 0)
+        if len(cells) > worksheet.row_count or width > worksheet.col_count:
+            _with_backoff(lambda: worksheet.resize(rows=max(len(cells), worksheet.row_count),
+                                                   cols=max(width, worksheet.col_count)), report, max_retries)
+
+        for batch in _sheet_batches(blocks):
+            _with_backoff(lambda: worksheet.batch_update(batch, value_input_option='RAW'), report, max_retries)
+            report['batches'] += 1
+            report['cells'] += sum(len(item['values']) * len(item['values'][0]) for item in batch)
+
+        if clear is not None:
+            clear_range = f"{_a1(clear[0], 0)}:{_a1(clear[1] - 1, clear[2] - 1)}"
+            _with_backoff(lambda: worksheet.batch_clear([clear_range]), report, max_retries)
+            report['batches'] += 1
+    except Exception as e:
+        report['seconds'] = time_module.time() - started
+        return report, str(e)
+
+    try:
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        snapshot = pd.DataFrame(_cell_keys(cells), columns=[str(j) for j in range(cells.shape[1])])
+        snapshot.to_parquet(snapshot_path + '.tmp', index=False)
+        os.replace(snapshot_path + '.tmp', snapshot_path)
+    except Exception as e:
+        logger.warning("Could not save the write-back snapshot for sheet %s: %s", sheet_id, e)
+
+    report['seconds'] = time_module.time() - started
+    report['cells_per_second'] = report['cells'] / report['seconds'] if report['seconds'] else 0.0
+    return report, None
@@ -0,0 +1,668 @@
+#!/usr/bin/env python3
+"""
+🔗 AIVACEO Webhook Ingestion
+Standalone Flask endpoint for VAPI and n8n webhooks, a registry of the endpoints it accepts,
+an append-only durable event log and a feed that tails the log into the shared call stores
+
+Usage: python aiva_webhooks.py [--host 0.0.0.0] [--port 8765]
+"""
+
+import argparse
+import glob
+import hmac
+import json
+import logging
+import os
+import queue
+import threading
+import time as time_module
+from collections import deque
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from aiva_call_store import CACHE_DIR
+from aiva_live import get_live_channel
+
+logger = logging.getLogger(__name__)
+
+#######################################
+# DURABLE EVENT LOG
+#######################################
+
+WEBHOOK_LOG_DIR = os.environ.get('AIVA_WEBHOOK_LOG_DIR', os.path.join(CACHE_DIR, 'webhooks'))
+SEGMENT_BYTES = 64 * 1024 * 1024
+COMMIT_MAX_EVENTS = 5_000
+TAIL_READ_BYTES = 64 * 1024
+
+class WebhookLog:
+    """
+    Append-only JSON Lines log of webhook events, split into numbered segment files.
+
+    Writers hand events to one committer thread, which writes everything queued as one
+    batch and fsyncs once before acknowledging the whole batch (group commit), so each
+    acknowledged event is on disk without a sync per request. Readers in any process tail
+    the segments from an (segment, byte offset) position and only ever consume complete
+    lines. One process writes a log at a time.
+    """
+
+    def __init__(self, directory=WEBHOOK_LOG_DIR, segment_bytes=SEGMENT_BYTES):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.seq = 0
+        self._queue = queue.Queue()
+        self._handle = None
+        self._segment = 0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, f"events-{segment:06d}.jsonl")
+
+    def segments(self):
+        """Segment numbers on disk, oldest first"""
+        names = glob.glob(os.path.join(self.directory, 'events-*.jsonl'))
+        return sorted(int(os.path.basename(name)[7:13]) for name in names)
+
+    def _open_for_append(self):
+        os.makedirs(self.directory, exist_ok=True)
+        segments = self.segments()
+        self._segment = segments[-1] if segments else 1
+        path = self._segment_path(self._segment)
+
+        # A torn last line (crash mid-write) is cut off
+        if os.path.exists(path):
+            with open(path, 'rb+') as f:
+                data = f.read()
+                complete = data.rfind(b'\n') + 1
+                if complete < len(data):
+                    f.truncate(complete)
+
+        # The newest segment is empty right after a rotation, so the last sequence number can be in an older one
+        for number in reversed(segments):
+            seq = self._last_seq(number)
+            if seq is not None:
+                self.seq = seq
+                break
+        self._handle = open(path, 'ab')
+
+    def _last_seq(self, segment):
+        """Sequence number of the last complete line of a segment (None when it has none), read from the end"""
+        with open(self._segment_path(segment), 'rb') as f:
+            start = f.seek(0, os.SEEK_END)
+            tail = b''
+            while start > 0:
+                step = min(TAIL_READ_BYTES, start)
+                start -= step
+                f.seek(start)
+                tail = f.read(step) + tail
+                # Lines end with a newline; the first one read is only whole once the start of the file is reached
+                lines = tail.split(b'\n')[:-1]
+                for line in reversed(lines if start == 0 else lines[1:]):
+                    if line.strip():
+                        return json.loads(line)['seq']
+        return None
+
+    def start(self):
+        """Open the log for writing and start the committer thread"""
+        with self._lock:
+            if self._thread is None:
+                self._open_for_append()
+                self._thread = threading.Thread(target=self._commit_loop, name='webhook-log-commit', daemon=True)
+                self._thread.start()
+        return self
+
+    def append(self, events, timeout=10):
+        """Durably append events ({'source', 'kind', 'payload'} dicts); returns their sequence numbers"""
+        self.start()
+        pending = {'events': events, 'done': threading.Event(), 'seqs': None, 'error': None}
+        self._queue.put(pending)
+        if not pending['done'].wait(timeout):
+            raise TimeoutError("Webhook log commit timed out")
+        if pending['error']:
+            raise RuntimeError(pending['error'])
+        return pending['seqs']
+
+    def _commit_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            queued = len(batch[0]['events'])
+            while queued < COMMIT_MAX_EVENTS:
+                try:
+                    pending = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(pending)
+                queued += len(pending['events'])
+
+            try:
+                lines = []
+                received_at = time_module.time()
+                for pending in batch:
+                    pending['seqs'] = []
+                    for event in pending['events']:
+                        self.seq += 1
+                        pending['seqs'].append(self.seq)
+                        lines.append(json.dumps(dict(event, seq=self.seq, received_at=received_at), default=str))
+                self._handle.write(('\n'.join(lines) + '\n').encode('utf-8'))
+                self._handle.flush()
+                os.fsync(self._handle.fileno())
+
+                if self._handle.tell() >= self.segment_bytes:
+                    self._handle.close()
+                    self._segment += 1
+                    self._handle = open(self._segment_path(self._segment), 'ab')
+            except Exception as e:
+                for pending in batch:
+                    pending['error'] = str(e)
+            for pending in batch:
+                pending['done'].set()
+
+    def read_from(self, position=(0, 0), max_events=None):
+        """
+        (events, next position) of complete lines after position = (segment, byte offset),
+        stopping after max_events so a long backlog is read in bounded pages
+        """
+        segment, offset = position
+        events = []
+        for number in self.segments():
+            if number < segment:
+                continue
+            if number > segment:
+                segment, offset = number, 0
+            try:
+                with open(self._segment_path(number), 'rb') as f:
+                    f.seek(offset)
+                    for line in f:
+                        # A line without its newline is still being written
+                        if not line.endswith(b'\n'):
+                            break
+                        offset += len(line)
+                        if line.strip():
+                            events.append(json.loads(line))
+                        if max_events is not None and len(events) >= max_events:
+                            return events, (segment, offset)
+            except FileNotFoundError:
+                continue
+        return events, (segment, offset)
+
+    def info(self):
+        """Events and bytes on disk (cheap: file sizes only)"""
+        sizes = [os.path.getsize(self._segment_path(number)) for number in self.segments()]
+        return {'segments': len(sizes), 'bytes': sum(sizes), 'seq': self.seq}
+
+#######################################
+# ENDPOINT REGISTRY
+#######################################
+
+WEBHOOK_SOURCES = {'vapi': 'VAPI', 'n8n': 'n8n'}
+BUILTIN_ENDPOINTS = {source: {'id': source, 'name': label, 'source': source, 'status': 'Active', 'created': None}
+                     for source, label in WEBHOOK_SOURCES.items()}
+
+class WebhookRegistry:
+    """
+    Webhook endpoints the ingestion service accepts, kept in endpoints.json next to the log
+    so the dashboard and the service process share them. Each endpoint receives events at
+    /webhooks/<id>, normalized as VAPI or n8n events; paused endpoints refuse events. The
+    built-in vapi and n8n endpoints can be paused but not deleted.
+    """
+
+    def __init__(self, directory=WEBHOOK_LOG_DIR):
+        self.directory = directory
+        self._endpoints = None
+        self._stamp = None
+        self._lock = threading.RLock()
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, 'endpoints.json')
+
+    def endpoints(self):
+        """Endpoints by id, re-read when another process changed the file"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+                stamp = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stamp = None
+            if self._endpoints is None or stamp != self._stamp:
+                self._endpoints = self._load(stamp)
+                self._stamp = stamp
+            return {endpoint_id: dict(endpoint) for endpoint_id, endpoint in self._endpoints.items()}
+
+    def _load(self, stamp):
+        endpoints = {endpoint_id: dict(endpoint) for endpoint_id, endpoint in BUILTIN_ENDPOINTS.items()}
+        if stamp is None:
+            return endpoints
+        try:
+            with open(self.path) as f:
+                endpoints.update(json.load(f))
+        except Exception as e:
+            logger.warning("Webhook endpoints in %r could not be read: %s", self.path, e)
+        return endpoints
+
+    def _save(self, endpoints):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(endpoints, f)
+        os.replace(tmp_path, self.path)
+        self._endpoints = None
+
+    def add(self, name, source):
+        """Register an endpoint; returns (endpoint, error)"""
+        endpoint_id = "".join(c if c.isalnum() else '-' for c in name.strip().lower()).strip('-')
+        if not endpoint_id:
+            return None, "Webhook name needs at least one letter or digit"
+        if source not in WEBHOOK_SOURCES:
+            return None, f"Unknown webhook type: {source}"
+        with self._lock:
+            endpoints = self.endpoints()
+            if endpoint_id in endpoints:
+                return None, f"Webhook '{endpoint_id}' already exists"
+            endpoints[endpoint_id] = {'id': endpoint_id, 'name': name.strip(), 'source': source, 'status': 'Active',
+                                      'created': datetime.now().isoformat(timespec='seconds')}
+            self._save(endpoints)
+            return endpoints[endpoint_id], None
+
+    def set_status(self, endpoint_id, status):
+        """Mark an endpoint 'Active' or 'Paused'; returns (endpoint, error)"""
+        with self._lock:
+            endpoints = self.endpoints()
+            if endpoint_id not in endpoints:
+                return None, f"Webhook not found: {endpoint_id}"
+            endpoints[endpoint_id]['status'] = status
+            self._save(endpoints)
+            return endpoints[endpoint_id], None
+
+    def delete(self, endpoint_id):
+        """Remove a registered endpoint; returns (removed endpoint, error)"""
+        if endpoint_id in BUILTIN_ENDPOINTS:
+            return None, "Built-in webhooks can be paused but not deleted"
+        with self._lock:
+            endpoints = self.endpoints()
+            endpoint = endpoints.pop(endpoint_id, None)
+            if endpoint is None:
+                return None, f"Webhook not found: {endpoint_id}"
+            self._save(endpoints)
+            return endpoint, None
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+def get_webhook_registry(directory=WEBHOOK_LOG_DIR):
+    """Shared endpoint registry of a webhook log directory"""
+    with _registries_lock:
+        registry = _registries.get(directory)
+        if registry is None:
+            registry = _registries[directory] = WebhookRegistry(directory)
+        return registry
+
+#######################################
+# EVENT NORMALIZATION
+#######################################
+
+def _utc(value):
+    """Naive UTC datetime from an ISO string or epoch milliseconds (VAPI message timestamps); None if unparseable"""
+    if value is None or value == '':
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            parsed = datetime.fromtimestamp(value / 1000, timezone.utc)
+        else:
+            # fromisoformat covers VAPI's ISO timestamps at a fraction of pd.to_datetime's per-value cost
+            parsed = datetime.fromisoformat(str(value))
+    except (ValueError, OverflowError, OSError):
+        parsed = pd.to_datetime(value, errors='coerce', utc=True)
+        if pd.isna(parsed):
+            return None
+        parsed = parsed.to_pydatetime()
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+def _sent_at(event):
+    """Epoch seconds the sender stamped on the event (VAPI message timestamps), if any"""
+    payload = event['payload']
+    sent = payload.get('message', payload).get('timestamp')
+    return sent / 1000 if isinstance(sent, (int, float)) and not isinstance(sent, bool) else None
+
+def _call_start(message, call, received_at):
+    started = _utc(message.get('startedAt') or call.get('startedAt') or call.get('createdAt') or message.get('timestamp'))
+    return started or datetime.fromtimestamp(received_at, timezone.utc).replace(tzinfo=None)
+
+def vapi_call_row(event):
+    """
+    Call row from a VAPI server message (status-update, end-of-call-report, ...) or the flat
+    {call_id, customer_name, phone_number, status, timestamp} format. Fields an event does
+    not carry are left out, so later events for the same call fill in the rest.
+    """
+    payload = event['payload']
+    message = payload.get('message', payload)
+    call = message.get('call') or {}
+    customer = call.get('customer') or message.get('customer') or {}
+    analysis = message.get('analysis') or {}
+    assistant = message.get('assistant') or call.get('assistant') or {}
+    started = _call_start(message, call, event['received_at'])
+    ended = _utc(message.get('endedAt'))
+
+    row = {
+        'call_id': message.get('call_id') or call.get('id') or f"WEBHOOK-{event['seq']}",
+        'customer_name': customer.get('name') or message.get('customer_name'),
+        'phone_number': customer.get('number') or message.get('phone_number'),
+        'call_status': message.get('status') or message.get('type'),
+        'voice_agent_name': assistant.get('name'),
+        'call_date': started.strftime('%Y-%m-%d'),
+        'call_start_time': started.strftime('%H:%M:%S'),
+        'call_end_time': ended.strftime('%H:%M:%S') if ended else None,
+        'call_duration_seconds': message.get('durationSeconds') or message.get('duration'),
+        'cost': message.get('cost'),
+        'call_outcome': message.get('endedReason'),
+        'call_recording_url': message.get('recordingUrl'),
+        'transcript': message.get('transcript'),
+        'summary': message.get('summary') or analysis.get('summary'),
+        'upload_timestamp': datetime.fromtimestamp(event['received_at']).isoformat()
+    }
+    return {key: value for key, value in row.items() if value is not None}
+
+def n8n_call_row(event):
+    """Call row from an n8n call_processing workflow event"""
+    data = event['payload'].get('data') or {}
+    started = _call_start(data, {}, event['received_at'])
+    row = {
+        'call_id': data.get('call_id') or f"WEBHOOK-{event['seq']}",
+        'customer_name': data.get('customer_name'),
+        'phone_number': data.get('phone_number'),
+        'call_date': started.strftime('%Y-%m-%d'),
+        'call_start_time': started.strftime('%H:%M:%S'),
+        'call_duration_seconds': data.get('duration'),
+        'call_outcome': data.get('outcome'),
+        'summary': data.get('ai_summary'),
+        'next_best_action': data.get('next_action'),
+        'upload_timestamp': datetime.fromtimestamp(event['received_at']).isoformat()
+    }
+    return {key: value for key, value in row.items() if value is not None}
+
+def n8n_contact(event):
+    """CRM contact from an n8n customer_update workflow event"""
+    data = event['payload'].get('data') or {}
+    return {
+        'customer_id': data.get('customer_id'),
+        'customer_name': data.get('name'),
+        'email': data.get('email'),
+        'phone': data.get('phone'),
+        'tier': data.get('tier'),
+        'last_interaction': data.get('last_interaction'),
+        'notes': data.get('notes'),
+        'timestamp': datetime.fromtimestamp(event['received_at']).isoformat()
+    }
+
+SAMPLE_PAYLOADS = {
+    'vapi': {'message': {'type': 'status-update', 'status': 'ended', 'call': {'id': 'test-call'},
+                         'customer': {'name': 'Test Customer', 'number': '+15550000000'}}},
+    'n8n': {'workflow_id': 'call_processing', 'data': {'call_id': 'test-call', 'customer_name': 'Test Customer',
+                                                       'outcome': 'completed', 'ai_summary': 'Test event'}}
+}
+
+def sample_event(endpoint):
+    """A sample event for an endpoint and the call row the feed would make of it (nothing is logged)"""
+    payload = SAMPLE_PAYLOADS[endpoint['source']]
+    event = {'source': endpoint['source'], 'kind': event_kind(endpoint['source'], payload), 'payload': payload,
+             'endpoint': endpoint['id'], 'seq': 0, 'received_at': time_module.time()}
+    return event, vapi_call_row(event) if endpoint['source'] == 'vapi' else n8n_call_row(event)
+
+def event_kind(source, payload):
+    """'call', 'customer' or 'workflow' for an incoming payload"""
+    if source == 'vapi':
+        return 'call'
+    workflow = payload.get('workflow_id')
+    if workflow == 'call_processing':
+        return 'call'
+    if workflow == 'customer_update':
+        return 'customer'
+    return 'workflow'
+
+#######################################
+# LOG FEED
+#######################################
+
+FEED_INTERVAL_SECONDS = 0.5
+FEED_RECENT_EVENTS = 100
+FEED_PAGE_EVENTS = 2_000
+
+class WebhookFeed:
+    """
+    Tails the webhook log into a call store: call events are upserted by call_id (so the
+    status updates and end-of-call report of one call merge into one row), customer
+    updates are kept as recent CRM contacts. Polls every FEED_INTERVAL_SECONDS and
+    publishes new events on the store's live channel.
+
+    The log position is saved next to the store snapshot with the store's base_id, once
+    the rows it covers are persisted, so a restarted process resumes after the events the
+    store already holds. A replace by another writer (e.g. a full sheet sync) does not
+    rewind the feed: the reloaded source supersedes the events before it, and only newer
+    events are applied on top. Without a saved position the feed starts at the beginning
+    of the log. The log is read in pages of FEED_PAGE_EVENTS, each upserted under the store
+    lock on its own, so catching up never holds the store for the whole backlog.
+    """
+
+    def __init__(self, store, log, interval=FEED_INTERVAL_SECONDS):
+        self.store = store
+        self.log = log
+        self.interval = interval
+        self.position = (0, 0)
+        self.base_id = None
+        self.events = 0
+        self.calls = 0
+        self.last_event_at = None
+        self.recent = deque(maxlen=FEED_RECENT_EVENTS)
+        self.contacts = deque(maxlen=FEED_RECENT_EVENTS)
+        self.endpoint_stats = {}
+        self.channel = get_live_channel(store.name)
+        self.published_seq = 0
+        self._unpersisted = False
+        self._thread = None
+        self._lock = threading.Lock()
+        self._load_state()
+
+    @property
+    def state_path(self):
+        return os.path.splitext(self.store.parquet_path)[0] + '.webhook_feed.json'
+
+    def _load_state(self):
+        """Resume from the position saved for this store and log, if any"""
+        if not self.store.persist_enabled:
+            return
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Webhook feed for %r could not read its position, replaying the log: %s", self.store.name, e)
+            return
+        if state.get('store') != self.store.name or state.get('log') != os.path.abspath(self.log.directory):
+            return
+
+        self.position = tuple(state['position'])
+        self.published_seq = state.get('published_seq', 0)
+        self.base_id = state.get('base_id')
+        if self.base_id != self.store.base_id:
+            logger.info("Call store %r was replaced since its webhook feed stopped; resuming after the events it superseded",
+                        self.store.name)
+
+    def _save_state(self):
+        """Save the position next to the store snapshot (after the rows it covers were persisted)"""
+        if not self.store.persist_enabled or self._unpersisted:
+            return
+        state = {'store': self.store.name, 'base_id': self.store.base_id, 'log': os.path.abspath(self.log.directory),
+                 'position': list(self.position), 'published_seq': self.published_seq}
+        try:
+            tmp_path = self.state_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logger.warning("Webhook feed for %r could not save its position: %s", self.store.name, e)
+
+    def poll(self):
+        """Apply events logged since the last poll, page by page; returns how many were read"""
+        with self._lock:
+            read = 0
+            while True:
+                page = self._poll_page()
+                read += page
+                if page < FEED_PAGE_EVENTS:
+                    return read
+
+    def _poll_page(self):
+        # The store lock keeps a replace by another writer from landing between the check and the upsert
+        with self.store._lock:
+            if not self.store.is_loaded():
+                return 0
+
+            events, position = self.log.read_from(self.position, max_events=FEED_PAGE_EVENTS)
+            rows = []
+            published = []
+            for event in events:
+                kind = event.get('kind')
+                summary = {'seq': event['seq'], 'source': event['source'], 'kind': kind,
+                           'received_at': event['received_at']}
+                if kind == 'call':
+                    rows.append(vapi_call_row(event) if event['source'] == 'vapi' else n8n_call_row(event))
+                    published.append(dict(summary, row=rows[-1], sent_at=_sent_at(event)))
+                elif kind == 'customer':
+                    self.contacts.append(n8n_contact(event))
+                    published.append(dict(summary, row=self.contacts[-1]))
+                self.recent.append(summary)
+                # Events logged before endpoints were registered came in on their source's endpoint
+                stats = self.endpoint_stats.setdefault(event.get('endpoint', event['source']),
+                                                       {'events': 0, 'calls': 0, 'last_event_at': None})
+                stats['events'] += 1
+                stats['calls'] += kind == 'call'
+                stats['last_event_at'] = event['received_at']
+
+            if rows:
+                entry = self.store.load_chunks([pd.DataFrame(rows)], mode='upsert')
+                self.calls += len(rows)
+                # Rows the store could not persist are lost on a restart: the saved position stays before them
+                if entry is not None and entry['persisted'] is False:
+                    self._unpersisted = True
+            # Events replayed after a restart from a position held back are not published twice
+            published = [event for event in published if event['seq'] > self.published_seq]
+            if published:
+                self.channel.publish(published)
+                self.published_seq = published[-1]['seq']
+            self.position = position
+            self.events += len(events)
+            if events:
+                self.last_event_at = events[-1]['received_at']
+            if events or self.base_id != self.store.base_id:
+                self.base_id = self.store.base_id
+                self._save_state()
+            return len(events)
+
+    def _run(self):
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                logger.warning("Webhook feed for %r failed: %s", self.store.name, e)
+            time_module.sleep(self.interval)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"webhook-feed-{self.store.name}", daemon=True)
+                self._thread.start()
+        return self
+
+    def info(self):
+        """Cheap summary for the Webhooks page"""
+        return {
+            'events': self.events,
+            'calls': self.calls,
+            'contacts': len(self.contacts),
+            'last_event_at': datetime.fromtimestamp(self.last_event_at).isoformat() if self.last_event_at else None,
+            'seconds_since_event': time_module.time() - self.last_event_at if self.last_event_at else None
+        }
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+
+def get_webhook_feed(store, directory=WEBHOOK_LOG_DIR):
+    """Shared, running feed of the webhook log into a call store"""
+    with _feeds_lock:
+        feed = _feeds.get(store.name)
+        if feed is None or feed.store is not store:
+            feed = _feeds[store.name] = WebhookFeed(store, WebhookLog(directory)).start()
+        return feed
+
+#######################################
+# HTTP ENDPOINT
+#######################################
+
+def create_app(log, secret=None, registry=None):
+    """
+    Flask app accepting POST /webhooks/<endpoint id> for the registry's endpoints
+    (/webhooks/vapi and /webhooks/n8n built in; one JSON event or a JSON array of events).
+    Events are acknowledged (202) once they are in the durable log; paused endpoints answer
+    503. With a secret, requests must carry it in X-Vapi-Secret or X-Webhook-Secret.
+    """
+    from flask import Flask, jsonify, request
+
+    app = Flask(__name__)
+    registry = registry or get_webhook_registry(log.directory)
+
+    def authorized():
+        if not secret:
+            return True
+        supplied = request.headers.get('X-Vapi-Secret') or request.headers.get('X-Webhook-Secret') or ''
+        return hmac.compare_digest(supplied.encode(), secret.encode())
+
+    def ingest(endpoint_id):
+        if not authorized():
+            return jsonify({'error': 'invalid webhook secret'}), 401
+        endpoint = registry.endpoints().get(endpoint_id)
+        if endpoint is None:
+            return jsonify({'error': f'unknown webhook: {endpoint_id}'}), 404
+        if endpoint['status'] != 'Active':
+            return jsonify({'error': f'webhook {endpoint_id} is paused'}), 503
+        source = endpoint['source']
+        payload = request.get_json(silent=True)
+        if payload is None:
+            return jsonify({'error': 'expected a JSON body'}), 400
+
+        payloads = payload if isinstance(payload, list) else [payload]
+        events = [{'source': source, 'kind': event_kind(source, item), 'payload': item, 'endpoint': endpoint_id}
+                  for item in payloads if isinstance(item, dict)]
+        if not events:
+            return jsonify({'error': 'no JSON objects in body'}), 400
+        try:
+            seqs = log.append(events)
+        except Exception as e:
+            return jsonify({'error': str(e)}), 503
+        return jsonify({'accepted': len(seqs), 'seq': seqs[-1]}), 202
+
+    @app.post('/webhooks/<endpoint_id>')
+    def webhook(endpoint_id):
+        return ingest(endpoint_id)
+
+    @app.get('/health')
+    def health():
+        return jsonify(dict(log.info(), status='ok'))
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="AIVACEO webhook ingestion endpoint")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--log-dir', default=WEBHOOK_LOG_DIR)
+    args = parser.parse_args()
+
+    log = WebhookLog(args.log_dir).start()
+    app = create_app(log, secret=os.environ.get('AIVA_WEBHOOK_SECRET'))
+    print(f"🔗 Webhook endpoints on http://{args.host}:{args.port}/webhooks/<id> (vapi, n8n and registered ones), log in {args.log_dir}")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+if __name__ == "__main__":
+    main()
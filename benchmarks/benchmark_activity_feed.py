@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+⏱️ AIVACEO Live Activity Feed Benchmark
+Building the feed from a DataFrame with iterrows() and one HTML block per activity vs the
+ActivityLog ring buffer (vectorized ingest, one HTML block for the visible window)
+
+Usage: python benchmarks/benchmark_activity_feed.py [events] [visible rows]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aiva_live import ActivityLog, activity_html
+
+def main():
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    visible = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    now = time.time()
+    rng = np.random.default_rng(7)
+    statuses = np.array(['queued', 'in-progress', 'ended'])
+    events = [{'kind': 'call', 'source': 'vapi', 'received_at': now - n_events + i,
+               'row': {'call_id': f"CALL-{i // 3:08d}", 'call_status': status, 'customer_name': f"Customer {i % 500}",
+                       'voice_agent_name': 'VAPI Agent Alpha', 'call_duration_seconds': 180.0}}
+              for i, status in enumerate(rng.choice(statuses, n_events))]
+
+    # Per-row: a list of dicts, a DataFrame, then one HTML block per visible activity
+    started = time.perf_counter()
+    activities = [{'Time': time.strftime('%H:%M:%S', time.localtime(event['received_at'])), 'Type': event['row']['call_status'],
+                   'Customer': event['row']['customer_name'], 'Agent': event['row']['voice_agent_name'],
+                   'Duration': '03:00'} for event in events[-visible:]]
+    blocks = [f"<div>{activity['Time']} - {activity['Type']} | {activity['Customer']} | {activity['Agent']}</div>"
+              for _, activity in pd.DataFrame(activities).iterrows()]
+    per_row_ms = (time.perf_counter() - started) * 1000
+
+    log = ActivityLog()
+    started = time.perf_counter()
+    for start in range(0, n_events, 1000):
+        log.observe(events[start:start + 1000])
+    ingest_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(20):
+        html = activity_html(log.window(visible))
+    batched_ms = (time.perf_counter() - started) / 20 * 1000
+
+    print(f"📊 {n_events:,} events into a {log.capacity:,}-row ring, {visible:,} visible")
+    print(f"{'iterrows + per-row blocks':<32}{per_row_ms:>10.2f} ms ({len(blocks):,} elements)")
+    print(f"{'Ring buffer ingest':<32}{n_events / ingest_seconds:>10,.0f} events/s")
+    print(f"{'Window + one HTML block':<32}{batched_ms:>10.2f} ms (1 element, {len(html) / 1024:.0f} KB)")
+
+if __name__ == "__main__":
+    main()
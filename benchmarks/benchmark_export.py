@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+⏱️ AIVACEO Export Benchmark
+In-memory to_csv vs the chunked export pipeline (CSV+GZIP, Parquet, Excel) on a synthetic call store, time and peak memory
+
+Usage: python benchmarks/benchmark_export.py [rows]
+"""
+
+import gzip
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmark_import import write_export
+
+def run_mode(mode, path):
+    """Load the export into a store, export it one way and print seconds, output MB and peak RSS (MB)"""
+    from aiva_call_store import CallStore
+    from aiva_export import export_calls
+    from aiva_import import import_upload
+
+    store = CallStore('benchmark_export', cache_dir=tempfile.mkdtemp(), persist=False)
+    with open(path, 'rb') as f:
+        import_upload(store, f, path, mode='replace')
+    # Peak RSS so far is the load; reset the baseline by reporting the growth past it
+    loaded_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    frame = store.view()
+
+    started = time.perf_counter()
+    if mode == 'in-memory':
+        data = gzip.compress(store.with_text(frame).to_csv(index=False).encode('utf-8'))
+        size = len(data)
+    else:
+        export_format, compression = {'csv-gzip': ('CSV', 'GZIP'), 'parquet': ('Parquet', 'None'),
+                                      'excel': ('Excel', 'None')}[mode]
+        export, error = export_calls(store, frame, export_format, compression)
+        if error:
+            raise RuntimeError(error)
+        size = export['bytes']
+        export['file'].close()
+    seconds = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode} {seconds:.2f} {size / 1024 / 1024:.1f} {max(peak_mb - loaded_mb, 0):.0f}")
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--mode':
+        run_mode(sys.argv[2], sys.argv[3])
+        return
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    path = os.path.join(tempfile.mkdtemp(), 'calls_export.csv')
+
+    print(f"📊 Writing {n_rows:,} synthetic calls...")
+    write_export(path, n_rows)
+
+    print(f"{'Export':<12}{'seconds':>10}{'output MB':>12}{'extra peak RSS (MB)':>22}")
+    for mode in ['in-memory', 'csv-gzip', 'parquet', 'excel']:
+        # Each export runs in its own process so peak memory is measured separately
+        output = subprocess.run([sys.executable, __file__, '--mode', mode, path],
+                                capture_output=True, text=True, check=True).stdout.split()
+        print(f"{mode:<12}{float(output[1]):>10.2f}{float(output[2]):>12.1f}{float(output[3]):>22,.0f}")
+
+    os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+⏱️ AIVACEO Import Benchmark
+Whole-file pd.read_csv vs the chunked import pipeline on a synthetic call export, time and peak memory
+
+Usage: python benchmarks/benchmark_import.py [rows]
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def write_export(path, n_rows, seed=42, block=200_000):
+    """Synthetic telephony export with the dashboard's columns, written in blocks"""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, block):
+        n = min(block, n_rows - start)
+        frame = pd.DataFrame({
+            'call_id': [f"call_{i}" for i in range(start, start + n)],
+            'customer_name': rng.choice(['John Smith', 'Mary Johnson', 'Ana Garcia', 'Chen Wei'], n),
+            'call_date': pd.to_datetime('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D'),
+            'call_start_time': [f"{h:02d}:{m:02d}:00" for h, m in zip(rng.integers(8, 18, n), rng.integers(0, 60, n))],
+            'voice_agent_name': rng.choice(['Agent A', 'Agent B', 'Agent C'], n),
+            'intent_detected': rng.choice(['booking', 'support', 'billing'], n),
+            'call_duration_seconds': rng.integers(30, 900, n),
+            'cost': rng.random(n).round(2),
+            'sentiment_score': rng.random(n).round(3),
+            'transcript': [f"Customer called about order {i} and asked for a follow-up on the delivery window. " * 4
+                           for i in range(start, start + n)],
+            'summary': [f"Call {i}: delivery follow-up requested" for i in range(start, start + n)]
+        })
+        frame['call_date'] = frame['call_date'].dt.strftime('%Y-%m-%d')
+        frame.to_csv(path, mode='a' if start else 'w', header=start == 0, index=False)
+
+def run_mode(mode, path):
+    """Load the export one way and print seconds and peak RSS (MB)"""
+    from aiva_call_store import CallStore, coerce_call_frame
+    from aiva_import import import_upload
+
+    started = time.perf_counter()
+    if mode == 'full':
+        frame = coerce_call_frame(pd.read_csv(path))
+        rows = len(frame)
+    else:
+        store = CallStore('benchmark_import', cache_dir=tempfile.mkdtemp(), persist=False)
+        with open(path, 'rb') as f:
+            report, error = import_upload(store, f, path, mode='replace')
+        if error:
+            raise RuntimeError(error)
+        rows = report['rows_imported']
+    seconds = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode} {rows} {seconds:.2f} {peak_mb:.0f}")
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--mode':
+        run_mode(sys.argv[2], sys.argv[3])
+        return
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    path = os.path.join(tempfile.mkdtemp(), 'calls_export.csv')
+
+    print(f"📊 Writing {n_rows:,} synthetic calls...")
+    write_export(path, n_rows)
+    print(f"📁 Export size: {os.path.getsize(path) / 1024 / 1024:.0f} MB")
+
+    print(f"{'Loader':<12}{'rows':>12}{'seconds':>10}{'peak RSS (MB)':>16}")
+    for mode in ['full', 'chunked']:
+        # Each loader runs in its own process so peak memory is measured separately
+        output = subprocess.run([sys.executable, __file__, '--mode', mode, path],
+                                capture_output=True, text=True, check=True).stdout.split()
+        print(f"{mode:<12}{int(output[1]):>12,}{float(output[2]):>10.2f}{float(output[3]):>16,.0f}")
+
+    os.remove(path)
+
+if __name__ == "__main__":
+    main()
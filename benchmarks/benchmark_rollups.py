@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+⏱️ AIVACEO Rollup Benchmark
+Lambda groupby aggregations vs vectorized boolean rollups on synthetic call data
+
+Usage: python benchmarks/benchmark_rollups.py [rows]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiva_analytics import rollup
+from aiva_call_store import coerce_call_frame
+
+def generate_calls(n_rows, seed=42):
+    """Synthetic call table with the dashboard's column shapes"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'call_id': np.arange(n_rows),
+        'customer_name': [f"Customer {i}" for i in rng.integers(0, n_rows // 20 + 1, n_rows)],
+        'voice_agent_name': rng.choice([f"Agent {i}" for i in range(12)], n_rows),
+        'intent_detected': rng.choice(['Booking', 'Support', 'Billing', 'Sales', 'Complaint'], n_rows),
+        'call_hour': rng.integers(8, 19, n_rows),
+        'call_duration_seconds': rng.integers(10, 1800, n_rows),
+        'call_success': rng.choice(['Yes', 'No'], n_rows, p=[0.82, 0.18]),
+        'follow_up_required': rng.choice(['Yes', 'No'], n_rows, p=[0.3, 0.7]),
+        'customer_satisfaction': rng.uniform(1, 5, n_rows),
+        'revenue_impact': rng.uniform(0, 5000, n_rows),
+        'sentiment_score': rng.uniform(0, 1, n_rows)
+    })
+
+def lambda_rate(x):
+    return (x == 'Yes').sum() / len(x) * 100
+
+def lambda_count(x):
+    return (x == 'Yes').sum()
+
+def duration_bins(frame):
+    return pd.cut(frame['call_duration_seconds'],
+                  bins=[0, 60, 300, 600, 1200, float('inf')],
+                  labels=['<1min', '1-5min', '5-10min', '10-20min', '>20min'])
+
+CASES = [
+    ('Hourly success rate',
+     lambda f: f.groupby('call_hour')['call_success'].apply(lambda_rate),
+     lambda f: rollup(f, 'call_hour', {'call_success': 'yes_rate'})),
+    ('Intent success rate',
+     lambda f: f.groupby('intent_detected', observed=True)['call_success'].apply(lambda_rate),
+     lambda f: rollup(f, 'intent_detected', {'call_success': 'yes_rate'})),
+    ('Duration-bin success rate',
+     lambda f: f.groupby(duration_bins(f), observed=True)['call_success'].apply(lambda_rate),
+     lambda f: rollup(f, duration_bins(f), {'call_success': 'yes_rate'})),
+    ('Contact directory',
+     lambda f: f.groupby('customer_name').agg({
+         'call_id': 'count', 'call_success': lambda_rate, 'customer_satisfaction': 'mean',
+         'revenue_impact': 'sum', 'follow_up_required': lambda_count, 'sentiment_score': 'mean'}),
+     lambda f: rollup(f, 'customer_name', {
+         'call_id': 'count', 'call_success': 'yes_rate', 'customer_satisfaction': 'mean',
+         'revenue_impact': 'sum', 'follow_up_required': 'yes_count', 'sentiment_score': 'mean'})),
+]
+
+def best_of(func, frame, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = func(frame)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeats = 3
+
+    print(f"📊 Generating {n_rows:,} synthetic calls...")
+    frames = {'object columns': generate_calls(n_rows)}
+    frames['typed call store'] = coerce_call_frame(frames['object columns'])
+
+    for label, frame in frames.items():
+        print(f"\n🗄️ {label}")
+        print(f"{'Aggregation':<28}{'lambda (s)':>12}{'rollup (s)':>12}{'speedup':>10}")
+
+        for name, slow, fast in CASES:
+            slow_time, slow_result = best_of(slow, frame, repeats)
+            fast_time, fast_result = best_of(fast, frame, repeats)
+
+            # Same numbers, column for column
+            np.testing.assert_allclose(
+                np.asarray(slow_result, dtype=float).reshape(len(slow_result), -1),
+                np.asarray(fast_result, dtype=float).reshape(len(fast_result), -1)
+            )
+            print(f"{name:<28}{slow_time:>12.3f}{fast_time:>12.3f}{slow_time / fast_time:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
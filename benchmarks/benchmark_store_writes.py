@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+⏱️ AIVACEO Store Write Benchmark
+Latency of small upserts (webhook-sized) into a large call store, in memory and persisted
+
+Usage: python benchmarks/benchmark_store_writes.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiva_call_store import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, CallStore
+
+WRITES = 20
+
+def generate_calls(n_rows, seed=42):
+    """Synthetic call table with the dashboard's columns"""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'call_id': [f"call_{i}" for i in range(n_rows)],
+        'customer_name': rng.choice(['John Smith', 'Mary Johnson', 'Ana Garcia', 'Chen Wei'], n_rows),
+        'phone_number': [f"+1555{i % 10_000_000:07d}" for i in range(n_rows)],
+        'call_date': (pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D')).strftime('%Y-%m-%d'),
+        'call_start_time': [f"{h:02d}:{m:02d}:00" for h, m in zip(rng.integers(8, 18, n_rows), rng.integers(0, 60, n_rows))],
+        'call_status': rng.choice(['ended', 'in-progress'], n_rows),
+        'recording_url': [f"https://recordings.example.com/{i}" for i in range(n_rows)],
+        'transcript': [f"Customer called about order {i}." for i in range(n_rows)],
+        'summary': [f"Call {i}" for i in range(n_rows)]
+    })
+    for col in CATEGORICAL_COLUMNS:
+        frame[col] = rng.choice(['A', 'B', 'C', 'D'], n_rows)
+    for col in NUMERIC_COLUMNS:
+        frame[col] = rng.random(n_rows)
+    return frame
+
+def time_writes(store, make_rows):
+    """Median seconds of WRITES upserts (after one warm-up write)"""
+    store.upsert(make_rows(-1))
+    seconds = []
+    for i in range(WRITES):
+        rows = make_rows(i)
+        started = time.perf_counter()
+        store.upsert(rows)
+        seconds.append(time.perf_counter() - started)
+    return float(np.median(seconds))
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"📊 Generating {n_rows:,} synthetic calls...")
+    frame = generate_calls(n_rows)
+
+    writes = {
+        '1 updated call': lambda i: pd.DataFrame({'call_id': [f"call_{i + 10}"], 'cost': [float(i)],
+                                                  'call_status': ['ended']}),
+        '1 new call': lambda i: pd.DataFrame({'call_id': [f"new_{i}"], 'cost': [1.0], 'call_status': ['queued'],
+                                              'call_date': ['2024-06-01'], 'transcript': ['Hello']}),
+        '50 mixed calls': lambda i: pd.DataFrame({'call_id': [f"call_{i * 25 + j}" for j in range(25)]
+                                                             + [f"batch_{i}_{j}" for j in range(25)],
+                                                  'cost': np.arange(50, dtype=float), 'call_status': ['ended'] * 50})
+    }
+
+    print(f"{'Write':<20}{'memory (ms)':>14}{'persisted (ms)':>16}")
+    stores = {}
+    for persist in (False, True):
+        store = CallStore(f"benchmark_writes_{persist}", cache_dir=tempfile.mkdtemp(), persist=persist)
+        store.replace(frame)
+        stores[persist] = store
+
+    for name, make_rows in writes.items():
+        memory, persisted = (time_writes(stores[persist], make_rows) for persist in (False, True))
+        print(f"{name:<20}{memory * 1000:>14.1f}{persisted * 1000:>16.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+⏱️ AIVACEO URL Monitor Benchmark
+Page-blocking time of sequential requests.get checks vs reading the background prober's cache,
+against local endpoints that are healthy, erroring, or accept connections and never answer
+
+Usage: python benchmarks/benchmark_url_monitor.py [dead endpoints] [timeout seconds]
+"""
+
+import http.server
+import os
+import socket
+import sys
+import threading
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aiva_monitor import UrlProber
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200 if self.path == '/health' else 503)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+def main():
+    n_dead = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    timeout = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # Accepts connections but never responds, like a hung upstream
+    blackhole = socket.socket()
+    blackhole.bind(('127.0.0.1', 0))
+    blackhole.listen(128)
+
+    live = f"http://127.0.0.1:{server.server_address[1]}"
+    dead = f"http://127.0.0.1:{blackhole.getsockname()[1]}"
+    urls = [f"{live}/health", f"{live}/error"] + [f"{dead}/hung/{i}" for i in range(n_dead)]
+    print(f"🌐 {len(urls)} URLs ({n_dead} hung), {timeout:.0f}s timeout")
+
+    started = time.perf_counter()
+    for url in urls:
+        try:
+            requests.get(url, timeout=timeout)
+        except requests.RequestException:
+            pass
+    print(f"{'Sequential checks per rerun':<34}{time.perf_counter() - started:>10.3f}s")
+
+    prober = UrlProber(interval=timeout * 2, timeout=timeout)
+    started = time.perf_counter()
+    for url in urls:
+        prober.watch(url)
+    prober.status(urls)
+    print(f"{'Prober: rerun reads the cache':<34}{time.perf_counter() - started:>10.3f}s")
+
+    started = time.perf_counter()
+    while any(result['status'] == 'pending' for result in prober.status(urls)):
+        time.sleep(0.01)
+    print(f"{'Prober: all URLs have a result':<34}{time.perf_counter() - started:>10.3f}s")
+
+    time.sleep(timeout * 4)
+    history = prober.history_frame(urls[0])
+    print(f"📊 {len(history)} probes of {urls[0]} in history, uptime {prober.uptime(urls[0]) * 100:.0f}%, "
+          f"hung URL uptime {prober.uptime(urls[-1]) * 100:.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+⏱️ AIVACEO Webhook Ingestion Benchmark
+Runs the webhook endpoint against a stub VAPI/n8n sender (single-event and batched posts from
+concurrent threads), then checks every acknowledged event is in the log and times how long a
+call store feed takes to pick up a new call
+
+Usage: python benchmarks/benchmark_webhooks.py [events] [threads]
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import pandas as pd
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aiva_call_store import CallStore
+from aiva_webhooks import WebhookFeed, WebhookLog
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def stub_event(i):
+    """End-of-call report in VAPI's server message shape"""
+    return {'message': {'type': 'end-of-call-report', 'call': {'id': f"BENCH-{i:08d}", 'customer': {'number': f"+1555{i % 10_000_000:07d}"}},
+                        'startedAt': '2024-05-01T10:00:00Z', 'durationSeconds': 60 + i % 600, 'cost': 0.05 * (i % 40),
+                        'endedReason': 'customer-ended-call', 'transcript': f"AI: Hello, this is call {i}.",
+                        'analysis': {'summary': f"Benchmark call {i}"}}}
+
+def send(url, n_events, n_threads, batch):
+    """Post n_events from n_threads threads, batch events per request; returns seconds"""
+    def worker(offset):
+        session = requests.Session()
+        for start in range(offset * batch, n_events, n_threads * batch):
+            events = [stub_event(i) for i in range(start, min(start + batch, n_events))]
+            response = session.post(url, json=events if batch > 1 else events[0], timeout=30)
+            response.raise_for_status()
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(n_threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+def main():
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    n_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    log_dir = tempfile.mkdtemp()
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/webhooks/vapi"
+
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'aiva_webhooks.py'), '--host', '127.0.0.1',
+                               '--port', str(port), '--log-dir', log_dir],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                requests.get(f"http://127.0.0.1:{port}/health", timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+
+        print(f"📨 Posting {n_events:,} events per run from {n_threads} threads...")
+        print(f"{'Run':<16}{'seconds':>10}{'events/s':>12}")
+        total = 0
+        for label, batch in [('single events', 1), ('batches of 50', 50)]:
+            seconds = send(url, n_events, n_threads, batch)
+            total += n_events
+            print(f"{label:<16}{seconds:>10.2f}{n_events / seconds:>12,.0f}")
+
+        logged = requests.get(f"http://127.0.0.1:{port}/health", timeout=5).json()
+        print(f"💾 Log: {logged['seq']:,} events ({'all acknowledged events present' if logged['seq'] == total else 'MISSING EVENTS'}), "
+              f"{logged['bytes'] / 1024 / 1024:.1f} MB in {logged['segments']} segment(s)")
+
+        store = CallStore('benchmark_webhooks', cache_dir=tempfile.mkdtemp(), persist=False)
+        store.replace(pd.DataFrame({'call_id': ['SEED'], 'cost': [0.0]}))
+        feed = WebhookFeed(store, WebhookLog(log_dir))
+        started = time.perf_counter()
+        feed.poll()
+        print(f"🔁 Feed replayed the log into the store in {time.perf_counter() - started:.2f}s ({len(store.view()) - 1:,} distinct calls)")
+
+        # Visibility: time from an acknowledged post until a polling feed has the call in the store
+        feed.start()
+        latencies = []
+        for i in range(10):
+            call_id = f"LATENCY-{i}"
+            requests.post(url, json={'message': {'type': 'status-update', 'call': {'id': call_id}}}, timeout=5).raise_for_status()
+            posted = time.perf_counter()
+            while call_id not in set(store.view()['call_id'].tail(5)):
+                time.sleep(0.01)
+            latencies.append(time.perf_counter() - posted)
+        print(f"⚡ New call visible to the store after {sum(latencies) / len(latencies) * 1000:.0f} ms on average, "
+              f"{max(latencies) * 1000:.0f} ms at worst")
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import os
+import sys
+
+# The modules live at the repository root, next to the dashboards
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+AGENTS = ['Ava', 'Max', 'Zoe']
+TIERS = ['Gold', 'Silver', 'Bronze']
+WORDS = ['refund', 'order', 'late', 'billing', 'upgrade', 'cancel', 'thanks', 'price', 'delivery']
+
+
+@pytest.fixture
+def make_calls():
+    """Builder for small synthetic call frames: make_calls(n, prefix='c', seed=0)"""
+    def build(n, prefix='c', seed=0):
+        rng = np.random.default_rng(seed)
+        return pd.DataFrame({
+            'call_id': [f'{prefix}{i}' for i in range(n)],
+            'call_date': rng.choice(['2024-01-01', '2024-01-02', '2024-01-03'], n),
+            'call_start_time': rng.choice(['09:15:00', '13:40:00', '17:05:00'], n),
+            'voice_agent_name': rng.choice(AGENTS, n),
+            'customer_tier': rng.choice(TIERS, n),
+            'call_success': rng.choice(['Yes', 'No'], n),
+            'cost': rng.random(n).round(3),
+            'sentiment_score': rng.random(n).round(3),
+            'customer_name': [f'Customer {i}' for i in range(n)],
+            'transcript': [' '.join(rng.choice(WORDS, rng.integers(1, 8))) for _ in range(n)],
+            'summary': [' '.join(rng.choice(WORDS, 3)) for _ in range(n)],
+        })
+    return build
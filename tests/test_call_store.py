@@ -0,0 +1,86 @@
+"""Call store writes, change tracking and snapshot restore"""
+
+import numpy as np
+import pandas as pd
+
+from aiva_call_store import CallStore
+
+
+def full_view(store):
+    return store.view(columns=store.columns)
+
+
+def test_upsert_updates_known_calls_and_appends_new_ones(tmp_path, make_calls):
+    store = CallStore('calls', cache_dir=str(tmp_path), persist=False)
+    store.replace(make_calls(20))
+
+    rows = make_calls(4, seed=7).assign(call_id=['c3', 'new1', 'c3', 'c10'])
+    rows['customer_name'] = ['first', 'appended', 'last', 'tenth']
+    store.upsert(rows)
+
+    frame = full_view(store)
+    assert len(frame) == 21
+    assert frame['call_id'].is_unique
+    by_id = frame.set_index('call_id')
+    # Duplicate ids in one batch: the last row wins
+    assert by_id.loc['c3', 'customer_name'] == 'last'
+    assert by_id.loc['c10', 'customer_name'] == 'tenth'
+    assert by_id.loc['new1', 'customer_name'] == 'appended'
+    assert by_id.loc['c3', 'transcript'] == rows['transcript'].iloc[2]
+    # Untouched calls keep their values and positions
+    assert frame['call_id'].iloc[:20].tolist() == [f'c{i}' for i in range(20)]
+    assert by_id.loc['c4', 'customer_name'] == 'Customer 4'
+
+
+def test_changes_since_reports_patched_and_appended_rows(tmp_path, make_calls):
+    store = CallStore('calls', cache_dir=str(tmp_path), persist=False)
+    store.replace(make_calls(20))
+    since = store.version
+    before = full_view(store)
+
+    store.upsert(pd.DataFrame({'call_id': ['c5', 'n1'], 'cost': [9.5, 1.0]}))
+    store.upsert(pd.DataFrame({'call_id': ['c5', 'c8'], 'cost': [7.5, 2.0], 'transcript': ['rewritten', 'again']}))
+    store.upsert(pd.DataFrame({'call_id': ['n2'], 'cost': [3.0]}))
+
+    changes = store.changes_since(since)
+    assert changes['since'] == since and changes['version'] == store.version
+    assert changes['start'] == 20
+    assert len(changes['frame']) == 22
+    assert changes['patched'].tolist() == [5, 8]
+    # old holds the values as of since, new the current ones
+    assert changes['old']['cost'].tolist() == before['cost'].iloc[[5, 8]].tolist()
+    assert changes['new']['cost'].tolist() == [7.5, 2.0]
+    assert changes['text'].tolist() == [5, 8]
+
+    # A later starting point only sees the writes after it
+    assert store.changes_since(store.version - 1)['start'] == 21
+    assert store.changes_since(store.version)['patched'].tolist() == []
+
+    store.replace(make_calls(5))
+    assert store.changes_since(since) is None
+
+
+def test_restore_replays_deltas_over_the_snapshot(tmp_path, make_calls):
+    store = CallStore('calls', cache_dir=str(tmp_path))
+    store.replace(make_calls(30))
+    store.upsert(pd.DataFrame({'call_id': ['c2', 'n1'], 'cost': [5.0, 6.0], 'transcript': ['patched text', 'new call']}))
+    store.upsert(make_calls(3, prefix='m', seed=4))
+    store.upsert(pd.DataFrame({'call_id': ['c2', 'm1'], 'customer_tier': ['Platinum', 'Gold']}))
+    expected = full_view(store)
+
+    restored = CallStore('calls', cache_dir=str(tmp_path))
+    assert restored.restore()
+    frame = full_view(restored)
+
+    # Restore re-encodes categoricals, so their categories may come back in another order
+    pd.testing.assert_frame_equal(frame.reset_index(drop=True), expected.reset_index(drop=True),
+                                  check_categorical=False)
+    assert restored.base_id == store.base_id
+    # Writes after a restore keep going on top of the restored rows
+    restored.upsert(pd.DataFrame({'call_id': ['c2'], 'cost': [1.25]}))
+    again = CallStore('calls', cache_dir=str(tmp_path))
+    assert again.restore()
+    assert full_view(again).set_index('call_id').loc['c2', 'cost'] == 1.25
+    assert len(again.frame) == 34
+    assert np.array_equal(again.text(columns=['transcript'])['transcript'].to_numpy(),
+                          full_view(restored)['transcript'].to_numpy())
@@ -0,0 +1,66 @@
+"""Filter index queries and catch-up after store writes"""
+
+import numpy as np
+import pandas as pd
+
+from aiva_call_store import CallStore
+from aiva_filters import FilterIndex
+
+
+def select(index):
+    return index.select(isin={'voice_agent_name': ['Ava', 'Zoe'], 'customer_tier': ['Gold', 'Platinum']},
+                        ranges={'cost': (0.2, 0.8)}, search='cUSTOMER 1',
+                        search_columns=('customer_name', 'call_id')).positions
+
+
+def expected(frame):
+    mask = (frame['voice_agent_name'].isin(['Ava', 'Zoe']) & frame['customer_tier'].isin(['Gold', 'Platinum'])
+            & frame['cost'].between(0.2, 0.8)
+            & (frame['customer_name'].str.lower().str.contains('customer 1', regex=False)
+               | frame['call_id'].str.contains('customer 1', regex=False)))
+    return np.flatnonzero(mask.to_numpy())
+
+
+def test_select_matches_a_pandas_mask(tmp_path, make_calls):
+    store = CallStore('calls', cache_dir=str(tmp_path), persist=False)
+    store.replace(make_calls(300))
+    index = FilterIndex(store.view())
+
+    assert select(index).tolist() == expected(store.view()).tolist()
+    assert index.select().is_all
+    assert index.select(isin={'voice_agent_name': []}).is_all
+    within = np.arange(0, 300, 2)
+    assert index.select(ranges={'cost': (0.2, 0.8)}, within=within).positions.tolist() == \
+        [pos for pos in within if 0.2 <= store.view()['cost'].iloc[pos] <= 0.8]
+
+
+def test_updated_index_matches_a_rebuild(tmp_path, make_calls):
+    store = CallStore('calls', cache_dir=str(tmp_path), persist=False)
+    store.replace(make_calls(300))
+    index = FilterIndex(store.view())
+    select(index)  # builds the column indexes that updated() carries over
+
+    for step in range(5):
+        since = store.version
+        rows = make_calls(12, prefix=f'n{step}_', seed=step + 1)
+        rows['call_id'] = [f'c{i}' for i in range(step * 7, step * 7 + 8)] + rows['call_id'].tolist()[8:]
+        rows.loc[:3, 'customer_tier'] = 'Platinum'
+        rows.loc[4:6, 'customer_name'] = f'Customer 1{step} renamed'
+        store.upsert(rows)
+
+        index = index.updated(store.view(), store.changes_since(since))
+        fresh = FilterIndex(store.view())
+        assert select(index).tolist() == select(fresh).tolist() == expected(store.view()).tolist()
+        assert index.n_rows == len(store.view())
+
+
+def test_updated_index_rebuilds_when_rows_were_not_appended_at_its_end(tmp_path, make_calls):
+    store = CallStore('calls', cache_dir=str(tmp_path), persist=False)
+    store.replace(make_calls(50))
+    stale = FilterIndex(store.view())
+    store.upsert(make_calls(5, prefix='n'))
+    since = store.version
+    store.upsert(pd.DataFrame({'call_id': ['c1'], 'customer_tier': ['Platinum']}))
+
+    index = stale.updated(store.view(), store.changes_since(since))
+    assert index.select(isin={'customer_tier': ['Platinum']}).positions.tolist() == [1]
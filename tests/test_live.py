@@ -0,0 +1,45 @@
+"""Live call tiles fed from webhook events"""
+
+from aiva_live import ACTIVE_CALL_TIMEOUT_SECONDS, BucketRing, LiveMetrics
+
+NOW = 1_700_000_000.0
+
+
+def status_event(call_id, status, at, sent_at=None):
+    return {'kind': 'call', 'source': 'vapi', 'received_at': at, 'sent_at': sent_at,
+            'row': {'call_id': call_id, 'call_status': status}}
+
+
+def test_bucket_ring_windows_slide_and_drop_old_buckets():
+    ring = BucketRing(60, 5)
+    ring.add(NOW - 400, 1.0)
+    ring.add(NOW - 100, 2.0)
+    ring.add(NOW - 10, 3.0)
+    ring.add(NOW - 5, 4.0)
+    # NOW - 400 fell out of the ring's five minutes
+    assert ring.window(300, NOW) == (3, 9.0)
+    assert ring.window(60, NOW) == (2, 7.0)
+    assert ring.window(60, NOW + 120) == (0, 0.0)
+
+
+def test_live_metrics_follow_calls_through_the_queue():
+    metrics = LiveMetrics()
+    metrics.observe([status_event('a', 'queued', NOW - 50), status_event('b', 'queued', NOW - 40),
+                     status_event('a', 'in-progress', NOW - 20, sent_at=NOW - 20.5)])
+    snapshot = metrics.snapshot(NOW)
+    assert (snapshot['queue_length'], snapshot['active_calls']) == (1, 1)
+    # The start is timed by the sender's timestamp, the half second of delivery is latency
+    assert snapshot['avg_wait_seconds'] == 29.5
+    assert round(snapshot['api_latency_ms']) == 500
+    assert snapshot['calls_last_hour'] == 2
+    # Oldest first: b has waited in the queue since before a connected
+    assert [(call['call_id'], call['status']) for call in metrics.live_calls(NOW)] == [('b', 'Queued'), ('a', 'Connected')]
+
+    metrics.observe([status_event('a', 'ended', NOW - 10), status_event('b', 'in-progress', NOW - 5)])
+    snapshot = metrics.snapshot(NOW)
+    assert (snapshot['queue_length'], snapshot['active_calls']) == (0, 1)
+    assert snapshot['calls_last_hour'] == 2
+
+    # A call whose end never arrives stops counting as live
+    later = NOW + ACTIVE_CALL_TIMEOUT_SECONDS + 1
+    assert metrics.snapshot(later)['active_calls'] == 0
@@ -0,0 +1,33 @@
+"""Shared URL prober: per-watcher claims on probed URLs"""
+
+import time
+
+from aiva_monitor import UrlProber
+
+# Nothing listens on the discard port, so probes fail fast without network access
+URL = 'http://127.0.0.1:9/health'
+
+
+def test_unwatch_keeps_urls_other_sessions_watch():
+    prober = UrlProber(interval=60, timeout=0.5)
+    prober.watch(URL, 'session-a')
+    prober.watch(URL, 'session-b')
+
+    prober.unwatch(URL, 'session-a')
+    assert URL in prober.targets
+
+    prober.unwatch(URL, 'session-b')
+    assert URL not in prober.targets and URL not in prober.history
+
+
+def test_urls_nobody_renews_expire():
+    prober = UrlProber(interval=60, timeout=0.5, watch_ttl=0.5)
+    prober.watch(URL, 'session-a')
+    prober.watch('http://127.0.0.1:9/status', 'session-b')
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and URL in prober.targets:
+        prober.watch('http://127.0.0.1:9/status', 'session-b')
+        time.sleep(0.1)
+    assert URL not in prober.targets
+    assert 'http://127.0.0.1:9/status' in prober.targets
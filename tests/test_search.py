@@ -0,0 +1,95 @@
+"""Transcript and contact search catch-up after store writes"""
+
+import numpy as np
+import pandas as pd
+
+from aiva_call_store import CallStore
+from aiva_search import MAX_TRANSCRIPT_SEGMENTS, ContactSearchIndex, TranscriptIndex
+
+QUERIES = ['refund', 'late billing', '"order late"', 'cancel price thanks', 'rewritten', 'zebra']
+
+
+def fresh_index(store):
+    return TranscriptIndex('fresh', persist=False).sync(store.view(), text_store=store)
+
+
+def assert_same_results(index, fresh):
+    for query in QUERIES:
+        got, want = index.search(query, limit=1000), fresh.search(query, limit=1000)
+        assert np.array_equal(got[0], want[0]), query
+        assert np.allclose(got[1], want[1]), query
+    assert index.total_tokens == fresh.total_tokens
+
+
+def write(store, step, make_calls):
+    rows = make_calls(12, prefix=f'n{step}_', seed=step + 1)
+    rows.loc[:7, 'call_id'] = [f'c{i}' for i in range(step * 5, step * 5 + 8)]
+    rows.loc[:2, 'transcript'] = 'rewritten zebra order late'
+    if step % 3 == 0:
+        # Metadata-only updates leave the indexed text alone
+        rows = rows.drop(columns=['transcript', 'summary'])
+    store.upsert(rows)
+
+
+def no_rebuild(index):
+    raise AssertionError("index was rebuilt instead of caught up")
+
+
+def test_synced_transcript_index_matches_a_rebuild(tmp_path, make_calls, monkeypatch):
+    store = CallStore('calls', cache_dir=str(tmp_path))
+    store.replace(make_calls(200))
+    index = TranscriptIndex('calls', cache_dir=str(tmp_path))
+    index.sync(store.view(), version=('calls', store.version), text_store=store)
+    assert_same_results(index, fresh_index(store))
+    monkeypatch.setattr(TranscriptIndex, 'clear', no_rebuild)
+
+    # Enough writes to go past MAX_TRANSCRIPT_SEGMENTS and merge segments
+    for step in range(MAX_TRANSCRIPT_SEGMENTS + 4):
+        write(store, step, make_calls)
+        index.sync(store.view(), version=('calls', store.version), text_store=store)
+        assert_same_results(index, fresh_index(store))
+    assert len(index.segments) <= MAX_TRANSCRIPT_SEGMENTS + 1
+
+
+def test_restarted_transcript_index_resumes_from_disk(tmp_path, make_calls, monkeypatch):
+    store = CallStore('calls', cache_dir=str(tmp_path))
+    store.replace(make_calls(200))
+    index = TranscriptIndex('calls', cache_dir=str(tmp_path))
+    for step in range(3):
+        write(store, step + 1, make_calls)
+        index.sync(store.view(), version=('calls', store.version), text_store=store)
+
+    with monkeypatch.context() as patched:
+        patched.setattr(TranscriptIndex, 'clear', no_rebuild)
+        restarted = TranscriptIndex('calls', cache_dir=str(tmp_path))
+        restarted.sync(store.view(), version=('calls', store.version), text_store=store)
+    assert restarted.generation == index.generation
+    assert_same_results(restarted, fresh_index(store))
+
+    # A rewrite the saved index never saw changes the text generation, so the restart rebuilds
+    store.upsert(pd.DataFrame({'call_id': ['c150'], 'transcript': ['zebra zebra']}))
+    stale = TranscriptIndex('calls', cache_dir=str(tmp_path))
+    stale.sync(store.view(), version=('calls', store.version), text_store=store)
+    assert_same_results(stale, fresh_index(store))
+    assert 150 in stale.search('zebra')[0]
+
+
+def test_synced_contact_index_matches_a_rebuild(tmp_path, make_calls):
+    store = CallStore('calls', cache_dir=str(tmp_path), persist=False)
+    calls = make_calls(100)
+    calls['email'] = [f'customer{i}@example{i % 3}.com' for i in range(100)]
+    calls['phone_number'] = [f'+1 555 010 {i:04d}' for i in range(100)]
+    store.replace(calls)
+    index = ContactSearchIndex().sync(store)
+
+    store.upsert(pd.DataFrame({'call_id': ['c7', 'n1'], 'customer_name': ['Ann Lee', 'Bob Annson'],
+                               'email': ['ann@gmail.com', 'bob@example1.com'], 'phone_number': ['555-1234', None]}))
+    index.sync(store)
+    fresh = ContactSearchIndex().build(store.view())
+
+    for term in ['ann', 'customer 1', 'ann@gm', 'example1', '0100 0042', '1234']:
+        got, want = index.search(term), fresh.search(term)
+        assert np.array_equal(got[0], want[0]), term
+        assert np.allclose(got[1], want[1]), term
+    assert 7 in index.search('ann lee')[0]
+    assert 7 not in index.search('customer 7')[0]
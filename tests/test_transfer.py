@@ -0,0 +1,71 @@
+"""Chunked import and export round trips"""
+
+import gzip
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+
+from aiva_call_store import CallStore
+from aiva_export import export_calls
+from aiva_import import import_upload
+
+
+def csv_upload(frame):
+    return io.BytesIO(frame.to_csv(index=False).encode('utf-8'))
+
+
+def test_import_in_chunks_then_upsert(tmp_path, make_calls):
+    store = CallStore('calls', cache_dir=str(tmp_path), persist=False)
+    calls = make_calls(120)
+    calls.loc[5, 'call_id'] = None
+
+    report, error = import_upload(store, csv_upload(calls), 'calls.csv', chunk_rows=50)
+    assert error is None
+    assert report['chunks'] == 3
+    assert report['rows_read'] == 120 and report['rejected_rows'] == 1
+    assert len(store.frame) == 119
+
+    updates = make_calls(10, seed=3)
+    updates['call_id'] = [f'c{i}' for i in range(100, 110)]
+    updates.loc[8:, 'call_id'] = ['extra1', 'extra2']
+    report, error = import_upload(store, csv_upload(updates), 'updates.csv', mode='upsert', chunk_rows=4)
+    assert error is None
+    assert (report['updated'], report['inserted']) == (8, 2)
+    frame = store.view(columns=store.columns).set_index('call_id')
+    assert len(frame) == 121
+    assert frame.loc['c104', 'transcript'] == updates['transcript'].iloc[4]
+
+    _, error = import_upload(store, csv_upload(updates), 'updates.csv', mode='merge')
+    assert error == "Unknown import mode: merge"
+
+
+@pytest.mark.parametrize('export_format, compression', [('CSV', 'None'), ('CSV', 'GZIP'), ('JSON', 'None'),
+                                                        ('Parquet', 'ZIP')])
+def test_export_round_trips_the_selected_rows(tmp_path, make_calls, export_format, compression):
+    store = CallStore('calls', cache_dir=str(tmp_path), persist=False)
+    store.replace(make_calls(80))
+    selected = store.view().iloc[10:70]
+    columns = ['call_id', 'voice_agent_name', 'cost', 'transcript']
+
+    export, error = export_calls(store, selected, export_format, compression, columns=columns, chunk_rows=25)
+    assert error is None
+    assert export['rows'] == 60
+    data = export['file'].read()
+    export['file'].close()
+    assert export['bytes'] == len(data)
+
+    if compression == 'GZIP':
+        data = gzip.decompress(data)
+    elif compression == 'ZIP':
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            data = archive.read(archive.namelist()[0])
+    reader = {'CSV': pd.read_csv, 'JSON': pd.read_json, 'Parquet': pd.read_parquet}[export_format]
+    exported = reader(io.BytesIO(data))
+
+    expected = store.view(columns=columns).iloc[10:70].reset_index(drop=True)
+    assert exported.columns.tolist() == columns
+    assert exported['call_id'].tolist() == expected['call_id'].tolist()
+    assert exported['transcript'].tolist() == expected['transcript'].tolist()
+    assert exported['cost'].round(6).tolist() == expected['cost'].round(6).tolist()
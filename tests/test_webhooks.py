@@ -0,0 +1,109 @@
+"""Webhook log, feed and endpoint registry"""
+
+import pandas as pd
+import pytest
+
+from aiva_call_store import CallStore
+from aiva_webhooks import WebhookFeed, WebhookLog, WebhookRegistry, create_app
+
+
+def call_event(call_id=None):
+    payload = {'message': {'type': 'status-update', 'status': 'in-progress', 'call': {'id': call_id} if call_id else {}}}
+    return {'source': 'vapi', 'kind': 'call', 'payload': payload}
+
+
+def test_log_keeps_sequence_numbers_across_rotation_and_restart(tmp_path):
+    log = WebhookLog(str(tmp_path), segment_bytes=200)
+    first = log.append([call_event() for _ in range(5)])
+    assert first == [1, 2, 3, 4, 5]
+    # The batch filled the segment, so the newest segment is empty when the process stops
+    assert len(log.segments()) == 2
+
+    restarted = WebhookLog(str(tmp_path), segment_bytes=200)
+    assert restarted.append([call_event()]) == [6]
+
+    events, _ = restarted.read_from()
+    seqs = [event['seq'] for event in events]
+    assert seqs == sorted(set(seqs)) == [1, 2, 3, 4, 5, 6]
+
+
+def test_log_cuts_off_a_torn_last_line(tmp_path):
+    log = WebhookLog(str(tmp_path))
+    log.append([call_event('a'), call_event('b')])
+    with open(log._segment_path(log.segments()[-1]), 'ab') as f:
+        f.write(b'{"seq": 3, "sou')
+
+    restarted = WebhookLog(str(tmp_path))
+    assert restarted.append([call_event('c')]) == [3]
+    events, _ = restarted.read_from()
+    assert [event['payload']['message']['call']['id'] for event in events] == ['a', 'b', 'c']
+
+
+def feed_for(tmp_path, log):
+    store = CallStore('feed', cache_dir=str(tmp_path / 'store'))
+    store.restore()
+    return WebhookFeed(store, log)
+
+
+def test_feed_resumes_after_restart_without_replaying(tmp_path):
+    log = WebhookLog(str(tmp_path / 'log'))
+    log.append([call_event('call-1'), call_event('call-2')])
+    feed = feed_for(tmp_path, log)
+    feed.store.replace(pd.DataFrame({'call_id': ['sheet-1'], 'call_status': ['ended']}))
+    assert feed.poll() == 2
+
+    log.append([call_event('call-3')])
+    restarted = feed_for(tmp_path, log)
+    assert restarted.position == feed.position
+    assert restarted.poll() == 1
+    assert sorted(restarted.store.view()['call_id']) == ['call-1', 'call-2', 'call-3', 'sheet-1']
+
+
+def test_feed_does_not_replay_old_events_over_a_replace(tmp_path):
+    log = WebhookLog(str(tmp_path / 'log'))
+    log.append([call_event('call-1')])
+    feed = feed_for(tmp_path, log)
+    feed.store.replace(pd.DataFrame({'call_id': ['call-1'], 'call_status': ['ended']}))
+    feed.poll()
+
+    # A full reload from the source supersedes the webhook values logged before it
+    feed.store.replace(pd.DataFrame({'call_id': ['call-1'], 'call_status': ['completed']}))
+    assert feed.poll() == 0
+    assert feed.store.view()['call_status'].tolist() == ['completed']
+
+    log.append([call_event('call-2')])
+    assert feed.poll() == 1
+    assert feed_for(tmp_path, log).base_id == feed.store.base_id
+
+
+def test_registry_pauses_and_deletes_endpoints(tmp_path):
+    registry = WebhookRegistry(str(tmp_path))
+    endpoint, error = registry.add("Sales Line", 'n8n')
+    assert error is None and endpoint['id'] == 'sales-line'
+    assert registry.add("sales line", 'n8n')[1] is not None
+
+    registry.set_status('vapi', 'Paused')
+    # Another process (the ingestion service) sees the same endpoints
+    shared = WebhookRegistry(str(tmp_path)).endpoints()
+    assert shared['vapi']['status'] == 'Paused' and 'sales-line' in shared
+
+    assert registry.delete('vapi')[1] is not None
+    assert registry.delete('sales-line')[0]['name'] == "Sales Line"
+    assert set(registry.endpoints()) == {'vapi', 'n8n'}
+
+
+def test_endpoints_log_events_unless_paused(tmp_path):
+    pytest.importorskip('flask')
+    log = WebhookLog(str(tmp_path))
+    registry = WebhookRegistry(str(tmp_path))
+    registry.add("Sales Line", 'vapi')
+    client = create_app(log, registry=registry).test_client()
+
+    response = client.post('/webhooks/sales-line', json=[call_event('a')['payload'], call_event('b')['payload']])
+    assert response.status_code == 202 and response.get_json()['accepted'] == 2
+    assert client.post('/webhooks/unknown', json=call_event('c')['payload']).status_code == 404
+    registry.set_status('sales-line', 'Paused')
+    assert client.post('/webhooks/sales-line', json=call_event('d')['payload']).status_code == 503
+
+    events, _ = log.read_from()
+    assert [event['endpoint'] for event in events] == ['sales-line', 'sales-line']